@@ -0,0 +1,235 @@
+import json
+import multiprocessing
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from measurement.planner import ANGLE_MAJOR
+from test_state import TestState
+
+BENCHES_FILE = "benches.json"
+RESULT_FILE = "result.json"
+
+# Spawn on every platform: the worker must not inherit the parent's instrument sessions or threads.
+_CONTEXT = multiprocessing.get_context("spawn")
+
+
+class _WorkerTestState(TestState):
+    """Test state of a worker process; running and stop are shared with the API process."""
+
+    def __init__(self, active, verdicts):
+        super().__init__()
+        self._active = active
+        self._verdict_queue = verdicts
+
+    def start(self):
+        self._active.set()
+
+    def stop(self):
+        self._active.clear()
+
+    def is_active(self):
+        return self._active.is_set()
+
+    def set_verdict(self, key: str, verdict: dict):
+        self._verdict_queue.put((key, verdict))
+
+
+def _run_bench(config_dir: str, order: str, resume: bool, active, verdicts) -> None:
+    """Entry point of a worker process: one campaign of one bench."""
+    # Imported in the worker only; the API process does not load the measurement modules for it.
+    from testowy import run_antenna_test
+
+    state = _WorkerTestState(active, verdicts)
+    try:
+        run_antenna_test(state, Path(config_dir) / RESULT_FILE, order, resume)
+    finally:
+        state.stop()
+        verdicts.close()
+        verdicts.join_thread()
+
+
+class BenchWorker:
+    """
+    One test chamber driven from the API process.
+
+    Each campaign runs in a separate process, so the bench's SMB100A session, NI
+    tasks and axis controller live in that process and several benches measure at
+    the same time. The configuration, checkpoint, traces and results of the bench
+    are in its own ``config_dir``.
+
+    Args:
+        bench_id: The identifier used in the API (``/benches/{bench_id}/...``).
+        config_dir: The configuration directory of the bench.
+        name: The display name.
+    """
+
+    def __init__(self, bench_id: str, config_dir: Path, name: str = ""):
+        self.bench_id = bench_id
+        self.config_dir = config_dir
+        self.name = name or bench_id
+        self._active = _CONTEXT.Event()
+        self._verdict_queue = None
+        self._verdicts: Dict[str, dict] = {}
+        self._process: Optional[multiprocessing.Process] = None
+        self._lock = threading.Lock()
+
+    @property
+    def result_file(self) -> Path:
+        return self.config_dir / RESULT_FILE
+
+    def start(self, order: str = ANGLE_MAJOR, resume: bool = False) -> bool:
+        """
+        Starts a campaign of the bench in a new worker process.
+
+        Returns:
+            False if the bench is already measuring.
+        """
+        with self._lock:
+            if self.is_active():
+                return False
+            self._verdicts = {}
+            self._verdict_queue = _CONTEXT.Queue()
+            self._active.set()
+            self._process = _CONTEXT.Process(
+                target=_run_bench, name=f"bench-{self.bench_id}", daemon=True,
+                args=(str(self.config_dir), order, resume, self._active, self._verdict_queue),
+            )
+            self._process.start()
+            return True
+
+    def stop(self) -> None:
+        """Asks the worker to stop after the current point (it leaves the bench in a safe state)."""
+        self._active.clear()
+
+    def is_active(self) -> bool:
+        # Running until the process exits: after a stop it still parks the bench and saves results.
+        return self._process is not None and self._process.is_alive()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._process is not None:
+            self._process.join(timeout)
+
+    def terminate(self, timeout: float = 5.0) -> None:
+        """Stops the worker, killing it if it does not finish in time."""
+        self.stop()
+        if self._process is not None and self._process.is_alive():
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+
+    def verdicts(self) -> Dict[str, dict]:
+        """Pass/fail verdicts published by the worker so far, keyed by "<sheet>/<id>"."""
+        with self._lock:
+            if self._verdict_queue is not None:
+                while True:
+                    try:
+                        key, verdict = self._verdict_queue.get_nowait()
+                    except (queue.Empty, OSError, ValueError):
+                        break
+                    self._verdicts[key] = verdict
+            return dict(self._verdicts)
+
+    def status(self) -> Dict[str, Any]:
+        process = self._process
+        return {
+            "id": self.bench_id,
+            "name": self.name,
+            "is_running": self.is_active(),
+            "pid": process.pid if process is not None and process.is_alive() else None,
+            "exit_code": process.exitcode if process is not None else None,
+            "verdicts": self.verdicts(),
+        }
+
+
+class BenchPool:
+    """
+    The additional benches listed in ``benches.json`` of the main configuration directory.
+
+    The file holds a list of ``{"id", "config_dir", "name"}``; ``config_dir`` is
+    relative to the main configuration directory. The list is read again when the
+    file changes; workers of benches still listed are kept.
+    """
+
+    def __init__(self, config_dir: Path):
+        self.path = config_dir / BENCHES_FILE
+        self.config_dir = config_dir
+        self._workers: Dict[str, BenchWorker] = {}
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    def workers(self) -> List[BenchWorker]:
+        with self._lock:
+            stopped = self._reload()
+            workers = list(self._workers.values())
+        self._stop(stopped)
+        return workers
+
+    def get(self, bench_id: str) -> BenchWorker:
+        """
+        Raises:
+            KeyError: If the bench is not configured.
+        """
+        with self._lock:
+            stopped = self._reload()
+            worker = self._workers.get(bench_id)
+        self._stop(stopped)
+        if worker is None:
+            raise KeyError(bench_id)
+        return worker
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        for worker in list(self._workers.values()):
+            worker.terminate(timeout)
+
+    @staticmethod
+    def _stop(workers: List[BenchWorker]) -> None:
+        # Outside the pool lock: terminating a worker may wait for its process.
+        for worker in workers:
+            worker.terminate()
+
+    def _reload(self) -> List[BenchWorker]:
+        """
+        Reads benches.json again if it changed.
+
+        The file is remembered as read only once it is parsed, so a malformed file
+        keeps failing until it is fixed instead of leaving the old list in place.
+
+        Returns:
+            The workers of removed or moved benches, to be terminated by the caller.
+
+        Raises:
+            ValueError: If the file is not a list of bench entries.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            stat = None
+        stamp = (stat.st_mtime_ns, stat.st_size) if stat is not None else None
+        if stamp == self._stamp:
+            return []
+        entries = []
+        if stat is not None:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        try:
+            benches = [(str(entry["id"]), (self.config_dir / entry.get("config_dir", str(entry["id"]))).resolve(),
+                        entry.get("name", "")) for entry in entries]
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid bench entry in {self.path}: {e!r}") from None
+
+        workers = {}
+        stopped = []
+        for bench_id, config_dir, name in benches:
+            worker = self._workers.get(bench_id)
+            if worker is None or worker.config_dir != config_dir:
+                if worker is not None:
+                    stopped.append(worker)
+                worker = BenchWorker(bench_id, config_dir, name)
+            workers[bench_id] = worker
+        stopped.extend(worker for bench_id, worker in self._workers.items() if bench_id not in workers)
+        self._workers = workers
+        self._stamp = stamp
+        return stopped
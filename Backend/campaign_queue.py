@@ -0,0 +1,369 @@
+import copy
+import json
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from template_ingest import write_atomic
+from test_state import TestState
+
+QUEUE_FILE = "campaign_queue.json"
+JOBS_DIR = "jobs"
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+STOPPED = "stopped"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (DONE, STOPPED, FAILED, CANCELLED)
+
+
+@dataclass
+class CampaignJob:
+    """A queued campaign: a frozen we_config snapshot with the DUT it measures."""
+
+    job_id: str
+    we_config: List[Dict[str, Any]]
+    order: str
+    name: str = ""
+    dut: Dict[str, Any] = field(default_factory=dict)
+    priority: int = 0
+    position: int = 0
+    status: str = QUEUED  # queued -> running -> done | stopped | failed; queued | running -> cancelled
+    resume: bool = False
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    message: str = ""
+
+    @property
+    def wait_s(self) -> Optional[float]:
+        return self.started_at - self.created_at if self.started_at is not None else None
+
+    def to_dict(self, with_config: bool = False) -> Dict[str, Any]:
+        data = asdict(self)
+        if not with_config:
+            data.pop("we_config")
+            data["sheets"] = len(self.we_config)
+        data["wait_s"] = round(self.wait_s, 1) if self.wait_s is not None else None
+        return data
+
+
+class CampaignQueue:
+    """
+    Persistent queue of campaigns executed back-to-back on one bench.
+
+    Jobs run in order of priority (higher first), then position. The queue is
+    stored in ``campaign_queue.json`` after every change; a job that was running
+    when the backend stopped is queued again and resumed from its checkpoint.
+    Results of every job are written to ``jobs/<job_id>/result.json``.
+
+    Args:
+        config_dir: The configuration directory of the bench.
+        state: The test state shared with manually started tests.
+        run_job: Runs one job; called as ``run_job(job, result_file, bench)`` and
+            returns True when every point was measured.
+        open_bench: Opens the bench kept open while the queue has jobs.
+    """
+
+    def __init__(self, config_dir: Path, state: TestState,
+                 run_job: Callable[["CampaignJob", Path, Any], bool], open_bench: Callable[[], Any]):
+        self.config_dir = config_dir
+        self.path = config_dir / QUEUE_FILE
+        self.state = state
+        self._run_job = run_job
+        self._open_bench = open_bench
+        self._jobs: Dict[str, CampaignJob] = {}
+        self._paused = False
+        # Why the queue paused itself (bench not available, job stopped from outside); "" when paused by hand.
+        self.pause_reason = ""
+        self._current: Optional[CampaignJob] = None
+        self._wake = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._shutdown = False
+        self._load()
+
+    # --- Queue management ------------------------------------------------------------
+
+    def add(self, we_config: List[Dict[str, Any]], order: str, name: str = "", dut: Optional[Dict[str, Any]] = None,
+            priority: int = 0) -> CampaignJob:
+        """Queues a snapshot of the campaign; the DUT serial is stamped on sheets that have none."""
+        dut = dict(dut or {})
+        snapshot = copy.deepcopy(we_config)
+        if dut.get("serial"):
+            for item in snapshot:
+                item.setdefault("dut_serial", dut["serial"])
+        with self._wake:
+            position = max((job.position for job in self._jobs.values()), default=0) + 1
+            job = CampaignJob(uuid.uuid4().hex[:12], snapshot, order, name, dut, int(priority), position)
+            self._jobs[job.job_id] = job
+            self._save()
+            self._wake.notify_all()
+        return job
+
+    def get(self, job_id: str) -> Optional[CampaignJob]:
+        with self._wake:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[CampaignJob]:
+        """All jobs: the running one, the queued ones in execution order, then the finished ones."""
+        with self._wake:
+            jobs = list(self._jobs.values())
+        running = [job for job in jobs if job.status == RUNNING]
+        finished = sorted((job for job in jobs if job.status in FINISHED_STATES),
+                          key=lambda job: job.finished_at or 0, reverse=True)
+        return running + self._pending(jobs) + finished
+
+    def set_priority(self, job_id: str, priority: int) -> CampaignJob:
+        with self._wake:
+            job = self._queued(job_id)
+            job.priority = int(priority)
+            self._save()
+            return job
+
+    def move(self, job_id: str, index: int) -> CampaignJob:
+        """
+        Moves a queued job to the given place (0 = next) in the execution order.
+
+        The job takes the priority of the job it displaces, so the new order holds.
+        """
+        with self._wake:
+            job = self._queued(job_id)
+            pending = [other for other in self._pending(self._jobs.values()) if other is not job]
+            index = min(max(int(index), 0), len(pending))
+            if pending:
+                neighbour = pending[min(index, len(pending) - 1)]
+                job.priority = neighbour.priority
+            pending.insert(index, job)
+            for position, other in enumerate(pending, start=1):
+                other.position = position
+            self._save()
+            return job
+
+    def cancel(self, job_id: str) -> CampaignJob:
+        """Cancels a queued job, or stops the running one (its measured points are kept)."""
+        with self._wake:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise KeyError(job_id)
+            if job.status in FINISHED_STATES:
+                raise ValueError(f"Job {job_id} is already {job.status}.")
+            if job.status == RUNNING:
+                self.state.stop()
+            else:
+                job.finished_at = time.time()
+            job.status = CANCELLED
+            self._save()
+            return job
+
+    def requeue(self, job_id: str) -> CampaignJob:
+        """Queues a stopped or failed job again; it resumes from its checkpoint."""
+        with self._wake:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise KeyError(job_id)
+            if job.status not in (STOPPED, FAILED):
+                raise ValueError(f"Job {job_id} is {job.status}; only stopped or failed jobs can be requeued.")
+            job.status = QUEUED
+            job.resume = True
+            job.finished_at = None
+            job.message = ""
+            self._save()
+            self._wake.notify_all()
+            return job
+
+    def pause(self) -> None:
+        """Finishes the running job and starts no new ones."""
+        with self._wake:
+            self._paused = True
+            self.pause_reason = ""
+            self._save()
+
+    def resume(self) -> None:
+        with self._wake:
+            self._paused = False
+            self.pause_reason = ""
+            self._save()
+            self._wake.notify_all()
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    def stats(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Queue wait and bench utilisation.
+
+        Utilisation is the share of time spent running jobs between the start of the
+        first job and now (or the end of the last job when the queue is idle).
+        """
+        now = now or time.time()
+        with self._wake:
+            jobs = list(self._jobs.values())
+        started = [job for job in jobs if job.started_at is not None]
+        waits = [job.wait_s for job in started]
+        busy = sum((job.finished_at or now) - job.started_at for job in started)
+        window_end = now if any(job.status == RUNNING for job in jobs) or not started \
+            else max(job.finished_at or now for job in started)
+        window = window_end - min((job.started_at for job in started), default=now)
+        return {
+            "queued": sum(job.status == QUEUED for job in jobs),
+            "running": self._current.job_id if self._current is not None else None,
+            "paused": self._paused,
+            "pause_reason": self.pause_reason,
+            "finished": {status: sum(job.status == status for job in jobs) for status in FINISHED_STATES},
+            "mean_wait_s": round(sum(waits) / len(waits), 1) if waits else None,
+            "max_wait_s": round(max(waits), 1) if waits else None,
+            "busy_s": round(busy, 1),
+            "utilisation": round(busy / window, 3) if window > 0 else None,
+        }
+
+    def result_file(self, job: CampaignJob) -> Path:
+        return self.config_dir / JOBS_DIR / job.job_id / "result.json"
+
+    # --- Execution -------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Starts the worker thread executing the queue."""
+        if self._thread is None:
+            self._shutdown = False
+            self._thread = threading.Thread(target=self._worker, name="campaign-queue", daemon=True)
+            self._thread.start()
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        with self._wake:
+            self._shutdown = True
+            self._wake.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_pending(self) -> int:
+        """
+        Runs queued jobs back-to-back until the queue is empty or paused.
+
+        The bench is opened once for the whole batch and closed when it ends, so
+        instrument sessions and the axis controller stay attached between jobs. If
+        the bench cannot be opened the job goes back to the queue and the queue
+        pauses, instead of every remaining job failing the same way.
+
+        Returns:
+            The number of jobs run.
+        """
+        bench = None
+        count = 0
+        try:
+            while not self._shutdown:
+                job = self._claim_next()
+                if job is None:
+                    break
+                if bench is None:
+                    try:
+                        bench = self._open_bench()
+                    except Exception as e:
+                        self.state.stop()
+                        self._hold(job, f"Bench could not be opened: {type(e).__name__}: {e}")
+                        break
+                count += 1
+                try:
+                    finished = self._run_job(job, self.result_file(job), bench)
+                except Exception as e:
+                    self._finish(job, FAILED, f"{type(e).__name__}: {e}")
+                    continue
+                finally:
+                    self.state.stop()
+                self._finish(job, DONE if finished else STOPPED)
+        finally:
+            if bench is not None:
+                bench.close()
+        return count
+
+    def _worker(self) -> None:
+        while not self._shutdown:
+            self.run_pending()
+            with self._wake:
+                if not self._shutdown:
+                    # Woken by a new job or resume; polled while a manual test holds the bench.
+                    self._wake.wait(timeout=5.0)
+
+    def _claim_next(self) -> Optional[CampaignJob]:
+        with self._wake:
+            if self._paused:
+                return None
+            pending = self._pending(self._jobs.values())
+            if not pending or not self.state.try_start():
+                return None
+            job = pending[0]
+            job.status = RUNNING
+            job.started_at = job.started_at or time.time()
+            job.message = ""
+            self._current = job
+            self._save()
+            return job
+
+    def _hold(self, job: CampaignJob, reason: str) -> None:
+        """Puts a claimed job back in the queue unrun and pauses the queue."""
+        with self._wake:
+            self._current = None
+            if job.status != CANCELLED:
+                job.status = QUEUED
+                if not job.resume:
+                    job.started_at = None
+            job.message = reason
+            self._paused = True
+            self.pause_reason = reason
+            self._save()
+
+    def _finish(self, job: CampaignJob, status: str, message: str = "") -> None:
+        with self._wake:
+            self._current = None
+            if job.status == CANCELLED:
+                status = CANCELLED
+            elif status == STOPPED:
+                # Stopped from outside the queue (POST /stop-test): do not start the next job.
+                self._paused = True
+                message = message or "Stopped outside the queue; the queue is paused."
+                self.pause_reason = message
+            job.status = status
+            job.message = message
+            job.finished_at = time.time()
+            self._save()
+
+    # --- Storage ---------------------------------------------------------------------
+
+    @staticmethod
+    def _pending(jobs) -> List[CampaignJob]:
+        return sorted((job for job in jobs if job.status == QUEUED), key=lambda job: (-job.priority, job.position))
+
+    def _queued(self, job_id: str) -> CampaignJob:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        if job.status != QUEUED:
+            raise ValueError(f"Job {job_id} is {job.status}; only queued jobs can be reordered.")
+        return job
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        self._paused = bool(data.get("paused", False))
+        self.pause_reason = data.get("pause_reason", "")
+        for entry in data.get("jobs", []):
+            entry.pop("wait_s", None)
+            job = CampaignJob(**entry)
+            if job.status == RUNNING:
+                # Interrupted by a backend restart: measured points are in the job's checkpoint.
+                job.status = QUEUED
+                job.resume = True
+            self._jobs[job.job_id] = job
+
+    def _save(self) -> None:
+        data = {"paused": self._paused, "pause_reason": self.pause_reason, "jobs": [job.to_dict(with_config=True) for job in self._jobs.values()]}
+        write_atomic(self.path, json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8"))
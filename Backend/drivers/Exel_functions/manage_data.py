@@ -0,0 +1,276 @@
+import functools
+import io
+import re
+import logging
+import xml.etree.ElementTree as ET
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+# openpyxl is imported where it is used; it is a large part of the backend startup.
+if TYPE_CHECKING:
+    from openpyxl.worksheet.cell_range import CellRange
+
+_LOGGER = logging.getLogger(__name__)
+
+# Frequency block layout in the Somfy template: keys in column T, one object per column V..AD.
+KEY_COLUMN = 20
+FIRST_DATA_COLUMN = 22
+LAST_DATA_COLUMN = 30
+FIRST_ROW = 3
+LAST_ROW = 8
+
+_SPREADSHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+Coordinate = Tuple[int, int]
+
+
+class MergedCellIndex:
+    """
+    Maps every covered cell of a merged range to its top-left anchor.
+
+    The index is built once per sheet, so resolving a cell is a single dict
+    lookup instead of a scan over all merged ranges.
+    """
+
+    def __init__(self, ranges: List["CellRange"]):
+        """
+        Builds the cell -> anchor map.
+
+        Args:
+            ranges: The merged ranges of the sheet.
+        """
+        self._anchors: Dict[Coordinate, Coordinate] = {}
+        for merged in ranges:
+            anchor = (merged.min_row, merged.min_col)
+            for row in range(merged.min_row, merged.max_row + 1):
+                for col in range(merged.min_col, merged.max_col + 1):
+                    self._anchors[(row, col)] = anchor
+
+    def anchor(self, row: int, col: int) -> Optional[Coordinate]:
+        """Returns the anchor of the merged range containing the cell, or None."""
+        return self._anchors.get((row, col))
+
+    def anchors_in(self, min_row: int, max_row: int, min_col: int, max_col: int) -> List[Coordinate]:
+        """Returns the anchors of all merged ranges overlapping the given block."""
+        return [
+            anchor
+            for (row, col), anchor in self._anchors.items()
+            if min_row <= row <= max_row and min_col <= col <= max_col
+        ]
+
+
+def read_merged_ranges(worksheet: Any, source: Union[bytes, str, None] = None) -> List["CellRange"]:
+    """
+    Reads the merged ranges of a worksheet.
+
+    Read-only worksheets do not expose ``merged_cells``, so for them the
+    ``<mergeCells>`` element is streamed directly from the worksheet XML part.
+    That uses the private ``parent._archive`` and ``_worksheet_path`` attributes of
+    openpyxl's read-only worksheet, present in the pinned openpyxl 3.1.5. Without
+    them the ranges are read from a regular (non read-only) load of ``source``.
+
+    Args:
+        worksheet: A regular or read-only openpyxl worksheet.
+        source: The workbook content or path, for the fallback of a read-only worksheet.
+
+    Returns:
+        The list of merged ranges.
+
+    Raises:
+        ValueError: If the read-only worksheet has no XML part to stream and no source is given.
+    """
+    if hasattr(worksheet, "merged_cells"):
+        return list(worksheet.merged_cells.ranges)
+
+    from openpyxl.worksheet.cell_range import CellRange
+
+    # ReadOnlyWorksheet keeps the path of its XML part and the workbook keeps the archive open.
+    archive = getattr(getattr(worksheet, "parent", None), "_archive", None)
+    part = getattr(worksheet, "_worksheet_path", None)
+    if archive is None or part is None:
+        if source is None:
+            raise ValueError(f"Cannot read the merged cells of read-only sheet '{worksheet.title}' without its source.")
+        _LOGGER.warning("openpyxl read-only worksheets no longer expose their XML part; loading the full workbook.")
+        return [CellRange(ref) for ref in _regular_merged_ranges(source).get(worksheet.title, ())]
+
+    ranges = []
+    with archive.open(part) as xml:
+        for _, element in ET.iterparse(xml):
+            if element.tag == f"{_SPREADSHEET_NS}mergeCell":
+                ranges.append(CellRange(element.get("ref")))
+            elif element.tag == f"{_SPREADSHEET_NS}row":
+                element.clear()
+    return ranges
+
+
+@functools.lru_cache(maxsize=1)
+def _regular_merged_ranges(source: Union[bytes, str]) -> Dict[str, Tuple[str, ...]]:
+    # One regular load serves every sheet of the workbook being parsed.
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(io.BytesIO(source) if isinstance(source, bytes) else source)
+    try:
+        return {sheet.title: tuple(str(merged) for merged in sheet.merged_cells.ranges)
+                for sheet in workbook.worksheets}
+    finally:
+        workbook.close()
+
+
+def normalize_key(value: Any) -> str:
+    """
+    Normalizes a header cell to a JSON key.
+
+    Example: "Frequency (MHz)" -> "frequency_mhz"
+    """
+    words = re.findall(r"\w+", str(value).lower())
+    return "_".join(words)
+
+
+def read_frequency_block(
+    worksheet: Any, merged: Optional[MergedCellIndex] = None
+) -> Tuple[List[str], Dict[int, Dict[str, Any]]]:
+    """
+    Reads the frequency block (rows 3-8, keys in column T, objects in V-AD) of one sheet.
+
+    The block is read in a single ``iter_rows(values_only=True)`` pass. Empty cells
+    covered by a merged range take the value of the range anchor; the read window is
+    widened so that anchors lying outside the block (e.g. a title merged from row 2)
+    are part of the same pass.
+
+    Args:
+        worksheet: A regular or read-only openpyxl worksheet.
+        merged: A prebuilt merged-cell index; built from the worksheet if omitted.
+
+    Returns:
+        The normalized keys (one per row) and the frequency objects keyed by column index.
+    """
+    if merged is None:
+        merged = MergedCellIndex(read_merged_ranges(worksheet))
+
+    anchors = merged.anchors_in(FIRST_ROW, LAST_ROW, KEY_COLUMN, LAST_DATA_COLUMN)
+    min_row = min([FIRST_ROW] + [row for row, _ in anchors])
+    min_col = min([KEY_COLUMN] + [col for _, col in anchors])
+
+    values: Dict[Coordinate, Any] = {}
+    rows = worksheet.iter_rows(
+        min_row=min_row, max_row=LAST_ROW, min_col=min_col, max_col=LAST_DATA_COLUMN, values_only=True
+    )
+    for row_idx, row in enumerate(rows, start=min_row):
+        for col_idx, value in enumerate(row, start=min_col):
+            if value is not None:
+                values[(row_idx, col_idx)] = value
+
+    def get_value(r: int, c: int) -> Any:
+        value = values.get((r, c))
+        if value is not None:
+            return value
+        anchor = merged.anchor(r, c)
+        return values.get(anchor) if anchor else None
+
+    keys = []
+    for r in range(FIRST_ROW, LAST_ROW + 1):
+        val = get_value(r, KEY_COLUMN)
+        keys.append(normalize_key(val) if val else f"field_{r}")
+
+    items = {}
+    for col in range(FIRST_DATA_COLUMN, LAST_DATA_COLUMN + 1):
+        # The object exists only if it has a value in the first key row.
+        if get_value(FIRST_ROW, col) is None:
+            continue
+        items[col] = {key: get_value(r, col) for key, r in zip(keys, range(FIRST_ROW, LAST_ROW + 1))}
+    return keys, items
+
+
+def parse_frequency_block(worksheet: Any, merged: Optional[MergedCellIndex] = None) -> List[Dict[str, Any]]:
+    """
+    Parses the frequency block of one sheet.
+
+    Args:
+        worksheet: A regular or read-only openpyxl worksheet.
+        merged: A prebuilt merged-cell index; built from the worksheet if omitted.
+
+    Returns:
+        A list of frequency objects without ids, in column order.
+    """
+    _, items = read_frequency_block(worksheet, merged)
+    return list(items.values())
+
+
+def inspect_template(source: Union[bytes, str], all_sheets: bool = True) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Parses the frequency definitions from a Somfy report template and validates them.
+
+    The workbook is opened in read-only mode. With ``all_sheets`` every sheet is parsed;
+    identical frequency objects found on several sheets are reported once, with the
+    list of sheets they appear on.
+
+    The validation report lists, per sheet, whether the frequency block was recognised,
+    the normalized keys, the data columns found and the frequencies, wire losses and
+    antenna factors read from them. Missing calibration values are reported as warnings.
+
+    Args:
+        source: The template content or a path to the file.
+        all_sheets: If False, only the active sheet is parsed.
+
+    Returns:
+        The list of frequency objects with sequential ids and the validation report.
+    """
+    import openpyxl
+    from openpyxl.utils import get_column_letter
+
+    stream = io.BytesIO(source) if isinstance(source, bytes) else source
+    workbook = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+    try:
+        sheets = workbook.worksheets if all_sheets else [workbook.active]
+        frequencies: List[Dict[str, Any]] = []
+        seen: Dict[Tuple, Dict[str, Any]] = {}
+        report: Dict[str, Any] = {"sheets": [], "warnings": [], "frequency_count": 0}
+        for sheet in sheets:
+            keys, items = read_frequency_block(sheet, MergedCellIndex(read_merged_ranges(sheet, source)))
+            recognised = "frequency_mhz" in keys and bool(items)
+            report["sheets"].append({
+                "title": sheet.title,
+                "recognised": recognised,
+                "keys": keys,
+                "columns": [get_column_letter(col) for col in items],
+                "frequencies_mhz": [item.get("frequency_mhz") for item in items.values()],
+                "wire_loss_db": [item.get("wire_loss_db") for item in items.values()],
+                "antenna_factor_dbm_1": [item.get("antenna_factor_dbm_1") for item in items.values()],
+            })
+            if not recognised:
+                report["warnings"].append(f"Arkusz '{sheet.title}': nie rozpoznano bloku częstotliwości.")
+                continue
+
+            for col, item in items.items():
+                for field in ("wire_loss_db", "antenna_factor_dbm_1"):
+                    if item.get(field) is None:
+                        report["warnings"].append(
+                            f"Arkusz '{sheet.title}', kolumna {get_column_letter(col)}: brak wartości '{field}'."
+                        )
+                signature = tuple(item.items())
+                if signature in seen:
+                    seen[signature]["sheets"].append(sheet.title)
+                    continue
+                entry = {"id": len(frequencies) + 1, **item, "sheets": [sheet.title]}
+                seen[signature] = entry
+                frequencies.append(entry)
+            _LOGGER.debug(f"Parsed frequency block of sheet '{sheet.title}'.")
+
+        report["frequency_count"] = len(frequencies)
+        return frequencies, report
+    finally:
+        workbook.close()
+
+
+def parse_template(source: Union[bytes, str], all_sheets: bool = True) -> List[Dict[str, Any]]:
+    """
+    Parses the frequency definitions from a Somfy report template.
+
+    Args:
+        source: The template content or a path to the file.
+        all_sheets: If False, only the active sheet is parsed.
+
+    Returns:
+        A list of frequency objects with sequential ids.
+    """
+    frequencies, _ = inspect_template(source, all_sheets)
+    return frequencies
@@ -0,0 +1,142 @@
+"""
+asyncio front-end for the synchronous instrument drivers.
+
+Each instrument gets its own single-thread executor, so commands to one instrument
+are serialised on its session while commands to different instruments run in
+parallel::
+
+    generator = AsyncSMB100A(SMB100A("GPIB0::28::INSTR"))
+    interferer = AsyncSMB100A(SMB100A("GPIB0::29::INSTR"))
+    await asyncio.gather(generator.set_frequency(433.92e6), interferer.set_frequency(434.5e6))
+
+A timed-out or cancelled command stops being awaited, but a command already sent
+to the instrument runs to completion on its executor before the next one starts, so
+the session never sees interleaved I/O.
+"""
+import asyncio
+import contextlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT_S = 10.0
+
+
+class InstrumentTimeoutError(TimeoutError):
+    """Raised when an instrument command does not complete within its timeout."""
+
+    pass
+
+
+class AsyncInstrument:
+    """
+    Runs the blocking calls of one driver without blocking the event loop.
+
+    Args:
+        driver: The synchronous driver instance.
+        name: Name used in logs and timeout messages.
+        timeout_s: Default timeout of one command.
+    """
+
+    def __init__(self, driver: Any, name: Optional[str] = None, timeout_s: float = DEFAULT_TIMEOUT_S):
+        self.driver = driver
+        self.name = name or type(driver).__name__
+        self.timeout_s = timeout_s
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"io-{self.name}")
+        self._lock: Optional[asyncio.Lock] = None
+        self._owner: Optional[asyncio.Task] = None
+
+    async def call(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Runs ``func(*args)`` on the instrument's executor.
+
+        Args:
+            func: A blocking callable using the driver (usually one of its methods).
+            *args: Arguments of the call.
+            timeout: Timeout in seconds; defaults to the instrument timeout.
+
+        Raises:
+            InstrumentTimeoutError: If the call does not complete in time.
+        """
+        if self._owner is not None and self._owner is asyncio.current_task():
+            return await self._submit(func, args, timeout)
+        async with self._get_lock():
+            return await self._submit(func, args, timeout)
+
+    @contextlib.asynccontextmanager
+    async def exclusive(self) -> AsyncIterator["AsyncInstrument"]:
+        """Reserves the instrument for a sequence of commands of the current task."""
+        async with self._get_lock():
+            self._owner = asyncio.current_task()
+            try:
+                yield self
+            finally:
+                self._owner = None
+
+    def close(self) -> None:
+        """Waits for the command in progress and stops the executor."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    async def __aenter__(self) -> "AsyncInstrument":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _get_lock(self) -> asyncio.Lock:
+        # Created lazily so the instrument can be built outside of a running loop.
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _submit(self, func: Callable[..., Any], args: tuple, timeout: Optional[float]) -> Any:
+        future = asyncio.wrap_future(self._executor.submit(func, *args))
+        timeout = self.timeout_s if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError as exc:
+            name = getattr(func, "__name__", repr(func))
+            _LOGGER.error(f"{self.name}: {name}{args} did not complete within {timeout} s.")
+            raise InstrumentTimeoutError(f"{self.name}: {name} timed out after {timeout} s.") from exc
+
+
+class AsyncSMB100A(AsyncInstrument):
+    """Async API of the SMB100A driver (or a compatible stand-in)."""
+
+    async def write(self, cmd: str, timeout: Optional[float] = None) -> None:
+        """Writes a raw SCPI command with *OPC? synchronisation."""
+        await self.call(self.driver._write, cmd, timeout=timeout)
+
+    async def query(self, cmd: str, timeout: Optional[float] = None) -> str:
+        """Sends a raw SCPI query and returns the stripped response."""
+        return await self.call(self.driver._query_str, cmd, timeout=timeout)
+
+    async def get_idn(self) -> str:
+        return await self.call(self.driver.get_idn)
+
+    async def set_output_rf(self, state: bool) -> None:
+        await self.call(self.driver.set_output_rf, state)
+
+    async def get_output_rf_state(self) -> bool:
+        return await self.call(self.driver.get_output_rf_state)
+
+    async def set_frequency(self, hz: float) -> None:
+        await self.call(self.driver.set_frequency, hz)
+
+    async def get_frequency(self) -> float:
+        return await self.call(self.driver.get_frequency)
+
+    async def set_power(self, dbm: float) -> None:
+        await self.call(self.driver.set_power, dbm)
+
+    async def get_power(self) -> float:
+        return await self.call(self.driver.get_power)
+
+    async def check_errors(self) -> None:
+        """Drains the SCPI error queue, raising if it held errors."""
+        await self.call(self.driver.check_errors)
+
+    async def safe_state(self) -> None:
+        await self.call(self.driver.safe_state)
@@ -0,0 +1,82 @@
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, List, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+ERROR_QUERY = "SYST:ERR?"
+# Upper limit of SYST:ERR? reads per drain; the SCPI error queue is finite.
+MAX_DRAIN = 32
+# Commands kept for attributing errors; older commands of a window are only counted.
+WINDOW_SIZE = 64
+
+
+@dataclass(frozen=True)
+class QueuedError:
+    """
+    An entry of the SCPI error queue with the window of commands that may have caused it.
+
+    Attributes:
+        code: SCPI error code (negative for standard errors).
+        message: Error description reported by the instrument.
+        first_command: Sequence number of the first command of the window.
+        last_command: Sequence number of the last command of the window.
+        commands: The most recent commands of the window.
+    """
+
+    code: int
+    message: str
+    first_command: int
+    last_command: int
+    commands: Tuple[str, ...]
+
+    def __str__(self) -> str:
+        return (f"{self.code},{self.message} (commands #{self.first_command}-#{self.last_command}, "
+                f"last: {', '.join(self.commands[-3:])})")
+
+
+def parse_error(response: str) -> Tuple[int, str]:
+    """Parses a SYST:ERR? response such as '-222,"Data out of range"'."""
+    code, _, message = response.strip().partition(",")
+    return int(code), message.strip().strip('"')
+
+
+class ErrorQueue:
+    """
+    Tracks the commands sent since the last drain of the instrument error queue.
+
+    SCPI does not tell which command queued an error, so drained errors are
+    attributed to the window of commands sent since the previous drain.
+
+    Args:
+        query: Sends a query to the instrument and returns the raw response.
+    """
+
+    def __init__(self, query: Callable[[str], str]):
+        self._query = query
+        self._sequence = 0
+        self._window_start = 1
+        self._commands: Deque[str] = deque(maxlen=WINDOW_SIZE)
+
+    def sent(self, command: str) -> None:
+        """Records a command sent to the instrument."""
+        self._sequence += 1
+        self._commands.append(command)
+
+    def drain(self) -> List[QueuedError]:
+        """Reads the error queue until it is empty and starts a new command window."""
+        errors = []
+        window = (self._window_start, self._sequence, tuple(self._commands))
+        for _ in range(MAX_DRAIN):
+            code, message = parse_error(self._query(ERROR_QUERY))
+            if code == 0:
+                break
+            errors.append(QueuedError(code, message, *window))
+        else:
+            _LOGGER.warning(f"Error queue not empty after {MAX_DRAIN} reads.")
+        self._window_start = self._sequence + 1
+        self._commands.clear()
+        for error in errors:
+            _LOGGER.error(f"Instrument error {error}")
+        return errors
@@ -0,0 +1,182 @@
+import bisect
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is unbounded.
+BUCKET_BOUNDS_S: Tuple[float, ...] = (
+    0.0001, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05,
+    0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram of one operation.
+
+    Buckets are shared by all operations so histograms of different runs can be
+    compared and merged. Percentiles are estimated from the bucket bounds.
+    """
+
+    __slots__ = ("count", "errors", "total_s", "min_s", "max_s", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_s = 0.0
+        self.min_s = float("inf")
+        self.max_s = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_S) + 1)
+
+    def observe(self, seconds: float, failed: bool = False) -> None:
+        self.count += 1
+        self.errors += failed
+        self.total_s += seconds
+        self.min_s = min(self.min_s, seconds)
+        self.max_s = max(self.max_s, seconds)
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_S, seconds)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Returns the upper bound of the bucket holding the given fraction of samples."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        cumulative = 0
+        for i, n in enumerate(self.buckets):
+            cumulative += n
+            if cumulative >= rank:
+                bound = BUCKET_BOUNDS_S[i] if i < len(BUCKET_BOUNDS_S) else self.max_s
+                return round(min(bound, self.max_s), 6)
+        return round(self.max_s, 6)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_s": round(self.total_s, 6),
+            "mean_s": round(self.total_s / self.count, 6) if self.count else 0.0,
+            "min_s": round(self.min_s, 6) if self.count else 0.0,
+            "p50_s": self.percentile(0.5),
+            "p95_s": self.percentile(0.95),
+            "max_s": round(self.max_s, 6),
+            "buckets": {
+                (f"le_{bound}" if i < len(BUCKET_BOUNDS_S) else "inf"): n
+                for i, (bound, n) in enumerate(zip(BUCKET_BOUNDS_S + (None,), self.buckets))
+                if n
+            },
+        }
+
+
+class MetricsRegistry:
+    """
+    Thread-safe collection of operation histograms for the current run.
+
+    The measurement runs in a background thread while the API reads the metrics,
+    so all access goes through one lock. ``start_run`` clears the histograms.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self.run_id: Optional[str] = None
+        self._run_start = time.perf_counter()
+        self._run_end: Optional[float] = None
+
+    def start_run(self, run_id: str) -> None:
+        """Clears the histograms and starts timing a new run."""
+        with self._lock:
+            self._histograms = {}
+            self.run_id = run_id
+            self._run_start = time.perf_counter()
+            self._run_end = None
+
+    def end_run(self) -> None:
+        """Freezes the wall time of the current run."""
+        with self._lock:
+            self._run_end = time.perf_counter()
+
+    def observe(self, name: str, seconds: float, failed: bool = False) -> None:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.observe(seconds, failed)
+
+    def count(self, name: str) -> int:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            return histogram.count if histogram else 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the histograms with the share of the run wall time spent in each operation.
+
+        Operations may nest (a motion wait includes the UIA lookups polling the
+        position), so the shares do not add up to 100%.
+        """
+        with self._lock:
+            wall_s = (self._run_end or time.perf_counter()) - self._run_start
+            operations = {}
+            for name, histogram in sorted(self._histograms.items()):
+                entry = histogram.to_dict()
+                entry["share_pct"] = round(100 * histogram.total_s / wall_s, 2) if wall_s > 0 else 0.0
+                operations[name] = entry
+            return {
+                "run_id": self.run_id,
+                "running": self._run_end is None,
+                "wall_s": round(wall_s, 3),
+                "operations": operations,
+            }
+
+
+METRICS = MetricsRegistry()
+
+
+class timed:
+    """
+    Records the duration of an operation in a metrics registry.
+
+    Usable as a context manager::
+
+        with timed("sleep.dut_settle"):
+            time.sleep(0.05)
+
+    or as a decorator of functions and methods::
+
+        @timed("scpi.write")
+        def _write(self, cmd): ...
+
+    Failed operations (raising an exception) are counted as errors of the operation.
+    """
+
+    __slots__ = ("name", "registry", "_start")
+
+    def __init__(self, name: str, registry: Optional[MetricsRegistry] = None):
+        self.name = name
+        self.registry = registry
+        self._start = 0.0
+
+    def __enter__(self) -> "timed":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        (self.registry or METRICS).observe(self.name, time.perf_counter() - self._start, exc_type is not None)
+
+    def __call__(self, func: Callable) -> Callable:
+        name, registry = self.name, self.registry
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                (registry or METRICS).observe(name, time.perf_counter() - start, failed)
+
+        return wrapper
+
@@ -0,0 +1,67 @@
+"""
+Deferred imports of the hardware libraries.
+
+RsInstrument, nidaqmx and pywinauto take a noticeable part of the backend startup and
+are not installed on every machine (e.g. a PC used only to prepare configurations).
+The driver modules bind them at module level through the proxies below, so importing
+a driver is cheap and the library is loaded, or reported missing, on first use.
+"""
+import importlib
+from typing import Any
+
+
+class LazyModule:
+    """
+    Stands in for a module and imports it on first attribute access.
+
+    Args:
+        name: The module name, e.g. ``"nidaqmx.constants"``.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def resolve(self) -> Any:
+        """Imports the module (once) and returns it."""
+        if self._module is None:
+            try:
+                self._module = importlib.import_module(self._name)
+            except ImportError as e:
+                raise ImportError(
+                    f"'{self._name}' is required for this hardware driver but cannot be imported: {e}"
+                ) from e
+        return self._module
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self.resolve(), attribute)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+class LazyAttribute:
+    """
+    Stands in for a class or function of a module that is imported when first called.
+
+    Args:
+        module: The module name.
+        attribute: The name of the class or function in the module.
+    """
+
+    def __init__(self, module: str, attribute: str):
+        self._module = LazyModule(module)
+        self._attribute = attribute
+
+    def resolve(self) -> Any:
+        return getattr(self._module.resolve(), self._attribute)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self.resolve(), attribute)
+
+    def __repr__(self) -> str:
+        return f"<lazy attribute '{self._attribute}' of {self._module!r}>"
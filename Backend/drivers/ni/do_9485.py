@@ -1,9 +1,13 @@
 import logging
-import nidaqmx
+from drivers.instrumentation import timed
+from drivers.lazy_imports import LazyModule
 from drivers.ni.exceptions import NIError, NIConfigurationError, NIOperationError
 
 _LOGGER = logging.getLogger(__name__)
 
+# Loaded when the first task is created.
+nidaqmx = LazyModule("nidaqmx")
+
 
 class NI9485Handler:
     """
@@ -23,6 +27,7 @@ class NI9485Handler:
         self.device_id = device_id
         _LOGGER.debug(f"Initializing NI 9485 Relay Handler for device: {device_id}")
 
+    @timed("relay.write")
     def write_relay(self, line: int, state: bool) -> None:
         """
         Sets the state of a single relay channel.
@@ -55,6 +60,37 @@ class NI9485Handler:
         except nidaqmx.DaqError as exc:
             raise NIError(f"An unexpected NI 9485 error occurred: {exc}") from exc
 
+    @timed("relay.write")
+    def write_port(self, mask: int) -> None:
+        """
+        Sets all relay channels in one write.
+
+        Args:
+            mask: Bit n closes relay line n (0x00 opens all, 0xFF closes all).
+
+        Raises:
+            NIConfigurationError: If the port path is invalid.
+            NIOperationError: If the physical switching operation fails.
+            NIError: For other unexpected NI-DAQmx errors.
+        """
+        port_path = f"{self.device_id}/port0"
+        _LOGGER.debug(f"Writing relay port {port_path}: {mask:#04x}")
+
+        try:
+            with nidaqmx.Task() as task:
+                try:
+                    task.do_channels.add_do_chan(port_path)
+                except nidaqmx.DaqError as exc:
+                    raise NIConfigurationError(f"Failed to configure relay port: {port_path}") from exc
+
+                try:
+                    task.write(mask)
+                except nidaqmx.DaqError as exc:
+                    raise NIOperationError(f"Physical switching failed on port: {port_path}") from exc
+
+        except nidaqmx.DaqError as exc:
+            raise NIError(f"An unexpected NI 9485 error occurred: {exc}") from exc
+
     def safe_state(self) -> None:
         """
         Sets the device to a safe state by opening all relays (OFF).
@@ -0,0 +1,220 @@
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+RELAY_LINES = 8
+# Switch counters summed over runs (see save_relay_wear).
+RELAY_WEAR_FILE = "relay_wear.json"
+
+
+@dataclass(frozen=True)
+class RelayRoute:
+    """
+    A named signal path of the bench closed by a set of relay lines.
+
+    Attributes:
+        name: The route name used in the configuration (e.g. "dut_power").
+        mask: Bit n set when relay line n is closed by the route.
+        group: Routes of one group are mutually exclusive (e.g. the ports of an
+            antenna); selecting one opens the lines of the others.
+        break_before_make: Open the lines of the previous route before closing
+            the new ones (two port writes) instead of switching in one write.
+        settle_s: Wait after the route is switched.
+    """
+
+    name: str
+    mask: int
+    group: str
+    break_before_make: bool = True
+    settle_s: float = 0.0
+
+
+@dataclass(frozen=True)
+class Transition:
+    """Lines to open and to close when a group switches between two routes."""
+
+    open_mask: int
+    close_mask: int
+    break_before_make: bool
+
+
+def _mask(lines: Iterable[int], name: str) -> int:
+    mask = 0
+    for line in lines:
+        if not isinstance(line, int) or not 0 <= line < RELAY_LINES:
+            raise ValueError(f"Route '{name}': relay line {line!r} is outside 0-{RELAY_LINES - 1}.")
+        mask |= 1 << line
+    if not mask:
+        raise ValueError(f"Route '{name}' has no relay lines.")
+    return mask
+
+
+def parse_routes(config: Dict[str, Dict[str, Any]]) -> Dict[str, RelayRoute]:
+    """
+    Reads route definitions.
+
+    Args:
+        config: Route name -> ``{"lines": [...], "group": ..., "break_before_make": ...,
+            "settle_s": ...}``. Without a group the route forms a group of its own.
+
+    Raises:
+        ValueError: If a line is out of range, a route has no lines or two groups
+            share a line.
+    """
+    routes = {}
+    for name, definition in (config or {}).items():
+        routes[name] = RelayRoute(
+            name=name,
+            mask=_mask(definition.get("lines", []), name),
+            group=str(definition.get("group") or name),
+            break_before_make=bool(definition.get("break_before_make", True)),
+            settle_s=float(definition.get("settle_s", 0.0)),
+        )
+    owners: Dict[int, str] = {}
+    for route in routes.values():
+        for line in range(RELAY_LINES):
+            if route.mask & (1 << line):
+                owner = owners.setdefault(line, route.group)
+                if owner != route.group:
+                    raise ValueError(f"Relay line {line} is used by route groups '{owner}' and '{route.group}'.")
+    return routes
+
+
+class RelayRouter:
+    """
+    Switches named routes on an NI9485Handler with one port write per change.
+
+    The port state is kept in memory, so a route change writes the whole port at
+    once. The transitions between the routes of a group are computed up front and
+    change only the lines that differ; with ``break_before_make`` the opening lines
+    are written before the closing ones. Every route switch and every line toggle
+    is counted to track relay wear.
+
+    Args:
+        relay: The relay module (NI9485Handler or a stand-in with ``write_port``).
+        routes: The route definitions (see ``parse_routes``).
+    """
+
+    def __init__(self, relay: Any, routes: Dict[str, RelayRoute]):
+        self.relay = relay
+        self.routes = routes
+        self.port_state = 0
+        self._active: Dict[str, Optional[str]] = {}
+        self.switch_counts: Dict[str, int] = {name: 0 for name in routes}
+        self.line_toggles: List[int] = [0] * RELAY_LINES
+        self.port_writes = 0
+        self._transitions: Dict[Tuple[Optional[str], str], Transition] = {}
+        groups: Dict[str, List[RelayRoute]] = {}
+        for route in routes.values():
+            groups.setdefault(route.group, []).append(route)
+        for members in groups.values():
+            group_mask = 0
+            for route in members:
+                group_mask |= route.mask
+            for target in members:
+                # From an unknown or released group every line of the group not in the target is opened.
+                self._transitions[(None, target.name)] = Transition(
+                    group_mask & ~target.mask, target.mask, target.break_before_make)
+                for source in members:
+                    if source is not target:
+                        self._transitions[(source.name, target.name)] = Transition(
+                            source.mask & ~target.mask, target.mask & ~source.mask, target.break_before_make)
+
+    def active(self, group: str) -> Optional[str]:
+        return self._active.get(group)
+
+    def transition(self, source: Optional[str], target: str) -> Transition:
+        return self._transitions[(source, target)]
+
+    def select(self, name: str) -> float:
+        """
+        Switches to a route, opening the other route of its group.
+
+        Returns:
+            The settle time of the route, or 0 if it was already selected.
+
+        Raises:
+            KeyError: If the route is not defined.
+        """
+        route = self.routes[name]
+        current = self._active.get(route.group)
+        if current == name:
+            return 0.0
+        transition = self._transitions[(current, name)]
+        opened = self.port_state & ~transition.open_mask
+        if transition.break_before_make and transition.open_mask & self.port_state and transition.close_mask:
+            self._write(opened)
+        self._write(opened | transition.close_mask)
+        self._active[route.group] = name
+        self.switch_counts[name] += 1
+        _LOGGER.debug(f"Relay route '{name}' selected (port {self.port_state:#04x}).")
+        return route.settle_s
+
+    def release(self, group: str) -> None:
+        """Opens the lines of the selected route of a group."""
+        current = self._active.pop(group, None)
+        if current is not None:
+            self._write(self.port_state & ~self.routes[current].mask)
+
+    def safe_state(self) -> None:
+        """Opens all relays; the next selection switches from an unknown state."""
+        self.relay.safe_state()
+        self._count_toggles(0)
+        self.port_state = 0
+        self._active.clear()
+
+    def counters(self) -> Dict[str, Any]:
+        return {"routes": dict(self.switch_counts), "line_toggles": list(self.line_toggles),
+                "port_writes": self.port_writes}
+
+    def reset_counters(self) -> None:
+        self.switch_counts = {name: 0 for name in self.routes}
+        self.line_toggles = [0] * RELAY_LINES
+        self.port_writes = 0
+
+    def _write(self, mask: int) -> None:
+        if mask == self.port_state:
+            return
+        self.relay.write_port(mask)
+        self.port_writes += 1
+        self._count_toggles(mask)
+        self.port_state = mask
+
+    def _count_toggles(self, mask: int) -> None:
+        changed = self.port_state ^ mask
+        for line in range(RELAY_LINES):
+            if changed & (1 << line):
+                self.line_toggles[line] += 1
+
+
+def save_relay_wear(path: Path, router: RelayRouter) -> Dict[str, Any]:
+    """
+    Adds the counters of the router to the totals kept in ``path`` (relay_wear.json)
+    and resets them, so a bench kept open over several runs is not counted twice.
+
+    Returns:
+        The updated totals.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            totals = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        totals = {}
+    counters = router.counters()
+    routes = totals.get("routes", {})
+    for name, count in counters["routes"].items():
+        routes[name] = routes.get(name, 0) + count
+    toggles = list(totals.get("line_toggles", [])) + [0] * RELAY_LINES
+    totals = {
+        "routes": routes,
+        "line_toggles": [toggles[line] + count for line, count in enumerate(counters["line_toggles"])],
+        "port_writes": totals.get("port_writes", 0) + counters["port_writes"],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(totals, f, indent=2)
+    router.reset_counters()
+    return totals
@@ -1,11 +1,58 @@
 import logging
-import nidaqmx
-from nidaqmx.constants import TerminalConfiguration, VoltageUnits
-
+import time
+from typing import Any, List, Sequence
+from drivers.instrumentation import timed
+from drivers.lazy_imports import LazyModule
 from drivers.ni.exceptions import NIError, NIConfigurationError, NIOperationError
 
 _LOGGER = logging.getLogger(__name__)
 
+# Loaded when the first task is created.
+nidaqmx = LazyModule("nidaqmx")
+nidaqmx_constants = LazyModule("nidaqmx.constants")
+
+
+class ContinuousAnalogInput:
+    """
+    A running hardware-timed acquisition of one AI channel.
+
+    The DAQ sample clock fills the device buffer on its own; ``read_available``
+    drains what has been acquired since the last call. Sample ``i`` was taken at
+    ``start_time + i / rate_hz`` (``time.perf_counter`` clock), so samples are
+    evenly spaced whatever the host does between reads.
+
+    Attributes:
+        rate_hz: The sample clock rate.
+        start_time: ``time.perf_counter()`` when the acquisition started.
+    """
+
+    def __init__(self, task: Any, channel_path: str, rate_hz: float):
+        self._task = task
+        self._channel_path = channel_path
+        self.rate_hz = rate_hz
+        self.start_time = time.perf_counter()
+
+    @timed("daq.read_stream")
+    def read_available(self) -> List[float]:
+        """
+        Returns the samples acquired since the previous call.
+
+        Raises:
+            NIOperationError: If the read fails (e.g. the buffer overflowed).
+        """
+        try:
+            values = self._task.read(number_of_samples_per_channel=nidaqmx_constants.READ_ALL_AVAILABLE)
+        except nidaqmx.DaqError as exc:
+            raise NIOperationError(f"Failed to read the acquisition of {self._channel_path}") from exc
+        return list(values) if isinstance(values, (list, tuple)) else [values]
+
+    def close(self) -> None:
+        """Stops the acquisition and releases the task."""
+        try:
+            self._task.stop()
+        finally:
+            self._task.close()
+
 
 class NIUSB6361Handler:
     """
@@ -25,6 +72,7 @@ class NIUSB6361Handler:
         self.device_id = device_id
         _LOGGER.debug(f"Initializing NI-USB-6361 Analog Input Handler for device: {device_id}")
 
+    @timed("daq.read_analog_input")
     def read_analog_input(
         self,
         channel: int,
@@ -50,7 +98,8 @@ class NIUSB6361Handler:
             NIError: For other unexpected NI-DAQmx errors.
         """
         channel_path = f"{self.device_id}/ai{channel}"
-        term_config = TerminalConfiguration.DIFF if differential else TerminalConfiguration.RSE
+        terminal = nidaqmx_constants.TerminalConfiguration
+        term_config = terminal.DIFF if differential else terminal.RSE
 
         try:
             with nidaqmx.Task() as task:
@@ -60,7 +109,7 @@ class NIUSB6361Handler:
                         channel_path,
                         min_val=min_val,
                         max_val=max_val,
-                        units=VoltageUnits.VOLTS,
+                        units=nidaqmx_constants.VoltageUnits.VOLTS,
                         terminal_config=term_config,
                     )
                 except nidaqmx.DaqError as exc:
@@ -75,6 +124,121 @@ class NIUSB6361Handler:
         except nidaqmx.DaqError as exc:
             raise NIError(f"An unexpected NI error occurred on {channel_path}: {exc}") from exc
 
+    @timed("daq.read_analog_inputs")
+    def read_analog_inputs(
+        self,
+        channels: Sequence[int],
+        min_val: float = -10.0,
+        max_val: float = 10.0,
+        differential: bool = True,
+    ) -> List[float]:
+        """
+        Reads one sample from each of several channels in a single scan.
+
+        All channels are added to one task, so the samples are taken in one
+        conversion sweep instead of one task per channel.
+
+        Args:
+            channels: The analog input channel numbers.
+            min_val: The minimum expected voltage value.
+            max_val: The maximum expected voltage value.
+            differential: If True (default), uses Differential mode. Otherwise, uses RSE.
+
+        Returns:
+            The measured voltages in Volts, in the order of ``channels``.
+
+        Raises:
+            NIConfigurationError: If the channel configuration fails.
+            NIOperationError: If the physical read operation fails.
+            NIError: For other unexpected NI-DAQmx errors.
+        """
+        channel_path = ",".join(f"{self.device_id}/ai{channel}" for channel in channels)
+        terminal = nidaqmx_constants.TerminalConfiguration
+        term_config = terminal.DIFF if differential else terminal.RSE
+
+        try:
+            with nidaqmx.Task() as task:
+                try:
+                    task.ai_channels.add_ai_voltage_chan(
+                        channel_path,
+                        min_val=min_val,
+                        max_val=max_val,
+                        units=nidaqmx_constants.VoltageUnits.VOLTS,
+                        terminal_config=term_config,
+                    )
+                except nidaqmx.DaqError as exc:
+                    raise NIConfigurationError(f"Failed to configure AI channels: {channel_path}") from exc
+
+                try:
+                    values = task.read()
+                except nidaqmx.DaqError as exc:
+                    raise NIOperationError(f"Failed to read from AI channels: {channel_path}") from exc
+                # A task with a single channel returns a scalar.
+                return list(values) if isinstance(values, (list, tuple)) else [values]
+
+        except nidaqmx.DaqError as exc:
+            raise NIError(f"An unexpected NI error occurred on {channel_path}: {exc}") from exc
+
+    def start_continuous(
+        self,
+        channel: int,
+        rate_hz: float,
+        buffer_s: float = 10.0,
+        min_val: float = -10.0,
+        max_val: float = 10.0,
+        differential: bool = True,
+    ) -> ContinuousAnalogInput:
+        """
+        Starts a continuous, hardware-timed acquisition of one channel.
+
+        Unlike ``read_analog_input`` the task stays open and the samples are timed
+        by the DAQ sample clock, so the rate does not depend on how often the host
+        reads them. The caller must close the returned acquisition.
+
+        Args:
+            channel: The analog input channel number.
+            rate_hz: Sample clock rate in samples per second.
+            buffer_s: Device buffer length in seconds of samples; the host must read
+                more often than this.
+            min_val: The minimum expected voltage value.
+            max_val: The maximum expected voltage value.
+            differential: If True (default), uses Differential mode. Otherwise, uses RSE.
+
+        Raises:
+            NIConfigurationError: If the channel or the sample clock cannot be configured.
+            NIOperationError: If the acquisition cannot be started.
+        """
+        channel_path = f"{self.device_id}/ai{channel}"
+        terminal = nidaqmx_constants.TerminalConfiguration
+        term_config = terminal.DIFF if differential else terminal.RSE
+
+        task = nidaqmx.Task()
+        try:
+            try:
+                task.ai_channels.add_ai_voltage_chan(
+                    channel_path,
+                    min_val=min_val,
+                    max_val=max_val,
+                    units=nidaqmx_constants.VoltageUnits.VOLTS,
+                    terminal_config=term_config,
+                )
+                task.timing.cfg_samp_clk_timing(
+                    rate_hz,
+                    sample_mode=nidaqmx_constants.AcquisitionType.CONTINUOUS,
+                    samps_per_chan=max(2, int(rate_hz * buffer_s)),
+                )
+            except nidaqmx.DaqError as exc:
+                raise NIConfigurationError(f"Failed to configure continuous acquisition: {channel_path}") from exc
+            try:
+                task.start()
+            except nidaqmx.DaqError as exc:
+                raise NIOperationError(f"Failed to start continuous acquisition: {channel_path}") from exc
+        except Exception:
+            task.close()
+            raise
+        _LOGGER.debug(f"Continuous acquisition of {channel_path} started at {rate_hz} S/s.")
+        return ContinuousAnalogInput(task, channel_path, rate_hz)
+
     def safe_state(self) -> None:
         """
         Verifies that the analog input hardware is responsive.
@@ -1,10 +1,19 @@
 import enum
 import logging
+from typing import List
 
-from RsInstrument import RsInstrument
+from drivers.error_queue import ErrorQueue, QueuedError
+from drivers.instrumentation import timed
+from drivers.lazy_imports import LazyAttribute
 
 _LOGGER = logging.getLogger(__name__)
 
+# Loaded when the first generator is opened.
+RsInstrument = LazyAttribute("RsInstrument", "RsInstrument")
+# RsInstrument / PyVISA exceptions of a lost link or an unanswered command (matched by name,
+# so classifying a failure does not import the libraries).
+LINK_ERRORS = frozenset({"TimeoutException", "ResourceError", "VisaIOError"})
+
 
 class InstrumentError(Exception):
     """Base exception class for instrument-related errors."""
@@ -30,6 +39,15 @@ class InstrumentRangeError(InstrumentError):
     pass
 
 
+def _failure(message: str, exc: Exception) -> InstrumentError:
+    """Classifies a failed exchange: a lost link or a timeout is a connection error,
+    anything else (e.g. an error reported by the instrument) a command error."""
+    if isinstance(exc, (TimeoutError, ConnectionError)) or any(
+            cls.__name__ in LINK_ERRORS for cls in type(exc).__mro__):
+        return InstrumentConnectionError(f"{message} ({exc})")
+    return InstrumentCommandError(message)
+
+
 class CommonOrders(enum.StrEnum):
     """Standard IEEE 488.2 common commands."""
 
@@ -58,12 +76,14 @@ class SMB100A:
     frequency, and power levels using SCPI commands over the RsInstrument library.
     """
 
-    def __init__(self, resource: str, timeout_ms: int = 5000):
+    def __init__(self, resource: str, timeout_ms: int = 5000, deferred_errors: bool = False):
         """Initializes the connection to the SMB100A generator.
 
         Args:
             resource: The VISA resource address (e.g., 'TCPIP::192.168.1.10::INSTR').
             timeout_ms: Communication timeout in milliseconds.
+            deferred_errors: If True, commands are sent without a status check and the
+                error queue is read only by check_errors() (see set_error_checking).
 
         Raises:
             InstrumentConnectionError: If the connection to the instrument fails.
@@ -74,6 +94,8 @@ class SMB100A:
             self.inst.visa_timeout = timeout_ms
         except Exception as exc:
             raise InstrumentConnectionError(f"Cannot connect to SMB100A at resource {resource}") from exc
+        self._errors = ErrorQueue(self._query_error)
+        self.set_error_checking(deferred_errors)
         _LOGGER.debug("Instrument initialized successfully.")
 
     def __enter__(self):
@@ -106,6 +128,38 @@ class SMB100A:
         except Exception:
             pass
 
+    def set_error_checking(self, deferred: bool) -> None:
+        """Selects per-command or deferred error checking.
+
+        Per-command checking (default) lets RsInstrument query the instrument status
+        after every command, which costs a round trip per command. In deferred mode
+        commands are sent without it and the error queue is drained in one batch by
+        check_errors() at checkpoints of the measurement (e.g. after a power ramp).
+
+        Args:
+            deferred: True for deferred checking.
+        """
+        self.deferred_errors = deferred
+        self.inst.instrument_status_checking = not deferred
+
+    def drain_errors(self) -> List[QueuedError]:
+        """Reads the whole error queue (SYST:ERR?).
+
+        Returns:
+            The queued errors, each attributed to the commands sent since the last drain.
+        """
+        return self._errors.drain()
+
+    def check_errors(self) -> None:
+        """Drains the error queue and raises if the instrument reported errors.
+
+        Raises:
+            InstrumentCommandError: If the error queue was not empty.
+        """
+        errors = self.drain_errors()
+        if errors:
+            raise InstrumentCommandError("; ".join(str(error) for error in errors))
+
     def get_idn(self) -> str:
         """Queries the instrument identification string (*IDN?).
 
@@ -177,6 +231,7 @@ class SMB100A:
         _LOGGER.debug(f"Setting power to: {dbm} dBm")
         self._write(InstrumentOrders.POW_SET.format(f"{dbm:.2f}"))
 
+    @timed("scpi.write")
     def _write(self, cmd: str) -> None:
         """Writes an SCPI command and waits for completion (*OPC?).
 
@@ -185,12 +240,15 @@ class SMB100A:
 
         Raises:
             InstrumentCommandError: If the write operation or OPC synchronization fails.
+            InstrumentConnectionError: If the link is lost or the command times out.
         """
+        self._errors.sent(cmd)
         try:
             self.inst.write_with_opc(cmd)
         except Exception as exc:
-            raise InstrumentCommandError(f"SCPI write failed: {cmd}") from exc
+            raise _failure(f"SCPI write failed: {cmd}", exc) from exc
 
+    @timed("scpi.query")
     def _query_float(self, cmd: str) -> float:
         """Queries the instrument and converts the response to a float.
 
@@ -200,11 +258,13 @@ class SMB100A:
         Returns:
             The queried value as a float.
         """
+        self._errors.sent(cmd)
         try:
             return self.inst.query_float_with_opc(cmd)
         except Exception as exc:
-            raise InstrumentCommandError(f"SCPI query float failed: {cmd}") from exc
+            raise _failure(f"SCPI query float failed: {cmd}", exc) from exc
 
+    @timed("scpi.query")
     def _query_bool(self, cmd: str) -> bool:
         """Queries the instrument and converts the response to a boolean.
 
@@ -214,11 +274,13 @@ class SMB100A:
         Returns:
             The queried value as a bool.
         """
+        self._errors.sent(cmd)
         try:
             return self.inst.query_bool_with_opc(cmd)
         except Exception as exc:
-            raise InstrumentCommandError(f"SCPI query bool failed: {cmd}") from exc
+            raise _failure(f"SCPI query bool failed: {cmd}", exc) from exc
 
+    @timed("scpi.query")
     def _query_str(self, cmd: str) -> str:
         """Queries the instrument and returns the response as a stripped string.
 
@@ -228,7 +290,16 @@ class SMB100A:
         Returns:
             The queried value as a string.
         """
+        self._errors.sent(cmd)
         try:
             return self.inst.query_str_with_opc(cmd).strip()
         except Exception as exc:
-            raise InstrumentCommandError(f"SCPI query string failed: {cmd}") from exc
+            raise _failure(f"SCPI query string failed: {cmd}", exc) from exc
+
+    @timed("scpi.query")
+    def _query_error(self, cmd: str) -> str:
+        """Reads one entry of the error queue (no *OPC? synchronization, not part of a command window)."""
+        try:
+            return self.inst.query_str(cmd).strip()
+        except Exception as exc:
+            raise _failure(f"SCPI error queue query failed: {cmd}", exc) from exc
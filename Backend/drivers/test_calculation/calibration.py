@@ -0,0 +1,305 @@
+import bisect
+import csv
+import io
+import logging
+import math
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from drivers.test_calculation.sensitivity_value import calculate_sensitivity, generator_power_for_field
+
+_LOGGER = logging.getLogger(__name__)
+
+CABLE_LOSS = "cable_loss"
+ANTENNA_FACTOR = "antenna_factor"
+TABLE_KINDS = (CABLE_LOSS, ANTENNA_FACTOR)
+CALIBRATION_DIR = "calibration"
+
+# Accepted column headers (lower case) of the frequency and value columns.
+FREQUENCY_COLUMNS = {"frequency_hz": 1.0, "frequency_mhz": 1e6, "freq_hz": 1.0, "freq_mhz": 1e6, "mhz": 1e6, "hz": 1.0}
+VALUE_COLUMNS = ("value_db", "loss_db", "wire_loss_db", "cable_loss_db", "antenna_factor_db_1",
+                 "antenna_factor_dbm_1", "af_db", "db")
+
+
+class CalibrationTable:
+    """
+    Calibration quantity (dB) tabulated versus frequency.
+
+    Points are kept sorted by frequency. Values between points are interpolated
+    linearly in frequency or in log10(frequency); outside the table the edge value is
+    used and a warning is logged. Interpolated values are cached per frequency.
+
+    Args:
+        frequencies_hz: Frequencies of the calibration points.
+        values_db: Calibration values at those frequencies.
+        name: Name used in logs.
+        log_frequency: Interpolate in log10(frequency) instead of frequency.
+    """
+
+    def __init__(self, frequencies_hz: Sequence[float], values_db: Sequence[float], name: str = "",
+                 log_frequency: bool = True):
+        if len(frequencies_hz) != len(values_db) or not frequencies_hz:
+            raise ValueError(f"Calibration table {name!r} needs matching, non-empty frequency and value lists.")
+        points = sorted(zip(map(float, frequencies_hz), map(float, values_db)))
+        if any(f <= 0 for f, _ in points):
+            raise ValueError(f"Calibration table {name!r} contains a non-positive frequency.")
+        if len({f for f, _ in points}) != len(points):
+            raise ValueError(f"Calibration table {name!r} contains duplicate frequencies.")
+        self.name = name
+        self.log_frequency = log_frequency
+        self.frequencies_hz: Tuple[float, ...] = tuple(f for f, _ in points)
+        self.values_db: Tuple[float, ...] = tuple(v for _, v in points)
+        self._axis = tuple(self._x(f) for f in self.frequencies_hz)
+        self._cache: Dict[float, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.frequencies_hz)
+
+    def covers(self, frequency_hz: float) -> bool:
+        return self.frequencies_hz[0] <= frequency_hz <= self.frequencies_hz[-1]
+
+    def value_at(self, frequency_hz: float) -> float:
+        """Returns the (cached) interpolated value at one frequency."""
+        cached = self._cache.get(frequency_hz)
+        if cached is not None:
+            return cached
+        if not self.covers(frequency_hz):
+            _LOGGER.warning(f"{frequency_hz} Hz is outside calibration table {self.name!r}; using the edge value.")
+        x = self._x(frequency_hz)
+        i = bisect.bisect_left(self._axis, x)
+        if i == 0:
+            value = self.values_db[0]
+        elif i == len(self._axis):
+            value = self.values_db[-1]
+        else:
+            x0, x1 = self._axis[i - 1], self._axis[i]
+            v0, v1 = self.values_db[i - 1], self.values_db[i]
+            value = v0 + (v1 - v0) * (x - x0) / (x1 - x0)
+        with self._lock:
+            self._cache[frequency_hz] = value
+        return value
+
+    def values_at(self, frequencies_hz: Iterable[float]) -> List[float]:
+        """Interpolates many frequencies at once (e.g. every frequency of a template)."""
+        # numpy is only needed for batch interpolation.
+        import numpy as np
+
+        frequencies = np.asarray(list(frequencies_hz), dtype=float)
+        axis = np.log10(frequencies) if self.log_frequency else frequencies
+        return np.interp(axis, self._axis, self.values_db).tolist()
+
+    def _x(self, frequency_hz: float) -> float:
+        return math.log10(frequency_hz) if self.log_frequency else frequency_hz
+
+
+def _parse_rows(rows: Iterable[Sequence[Any]], name: str) -> Tuple[List[float], List[float]]:
+    rows = iter(rows)
+    header = [str(cell or "").strip().lower().replace(" ", "_").replace("[", "").replace("]", "") for cell in next(rows)]
+    freq_col = next((i for i, h in enumerate(header) if h in FREQUENCY_COLUMNS), None)
+    value_col = next((i for i, h in enumerate(header) if h in VALUE_COLUMNS), None)
+    if freq_col is None or value_col is None:
+        raise ValueError(
+            f"Calibration {name!r}: expected a frequency column ({', '.join(FREQUENCY_COLUMNS)}) "
+            f"and a value column ({', '.join(VALUE_COLUMNS)}), got {header}."
+        )
+    scale = FREQUENCY_COLUMNS[header[freq_col]]
+    frequencies, values = [], []
+    for row in rows:
+        if len(row) <= max(freq_col, value_col) or row[freq_col] in (None, "") or row[value_col] in (None, ""):
+            continue
+        frequencies.append(float(str(row[freq_col]).replace(",", ".")) * scale)
+        values.append(float(str(row[value_col]).replace(",", ".")))
+    return frequencies, values
+
+
+def load_table(source: Union[Path, bytes], name: str, filename: Optional[str] = None,
+               log_frequency: bool = True) -> CalibrationTable:
+    """
+    Loads a calibration table from a CSV or Excel file.
+
+    The first row is a header with a frequency column (``frequency_mhz`` or
+    ``frequency_hz``) and a value column (e.g. ``loss_db``, ``antenna_factor_db_1``).
+
+    Args:
+        source: Path of the file or its content.
+        name: Name of the table.
+        filename: File name deciding the format when ``source`` is bytes.
+        log_frequency: Interpolate in log10(frequency).
+
+    Raises:
+        ValueError: If the file has no usable columns or rows.
+    """
+    suffix = Path(filename or str(source if isinstance(source, Path) else "")).suffix.lower()
+    content = source.read_bytes() if isinstance(source, Path) else source
+    if suffix in (".xlsx", ".xlsm"):
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+        try:
+            frequencies, values = _parse_rows(workbook.worksheets[0].iter_rows(values_only=True), name)
+        finally:
+            workbook.close()
+    else:
+        text = content.decode("utf-8-sig")
+        dialect = csv.Sniffer().sniff(text.splitlines()[0], delimiters=",;\t")
+        frequencies, values = _parse_rows(csv.reader(io.StringIO(text), dialect), name)
+    return CalibrationTable(frequencies, values, name, log_frequency)
+
+
+@dataclass(frozen=True)
+class SheetCalibration:
+    """
+    Calibration of one sheet at its test frequency, with the origin of each value.
+
+    Converts between generator power (dBm) and field strength at the DUT (dBµV/m)
+    with the formula of ``calculate_sensitivity``.
+    """
+
+    frequency_mhz: Optional[float]
+    distance_m: Optional[float]
+    wire_loss_db: Optional[float]
+    antenna_factor_db_1: Optional[float]
+    wire_loss_source: str
+    antenna_factor_source: str
+
+    @property
+    def complete(self) -> bool:
+        return None not in (self.frequency_mhz, self.distance_m, self.wire_loss_db, self.antenna_factor_db_1)
+
+    def field_strength(self, generator_dbm: Optional[float]) -> Tuple[Optional[float], Optional[float]]:
+        """Returns the field strength (dBµV/m, µV/m) produced by the generator power."""
+        if not self.complete:
+            return None, None
+        return calculate_sensitivity(generator_dbm, self.frequency_mhz, self.distance_m, self.wire_loss_db,
+                                     self.antenna_factor_db_1)
+
+    def generator_power(self, field_db: float) -> float:
+        """
+        Returns the generator power (dBm) producing the field strength.
+
+        Raises:
+            ValueError: If the sheet calibration is incomplete.
+        """
+        if not self.complete:
+            raise ValueError(f"Incomplete calibration: {self.to_dict()}")
+        return generator_power_for_field(field_db, self.frequency_mhz, self.distance_m, self.wire_loss_db,
+                                         self.antenna_factor_db_1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "frequency_mhz": self.frequency_mhz,
+            "distance": self.distance_m,
+            "wire_loss_db": self.wire_loss_db,
+            "antenna_factor_dbm_1": self.antenna_factor_db_1,
+            "wire_loss_source": self.wire_loss_source,
+            "antenna_factor_source": self.antenna_factor_source,
+        }
+
+
+class Calibration:
+    """
+    Cable-loss and antenna-factor tables of the bench.
+
+    A table takes precedence over the scalar values stored per sheet in
+    we_config.json; the scalars remain the fallback when no table is loaded. There
+    are no built-in default values: without either the value is None.
+    """
+
+    def __init__(self, tables: Optional[Dict[str, CalibrationTable]] = None):
+        self.tables: Dict[str, CalibrationTable] = dict(tables or {})
+
+    def for_sheet(self, test_params: Dict[str, Any]) -> SheetCalibration:
+        """Returns the wire loss and antenna factor at the sheet's test frequency."""
+        frequency_hz = test_params.get("frequency_hz")
+        distance = test_params.get("distance")
+        wire_loss, wire_source = self._value(CABLE_LOSS, frequency_hz, test_params.get("wire_loss_db"))
+        factor, factor_source = self._value(ANTENNA_FACTOR, frequency_hz, test_params.get("antenna_factor_dbm_1"))
+        return SheetCalibration(
+            frequency_hz / 1e6 if frequency_hz else None,
+            float(distance) if distance else None,
+            wire_loss, factor, wire_source, factor_source,
+        )
+
+    def fill_frequencies(self, frequencies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Sets the table values on a list of frequency.json entries.
+
+        All frequencies of a table are interpolated in one vectorized call; entries
+        keep their scalar values for a quantity without a table.
+        """
+        hz = [float(item.get("frequency_mhz") or 0) * 1e6 for item in frequencies]
+        valid = [i for i, f in enumerate(hz) if f > 0]
+        filled = [dict(item) for item in frequencies]
+        for kind, field in ((CABLE_LOSS, "wire_loss_db"), (ANTENNA_FACTOR, "antenna_factor_dbm_1")):
+            table = self.tables.get(kind)
+            if table is None or not valid:
+                continue
+            for i, value in zip(valid, table.values_at(hz[i] for i in valid)):
+                filled[i][field] = round(value, 3)
+                filled[i][f"{field}_source"] = "table"
+        return filled
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            kind: {"points": len(table), "min_hz": table.frequencies_hz[0], "max_hz": table.frequencies_hz[-1],
+                   "log_frequency": table.log_frequency}
+            for kind, table in self.tables.items()
+        }
+
+    def _value(self, kind: str, frequency_hz: Optional[float], scalar: Any) -> Tuple[Optional[float], str]:
+        table = self.tables.get(kind)
+        if table is not None and frequency_hz:
+            return table.value_at(float(frequency_hz)), "table"
+        if scalar is not None:
+            return float(scalar), "sheet"
+        return None, "missing"
+
+
+_loaded: Dict[str, Tuple[Tuple, Calibration]] = {}
+_loaded_lock = threading.Lock()
+
+
+def table_path(config_dir: Path, kind: str) -> Optional[Path]:
+    """Returns the stored table file of the given kind, if there is one."""
+    for suffix in (".csv", ".xlsx"):
+        path = config_dir / CALIBRATION_DIR / f"{kind}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+def calibration_signature(config_dir: Path) -> Tuple:
+    """Identifies the stored tables by kind, file and modification time."""
+    paths = {kind: table_path(config_dir, kind) for kind in TABLE_KINDS}
+    return tuple((kind, str(p), os.stat(p).st_mtime_ns) for kind, p in paths.items() if p is not None)
+
+
+def load_calibration(config_dir: Path) -> Calibration:
+    """
+    Loads the tables stored in ``config/calibration``.
+
+    The result is cached and reloaded only when a table file changes, so the
+    interpolation cache survives between runs.
+    """
+    paths = {kind: table_path(config_dir, kind) for kind in TABLE_KINDS}
+    signature = calibration_signature(config_dir)
+    with _loaded_lock:
+        cached = _loaded.get(str(config_dir))
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+    tables = {}
+    for kind, path in paths.items():
+        if path is None:
+            continue
+        try:
+            tables[kind] = load_table(path, kind)
+        except (ValueError, OSError) as e:
+            _LOGGER.error(f"Cannot load calibration table {path}: {e}")
+    calibration = Calibration(tables)
+    with _loaded_lock:
+        _loaded[str(config_dir)] = (signature, calibration)
+    return calibration
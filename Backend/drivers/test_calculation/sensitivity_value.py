@@ -26,4 +26,15 @@ def calculate_sensitivity(gen_val, freq, distance, wire_loss, ant_factor):
         
         return db, uv
     except Exception:
-        return None, None
\ No newline at end of file
+        return None, None
+
+def generator_power_for_field(field_db, freq, distance, wire_loss, ant_factor):
+    """
+    Odwrotność calculate_sensitivity: moc generatora [dBm] dająca natężenie pola field_db [dBµV/m].
+    Wzór: genVal = db + wireLoss + 20*log10(distance) - 20*log10(freq) + antFactor - 75.01
+    """
+    if field_db is None or freq is None or distance is None or freq <= 0 or distance <= 0:
+        return None
+    wl = float(wire_loss) if wire_loss is not None else 0.0
+    af = float(ant_factor) if ant_factor is not None else 0.0
+    return float(field_db) + wl + 20 * math.log10(distance) - 20 * math.log10(freq) + af - 75.01
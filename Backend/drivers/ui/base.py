@@ -2,9 +2,11 @@ import re
 import logging
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Optional, Union, Any
-from pywinauto import Application, WindowSpecification
+from drivers.instrumentation import timed
+from drivers.lazy_imports import LazyAttribute
 
 if TYPE_CHECKING:
+    from pywinauto import WindowSpecification
     from pywinauto.controls.uia_controls import (
         ButtonWrapper,
         EditWrapper,
@@ -13,6 +15,9 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger("AppUiDriver")
 
+# pywinauto (Windows only) is loaded when the first driver is created.
+Application = LazyAttribute("pywinauto", "Application")
+
 
 @dataclass(frozen=True)
 class UiElement:
@@ -38,8 +43,8 @@ class AppUiDriver:
 
     def __init__(self):
         """Initializes the driver with the UIA backend."""
-        self.app: Application = Application(backend="uia")
-        self.win: Optional[WindowSpecification] = None
+        self.app = Application(backend="uia")
+        self.win: Optional["WindowSpecification"] = None
         _LOGGER.debug("Driver initialized with UIA backend.")
 
     def start_or_attach(self, app_name: str, app_exe: str) -> None:
@@ -133,6 +138,7 @@ class AppUiDriver:
         wrapper = self._get_wrapper(element)
         return wrapper.window_text()
 
+    @timed("uia.lookup")
     def _get_wrapper(self, element: UiElement) -> Any:
         """
         Resolves a UiElement to its pywinauto wrapper object.
@@ -0,0 +1,241 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from drivers.rs_smb100a import SMB100A, InstrumentConnectionError, InstrumentRangeError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ManagedInstrument:
+    """
+    Long-lived SMB100A session that survives a dropped connection.
+
+    The last frequency, power and RF state set through the session are cached. When
+    a command fails with a communication error (lost link or timeout) the session
+    is reopened (with ``*IDN?`` health checks and backoff), the cached state is
+    replayed with RF off until the level is restored, and the failed command is
+    sent once more.
+
+    Range errors and errors reported by the instrument are raised directly: they
+    are not caused by the connection, and resending the command would repeat them.
+    Reading the error queue is never retried, since a reconnect would empty it.
+    """
+
+    def __init__(self, resource: str, factory: Callable[[str], Any], manager: "VisaSessionManager"):
+        self.resource = resource
+        self._factory = factory
+        self._manager = manager
+        self._lock = threading.RLock()
+        self._driver: Optional[Any] = None
+        self._state: Dict[str, Any] = {}
+        self.last_used = 0.0
+        self.stats: Dict[str, Any] = {
+            "connects": 0, "reconnects": 0, "failed_reconnects": 0, "health_checks": 0,
+            "last_reconnect_s": None, "total_reconnect_s": 0.0,
+        }
+
+    # --- SMB100A API -----------------------------------------------------------------
+
+    def get_idn(self) -> str:
+        return self._call("get_idn")
+
+    def set_output_rf(self, state: bool) -> None:
+        self._call("set_output_rf", state)
+        self._state["rf_on"] = state
+
+    def get_output_rf_state(self) -> bool:
+        return self._call("get_output_rf_state")
+
+    def set_frequency(self, hz: float) -> None:
+        self._call("set_frequency", hz)
+        self._state["frequency_hz"] = hz
+
+    def get_frequency(self) -> float:
+        return self._call("get_frequency")
+
+    def set_power(self, dbm: float) -> None:
+        self._call("set_power", dbm)
+        self._state["power_dbm"] = dbm
+
+    def get_power(self) -> float:
+        return self._call("get_power")
+
+    def _write(self, cmd: str) -> None:
+        self._call("_write", cmd)
+
+    def _query_str(self, cmd: str) -> str:
+        return self._call("_query_str", cmd)
+
+    def set_error_checking(self, deferred: bool) -> None:
+        self._call("set_error_checking", deferred)
+        self._state["deferred_errors"] = deferred
+
+    def drain_errors(self) -> list:
+        return self._call("drain_errors", retry=False)
+
+    def check_errors(self) -> None:
+        self._call("check_errors", retry=False)
+
+    def safe_state(self) -> None:
+        with self._lock:
+            self._call("safe_state")
+            self._state.update(rf_on=False, power_dbm=-120)
+
+    def close(self) -> None:
+        """Releases the session back to the manager; the VISA session stays open."""
+        self.last_used = time.monotonic()
+
+    # --- Session handling ------------------------------------------------------------
+
+    def connect(self) -> None:
+        """Opens the session and verifies it with *IDN?, retrying with backoff."""
+        with self._lock:
+            self._disconnect()
+            delay = self._manager.backoff_s
+            for attempt in range(1, self._manager.max_attempts + 1):
+                try:
+                    self._driver = self._factory(self.resource)
+                    self.stats["health_checks"] += 1
+                    idn = self._driver.get_idn()
+                    self.stats["connects"] += 1
+                    self.last_used = time.monotonic()
+                    _LOGGER.info(f"Connected to {self.resource}: {idn}")
+                    return
+                except InstrumentRangeError:
+                    raise
+                except Exception as exc:
+                    self._disconnect()
+                    if attempt == self._manager.max_attempts:
+                        raise InstrumentConnectionError(
+                            f"Cannot connect to {self.resource} after {attempt} attempts") from exc
+                    _LOGGER.warning(f"Connection to {self.resource} failed ({exc}), retrying in {delay:.1f} s.")
+                    self._manager.sleep(delay)
+                    delay = min(delay * 2, self._manager.max_backoff_s)
+
+    def health_check(self) -> bool:
+        """Returns True if the instrument answers *IDN?."""
+        with self._lock:
+            if self._driver is None:
+                return False
+            self.stats["health_checks"] += 1
+            try:
+                self._driver.get_idn()
+                return True
+            except Exception as exc:
+                _LOGGER.warning(f"Health check of {self.resource} failed: {exc}")
+                return False
+
+    def reconnect(self) -> None:
+        """Reopens the session and replays the cached instrument state."""
+        with self._lock:
+            start = time.perf_counter()
+            try:
+                self.connect()
+                self._replay_state()
+            except Exception:
+                self.stats["failed_reconnects"] += 1
+                raise
+            elapsed = time.perf_counter() - start
+            self.stats["reconnects"] += 1
+            self.stats["last_reconnect_s"] = round(elapsed, 4)
+            self.stats["total_reconnect_s"] = round(self.stats["total_reconnect_s"] + elapsed, 4)
+            _LOGGER.warning(f"Reconnected to {self.resource} in {elapsed:.2f} s, state restored: {self._state}")
+
+    def shutdown(self) -> None:
+        """Closes the VISA session."""
+        with self._lock:
+            self._disconnect()
+
+    def _replay_state(self) -> None:
+        # RF stays off until frequency and power are back, so nothing is emitted at a wrong level.
+        driver = self._driver
+        if "deferred_errors" in self._state:
+            driver.set_error_checking(self._state["deferred_errors"])
+        driver.set_output_rf(False)
+        if "frequency_hz" in self._state:
+            driver.set_frequency(self._state["frequency_hz"])
+        if "power_dbm" in self._state:
+            driver.set_power(self._state["power_dbm"])
+        if self._state.get("rf_on"):
+            driver.set_output_rf(True)
+
+    def _call(self, method: str, *args: Any, retry: bool = True) -> Any:
+        with self._lock:
+            self.last_used = time.monotonic()
+            if self._driver is None:
+                self.connect()
+            try:
+                return getattr(self._driver, method)(*args)
+            except (InstrumentConnectionError, TimeoutError) as exc:
+                if not retry:
+                    raise
+                _LOGGER.warning(f"{self.resource}: {method}{args} failed ({exc}), reconnecting.")
+                self.reconnect()
+                return getattr(self._driver, method)(*args)
+
+    def _disconnect(self) -> None:
+        if self._driver is not None:
+            try:
+                self._driver.close()
+            except Exception:
+                pass
+            self._driver = None
+
+
+class VisaSessionManager:
+    """
+    Pool of long-lived instrument sessions, one per VISA resource.
+
+    Sessions are shared by the API runs and the bench tests instead of being opened
+    and closed per run. A session idle for longer than ``idle_check_s`` is health
+    checked (and reconnected if needed) before it is handed out again.
+
+    Args:
+        factory: Creates the driver of a resource.
+        max_attempts: Connection attempts before giving up.
+        backoff_s: Delay after the first failed attempt; doubled after each failure.
+        max_backoff_s: Upper limit of the delay.
+        idle_check_s: Idle time after which a session is checked before reuse.
+        sleep: Sleep function (replaceable in tests).
+    """
+
+    def __init__(self, factory: Callable[[str], Any] = SMB100A, max_attempts: int = 4, backoff_s: float = 0.5,
+                 max_backoff_s: float = 8.0, idle_check_s: float = 30.0, sleep: Callable[[float], None] = time.sleep):
+        self.factory = factory
+        self.max_attempts = max_attempts
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+        self.idle_check_s = idle_check_s
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, ManagedInstrument] = {}
+
+    def get(self, resource: str) -> ManagedInstrument:
+        """Returns the session of the resource, opening it on first use."""
+        with self._lock:
+            session = self._sessions.get(resource)
+            created = session is None
+            if created:
+                session = self._sessions[resource] = ManagedInstrument(resource, self.factory, self)
+        if created:
+            session.connect()
+        elif time.monotonic() - session.last_used > self.idle_check_s and not session.health_check():
+            session.reconnect()
+        return session
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Connection statistics per resource."""
+        with self._lock:
+            return {resource: dict(session.stats) for resource, session in self._sessions.items()}
+
+    def close_all(self) -> None:
+        """Closes every session."""
+        with self._lock:
+            sessions, self._sessions = list(self._sessions.values()), {}
+        for session in sessions:
+            session.shutdown()
+
+
+VISA_SESSIONS = VisaSessionManager()
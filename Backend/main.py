@@ -1,21 +1,55 @@
-from fastapi import FastAPI, BackgroundTasks, UploadFile, File, HTTPException
+from fastapi import FastAPI, BackgroundTasks, UploadFile, File, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 import time
 import json
+import functools
 import os
 import io
+import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
-import openpyxl
-import re
-from testowy import run_antenna_test
+from measurement.planner import ANGLE_MAJOR, SHEET_MAJOR
+from template_ingest import TemplateIngestor
+from campaign_queue import CampaignJob, CampaignQueue
+from bench_workers import BenchPool, BenchWorker
+from drivers.instrumentation import METRICS
+from drivers.ni.relay_router import RELAY_WEAR_FILE
+from drivers.test_calculation.calibration import (CALIBRATION_DIR, TABLE_KINDS, calibration_signature,
+                                                  load_calibration, load_table, table_path)
+from measurement.compiled_plan import compile_campaign, save_compiled_campaign
+from reporting.results_db import RESULTS_DB_FILE, ResultsDatabase
+from reporting.result_views import COLUMNAR, FORMATS, ROWS, filter_sheets, result_cursor, to_columnar
+from response_cache import ResponseCache, cached_response, file_signature
 from test_state import TestState
 from paths import CONFIG
 
+if TYPE_CHECKING:
+    import openpyxl
 
-app = FastAPI()
+
+def _visa_sessions():
+    """Pula sesji VISA, jeśli stanowisko sprzętowe zostało już otwarte (moduł ładowany tylko wtedy)."""
+    module = sys.modules.get("drivers.visa_sessions")
+    return module.VISA_SESSIONS if module is not None else None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if not CONFIG_ONLY:
+        campaign_queue.start()
+    yield
+    campaign_queue.shutdown(timeout=5.0)
+    bench_pool.shutdown()
+    sessions = _visa_sessions()
+    if sessions is not None:
+        sessions.close_all()
+    template_ingestor.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # --- Konfiguracja CORS ---
 # Pozwala frontendowi (React) na komunikację z backendem
@@ -30,6 +64,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Result-Cursor"],
 )
 
 REPORT_TEMPLATE_PATH = CONFIG / "report_template.xlsx"
@@ -40,17 +75,344 @@ HARDWARE_CONFIG_PATH = CONFIG / "hardware_config.json"
 TEST_CONFIG_PATH = CONFIG / "test_config.json"
 WE_CONFIG_PATH = CONFIG / "we_config.json"
 RESULT_FILE = CONFIG / "result.json"
+# Wynik pomiaru w ruchu (testowy.SCAN_RESULT_FILE)
+SCAN_RESULT_PATH = CONFIG / "scan_result.json"
+# Tryb konfiguracji (ANTENNA_API_MODE=config): edycja konfiguracji, kalibracji i raportów
+# bez stanowiska - pomiary są wyłączone. Odroczone są tylko biblioteki sprzętowe (RsInstrument,
+# nidaqmx, pywinauto) i pula sesji VISA; moduły measurement.* ładują się jak w trybie stanowiska.
+CONFIG_ONLY = os.getenv("ANTENNA_API_MODE", "").strip().lower() == "config"
 test_state = TestState()
+# Zserializowane odpowiedzi GET (konfiguracja, wyniki) trzymane do zmiany pliku źródłowego
+response_cache = ResponseCache()
+# Warianty /download-data (format, arkusz, kursor) dla bieżącej wersji result.json
+result_cache = ResponseCache(max_entries=32)
+template_ingestor = TemplateIngestor(UPLOADED_TEMPLATE_PATH, FREQUENCY_JSON_PATH)
+
+
+def _open_queue_bench():
+    from measurement.bench import load_bench_config, open_bench
+    return open_bench(load_bench_config(CONFIG / "bench_config.json"))
+
+
+def _run_queue_job(job: CampaignJob, result_file: Path, bench) -> bool:
+    """Wykonuje zadanie kolejki na stanowisku otwartym dla całej kolejki; wyniki w katalogu zadania."""
+    from testowy import CHECKPOINT_FILE, run_antenna_test
+    campaign = compile_campaign(job.we_config, load_calibration(CONFIG), calibration_signature(CONFIG))
+    result_file.parent.mkdir(parents=True, exist_ok=True)
+    resume = job.resume and (result_file.parent / CHECKPOINT_FILE).exists()
+    if not resume:
+        with open(result_file, "w", encoding="utf-8") as f:
+            json.dump(campaign.result_skeleton(), f, indent=2)
+    return run_antenna_test(test_state, result_file, job.order, resume, config_dir=CONFIG, campaign=campaign,
+                            bench=bench)
+
+
+# Kolejka kampanii wykonywanych jedna po drugiej na tym samym, otwartym stanowisku
+campaign_queue = CampaignQueue(CONFIG, test_state, _run_queue_job, _open_queue_bench)
+# Dodatkowe komory z benches.json - każda z własnym katalogiem konfiguracji i procesem pomiarowym
+bench_pool = BenchPool(CONFIG)
+
+def _require_bench():
+    if CONFIG_ONLY:
+        raise HTTPException(status_code=503, detail="Backend działa w trybie konfiguracji (ANTENNA_API_MODE=config) - "
+                                                    "pomiary są niedostępne.")
+
 
 @app.post("/start-test")
-async def start_test(background_tasks: BackgroundTasks):
-    if test_state.is_active():
+async def start_test(background_tasks: BackgroundTasks, order: str = ANGLE_MAJOR):
+    _require_bench()
+    # Moduł pomiarowy ładowany przy pierwszym teście, nie przy starcie serwera
+    from testowy import run_antenna_test
+    if order not in (ANGLE_MAJOR, SHEET_MAJOR):
+        raise HTTPException(status_code=400, detail=f"Nieznana kolejność kampanii: {order}")
+    # Atomowo względem kolejki kampanii, która może właśnie zajmować stanowisko
+    if not test_state.try_start():
         return JSONResponse(status_code=409, content={"message": "Test jest już w toku."})
 
-    test_state.start()
-    background_tasks.add_task(run_antenna_test, test_state, RESULT_FILE)
+    background_tasks.add_task(run_antenna_test, test_state, RESULT_FILE, order)
     return {"message": "Test uruchomiony w tle"}
 
+@app.post("/resume-test")
+async def resume_test(background_tasks: BackgroundTasks):
+    """Wznawia przerwaną kampanię, pomijając punkty zapisane w punkcie kontrolnym."""
+    _require_bench()
+    from testowy import describe_resume, run_antenna_test
+    if test_state.is_active():
+        return JSONResponse(status_code=409, content={"message": "Test jest już w toku."})
+    try:
+        resume_info = describe_resume(CONFIG)
+    except (ValueError, FileNotFoundError) as e:
+        return JSONResponse(status_code=409, content={"message": str(e)})
+
+    if not test_state.try_start():
+        return JSONResponse(status_code=409, content={"message": "Test jest już w toku."})
+    background_tasks.add_task(run_antenna_test, test_state, RESULT_FILE, resume_info["order"], True)
+    return {"message": "Test wznowiony w tle", **resume_info}
+
+
+class ScanRequest(BaseModel):
+    frequency_hz: float
+    level_dbm: float
+    polarization: str = "V"
+    # Prędkość ustawiona w CtrlAxes - ogranicza czas obrotu; kąt próbek pochodzi z odczytów pozycji
+    speed_deg_per_s: float = 6.0
+    sample_rate_hz: float = 100.0
+    position_poll_s: float = 0.1
+    start_deg: float = 0.0
+    span_deg: float = 360.0
+    resolution_deg: float = 1.0
+    analog_channel: int = 3
+    threshold_v: float = 4.5
+
+@app.post("/scan-rotation")
+async def scan_rotation(request: ScanRequest, background_tasks: BackgroundTasks):
+    """Pomiar w ruchu: stół obraca się ciągle przy stałym poziomie, a DAQ próbkuje wyjście DUT."""
+    _require_bench()
+    from measurement.scan import ScanSettings
+    from testowy import run_scan_test
+    try:
+        settings = ScanSettings(**request.dict())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not test_state.try_start():
+        return JSONResponse(status_code=409, content={"message": "Test jest już w toku."})
+
+    background_tasks.add_task(run_scan_test, test_state, settings, CONFIG)
+    return {"message": "Pomiar w ruchu uruchomiony w tle"}
+
+@app.get("/scan-result")
+async def scan_result(request: Request):
+    """Wynik ostatniego pomiaru w ruchu: próbki z kątem, wzór aktywacji i zbocza."""
+    if not SCAN_RESULT_PATH.exists():
+        return JSONResponse(status_code=404, content={"message": "Brak wyników pomiaru w ruchu"})
+    return _cached_file(request, SCAN_RESULT_PATH, {})
+
+# --- Dodatkowe stanowiska (benches.json) ---
+# Stanowisko główne obsługują endpointy bez prefiksu; pozostałe komory - /benches/{bench_id}/...
+PRIMARY_BENCH = "main"
+
+
+def _bench(bench_id: str) -> BenchWorker:
+    _require_bench()
+    try:
+        return bench_pool.get(bench_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Nieznane stanowisko: {bench_id}")
+
+
+@app.get("/benches")
+async def list_benches():
+    """Stanowisko główne i komory z benches.json ze stanem bieżącego testu."""
+    benches = [{"id": PRIMARY_BENCH, "name": PRIMARY_BENCH, "is_running": test_state.is_active(),
+                "results_ready": _results_ready(RESULT_FILE)}]
+    for worker in bench_pool.workers():
+        benches.append({**worker.status(), "results_ready": _results_ready(worker.result_file)})
+    return benches
+
+
+@app.post("/benches/{bench_id}/start-test")
+async def start_bench_test(bench_id: str, order: str = ANGLE_MAJOR):
+    """Uruchamia kampanię stanowiska w osobnym procesie pomiarowym."""
+    worker = _bench(bench_id)
+    if order not in (ANGLE_MAJOR, SHEET_MAJOR):
+        raise HTTPException(status_code=400, detail=f"Nieznana kolejność kampanii: {order}")
+    if not worker.start(order):
+        return JSONResponse(status_code=409, content={"message": f"Test na stanowisku {bench_id} jest już w toku."})
+    return {"message": f"Test uruchomiony na stanowisku {bench_id}"}
+
+
+@app.post("/benches/{bench_id}/resume-test")
+async def resume_bench_test(bench_id: str):
+    worker = _bench(bench_id)
+    from testowy import describe_resume
+    try:
+        resume_info = describe_resume(worker.config_dir)
+    except (ValueError, FileNotFoundError) as e:
+        return JSONResponse(status_code=409, content={"message": str(e)})
+    if not worker.start(resume_info["order"], resume=True):
+        return JSONResponse(status_code=409, content={"message": f"Test na stanowisku {bench_id} jest już w toku."})
+    return {"message": f"Test wznowiony na stanowisku {bench_id}", **resume_info}
+
+
+@app.post("/benches/{bench_id}/stop-test")
+async def stop_bench_test(bench_id: str):
+    worker = _bench(bench_id)
+    if not worker.is_active():
+        return {"message": f"Na stanowisku {bench_id} nie trwa żaden test."}
+    worker.stop()
+    return {"message": f"Wysłano sygnał zatrzymania testu na stanowisku {bench_id}."}
+
+
+@app.get("/benches/{bench_id}/check-status")
+async def check_bench_status(bench_id: str):
+    worker = _bench(bench_id)
+    return {**worker.status(), "results_ready": _results_ready(worker.result_file)}
+
+
+@app.post("/benches/{bench_id}/save-we-config")
+async def save_bench_we_config(bench_id: str, config: List[Dict[str, Any]]):
+    """Zapisuje we_config.json stanowiska (z kalibracją z jego katalogu) i tworzy jego pusty result.json."""
+    worker = _bench(bench_id)
+    if worker.is_active():
+        return JSONResponse(status_code=409, content={"message": f"Test na stanowisku {bench_id} jest w toku."})
+    worker.config_dir.mkdir(parents=True, exist_ok=True)
+    _write_we_config(worker.config_dir, config, worker.config_dir / "we_config.json", worker.result_file)
+    return {"message": f"Zapisano konfigurację stanowiska {bench_id}."}
+
+
+@app.get("/benches/{bench_id}/download-data")
+async def download_bench_data(request: Request, bench_id: str, format: str = ROWS, sheet: Optional[str] = None,
+                              since: Optional[int] = None):
+    """Wyniki stanowiska; parametry jak w /download-data."""
+    return _results_response(request, _bench(bench_id).result_file, format, sheet, since)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Histogramy czasu operacji sterowników (SCPI, DAQ, przekaźniki, UIA, ruch) bieżącego lub ostatniego testu."""
+    sessions = _visa_sessions()
+    return {**METRICS.snapshot(), "visa_sessions": sessions.stats() if sessions is not None else {}}
+
+@app.get("/relay-wear")
+async def relay_wear():
+    """Łączna liczba przełączeń każdej trasy i każdej linii przekaźników stanowiska."""
+    return _read_json_file(CONFIG / RELAY_WEAR_FILE, {})
+
+@app.get("/history/runs")
+async def history_runs(antenna: str = None, dut_serial: str = None, limit: int = 50):
+    """Ostatnie przebiegi zapisane w bazie wyników."""
+    with ResultsDatabase(CONFIG / RESULTS_DB_FILE) as db:
+        return db.runs(antenna, dut_serial, limit)
+
+
+@app.get("/history/activation-by-angle")
+async def history_activation_by_angle(antenna: str, frequency_hz: int, polarization: str = None,
+                                      dut_serial: str = None):
+    """Średnia, minimum i maksimum aktywacji dla każdego kąta we wszystkich przebiegach."""
+    with ResultsDatabase(CONFIG / RESULTS_DB_FILE) as db:
+        return db.activation_by_angle(antenna, frequency_hz, polarization, dut_serial)
+
+
+@app.get("/history/drift")
+async def history_drift(antenna: str, frequency_hz: int, angle: int = None, polarization: str = None,
+                        dut_serial: str = None):
+    """Średnia aktywacja kolejnych przebiegów i jej zmiana względem pierwszego (dryf)."""
+    with ResultsDatabase(CONFIG / RESULTS_DB_FILE) as db:
+        return db.drift(antenna, frequency_hz, angle, polarization, dut_serial)
+
+
+@app.get("/campaign-plan")
+async def campaign_plan(order: str = ANGLE_MAJOR):
+    """Zwraca plan kampanii z szacowanym czasem i oszczędnością względem kolejności arkuszy."""
+    if not os.path.exists(WE_CONFIG_PATH):
+        raise HTTPException(status_code=404, detail="Brak pliku we_config.json.")
+    from testowy import load_campaign_plan
+    try:
+        _, _, plan = load_campaign_plan(CONFIG, order)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=500, detail=f"Błąd odczytu we_config.json: {str(e)}")
+    return plan.summary()
+
+class QueueJobRequest(BaseModel):
+    we_config: Optional[List[Dict[str, Any]]] = None
+    order: str = ANGLE_MAJOR
+    name: str = ""
+    dut: Dict[str, Any] = {}
+    priority: int = 0
+
+
+def _queue_job(job_id: str) -> CampaignJob:
+    job = campaign_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Brak zadania {job_id} w kolejce.")
+    return job
+
+
+def _queue_call(method, job_id: str, *args) -> dict:
+    try:
+        return method(job_id, *args).to_dict()
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Brak zadania {job_id} w kolejce.")
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@app.post("/queue")
+async def queue_add(request: QueueJobRequest):
+    """
+    Dodaje kampanię do kolejki: zamrożoną kopię we_config (z żądania lub bieżącego
+    pliku) z danymi DUT. ``dut.serial`` trafia do arkuszy bez własnego numeru seryjnego.
+    """
+    if request.order not in (ANGLE_MAJOR, SHEET_MAJOR):
+        raise HTTPException(status_code=400, detail=f"Nieznana kolejność kampanii: {request.order}")
+    we_config = request.we_config
+    if we_config is None:
+        we_config = _read_json_file(WE_CONFIG_PATH, None)
+        if not we_config:
+            raise HTTPException(status_code=404, detail="Brak pliku we_config.json.")
+    try:
+        # Walidacja przy dodaniu - błędna konfiguracja nie czeka w kolejce na swoją kolej
+        compile_campaign(we_config, load_calibration(CONFIG), calibration_signature(CONFIG))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Nieprawidłowa konfiguracja: {str(e)}")
+    job = campaign_queue.add(we_config, request.order, request.name, request.dut, request.priority)
+    return job.to_dict()
+
+
+@app.get("/queue")
+async def queue_list():
+    """Zadania kolejki w kolejności wykonania oraz czas oczekiwania i wykorzystanie stanowiska."""
+    return {"jobs": [job.to_dict() for job in campaign_queue.jobs()], "stats": campaign_queue.stats()}
+
+
+@app.post("/queue/pause")
+async def queue_pause():
+    """Wstrzymuje kolejkę po bieżącym zadaniu."""
+    campaign_queue.pause()
+    return {"message": "Kolejka wstrzymana."}
+
+
+@app.post("/queue/resume")
+async def queue_resume():
+    _require_bench()
+    campaign_queue.resume()
+    return {"message": "Kolejka wznowiona."}
+
+
+@app.post("/queue/{job_id}/priority")
+async def queue_priority(job_id: str, priority: int):
+    return _queue_call(campaign_queue.set_priority, job_id, priority)
+
+
+@app.post("/queue/{job_id}/move")
+async def queue_move(job_id: str, index: int):
+    """Przesuwa zadanie na podane miejsce w kolejności wykonania (0 - następne)."""
+    return _queue_call(campaign_queue.move, job_id, index)
+
+
+@app.post("/queue/{job_id}/requeue")
+async def queue_requeue(job_id: str):
+    """Ponownie kolejkuje zatrzymane lub nieudane zadanie; zostanie wznowione od punktu kontrolnego."""
+    return _queue_call(campaign_queue.requeue, job_id)
+
+
+@app.delete("/queue/{job_id}")
+async def queue_cancel(job_id: str):
+    """Anuluje zadanie; uruchomione zadanie jest zatrzymywane (zmierzone punkty pozostają)."""
+    return _queue_call(campaign_queue.cancel, job_id)
+
+
+@app.get("/queue/{job_id}/results")
+async def queue_results(job_id: str):
+    """Wyniki (result.json) zadania kolejki."""
+    result_file = campaign_queue.result_file(_queue_job(job_id))
+    if not result_file.exists():
+        return JSONResponse(status_code=404, content={"message": "Brak wyników"})
+    return _read_json_file(result_file, [])
+
+
 @app.post("/stop-test")
 async def stop_test():
     """Zatrzymuje aktualnie działający test."""
@@ -62,10 +424,16 @@ async def stop_test():
 
 @app.get("/check-status")
 async def check_status():
+    # Bieżąca ocena pass/fail arkuszy względem limitów anteny
+    return {"is_running": test_state.is_active(), "results_ready": _results_ready(RESULT_FILE),
+            "verdicts": test_state.verdicts(), "mode": "config" if CONFIG_ONLY else "bench"}
+
+
+def _results_ready(result_file: Path) -> bool:
     results_ready = False
-    if os.path.exists(RESULT_FILE) and os.path.getsize(RESULT_FILE) > 0:
+    if os.path.exists(result_file) and os.path.getsize(result_file) > 0:
         try:
-            with open(RESULT_FILE, 'r') as f:
+            with open(result_file, 'r') as f:
                 data = json.load(f)
                 if isinstance(data, list) and data:
                     # Sprawdź, czy którykolwiek arkusz ma wyniki w tablicy 'result'
@@ -73,32 +441,136 @@ async def check_status():
                         results_ready = True
         except (json.JSONDecodeError, IOError):
             results_ready = False
-            
-    return {"is_running": test_state.is_active(), "results_ready": results_ready}
+    return results_ready
 
-@app.get("/download-data")
-async def download_data():
-    if not os.path.exists(RESULT_FILE):
+def _read_json_file(path: Path, default: Any) -> Any:
+    """Wczytuje plik JSON; brakujący, pusty lub uszkodzony plik daje wartość domyślną."""
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+            return json.loads(content) if content.strip() else default
+    except json.JSONDecodeError:
+        return default
+
+
+def _load_frequencies() -> list:
+    frequencies = _read_json_file(FREQUENCY_JSON_PATH, [])
+    if not frequencies:
+        return []
+    # Wartości z tablic kalibracyjnych mają pierwszeństwo przed wartościami z szablonu
+    return load_calibration(CONFIG).fill_frequencies(frequencies)
+
+
+def _frequencies_signature() -> tuple:
+    return file_signature(FREQUENCY_JSON_PATH) + calibration_signature(CONFIG)
+
+
+def _cached_file(request: Request, path: Path, default: Any) -> Response:
+    payload = response_cache.get(path.name, file_signature(path), lambda: _read_json_file(path, default))
+    return cached_response(request, payload)
+
+
+@functools.lru_cache(maxsize=8)
+def _parsed_results(signature: tuple) -> list:
+    """result.json wczytany raz na wersję pliku (sygnaturę), wspólny dla wszystkich wariantów odpowiedzi."""
+    data = _read_json_file(Path(signature[0][0]), [])
+    return data if isinstance(data, list) else []
+
+
+def _results_response(request: Request, result_file: Path, format: str, sheet: Optional[str], since: Optional[int]):
+    if not os.path.exists(result_file):
         return JSONResponse(status_code=404, content={"message": "Brak wyników"})
-    
-    with open(RESULT_FILE, "r") as f:
-        data = json.load(f)
-    return data
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Nieznany format wyników: {format}. Dostępne: {', '.join(FORMATS)}")
+
+    signature = file_signature(result_file)
+    sheets = _parsed_results(signature)
+
+    def build():
+        selected = filter_sheets(sheets, sheet, since)
+        return to_columnar(selected) if format == COLUMNAR else selected
+
+    payload = result_cache.get(f"{result_file}|{format}|{sheet}|{since}", signature, build)
+    return cached_response(request, payload, {"X-Result-Cursor": str(result_cursor(sheets))})
+
+
+@app.get("/download-data")
+async def download_data(request: Request, format: str = ROWS, sheet: Optional[str] = None,
+                        since: Optional[int] = None):
+    """
+    Zwraca wyniki z result.json.
+
+    ``format=columnar`` zwraca każdy arkusz jako tablice wartości pól (``columns``)
+    zamiast listy wierszy. ``sheet`` ogranicza odpowiedź do jednego arkusza, a
+    ``since`` do arkuszy zapisanych po kursorze z nagłówka ``X-Result-Cursor``
+    poprzedniej odpowiedzi.
+    """
+    return _results_response(request, RESULT_FILE, format, sheet, since)
 
 
 @app.get("/frequencies")
-async def get_frequencies():
+async def get_frequencies(request: Request):
     """Zwraca aktualną konfigurację częstotliwości z pliku w backendzie."""
-    if not os.path.exists(FREQUENCY_JSON_PATH):
-        return []
+    return cached_response(request, response_cache.get("frequencies", _frequencies_signature(), _load_frequencies))
+
+
+@app.get("/bootstrap")
+async def bootstrap(request: Request):
+    """Częstotliwości, konfiguracja sprzętowa, parametry przebiegu i konfiguracja testu w jednej odpowiedzi."""
+    signature = _frequencies_signature() + file_signature(HARDWARE_CONFIG_PATH, RUNTIME_PARAMS_PATH, TEST_CONFIG_PATH)
+    payload = response_cache.get("bootstrap", signature, lambda: {
+        "frequencies": _load_frequencies(),
+        "hardware_config": _read_json_file(HARDWARE_CONFIG_PATH, {}),
+        "runtime_params": _read_json_file(RUNTIME_PARAMS_PATH, {}),
+        "test_config": _read_json_file(TEST_CONFIG_PATH, []),
+    })
+    return cached_response(request, payload)
+
+
+@app.get("/calibration")
+async def get_calibration():
+    """Zwraca wczytane tablice kalibracyjne i kalibrację każdego arkusza z we_config.json."""
+    calibration = load_calibration(CONFIG)
+    sheets = []
+    if os.path.exists(WE_CONFIG_PATH):
+        with open(WE_CONFIG_PATH, "r", encoding="utf-8") as f:
+            we_config = json.load(f)
+        sheets = [
+            {"sheet": item.get("sheet"), "id": item.get("id"),
+             **calibration.for_sheet(item.get("test_params", {})).to_dict()}
+            for item in we_config
+        ]
+    return {"tables": calibration.describe(), "sheets": sheets}
+
+
+@app.post("/upload-calibration")
+async def upload_calibration(kind: str, file: UploadFile = File(...)):
+    """
+    Przyjmuje tablicę kalibracyjną (CSV lub Excel) tłumienia kabla lub współczynnika anteny.
+    kind: cable_loss | antenna_factor
+    """
+    if kind not in TABLE_KINDS:
+        raise HTTPException(status_code=400, detail=f"Nieznany rodzaj tablicy '{kind}'. Dozwolone: {', '.join(TABLE_KINDS)}.")
+    suffix = Path(file.filename or "").suffix.lower()
+    if suffix not in (".csv", ".xlsx"):
+        raise HTTPException(status_code=400, detail="Obsługiwane formaty tablic: .csv, .xlsx.")
+    content = await file.read()
     try:
-        with open(FREQUENCY_JSON_PATH, "r", encoding="utf-8") as f:
-            content = f.read()
-            return json.loads(content) if content.strip() else []
-    except json.JSONDecodeError:
-        return []
+        table = load_table(content, kind, filename=file.filename)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Niepoprawna tablica kalibracyjna: {e}")
+
+    old_path = table_path(CONFIG, kind)
+    if old_path is not None:
+        old_path.unlink()
+    target = CONFIG / CALIBRATION_DIR / f"{kind}{suffix}"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(content)
+    return {"message": f"Zapisano tablicę '{kind}' ({len(table)} punktów).", "points": len(table)}
  
-def _fill_workbook_with_results(workbook: openpyxl.Workbook, results_data: list):
+def _fill_workbook_with_results(workbook: "openpyxl.Workbook", results_data: list):
     """
     Wypełnia skoroszyt wynikami dla wielu arkuszy.
     Dopasowuje dane do arkusza Excel na podstawie pola 'sheet' w JSON.
@@ -137,7 +609,7 @@ def _fill_workbook_with_results(workbook: openpyxl.Workbook, results_data: list)
             print(f"Pominięto dane dla arkusza '{sheet_identifier}' - nie znaleziono w szablonie.")
 
 
-def _generate_excel_response(workbook: openpyxl.Workbook) -> StreamingResponse:
+def _generate_excel_response(workbook: "openpyxl.Workbook") -> StreamingResponse:
     """Saves a workbook to a memory buffer and returns it as a StreamingResponse."""
     output = io.BytesIO()
     workbook.save(output)
@@ -154,87 +626,25 @@ def _generate_excel_response(workbook: openpyxl.Workbook) -> StreamingResponse:
     )
 
 
-@app.post("/upload-template")
+@app.post("/upload-template", status_code=202)
 async def upload_template(file: UploadFile = File(...)):
     """
-    1. Zapisuje przesłany plik jako szablon w pamięci backendu (na dysku).
-    2. Aktualizuje frequency.json na podstawie danych z kolumn T-Y tego pliku.
+    Przyjmuje szablon Excel i zleca jego przetworzenie w osobnym procesie.
+    Szablon i frequency.json są podmieniane dopiero po poprawnej walidacji.
+    Status i raport walidacji: GET /upload-template/{job_id}.
     """
-    try:
-        content = await file.read()
-        
-        # Upewnij się, że katalog docelowy istnieje
-        UPLOADED_TEMPLATE_PATH.parent.mkdir(parents=True, exist_ok=True)
-
-        # 1. Zapisz plik na serwerze (jako szablon do późniejszego użycia)
-        with open(UPLOADED_TEMPLATE_PATH, "wb") as f:
-            f.write(content)
-
-        # 2. Przetwórz częstotliwości (logika parsowania kolumn T-Y)
-        workbook = openpyxl.load_workbook(io.BytesIO(content), data_only=True)
-        sheet = workbook.active
-
-        # Helper do obsługi scalonych komórek
-        def get_value(r, c):
-            cell = sheet.cell(row=r, column=c)
-            if cell.value is not None:
-                return cell.value
-            # Sprawdź czy komórka jest częścią scalonego obszaru
-            for merged_range in sheet.merged_cells.ranges:
-                if cell.coordinate in merged_range:
-                    # Zwróć wartość z lewego górnego rogu scalenia
-                    return sheet.cell(row=merged_range.min_row, column=merged_range.min_col).value
-            return None
-
-        # Pobierz klucze z kolumny T (indeks 20) w wierszach 3-8
-        keys = []
-        for r in range(3, 9):
-            val = get_value(r, 20) # Kolumna T (klucze)
-            if val:
-                # Normalizacja klucza: znajduje wszystkie "słowa" (ciągi liter i cyfr),
-                # konwertuje na małe litery i łączy je podkreśleniem.
-                # Przykład: "Frequency (MHz)" -> "frequency_mhz"
-                words = re.findall(r'\w+', str(val).lower())
-                key = "_".join(words)
-                keys.append(key)
-            else:
-                keys.append(f"field_{r}")
-
-        frequencies_data = []
-        current_id = 1
-        
-        # Iteracja po kolumnach od V (22) do AD (30) - każda kolumna to obiekt
-        for col in range(22, 31):
-            # Sprawdź czy obiekt istnieje (czy ma wartość w pierwszym wierszu kluczy - wiersz 3)
-            if get_value(3, col) is None:
-                continue
-
-            item = {"id": current_id}
-            for i, r in enumerate(range(3, 9)):
-                key = keys[i]
-                val = get_value(r, col)
-                item[key] = val
-
-            frequencies_data.append(item)
-            current_id += 1
-
-        if not frequencies_data:
-            raise HTTPException(
-                status_code=422,
-                detail="Nie udało się odczytać danych o częstotliwościach z pliku. Sprawdź, czy format pliku Excel jest zgodny z oczekiwanym szablonem (dane w kolumnach V-AD, nagłówki w kolumnie T)."
-            )
-
-        # Zapisz nowe dane do pliku JSON
-        with open(FREQUENCY_JSON_PATH, "w", encoding="utf-8") as f:
-            json.dump(frequencies_data, f, indent=2, ensure_ascii=False)
-
-        return {"message": f"Szablon zapisany. Zaktualizowano {len(frequencies_data)} częstotliwości."}
-
-    except HTTPException as e:
-        raise e # Przekaż dalej wyjątki HTTP z logiką walidacji
-    except Exception as e:
-        print(f"Błąd przetwarzania szablonu Excel: {e}")
-        raise HTTPException(status_code=500, detail=f"Wystąpił błąd serwera podczas przetwarzania pliku: {str(e)}")
+    content = await file.read()
+    job = template_ingestor.submit(content, file.filename or "")
+    return {"job_id": job.job_id, "status": job.status, "message": "Szablon przyjęty do przetworzenia."}
+
+
+@app.get("/upload-template/{job_id}")
+async def get_upload_status(job_id: str):
+    """Zwraca status przetwarzania szablonu wraz z raportem walidacji."""
+    job = template_ingestor.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Nie znaleziono zadania {job_id}.")
+    return job.to_dict()
 
 
 @app.get("/generate-report")
@@ -256,6 +666,7 @@ async def generate_report():
         raise HTTPException(status_code=404, detail="Plik wyników ma niepoprawny format lub jest pusty.")
 
     try:
+        import openpyxl
         workbook = openpyxl.load_workbook(UPLOADED_TEMPLATE_PATH)
         _fill_workbook_with_results(workbook, results_data)
         return _generate_excel_response(workbook)
@@ -274,10 +685,24 @@ class RuntimeParams(BaseModel):
     start_table_position: int
     start_malt_height: int
     silent_search_reduction_db: float
+    # Rampa w natężeniu pola (dBuV/m) zamiast mocy generatora (dBm)
+    sweep_unit: str = "dBm"
+    start_field_dbuvm: Optional[float] = None
+    end_field_dbuvm: Optional[float] = None
+    field_step_db: Optional[float] = None
+    # Pominięcie pozostałych punktów arkusza, który już przekroczył limit anteny
+    abort_sheet_on_fail: bool = False
+    # Start rampy poniżej progu przewidzianego z sąsiednich kątów i poprzednich przebiegów
+    predictive_start: bool = False
+    prediction_margin_db: float = 3.0
 
 @app.post("/save-runtime-params")
 async def save_runtime_params(params: RuntimeParams):
     """Zapisuje parametry wejściowe testu do pliku JSON w folderze config."""
+    if params.sweep_unit not in ("dBm", "dBuV/m"):
+        raise HTTPException(status_code=400, detail=f"Nieznana jednostka rampy '{params.sweep_unit}'.")
+    if params.sweep_unit == "dBuV/m" and (params.start_field_dbuvm is None or params.end_field_dbuvm is None):
+        raise HTTPException(status_code=400, detail="Rampa w dBuV/m wymaga start_field_dbuvm i end_field_dbuvm.")
     try:
         with open(RUNTIME_PARAMS_PATH, "w", encoding="utf-8") as f:
             json.dump(params.dict(), f, indent=2)
@@ -293,13 +718,20 @@ class HardwareConfig(BaseModel):
     analog_channel: int
     voltage_threshold_v: float
     safe_stop_power_dbm: float
+    # Antena dwupolaryzacyjna: linia przekaźnika NI 9485 dla każdej polaryzacji, np. {"V": 0, "H": 1}
+    polarization_relay: Optional[Dict[str, int]] = None
+    relay_settle_s: Optional[float] = None
+    # Nazwane trasy przekaźników, np. {"dut_power": {"lines": [0]}, "att_20db": {"lines": [3], "group": "attenuator"}}
+    relay_routes: Optional[Dict[str, Dict[str, Any]]] = None
+    # Kilka DUT w komorze, każdy na własnym kanale AI - arkusze o tym samym stanie stanowiska mierzone wspólną rampą
+    concurrent_duts: Optional[bool] = None
 
 @app.post("/save-hardware-config")
 async def save_hardware_config(config: HardwareConfig):
     """Zapisuje konfigurację sprzętową do pliku JSON w folderze config."""
     try:
         with open(HARDWARE_CONFIG_PATH, "w", encoding="utf-8") as f:
-            json.dump(config.dict(), f, indent=2)
+            json.dump(config.dict(exclude_none=True), f, indent=2)
         return {"message": "Konfiguracja sprzętowa została zapisana."}
     except Exception as e:
         print(f"Błąd zapisu hardware_config: {e}")
@@ -323,66 +755,44 @@ async def save_test_config(config: List[Dict[str, Any]]):
 # --- Obsługa scalania konfiguracji (WE Config) ---
 
 @app.get("/get-hardware-config")
-async def get_hardware_config():
-    if not os.path.exists(HARDWARE_CONFIG_PATH):
-        return {}
-    try:
-        with open(HARDWARE_CONFIG_PATH, "r", encoding="utf-8") as f:
-            content = f.read()
-            return json.loads(content) if content.strip() else {}
-    except json.JSONDecodeError:
-        return {}
+async def get_hardware_config(request: Request):
+    return _cached_file(request, HARDWARE_CONFIG_PATH, {})
 
 @app.get("/get-runtime-params")
-async def get_runtime_params():
-    if not os.path.exists(RUNTIME_PARAMS_PATH):
-        return {}
-    try:
-        with open(RUNTIME_PARAMS_PATH, "r", encoding="utf-8") as f:
-            content = f.read()
-            return json.loads(content) if content.strip() else {}
-    except json.JSONDecodeError:
-        return {}
+async def get_runtime_params(request: Request):
+    return _cached_file(request, RUNTIME_PARAMS_PATH, {})
 
 @app.get("/get-test-config")
-async def get_test_config():
-    if not os.path.exists(TEST_CONFIG_PATH):
-        return []
-    try:
-        with open(TEST_CONFIG_PATH, "r", encoding="utf-8") as f:
-            content = f.read()
-            return json.loads(content) if content.strip() else []
-    except json.JSONDecodeError:
-        return []
+async def get_test_config(request: Request):
+    return _cached_file(request, TEST_CONFIG_PATH, [])
 
 @app.post("/save-we-config")
 async def save_we_config(config: List[Dict[str, Any]]):
     """
-    Zapisuje scalony plik konfiguracyjny (we_config.json) oraz
-    tworzy pusty plik result.json na podstawie tej konfiguracji.
+    Sprawdza i kompiluje scalony plik konfiguracyjny (we_config.json), zapisuje go
+    razem z wersją skompilowaną (gotową listą punktów i stałymi kalibracji)
+    oraz tworzy pusty plik result.json na podstawie tej konfiguracji.
     """
+    _write_we_config(CONFIG, config, WE_CONFIG_PATH, RESULT_FILE)
+    return {"message": "Plik we_config.json został pomyślnie wygenerowany. Utworzono również result.json."}
+
+
+def _write_we_config(config_dir: Path, config: List[Dict[str, Any]], we_config_path: Path, result_file: Path):
+    try:
+        # 1. Kompilacja: walidacja, wartości domyślne, rampy i stałe kalibracji arkuszy
+        campaign = compile_campaign(config, load_calibration(config_dir), calibration_signature(config_dir))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Nieprawidłowa konfiguracja: {str(e)}")
+
     try:
-        # 1. Zapisz do pliku we_config.json
-        with open(WE_CONFIG_PATH, "w", encoding="utf-8") as f:
+        # 2. Zapisz do pliku we_config.json i wersję skompilowaną
+        with open(we_config_path, "w", encoding="utf-8") as f:
             json.dump(config, f, indent=2)
-        
-        # 2. Utwórz strukturę dla pliku result.json
-        result_structure = []
-        for sheet_config in config:
-            freq_hz = sheet_config.get("test_params", {}).get("frequency_hz", 0)
-            result_structure.append({
-                "sheet": sheet_config.get("sheet"),
-                "id": sheet_config.get("id"),
-                "antenna": sheet_config.get("antenna", ""),
-                "frequency_mhz": freq_hz / 1000000.0,
-                "result": []
-            })
-        
+        save_compiled_campaign(config_dir, campaign)
+
         # 3. Zapisz plik result.json
-        with open(RESULT_FILE, "w", encoding="utf-8") as f:
-            json.dump(result_structure, f, indent=2)
-            
-        return {"message": "Plik we_config.json został pomyślnie wygenerowany. Utworzono również result.json."}
+        with open(result_file, "w", encoding="utf-8") as f:
+            json.dump(campaign.result_skeleton(), f, indent=2)
     except Exception as e:
         print(f"Błąd zapisu we_config lub result.json: {e}")
         raise HTTPException(status_code=500, detail=f"Błąd zapisu pliku: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,221 @@
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from drivers.ni.relay_router import RELAY_LINES, RelayRouter, parse_routes
+from measurement.simulation import (
+    LATENCY_PROFILES,
+    SimulatedAnalogInput,
+    SimulatedChamber,
+    SimulatedCtrlAxes,
+    SimulatedGenerator,
+    SimulatedRelay,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_BENCH_CONFIG: Dict[str, Any] = {
+    "simulated": True,
+    "latency_profile": "demo",
+    "generator_address": "GPIB0::28::INSTR",
+    "ni_relay_device_id": "Dev1",
+    "ni_analog_device_id": "Dev2",
+    "ctrl_axes_exe": "C:\\AcEmcV7\\CtrlAxesV7.exe",
+    "ctrl_axes_title": r"Somfy_Pologne.cmp - CtrlAxesV7.*",
+    "polarization_settle_s": 1.0,
+    "dut_settle_s": 0.05,
+    "overlap_io": False,
+    "deferred_error_check": True,
+    # Relay line per polarization of a dual-polarized antenna, e.g. {"V": 0, "H": 1};
+    # None rotates the mast. Usually set in hardware_config.json (see load_bench_config).
+    "polarization_relay": None,
+    "relay_settle_s": 0.005,
+    # Named relay routes, e.g. {"dut_power": {"lines": [0]}, "att_20db": {"lines": [3], "group": "attenuator"}};
+    # a sheet selects routes by name with test_params.routes (see drivers.ni.relay_router).
+    "relay_routes": {},
+}
+# Keys of hardware_config.json (next to bench_config.json) that configure the bench.
+HARDWARE_CONFIG_FILE = "hardware_config.json"
+HARDWARE_BENCH_KEYS = ("polarization_relay", "relay_settle_s", "relay_routes")
+POLARIZATIONS = ("V", "H")
+POLARIZATION_GROUP = "polarization"
+# Route of the relay router connecting each port of a dual-polarized antenna.
+POLARIZATION_ROUTES = {polarization: f"{POLARIZATION_GROUP}_{polarization}" for polarization in POLARIZATIONS}
+
+
+@dataclass
+class Bench:
+    """
+    The set of instruments of one test chamber.
+
+    Attributes:
+        generator: SMB100A (or a compatible stand-in).
+        ni_analog: NIUSB6361Handler reading the DUT output.
+        ni_relay: NI9485Handler switching the bench relays.
+        ctrl_axes: CtrlAxesDriver moving the turntable and the mast.
+        polarization_settle_s: Wait after changing the mast polarization.
+        dut_settle_s: Wait between setting the generator power and reading the DUT.
+        simulated: True when the instruments are simulated.
+        overlap_io: Retune the generator while the turntable and the mast move.
+        polarization_relay: Relay line (of ``ni_relay``) selecting each port of a
+            dual-polarized antenna; None when polarization is changed by rotating the mast.
+        router: Named relay routes on ``ni_relay`` (the polarization ports included);
+            None when no route is configured.
+    """
+
+    generator: Any
+    ni_analog: Any
+    ni_relay: Any
+    ctrl_axes: Any
+    polarization_settle_s: float = 1.0
+    dut_settle_s: float = 0.05
+    simulated: bool = False
+    overlap_io: bool = False
+    polarization_relay: Optional[Dict[str, int]] = None
+    router: Optional[RelayRouter] = None
+
+    def safe_state(self) -> None:
+        """Turns RF off and opens all relays."""
+        self.generator.safe_state()
+        if self.router is not None:
+            self.router.safe_state()
+        else:
+            self.ni_relay.safe_state()
+
+    def close(self) -> None:
+        """Leaves the bench in a safe state and closes the instrument sessions."""
+        try:
+            self.safe_state()
+        finally:
+            self.generator.close()
+
+
+def _read_config(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError as e:
+        _LOGGER.warning(f"Invalid bench configuration {path}: {e}. Using defaults.")
+        return {}
+
+
+def load_bench_config(path: Path) -> Dict[str, Any]:
+    """
+    Reads bench_config.json, filling in defaults for missing keys.
+
+    The polarization relay settings (HARDWARE_BENCH_KEYS) edited with the rest of
+    the hardware configuration are taken from hardware_config.json in the same
+    directory and override bench_config.json.
+    """
+    config = dict(DEFAULT_BENCH_CONFIG)
+    config.update(_read_config(path))
+    hardware = _read_config(path.parent / HARDWARE_CONFIG_FILE)
+    config.update({key: hardware[key] for key in HARDWARE_BENCH_KEYS if hardware.get(key) is not None})
+    return config
+
+
+def polarization_relay_lines(config: Dict[str, Any]) -> Optional[Dict[str, int]]:
+    """
+    Validates the relay line of every polarization.
+
+    Raises:
+        ValueError: If a polarization has no line, a line is outside the relay
+            module or both polarizations share a line.
+    """
+    lines = config.get("polarization_relay")
+    if not lines:
+        return None
+    try:
+        lines = {polarization: int(lines[polarization]) for polarization in POLARIZATIONS}
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"polarization_relay must give a relay line for {' and '.join(POLARIZATIONS)}: {lines}")
+    if any(not 0 <= line < RELAY_LINES for line in lines.values()) or len(set(lines.values())) != len(lines):
+        raise ValueError(f"polarization_relay needs distinct lines 0-{RELAY_LINES - 1}: {lines}")
+    return lines
+
+
+def relay_router(relay: Any, config: Dict[str, Any], polarization_relay: Optional[Dict[str, int]],
+                 relay_settle_s: float) -> Optional[RelayRouter]:
+    """
+    Builds the router of the configured relay routes and the polarization ports.
+
+    Raises:
+        ValueError: If a route is invalid or shares relay lines with another group.
+    """
+    definitions = dict(config.get("relay_routes") or {})
+    for polarization, line in (polarization_relay or {}).items():
+        definitions[POLARIZATION_ROUTES[polarization]] = {
+            "lines": [line], "group": POLARIZATION_GROUP, "break_before_make": True, "settle_s": relay_settle_s}
+    routes = parse_routes(definitions)
+    return RelayRouter(relay, routes) if routes else None
+
+
+def create_simulated_bench(latency_profile: str = "instant", chamber: Optional[SimulatedChamber] = None,
+                           overlap_io: bool = False, deferred_errors: bool = True,
+                           polarization_relay: Optional[Dict[str, int]] = None,
+                           relay_routes: Optional[Dict[str, Dict[str, Any]]] = None) -> Bench:
+    """Builds a bench of simulated instruments sharing one chamber model."""
+    chamber = chamber or SimulatedChamber(profile=LATENCY_PROFILES[latency_profile])
+    ni_relay = SimulatedRelay(chamber, polarization_lines=polarization_relay)
+    return Bench(
+        generator=SimulatedGenerator(chamber, deferred_errors),
+        ni_analog=SimulatedAnalogInput(chamber),
+        ni_relay=ni_relay,
+        ctrl_axes=SimulatedCtrlAxes(chamber),
+        polarization_settle_s=0.0,
+        dut_settle_s=0.0,
+        simulated=True,
+        overlap_io=overlap_io,
+        polarization_relay=polarization_relay,
+        router=relay_router(ni_relay, {"relay_routes": relay_routes}, polarization_relay, 0.0),
+    )
+
+
+def open_bench(config: Dict[str, Any]) -> Bench:
+    """
+    Opens the instruments described by the bench configuration.
+
+    Args:
+        config: The bench configuration (see DEFAULT_BENCH_CONFIG).
+
+    Returns:
+        A simulated bench if ``simulated`` is set, otherwise the hardware drivers.
+    """
+    polarization_relay = polarization_relay_lines(config)
+    if config.get("simulated", True):
+        _LOGGER.info(f"Opening simulated bench (latency profile: {config.get('latency_profile')}).")
+        return create_simulated_bench(config.get("latency_profile", "instant"),
+                                      overlap_io=bool(config.get("overlap_io", False)),
+                                      deferred_errors=bool(config.get("deferred_error_check", True)),
+                                      polarization_relay=polarization_relay,
+                                      relay_routes=config.get("relay_routes"))
+
+    # Hardware drivers are imported only when a physical bench is used.
+    from drivers.visa_sessions import VISA_SESSIONS
+    from drivers.ni.do_9485 import NI9485Handler
+    from drivers.ni.usb_6361 import NIUSB6361Handler
+    from drivers.ui.ctrl_axes import CtrlAxesDriver
+
+    _LOGGER.info(f"Opening hardware bench (generator: {config['generator_address']}).")
+    # The generator session is pooled: it stays open between runs and reconnects by itself.
+    generator = VISA_SESSIONS.get(config["generator_address"])
+    generator.set_error_checking(deferred=bool(config.get("deferred_error_check", True)))
+    ni_relay = NI9485Handler(config["ni_relay_device_id"])
+    router = relay_router(ni_relay, config, polarization_relay, float(config.get("relay_settle_s", 0.005)))
+    ctrl_axes = CtrlAxesDriver()
+    ctrl_axes.start_or_attach(app_name=config["ctrl_axes_title"], app_exe=config["ctrl_axes_exe"])
+    return Bench(
+        generator=generator,
+        ni_analog=NIUSB6361Handler(config["ni_analog_device_id"]),
+        ni_relay=ni_relay,
+        ctrl_axes=ctrl_axes,
+        polarization_settle_s=float(config.get("polarization_settle_s", 1.0)),
+        dut_settle_s=float(config.get("dut_settle_s", 0.05)),
+        overlap_io=bool(config.get("overlap_io", False)),
+        polarization_relay=polarization_relay,
+        router=router,
+    )
@@ -0,0 +1,195 @@
+"""
+Headless throughput benchmark of the sweep engine on simulated instruments.
+
+Runs campaigns equivalent to ``tests/emc_bench/scenarios/test_sensitivity_sweep.py``
+against the simulated SMB100A, NI cards and CtrlAxes with a chosen latency profile
+and reports points/hour and the driver operations spent per point.
+
+Usage::
+
+    python -m measurement.benchmark --profile demo
+    python -m measurement.benchmark --update-baselines
+"""
+import argparse
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from drivers.instrumentation import METRICS
+from measurement.bench import create_simulated_bench
+from measurement.engine import SweepEngine
+from measurement.planner import OperationCosts, build_plan
+
+_LOGGER = logging.getLogger(__name__)
+
+BASELINES_PATH = Path(__file__).resolve().parent.parent / "tests" / "benchmark" / "baselines.json"
+
+# Throughput may drop this much below the baseline before it counts as a regression.
+THROUGHPUT_TOLERANCE = 0.3
+# Operation counts are deterministic on the simulator; only rounding noise is tolerated.
+COUNT_TOLERANCE = 0.02
+
+ANGLES = list(range(0, 360, 30))
+
+
+def _sheet(sheet: int, frequency_hz: float, start_dbm: float, threshold_v: float, channel: int) -> Dict[str, Any]:
+    return {
+        "sheet": sheet,
+        "id": sheet,
+        "test_params": {"frequency_hz": frequency_hz, "angles": ANGLES, "polarizations": ["V", "H"]},
+        "hardware_config": {"analog_channel": channel, "voltage_threshold_v": threshold_v},
+        "runtime_params": {"start_power_dbm": start_dbm, "end_power_dbm": 10, "power_step_db": 1,
+                           "silent_search_reduction_db": 5},
+    }
+
+
+SCENARIOS: Dict[str, List[Dict[str, Any]]] = {
+    # Same sweep as the bench scenario test_sensitivity_sweep.
+    "sensitivity_sweep": [_sheet(1, 869.8e6, -80.0, 2.5, 0)],
+    # Three-band campaign shaped like config/we_config.json.
+    "campaign": [
+        _sheet(1, 426.0625e6, -50.0, 4.5, 3),
+        _sheet(2, 433.42e6, -50.0, 4.5, 3),
+        _sheet(3, 868.95e6, -50.0, 4.5, 3),
+    ],
+}
+
+
+@dataclass
+class BenchmarkResult:
+    """Throughput and per-point driver operations of one benchmark run."""
+
+    scenario: str
+    profile: str
+    points: int
+    wall_s: float
+    points_per_hour: float
+    scpi_per_point: float
+    daq_per_point: float
+    uia_per_point: float
+    relay_per_point: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.scenario}/{self.profile}"
+
+
+def run_benchmark(scenario: str, profile: str = "instant") -> BenchmarkResult:
+    """
+    Runs one scenario on a fresh simulated bench.
+
+    Args:
+        scenario: Name from SCENARIOS.
+        profile: Latency profile of the simulated instruments.
+
+    Returns:
+        The benchmark result.
+    """
+    we_config = SCENARIOS[scenario]
+    bench = create_simulated_bench(profile)
+    plan = build_plan(we_config, OperationCosts())
+    engine = SweepEngine(bench, we_config)
+
+    METRICS.start_run(f"benchmark-{scenario}-{profile}")
+    start = time.perf_counter()
+    points = sum(1 for _ in engine.run(plan))
+    wall_s = time.perf_counter() - start
+    METRICS.end_run()
+    bench.close()
+
+    def per_point(*names: str) -> float:
+        return round(sum(METRICS.count(name) for name in names) / points, 2) if points else 0.0
+
+    return BenchmarkResult(
+        scenario=scenario,
+        profile=profile,
+        points=points,
+        wall_s=round(wall_s, 3),
+        points_per_hour=round(points * 3600 / wall_s, 1) if wall_s > 0 else 0.0,
+        scpi_per_point=per_point("scpi.write", "scpi.query"),
+        daq_per_point=per_point("daq.read_analog_input"),
+        uia_per_point=per_point("uia.lookup"),
+        relay_per_point=per_point("relay.write"),
+    )
+
+
+def load_baselines(path: Path = BASELINES_PATH) -> Dict[str, Dict[str, Any]]:
+    """Reads the stored baselines keyed by ``scenario/profile``."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(results: List[BenchmarkResult], path: Path = BASELINES_PATH) -> None:
+    """Stores the results as the new baselines, keeping baselines of other runs."""
+    baselines = load_baselines(path)
+    for result in results:
+        baselines[result.key] = asdict(result)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def find_regressions(result: BenchmarkResult, baseline: Optional[Dict[str, Any]]) -> List[str]:
+    """
+    Compares a result with its baseline.
+
+    On the "instant" profile the operation counts per point are deterministic, so
+    they are checked there; its throughput only measures the CPU of the machine and
+    is not checked. On profiles with simulated latency the throughput is checked,
+    while the counts vary with the number of position polls and are not.
+
+    Returns:
+        A description of every regression, empty if there is none.
+    """
+    if not baseline:
+        return []
+    regressions = []
+    if result.profile == "instant":
+        for name in ("scpi_per_point", "daq_per_point", "uia_per_point", "relay_per_point"):
+            if getattr(result, name) > baseline[name] * (1 + COUNT_TOLERANCE):
+                regressions.append(f"{result.key}: {name} {getattr(result, name)} > baseline {baseline[name]}")
+    elif result.points_per_hour < baseline["points_per_hour"] * (1 - THROUGHPUT_TOLERANCE):
+        regressions.append(
+            f"{result.key}: points_per_hour {result.points_per_hour} < baseline {baseline['points_per_hour']}"
+        )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Sweep throughput benchmark on simulated instruments.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append",
+                        help="Scenario to run (repeatable). Default: all.")
+    parser.add_argument("--profile", action="append", help="Latency profile (repeatable). Default: instant and demo.")
+    parser.add_argument("--update-baselines", action="store_true", help="Store the results as the new baselines.")
+    args = parser.parse_args(argv)
+
+    baselines = load_baselines()
+    results, regressions = [], []
+    for scenario in args.scenario or sorted(SCENARIOS):
+        for profile in args.profile or ["instant", "demo"]:
+            result = run_benchmark(scenario, profile)
+            results.append(result)
+            regressions += find_regressions(result, baselines.get(result.key))
+            print(
+                f"{result.key:32} {result.points:4d} pts {result.wall_s:8.2f} s {result.points_per_hour:10.1f} pts/h "
+                f"SCPI/pt {result.scpi_per_point:6.2f} DAQ/pt {result.daq_per_point:6.2f} "
+                f"UIA/pt {result.uia_per_point:5.2f} relay/pt {result.relay_per_point:4.2f}"
+            )
+
+    if args.update_baselines:
+        save_baselines(results)
+        print(f"Baselines saved to {BASELINES_PATH}")
+        return 0
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
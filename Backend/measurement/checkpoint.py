@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import time
+import logging
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from measurement.engine import SearchResult
+from measurement.planner import MeasurementPoint
+
+_LOGGER = logging.getLogger(__name__)
+
+PointKey = Tuple[int, int, str]
+
+
+def point_key(point: MeasurementPoint) -> PointKey:
+    """Identifies a point by its sheet index, angle and polarization."""
+    return point.sheet_index, point.angle, point.polarization
+
+
+def config_fingerprint(we_config: List[Dict[str, Any]]) -> str:
+    """Hash of the campaign configuration; a checkpoint is valid only for the same campaign."""
+    return hashlib.sha256(json.dumps(we_config, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CheckpointRecord:
+    """A completed measurement point as stored in the journal."""
+
+    sheet_index: int
+    sheet: Any
+    config_id: Any
+    angle: int
+    polarization: str
+    frequency_hz: float
+    activation_dbm: Optional[float]
+    stop_dbm: Optional[float]
+    steps: int
+    duration_s: float
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def key(self) -> PointKey:
+        return self.sheet_index, self.angle, self.polarization
+
+    def to_result(self) -> SearchResult:
+        return SearchResult(self.activation_dbm, self.stop_dbm, self.steps)
+
+
+@dataclass
+class CheckpointState:
+    """Content of a checkpoint journal."""
+
+    fingerprint: str = ""
+    order: str = ""
+    started_at: float = 0.0
+    completed: bool = False
+    records: Dict[PointKey, CheckpointRecord] = field(default_factory=dict)
+
+    @property
+    def saved_s(self) -> float:
+        """Bench time already spent on the recorded points, i.e. not repeated by a resume."""
+        return sum(record.duration_s for record in self.records.values())
+
+    @property
+    def last(self) -> Optional[CheckpointRecord]:
+        return max(self.records.values(), key=lambda r: r.timestamp, default=None)
+
+
+class CampaignCheckpoint:
+    """
+    Append-only journal of the completed points of a campaign.
+
+    Every completed (sheet, angle, polarization) point is appended as one JSON line and
+    flushed to disk, so a run that dies mid-campaign (VISA timeout, UIA failure, power
+    loss) loses at most the point in progress. A truncated last line is ignored on load
+    and cut off before a resume appends to the journal again.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def start(self, we_config: List[Dict[str, Any]], order: str) -> None:
+        """Starts a new journal for the campaign, discarding any previous one."""
+        header = {"type": "campaign", "fingerprint": config_fingerprint(we_config), "order": order,
+                  "started_at": time.time()}
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record(self, point: MeasurementPoint, result: SearchResult, duration_s: float) -> None:
+        """Appends a completed point to the journal."""
+        record = CheckpointRecord(
+            point.sheet_index, point.sheet, point.config_id, point.angle, point.polarization, point.frequency_hz,
+            result.activation_dbm, result.stop_dbm, result.steps, duration_s,
+        )
+        self._append({"type": "point", **asdict(record)})
+
+    def complete(self) -> None:
+        """Marks the campaign as finished; a completed campaign cannot be resumed."""
+        self._append({"type": "complete", "timestamp": time.time()})
+
+    def load(self) -> CheckpointState:
+        """Reads the journal. Returns an empty state if there is none."""
+        state = CheckpointState()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return state
+
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                _LOGGER.warning(f"Ignoring truncated checkpoint line in {self.path}.")
+                continue
+            kind = entry.pop("type", None)
+            if kind == "campaign":
+                state.fingerprint = entry["fingerprint"]
+                state.order = entry.get("order", "")
+                state.started_at = entry.get("started_at", 0.0)
+            elif kind == "point":
+                record = CheckpointRecord(**entry)
+                state.records[record.key] = record
+            elif kind == "complete":
+                state.completed = True
+        return state
+
+    def load_for(self, we_config: List[Dict[str, Any]]) -> CheckpointState:
+        """
+        Reads the journal of an interrupted run of this campaign.
+
+        Raises:
+            ValueError: If there is no journal, the campaign was completed or the
+                configuration changed since the journal was started.
+        """
+        self._drop_torn_tail()
+        state = self.load()
+        if not state.fingerprint:
+            raise ValueError("Brak punktu kontrolnego do wznowienia.")
+        if state.completed:
+            raise ValueError("Ostatnia kampania została zakończona - nie ma czego wznawiać.")
+        if state.fingerprint != config_fingerprint(we_config):
+            raise ValueError("Konfiguracja we_config.json zmieniła się od przerwanego testu.")
+        return state
+
+    def _drop_torn_tail(self) -> None:
+        """Truncates the journal after its last complete line, so the next record starts on a new line."""
+        try:
+            with open(self.path, "rb+") as f:
+                data = f.read()
+                if not data or data.endswith(b"\n"):
+                    return
+                _LOGGER.warning(f"Removing truncated last line of {self.path}.")
+                f.truncate(data.rfind(b"\n") + 1)
+                f.flush()
+                os.fsync(f.fileno())
+        except FileNotFoundError:
+            pass
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
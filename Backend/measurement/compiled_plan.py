@@ -0,0 +1,260 @@
+import json
+import logging
+import os
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from drivers.test_calculation.calibration import Calibration, SheetCalibration, calibration_signature, load_calibration
+from measurement.checkpoint import config_fingerprint
+from measurement.engine import RampSettings
+from measurement.planner import (ANGLE_MAJOR, PLANNER_VERSION, SHEET_MAJOR, CampaignPlan, MeasurementPoint,
+                                 OperationCosts, build_plan, estimate_runtime)
+
+_LOGGER = logging.getLogger(__name__)
+
+WE_CONFIG_FILE = "we_config.json"
+COMPILED_PLAN_FILE = "we_config.plan.pickle"
+# Bumped whenever the layout of the compiled classes changes; older files are recompiled.
+COMPILED_FORMAT = 2
+# Stored with the campaign: a file written by another format or planner is recompiled.
+COMPILED_VERSION = (COMPILED_FORMAT, PLANNER_VERSION)
+POLARIZATIONS = ("V", "H")
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSheet:
+    """
+    A validated sheet of the campaign with its defaults resolved.
+
+    Attributes:
+        index: Position of the sheet in we_config.json.
+        sheet: Sheet identifier.
+        config_id: Configuration identifier.
+        antenna: Antenna name.
+        dut_serial: Serial number of the DUT, if given.
+        frequency_hz: Test frequency.
+        frequency_mhz: Test frequency in MHz, as stored in result.json.
+        distance_m: Antenna to DUT distance.
+        angles: Turntable angles in the configured order.
+        polarizations: Polarizations in the configured order.
+        calibration: Calibration constants of the sheet.
+        ramp: Ramp of the threshold search.
+        abort_on_fail: Skip the remaining points once the sheet fails its limit.
+        routes: Relay routes switched before the sheet's points (``test_params.routes``).
+        concurrent: The DUT shares the chamber with the other ``concurrent_duts`` sheets.
+    """
+
+    index: int
+    sheet: Any
+    config_id: Any
+    antenna: str
+    dut_serial: Optional[str]
+    frequency_hz: float
+    frequency_mhz: float
+    distance_m: float
+    angles: Tuple[int, ...]
+    polarizations: Tuple[str, ...]
+    calibration: SheetCalibration
+    ramp: RampSettings
+    abort_on_fail: bool
+    routes: Tuple[str, ...] = ()
+    concurrent: bool = False
+
+    @property
+    def key(self) -> Tuple[Any, Any]:
+        return self.sheet, self.config_id
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledCampaign:
+    """
+    A campaign validated and compiled once, when we_config.json is saved.
+
+    Holds the resolved sheets and the ordered points of every campaign order, so a
+    run only estimates the plan with the current operation costs.
+
+    Attributes:
+        fingerprint: Hash of the source configuration (see ``config_fingerprint``).
+        calibration_signature: The calibration tables the constants were computed from.
+        we_config: The source configuration, for the checkpoint and result files.
+        sheets: The compiled sheets, indexed like we_config.
+        orders: Ordered points and sheet groups of every campaign order.
+    """
+
+    fingerprint: str
+    calibration_signature: Tuple
+    we_config: List[Dict[str, Any]]
+    sheets: Tuple[CompiledSheet, ...]
+    orders: Dict[str, Tuple[Tuple[MeasurementPoint, ...], List[List[Any]]]]
+
+    @property
+    def ramps(self) -> List[Tuple[SheetCalibration, RampSettings]]:
+        """The calibration and ramp of every sheet, as returned by ``sheet_ramps``."""
+        return [(sheet.calibration, sheet.ramp) for sheet in self.sheets]
+
+    def plan(self, costs: OperationCosts, order: str = ANGLE_MAJOR) -> CampaignPlan:
+        """Returns the plan of the given order with its estimate for the current costs."""
+        if order not in self.orders:
+            raise ValueError(f"Unknown campaign order '{order}'. Use '{ANGLE_MAJOR}' or '{SHEET_MAJOR}'.")
+        points, groups = self.orders[order]
+        naive_estimate = estimate_runtime(self.orders[SHEET_MAJOR][0], costs)
+        estimate = naive_estimate if order == SHEET_MAJOR else estimate_runtime(points, costs)
+        return CampaignPlan(order, list(points), groups, estimate, naive_estimate)
+
+    def result_skeleton(self) -> List[Dict[str, Any]]:
+        """The empty result.json of the campaign."""
+        return [
+            {"sheet": s.sheet, "id": s.config_id, "antenna": s.antenna, "frequency_mhz": s.frequency_mhz, "result": []}
+            for s in self.sheets
+        ]
+
+
+def _number(value: Any, name: str, sheet: Any) -> float:
+    if isinstance(value, bool):
+        raise ValueError(f"Sheet {sheet}: {name} must be a number, got {value!r}.")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Sheet {sheet}: {name} must be a number, got {value!r}.") from None
+
+
+def compile_sheet(index: int, config_item: Dict[str, Any], calibration: Calibration) -> CompiledSheet:
+    """
+    Validates one sheet and resolves its defaults.
+
+    Raises:
+        ValueError: If a value is missing or out of range.
+    """
+    if not isinstance(config_item, dict):
+        raise ValueError(f"Sheet #{index + 1}: expected an object, got {type(config_item).__name__}.")
+    sheet = config_item.get("sheet")
+    params = config_item.get("test_params") or {}
+    label = sheet if sheet is not None else f"#{index + 1}"
+    frequency_hz = _number(params.get("frequency_hz", 0), "frequency_hz", label)
+    if frequency_hz < 0:
+        raise ValueError(f"Sheet {label}: frequency_hz must not be negative.")
+    distance = _number(params.get("distance", 3.0), "distance", label)
+    if distance <= 0:
+        raise ValueError(f"Sheet {label}: distance must be positive.")
+    angles = tuple(int(_number(a, "angle", label)) for a in params.get("angles", []))
+    polarizations = tuple(params.get("polarizations", []))
+    unknown = [p for p in polarizations if p not in POLARIZATIONS]
+    if unknown:
+        raise ValueError(f"Sheet {label}: unknown polarizations {unknown}; use {list(POLARIZATIONS)}.")
+    # Names of the relay routes the sheet selects; the routes are defined in hardware_config.relay_routes.
+    routes = params.get("routes", [])
+    if not isinstance(routes, list) or not all(isinstance(name, str) for name in routes):
+        raise ValueError(f"Sheet {label}: routes must be a list of relay route names, got {routes!r}.")
+
+    sheet_calibration = calibration.for_sheet(params)
+    try:
+        ramp = RampSettings.from_config(config_item, sheet_calibration)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Sheet {label}: {e}") from None
+    if ramp.step_db <= 0:
+        raise ValueError(f"Sheet {label}: the power step must be positive.")
+    if ramp.end_dbm < ramp.start_dbm:
+        raise ValueError(f"Sheet {label}: the ramp ends ({ramp.end_dbm}) below its start ({ramp.start_dbm}).")
+
+    runtime = config_item.get("runtime_params") or {}
+    return CompiledSheet(
+        index=index,
+        sheet=sheet,
+        config_id=config_item.get("id"),
+        antenna=config_item.get("antenna", ""),
+        dut_serial=config_item.get("dut_serial"),
+        frequency_hz=frequency_hz,
+        frequency_mhz=frequency_hz / 1e6,
+        distance_m=distance,
+        angles=angles,
+        polarizations=polarizations,
+        calibration=sheet_calibration,
+        ramp=ramp,
+        abort_on_fail=bool(runtime.get("abort_sheet_on_fail", False)),
+        routes=tuple(routes),
+        concurrent=bool((config_item.get("hardware_config") or {}).get("concurrent_duts")),
+    )
+
+
+def compile_campaign(we_config: List[Dict[str, Any]], calibration: Optional[Calibration] = None,
+                     signature: Tuple = ()) -> CompiledCampaign:
+    """
+    Validates the campaign and precomputes everything a run needs from it.
+
+    Args:
+        we_config: The merged campaign configuration.
+        calibration: The calibration tables; sheet scalars only when None.
+        signature: ``calibration_signature`` of the tables, stored to detect changes.
+
+    Returns:
+        The compiled campaign.
+
+    Raises:
+        ValueError: If the configuration is not a valid campaign.
+    """
+    if not isinstance(we_config, list):
+        raise ValueError("The campaign configuration must be a list of sheets.")
+    calibration = calibration or Calibration()
+    sheets = tuple(compile_sheet(index, item, calibration) for index, item in enumerate(we_config))
+    orders = {}
+    for order in (ANGLE_MAJOR, SHEET_MAJOR):
+        plan = build_plan(we_config, OperationCosts(), order)
+        orders[order] = (tuple(plan.points), plan.groups)
+    return CompiledCampaign(config_fingerprint(we_config), signature, we_config, sheets, orders)
+
+
+def _source_stamp(config_dir: Path) -> Tuple[int, int]:
+    stat = os.stat(config_dir / WE_CONFIG_FILE)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def save_compiled_campaign(config_dir: Path, campaign: CompiledCampaign) -> None:
+    """
+    Stores the compiled campaign next to we_config.json, which must already be written.
+
+    The file is tied to the modification time and size of we_config.json, so an
+    edit of the JSON by hand makes it stale, and to ``COMPILED_VERSION``, so stored
+    point orders are rebuilt after a change of the planner.
+    """
+    path = config_dir / COMPILED_PLAN_FILE
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump((COMPILED_VERSION, _source_stamp(config_dir), campaign), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def load_compiled_campaign(config_dir: Path) -> CompiledCampaign:
+    """
+    Returns the compiled campaign of ``config_dir/we_config.json``.
+
+    The stored compilation is used when it matches the current we_config.json and
+    calibration tables; otherwise the campaign is compiled again and stored.
+
+    Raises:
+        OSError: If we_config.json cannot be read.
+        json.JSONDecodeError: If we_config.json is not valid JSON.
+        ValueError: If the configuration is not a valid campaign.
+    """
+    calibration = load_calibration(config_dir)
+    signature = calibration_signature(config_dir)
+    stamp = _source_stamp(config_dir)
+    try:
+        with open(config_dir / COMPILED_PLAN_FILE, "rb") as f:
+            version, stored_stamp, campaign = pickle.load(f)
+        if version == COMPILED_VERSION and stored_stamp == stamp and campaign.calibration_signature == signature:
+            return campaign
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        _LOGGER.warning(f"Ignoring compiled campaign in {config_dir}: {e}")
+
+    with open(config_dir / WE_CONFIG_FILE, "r", encoding="utf-8") as f:
+        we_config = json.load(f)
+    campaign = compile_campaign(we_config, calibration, signature)
+    try:
+        save_compiled_campaign(config_dir, campaign)
+    except OSError as e:
+        _LOGGER.warning(f"Could not store the compiled campaign: {e}")
+    return campaign
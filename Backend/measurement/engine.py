@@ -0,0 +1,622 @@
+import asyncio
+import time
+import logging
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Callable, Collection, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from drivers.async_instrument import AsyncSMB100A
+from drivers.instrumentation import timed
+from drivers.test_calculation.calibration import Calibration, SheetCalibration
+from measurement.bench import POLARIZATION_ROUTES, Bench
+from measurement.planner import CampaignPlan, MeasurementPoint, OperationCosts
+
+if TYPE_CHECKING:
+    from measurement.compiled_plan import CompiledSheet
+    from measurement.predictor import ThresholdPredictor
+    from measurement.trace import TraceWriter
+
+_LOGGER = logging.getLogger(__name__)
+
+POSITION_TOLERANCE_DEG = 0.01
+POSITION_POLL_S = 0.5
+MOVE_TIMEOUT_S = 240
+# Generator power held between points, while the turntable and the mast move.
+PARK_POWER_DBM = -120.0
+# Units of the ramp: generator power, or field strength at the DUT.
+DBM = "dBm"
+FIELD = "dBuV/m"
+
+
+@dataclass(frozen=True)
+class RampSettings:
+    """
+    Parameters of the power ramp searching for the DUT threshold.
+
+    The levels are in ``unit``: generator power (dBm), or field strength at the DUT
+    (dBµV/m), which the engine converts to generator power with the sheet calibration.
+
+    Attributes:
+        start_dbm: First level of the ramp.
+        end_dbm: Last level of the ramp.
+        step_db: Level increment.
+        threshold_v: DUT output voltage considered as activation.
+        stop_search_db: How far below the activation level the stop level is searched.
+        analog_channel: AI channel of the DUT output.
+        unit: DBM or FIELD.
+        predict: Start the ramp below the level predicted from the points already measured.
+        prediction_margin_db: How far below the predicted level the ramp starts.
+    """
+
+    start_dbm: float = -50.0
+    end_dbm: float = 10.0
+    step_db: float = 1.0
+    threshold_v: float = 4.5
+    stop_search_db: float = 5.0
+    analog_channel: int = 3
+    unit: str = DBM
+    predict: bool = False
+    prediction_margin_db: float = 3.0
+
+    @classmethod
+    def from_config(cls, config_item: Dict[str, Any], calibration: Optional[SheetCalibration] = None) -> "RampSettings":
+        """
+        Builds the ramp from the runtime_params and hardware_config of a sheet.
+
+        With ``sweep_unit`` set to dBuV/m in runtime_params the ramp is read from
+        ``start_field_dbuvm``, ``end_field_dbuvm`` and ``field_step_db``. The ramp never
+        goes above the hardware ``safe_stop_power_dbm`` (converted to field strength
+        in field mode), even if the configured end level is higher.
+
+        Raises:
+            ValueError: If a field-strength ramp has no complete sheet calibration.
+        """
+        runtime = config_item.get("runtime_params", {})
+        hardware = config_item.get("hardware_config", {})
+        unit = runtime.get("sweep_unit", DBM)
+        safe_stop = hardware.get("safe_stop_power_dbm")
+        if unit == FIELD:
+            if calibration is None or not calibration.complete:
+                raise ValueError(f"Sheet {config_item.get('sheet')}: field-strength ramp needs a complete calibration.")
+            start = float(runtime["start_field_dbuvm"])
+            end = float(runtime["end_field_dbuvm"])
+            step = float(runtime.get("field_step_db", runtime.get("power_step_db", cls.step_db)))
+            if safe_stop is not None:
+                end = min(end, calibration.field_strength(float(safe_stop))[0])
+        elif unit == DBM:
+            start = float(runtime.get("start_power_dbm", cls.start_dbm))
+            end = float(runtime.get("end_power_dbm", cls.end_dbm))
+            step = float(runtime.get("power_step_db", cls.step_db))
+            if safe_stop is not None:
+                end = min(end, float(safe_stop))
+        else:
+            raise ValueError(f"Unknown sweep unit {unit!r}.")
+        return cls(
+            start_dbm=start,
+            end_dbm=end,
+            step_db=step,
+            threshold_v=float(hardware.get("voltage_threshold_v", cls.threshold_v)),
+            stop_search_db=float(runtime.get("silent_search_reduction_db", cls.stop_search_db)),
+            analog_channel=int(hardware.get("analog_channel", cls.analog_channel)),
+            unit=unit,
+            predict=bool(runtime.get("predictive_start", cls.predict)),
+            prediction_margin_db=float(runtime.get("prediction_margin_db", cls.prediction_margin_db)),
+        )
+
+
+@dataclass
+class SearchResult:
+    """
+    Outcome of one threshold search.
+
+    ``search_threshold`` reports the levels in the unit of the ramp; the engine
+    always reports generator power and, for a field-strength ramp, the field levels.
+
+    Attributes:
+        activation_dbm: Lowest ramp level at which the DUT activated, None if it never did.
+        stop_dbm: Level below the activation at which the DUT went silent again,
+            None if it stayed active within the searched window.
+        steps: Number of generator power settings.
+        activation_field: Field strength (dBµV/m) of the activation in field mode.
+        stop_field: Field strength (dBµV/m) of the stop level in field mode.
+    """
+
+    activation_dbm: Optional[float] = None
+    stop_dbm: Optional[float] = None
+    steps: int = 0
+    activation_field: Optional[float] = None
+    stop_field: Optional[float] = None
+
+
+def search_threshold(
+    set_power: Callable[[float], None],
+    read_voltage: Callable[[], float],
+    ramp: RampSettings,
+) -> SearchResult:
+    """
+    Ramps the generator up until the DUT activates, then down until it goes silent.
+
+    Powers are computed from the step index (not accumulated), so the ramp lands on
+    exact multiples of the step. The search takes callables, so it can be fed by the
+    instruments as well as by recorded data.
+
+    Args:
+        set_power: Sets the generator power in dBm.
+        read_voltage: Reads the DUT output voltage.
+        ramp: The ramp parameters.
+
+    Returns:
+        The search result.
+    """
+    result = SearchResult()
+    n_up = int(round((ramp.end_dbm - ramp.start_dbm) / ramp.step_db))
+    for i in range(n_up + 1):
+        power = round(ramp.start_dbm + i * ramp.step_db, 2)
+        set_power(power)
+        result.steps += 1
+        if read_voltage() >= ramp.threshold_v:
+            result.activation_dbm = power
+            break
+
+    if result.activation_dbm is None:
+        return result
+
+    n_down = int(round(ramp.stop_search_db / ramp.step_db))
+    for i in range(1, n_down + 1):
+        power = round(result.activation_dbm - i * ramp.step_db, 2)
+        set_power(power)
+        result.steps += 1
+        if read_voltage() < ramp.threshold_v:
+            result.stop_dbm = power
+            break
+    return result
+
+
+def search_thresholds(
+    set_power: Callable[[float], None],
+    read_voltages: Callable[[], List[float]],
+    ramps: List[RampSettings],
+) -> List[SearchResult]:
+    """
+    Searches the thresholds of several DUTs with one shared power ramp.
+
+    Every generator step is followed by one scan of all DUT outputs. The ramp goes
+    up until every DUT has activated (or the end level), then down from the highest
+    activation; each DUT looks for its stop level in its own window below its
+    activation, as ``search_threshold`` does. The ramps must have the same levels;
+    channels and thresholds may differ.
+
+    Args:
+        set_power: Sets the generator power in dBm.
+        read_voltages: Reads the outputs of all DUTs, in the order of ``ramps``.
+        ramps: The ramp of every DUT.
+
+    Returns:
+        The result of every DUT; ``steps`` counts the shared steps.
+    """
+    ramp = ramps[0]
+    results = [SearchResult() for _ in ramps]
+    steps = 0
+    n_up = int(round((ramp.end_dbm - ramp.start_dbm) / ramp.step_db))
+    for i in range(n_up + 1):
+        power = round(ramp.start_dbm + i * ramp.step_db, 2)
+        set_power(power)
+        steps += 1
+        for result, dut_ramp, voltage in zip(results, ramps, read_voltages()):
+            if result.activation_dbm is None and voltage >= dut_ramp.threshold_v:
+                result.activation_dbm = power
+        if all(result.activation_dbm is not None for result in results):
+            break
+
+    n_down = int(round(ramp.stop_search_db / ramp.step_db))
+    pending = [index for index, result in enumerate(results) if result.activation_dbm is not None] if n_down else []
+    top = max((results[index].activation_dbm for index in pending), default=None)
+    k = 1
+    while pending:
+        power = round(top - k * ramp.step_db, 2)
+        set_power(power)
+        steps += 1
+        voltages = read_voltages()
+        for index in list(pending):
+            # Steps below this DUT's activation; its window is steps 1..n_down.
+            below = int(round((results[index].activation_dbm - power) / ramp.step_db))
+            if below >= 1 and voltages[index] < ramps[index].threshold_v:
+                results[index].stop_dbm = power
+            if results[index].stop_dbm is not None or below >= n_down:
+                pending.remove(index)
+        k += 1
+    for result in results:
+        result.steps = steps
+    return results
+
+
+def sheet_ramps(we_config: List[Dict[str, Any]], calibration: Optional[Calibration] = None
+                ) -> List[Tuple[SheetCalibration, RampSettings]]:
+    """
+    Returns the calibration and the ramp of every sheet.
+
+    Raises:
+        ValueError: If a field-strength ramp has no complete calibration.
+    """
+    calibration = calibration or Calibration()
+    sheets = []
+    for item in we_config:
+        sheet_calibration = calibration.for_sheet(item.get("test_params", {}))
+        sheets.append((sheet_calibration, RampSettings.from_config(item, sheet_calibration)))
+    return sheets
+
+
+class SweepEngine:
+    """
+    Executes a campaign plan on a bench, one measurement point at a time.
+
+    Generator frequency, turntable position and mast polarization are changed only
+    when the next point needs a different value, so the cost of a plan depends on its
+    order. The duration of every operation is fed back into the operation costs.
+    With a trace writer, every (power, voltage) sample of the searches is recorded.
+    With ``bench.overlap_io`` the generator is retuned on its own executor while the
+    turntable and the mast move to the next point. With ``bench.polarization_relay``
+    polarization is switched between the ports of a dual-polarized antenna by a
+    relay instead of rotating the mast; the relay routes listed in a sheet's
+    ``test_params.routes`` are switched before its points. A sheet with a field-strength ramp
+    is searched in dBµV/m, each level converted to generator power with the sheet
+    calibration. Sheets with ``hardware_config.concurrent_duts`` are DUTs in the
+    chamber at the same time: their points at one bench state share a power ramp,
+    with all DUT channels read in one scan per step (see ``search_thresholds``).
+    With a predictor, sheets with ``predict`` set start their ramp near
+    the activation level expected from the points already measured. ``sheets``
+    takes the sheets compiled with the campaign (see ``compiled_plan``); without it
+    they are compiled from ``we_config``.
+    """
+
+    def __init__(self, bench: Bench, we_config: List[Dict[str, Any]], costs: Optional[OperationCosts] = None,
+                 trace: Optional["TraceWriter"] = None, calibration: Optional[Calibration] = None,
+                 predictor: Optional["ThresholdPredictor"] = None,
+                 sheets: Optional[Sequence["CompiledSheet"]] = None):
+        self.bench = bench
+        self.we_config = we_config
+        self.costs = costs or OperationCosts()
+        self.trace = trace
+        self.predictor = predictor
+        self._point_seq = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._generator_io: Optional[AsyncSMB100A] = None
+        if sheets is None:
+            # compiled_plan builds on the ramp settings of this module.
+            from measurement.compiled_plan import compile_sheet
+            calibration = calibration or Calibration()
+            sheets = [compile_sheet(index, item, calibration) for index, item in enumerate(we_config)]
+        self._calibrations = [sheet.calibration for sheet in sheets]
+        self._ramps = [sheet.ramp for sheet in sheets]
+        self._concurrent = [sheet.concurrent for sheet in sheets]
+        self._routes = [sheet.routes for sheet in sheets]
+        known = bench.router.routes if bench.router is not None else {}
+        unknown = sorted({name for names in self._routes for name in names if name not in known})
+        if unknown:
+            raise ValueError(f"Relay routes not defined for the bench: {', '.join(unknown)}")
+        self._frequency: Optional[float] = None
+        self._angle: Optional[float] = None
+        self._polarization: Optional[str] = None
+
+    def run(self, plan: CampaignPlan, should_continue: Callable[[], bool] = lambda: True,
+            skip: Collection[Tuple[int, int, str]] = (),
+            should_measure: Callable[[MeasurementPoint], bool] = lambda point: True,
+            ) -> Iterator[Tuple[MeasurementPoint, SearchResult]]:
+        """
+        Measures the points of the plan in order.
+
+        Args:
+            plan: The campaign plan.
+            should_continue: Polled before every point; the run ends when it returns False.
+            skip: (sheet_index, angle, polarization) keys of points already measured.
+            should_measure: Polled before every point; a point for which it returns
+                False is skipped (e.g. the rest of a sheet that already failed).
+
+        Yields:
+            Each measured point with its search result.
+        """
+        points = [p for p in plan.points if (p.sheet_index, p.angle, p.polarization) not in skip]
+        generator = self.bench.generator
+        generator.set_power(PARK_POWER_DBM)
+        if skip and points:
+            self.restore_state(points[0])
+        generator.set_output_rf(True)
+        if self.bench.overlap_io:
+            self._loop = asyncio.new_event_loop()
+            self._generator_io = AsyncSMB100A(generator, "generator")
+        try:
+            index = 0
+            while index < len(points):
+                point = points[index]
+                if not should_continue():
+                    _LOGGER.info("Sweep stopped before completing the plan.")
+                    return
+                if not should_measure(point):
+                    index += 1
+                    continue
+                batch = self._concurrent_batch(points, index, should_measure)
+                index += len(batch)
+                if len(batch) == 1:
+                    yield point, self.measure_point(point)
+                else:
+                    yield from zip(batch, self.measure_concurrent(batch))
+        finally:
+            if self._loop is not None:
+                self._generator_io.close()
+                self._loop.close()
+                self._loop = self._generator_io = None
+            generator.set_output_rf(False)
+
+    @timed("sweep.point")
+    def measure_point(self, point: MeasurementPoint) -> SearchResult:
+        """Brings the bench to the point's state and runs the threshold search."""
+        ramp = self._ramps[point.sheet_index]
+        if self._loop is not None:
+            self._loop.run_until_complete(self._prepare_overlapped(point))
+        else:
+            self.tune(point.frequency_hz)
+            self._position(point)
+
+        set_power = self.bench.generator.set_power
+        calibration = self._calibrations[point.sheet_index]
+        if ramp.unit == FIELD:
+            set_power = lambda field: self.bench.generator.set_power(round(calibration.generator_power(field), 2))
+        read_voltage = lambda: self._read_dut(ramp)
+        if self.trace is not None:
+            set_power, read_voltage = self._traced(point, set_power, read_voltage)
+
+        start = time.perf_counter()
+        if self.predictor is not None and ramp.predict:
+            result = self.predictor.search(point, set_power, read_voltage, ramp)
+        else:
+            result = search_threshold(set_power, read_voltage, ramp)
+        if self.predictor is not None:
+            self.predictor.observe(point, result.activation_dbm)
+        if result.steps:
+            self.costs.observe("power_step_s", (time.perf_counter() - start) / result.steps)
+            self.costs.observe("steps_per_point", result.steps)
+        self.bench.generator.set_power(PARK_POWER_DBM)
+        # Checkpoint of the deferred error checking: a queued error invalidates the point.
+        self.bench.generator.check_errors()
+        if ramp.unit == FIELD:
+            result = self._field_result(result, calibration)
+        _LOGGER.info(
+            f"Sheet {point.sheet} {point.angle} deg {point.polarization}: "
+            f"activation {result.activation_dbm} dBm, stop {result.stop_dbm} dBm ({result.steps} steps)"
+        )
+        return result
+
+    def _concurrent_batch(self, points: List[MeasurementPoint], start: int,
+                          should_measure: Callable[[MeasurementPoint], bool]) -> List[MeasurementPoint]:
+        """
+        The point at ``start`` and the following points sharing its power ramp.
+
+        Points of sheets with ``hardware_config.concurrent_duts`` at the same
+        frequency, angle and polarization, with the same ramp levels, no predicted
+        start and distinct analog channels are DUTs measured together.
+        """
+        first = points[start]
+        if not self._concurrent[first.sheet_index] or self._ramps[first.sheet_index].predict:
+            return [first]
+        key = self._shared_ramp_key(first.sheet_index)
+        batch, channels = [first], {self._ramps[first.sheet_index].analog_channel}
+        for point in points[start + 1:]:
+            ramp = self._ramps[point.sheet_index]
+            if ((point.frequency_hz, point.angle, point.polarization)
+                    != (first.frequency_hz, first.angle, first.polarization)
+                    or not self._concurrent[point.sheet_index]
+                    or self._shared_ramp_key(point.sheet_index) != key
+                    or ramp.analog_channel in channels or not should_measure(point)):
+                break
+            batch.append(point)
+            channels.add(ramp.analog_channel)
+        return batch
+
+    def _shared_ramp_key(self, sheet_index: int) -> Tuple:
+        ramp = self._ramps[sheet_index]
+        # Field-strength levels map to the same generator power only with the same calibration.
+        calibration = self._calibrations[sheet_index] if ramp.unit == FIELD else None
+        return replace(ramp, analog_channel=0, threshold_v=0.0), calibration
+
+    @timed("sweep.point")
+    def measure_concurrent(self, points: List[MeasurementPoint]) -> List[SearchResult]:
+        """
+        Measures the DUTs of several sheets at one bench state with a shared ramp.
+
+        Returns:
+            The result of every point, in order.
+        """
+        first = points[0]
+        ramps = [self._ramps[point.sheet_index] for point in points]
+        if self._loop is not None:
+            self._loop.run_until_complete(self._prepare_overlapped(first))
+        else:
+            self.tune(first.frequency_hz)
+            self._position(first)
+        for point in points[1:]:
+            self.select_routes(point.sheet_index)
+
+        set_power = self.bench.generator.set_power
+        calibration = self._calibrations[first.sheet_index]
+        if ramps[0].unit == FIELD:
+            set_power = lambda field: self.bench.generator.set_power(round(calibration.generator_power(field), 2))
+        channels = [ramp.analog_channel for ramp in ramps]
+        read_voltages = lambda: self._read_duts(channels)
+        if self.trace is not None:
+            set_power, read_voltages = self._traced_concurrent(points, set_power, read_voltages)
+
+        start = time.perf_counter()
+        results = search_thresholds(set_power, read_voltages, ramps)
+        steps = results[0].steps
+        if steps:
+            self.costs.observe("power_step_s", (time.perf_counter() - start) / steps)
+            # Per point, so the estimate of a plan reflects the shared ramp.
+            self.costs.observe("steps_per_point", steps / len(points))
+        self.bench.generator.set_power(PARK_POWER_DBM)
+        self.bench.generator.check_errors()
+        measured = []
+        for point, ramp, result in zip(points, ramps, results):
+            if self.predictor is not None:
+                self.predictor.observe(point, result.activation_dbm)
+            if ramp.unit == FIELD:
+                result = self._field_result(result, self._calibrations[point.sheet_index])
+            _LOGGER.info(
+                f"Sheet {point.sheet} {point.angle} deg {point.polarization} (ai{ramp.analog_channel}, shared ramp): "
+                f"activation {result.activation_dbm} dBm, stop {result.stop_dbm} dBm ({result.steps} steps)"
+            )
+            measured.append(result)
+        return measured
+
+    @staticmethod
+    def _field_result(result: SearchResult, calibration: SheetCalibration) -> SearchResult:
+        """Converts the field levels of a search to the generator powers that produced them."""
+        to_dbm = lambda field: None if field is None else round(calibration.generator_power(field), 2)
+        return SearchResult(to_dbm(result.activation_dbm), to_dbm(result.stop_dbm), result.steps,
+                            result.activation_dbm, result.stop_dbm)
+
+    def _position(self, point: MeasurementPoint) -> None:
+        self.move_turntable(point.angle)
+        self.set_polarization(point.polarization)
+        self.select_routes(point.sheet_index)
+
+    async def _prepare_overlapped(self, point: MeasurementPoint) -> None:
+        """Retunes the generator on its executor while the CtrlAxes moves run in a worker thread."""
+        await asyncio.gather(
+            self._generator_io.call(self.tune, point.frequency_hz),
+            asyncio.to_thread(self._position, point),
+        )
+
+    def _traced(self, point: MeasurementPoint, set_power: Callable[[float], None],
+                read_voltage: Callable[[], float]) -> Tuple[Callable[[float], None], Callable[[], float]]:
+        """Wraps the search callables so every reading is recorded with its generator power."""
+        self._point_seq += 1
+        seq, trace, power = self._point_seq, self.trace, [PARK_POWER_DBM]
+
+        def traced_set_power(dbm: float) -> None:
+            set_power(dbm)
+            power[0] = dbm
+
+        def traced_read_voltage() -> float:
+            voltage = read_voltage()
+            trace.record(seq, point.sheet_index, point.angle, point.polarization, power[0], voltage)
+            return voltage
+
+        return traced_set_power, traced_read_voltage
+
+    def _traced_concurrent(self, points: List[MeasurementPoint], set_power: Callable[[float], None],
+                           read_voltages: Callable[[], List[float]]
+                           ) -> Tuple[Callable[[float], None], Callable[[], List[float]]]:
+        """Like ``_traced``, recording the reading of every DUT under the sequence number of its point."""
+        seqs = list(range(self._point_seq + 1, self._point_seq + 1 + len(points)))
+        self._point_seq += len(points)
+        trace, power = self.trace, [PARK_POWER_DBM]
+
+        def traced_set_power(dbm: float) -> None:
+            set_power(dbm)
+            power[0] = dbm
+
+        def traced_read_voltages() -> List[float]:
+            voltages = read_voltages()
+            for seq, point, voltage in zip(seqs, points, voltages):
+                trace.record(seq, point.sheet_index, point.angle, point.polarization, power[0], voltage)
+            return voltages
+
+        return traced_set_power, traced_read_voltages
+
+    def restore_state(self, point: MeasurementPoint) -> None:
+        """
+        Re-establishes and verifies the bench state for a resumed run.
+
+        After a crash the instruments may have been reset or moved, so the cached state
+        is dropped and frequency, turntable position and polarization are set explicitly,
+        then the generator frequency is read back.
+
+        Raises:
+            RuntimeError: If the generator does not report the requested frequency.
+        """
+        _LOGGER.info(f"Restoring bench state: {point.frequency_hz} Hz, {point.angle} deg, {point.polarization}.")
+        self._frequency = self._angle = self._polarization = None
+        self.tune(point.frequency_hz)
+        self.move_turntable(point.angle)
+        self.set_polarization(point.polarization)
+        actual = self.bench.generator.get_frequency()
+        if abs(actual - point.frequency_hz) > 0.1:
+            raise RuntimeError(f"Generator frequency mismatch after restore: {actual} Hz, expected {point.frequency_hz} Hz.")
+
+    def tune(self, frequency_hz: float) -> None:
+        if frequency_hz == self._frequency:
+            return
+        start = time.perf_counter()
+        self.bench.generator.set_frequency(frequency_hz)
+        self.costs.observe("retune_s", time.perf_counter() - start)
+        self._frequency = frequency_hz
+
+    def move_turntable(self, angle: float) -> None:
+        if angle == self._angle:
+            return
+        axes = self.bench.ctrl_axes
+        start = time.perf_counter()
+        axes.set_turntable_settings()
+        axes.set_target_position(int(angle))
+        axes.click_btn_move_target_position()
+        self._wait_for_position(axes.get_turntable_degrees, float(angle))
+        elapsed = time.perf_counter() - start
+        travel = abs(angle - (self._angle or 0.0))
+        if travel:
+            self.costs.observe("move_s_per_deg", max(0.0, elapsed - self.costs.move_overhead_s) / travel)
+        self._angle = angle
+
+    def set_polarization(self, polarization: str) -> None:
+        if polarization == self._polarization:
+            return
+        start = time.perf_counter()
+        if self.bench.polarization_relay:
+            self._switch_polarization_relay(polarization)
+        else:
+            axes = self.bench.ctrl_axes
+            axes.set_malt_settings()
+            axes.set_malt_orientation(horizontal=(polarization == "H"))
+            if self.bench.polarization_settle_s:
+                with timed("sleep.polarization_settle"):
+                    time.sleep(self.bench.polarization_settle_s)
+        self.costs.observe("polarization_s", time.perf_counter() - start)
+        self._polarization = polarization
+
+    def _switch_polarization_relay(self, polarization: str) -> None:
+        """Connects the port of a dual-polarized antenna, opening the other port first (break-before-make)."""
+        self._select_route(POLARIZATION_ROUTES[polarization])
+
+    def select_routes(self, sheet_index: int) -> None:
+        """Switches the relay routes of a sheet (``test_params.routes``) that are not selected yet."""
+        for name in self._routes[sheet_index]:
+            self._select_route(name)
+
+    def _select_route(self, name: str) -> None:
+        settle_s = self.bench.router.select(name)
+        if settle_s:
+            with timed("sleep.relay_settle"):
+                time.sleep(settle_s)
+
+    def _read_dut(self, ramp: RampSettings) -> float:
+        if self.bench.dut_settle_s:
+            with timed("sleep.dut_settle"):
+                time.sleep(self.bench.dut_settle_s)
+        return self.bench.ni_analog.read_analog_input(ramp.analog_channel)
+
+    def _read_duts(self, channels: List[int]) -> List[float]:
+        if self.bench.dut_settle_s:
+            with timed("sleep.dut_settle"):
+                time.sleep(self.bench.dut_settle_s)
+        return self.bench.ni_analog.read_analog_inputs(channels)
+
+    @staticmethod
+    @timed("motion.wait_position")
+    def _wait_for_position(get_position: Callable[[], float], target: float, timeout: float = MOVE_TIMEOUT_S) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if abs(get_position() - target) < POSITION_TOLERANCE_DEG:
+                    return
+            except Exception as e:
+                _LOGGER.warning(f"Could not read position during wait: {e}")
+            time.sleep(POSITION_POLL_S)
+        raise TimeoutError(f"Position {target} not reached within {timeout}s.")
@@ -0,0 +1,141 @@
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from drivers.test_calculation.calibration import SheetCalibration
+
+_LOGGER = logging.getLogger(__name__)
+
+PASS = "PASS"
+FAIL = "FAIL"
+PENDING = "PENDING"
+NO_LIMIT = "NO_LIMIT"
+
+
+@dataclass(frozen=True)
+class AntennaLimits:
+    """
+    Sensitivity limits of an antenna type, as defined in antennas.json.
+
+    Attributes:
+        down_limit_dbuvm: Highest field strength (dBµV/m) at which the DUT must activate.
+        upper_limit_uvm: The same limit in µV/m.
+        generator_dbm: Highest generator power at which the DUT must activate; used
+            when the sheet calibration is incomplete.
+    """
+
+    down_limit_dbuvm: Optional[float] = None
+    upper_limit_uvm: Optional[float] = None
+    generator_dbm: Optional[float] = None
+
+
+def load_antenna_limits(path: Path) -> Dict[str, AntennaLimits]:
+    """Reads antennas.json and returns the limits by antenna name."""
+    if not path.exists():
+        _LOGGER.warning(f"Antenna limits file {path} not found; sheets will not be evaluated.")
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        antennas = json.load(f)
+    limits = {}
+    for antenna in antennas:
+        params = antenna.get("parametry", {})
+        limits[antenna.get("nazwa")] = AntennaLimits(
+            params.get("down_limit"), params.get("upper_limit"), params.get("generator"),
+        )
+    return limits
+
+
+class SheetVerdict:
+    """
+    Pass/fail evaluation of one sheet, updated as its points are measured.
+
+    A point passes when the DUT activated at or below the limit: the activation
+    field strength must not exceed ``down_limit`` (or, without a complete
+    calibration, the activation power must not exceed the ``generator`` limit). A
+    point without activation fails. The sheet fails as soon as one point fails and
+    passes when all of its points passed.
+
+    Args:
+        limits: Limits of the sheet's antenna, None if it has none.
+        calibration: Calibration of the sheet.
+        total_points: Number of points of the sheet.
+    """
+
+    def __init__(self, limits: Optional[AntennaLimits], calibration: SheetCalibration, total_points: int):
+        self.limits = limits
+        self.calibration = calibration
+        self.total_points = total_points
+        self.points = 0
+        self.min_activation_dbm: Optional[float] = None
+        self.max_activation_dbm: Optional[float] = None
+        self.max_gap_db: Optional[float] = None
+        self.worst_margin_db: Optional[float] = None
+        self.failed: List[Dict[str, Any]] = []
+        self.aborted = False
+        self._by_field = (limits is not None and limits.down_limit_dbuvm is not None and calibration.complete)
+
+    @property
+    def verdict(self) -> str:
+        if self.limits is None or (not self._by_field and self.limits.generator_dbm is None):
+            return NO_LIMIT
+        if self.failed:
+            return FAIL
+        return PASS if self.points >= self.total_points else PENDING
+
+    @property
+    def has_failed(self) -> bool:
+        return self.verdict == FAIL
+
+    def add(self, angle: int, polarization: str, activation_dbm: Optional[float], stop_dbm: Optional[float]) -> None:
+        """Updates the running statistics and the verdict with one measured point."""
+        self.points += 1
+        if activation_dbm is not None:
+            self.min_activation_dbm = _min(self.min_activation_dbm, activation_dbm)
+            self.max_activation_dbm = _max(self.max_activation_dbm, activation_dbm)
+            if stop_dbm is not None:
+                self.max_gap_db = _max(self.max_gap_db, round(activation_dbm - stop_dbm, 2))
+
+        if self.verdict == NO_LIMIT:
+            return
+        margin = self._margin(activation_dbm)
+        if margin is not None:
+            self.worst_margin_db = _min(self.worst_margin_db, margin)
+        # No activation within the ramp is a failure without a finite margin.
+        if margin is None or margin < 0:
+            self.failed.append({"angle": angle, "polarization": polarization, "activation_dbm": activation_dbm,
+                                "margin_db": margin})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "verdict": self.verdict,
+            "limit": "field" if self._by_field else "generator",
+            "points": self.points,
+            "total_points": self.total_points,
+            "min_activation_dbm": self.min_activation_dbm,
+            "max_activation_dbm": self.max_activation_dbm,
+            "min_sensitivity_db": self.calibration.field_strength(self.min_activation_dbm)[0]
+            if self.min_activation_dbm is not None else None,
+            "max_gap_db": self.max_gap_db,
+            "worst_margin_db": self.worst_margin_db,
+            "failed_points": self.failed,
+            "aborted": self.aborted,
+        }
+
+    def _margin(self, activation_dbm: Optional[float]) -> Optional[float]:
+        """Distance to the limit in dB, positive when the point passes."""
+        if activation_dbm is None:
+            return None
+        if self._by_field:
+            field_db, _ = self.calibration.field_strength(activation_dbm)
+            return round(self.limits.down_limit_dbuvm - field_db, 2)
+        return round(self.limits.generator_dbm - activation_dbm, 2)
+
+
+def _min(current: Optional[float], value: float) -> float:
+    return value if current is None else min(current, value)
+
+
+def _max(current: Optional[float], value: float) -> float:
+    return value if current is None else max(current, value)
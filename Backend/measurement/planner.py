@@ -0,0 +1,273 @@
+import json
+import logging
+from dataclasses import dataclass, asdict, fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+SHEET_MAJOR = "sheet_major"
+ANGLE_MAJOR = "angle_major"
+# Bumped whenever the grouping or ordering of the points changes; plans stored by
+# an older planner (compiled_plan) are rebuilt.
+PLANNER_VERSION = 2
+
+
+@dataclass(frozen=True)
+class MeasurementPoint:
+    """
+    A single (sheet, angle, polarization) measurement of a campaign.
+
+    Attributes:
+        sheet_index: Index of the sheet configuration in we_config.json.
+        sheet: The 'sheet' identifier of the configuration.
+        config_id: The 'id' of the configuration.
+        angle: Turntable angle in degrees.
+        polarization: 'H' or 'V'.
+        frequency_hz: Generator frequency in Hz.
+    """
+
+    sheet_index: int
+    sheet: Any
+    config_id: Any
+    angle: int
+    polarization: str
+    frequency_hz: float
+
+
+@dataclass
+class OperationCosts:
+    """
+    Per-operation durations used to estimate campaign runtime.
+
+    The defaults are rough bench values; every run updates them with the
+    durations it actually measured (exponential moving average) and stores
+    them in ``operation_costs.json`` next to the configuration.
+    """
+
+    retune_s: float = 0.5
+    move_overhead_s: float = 2.0
+    move_s_per_deg: float = 0.3
+    polarization_s: float = 3.0
+    power_step_s: float = 0.1
+    steps_per_point: float = 30.0
+
+    SMOOTHING = 0.2
+
+    def observe(self, name: str, value: float) -> None:
+        """Blends a measured value into the stored cost."""
+        current = getattr(self, name)
+        setattr(self, name, current + self.SMOOTHING * (value - current))
+
+    def move_cost(self, from_angle: Optional[float], to_angle: float) -> float:
+        travel = abs(to_angle - (from_angle or 0.0))
+        return self.move_overhead_s + travel * self.move_s_per_deg
+
+    @classmethod
+    def load(cls, path: Path) -> "OperationCosts":
+        """Loads costs from a JSON file, falling back to defaults for missing values."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return cls()
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: float(v) for k, v in data.items() if k in known})
+
+    def save(self, path: Path) -> None:
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(asdict(self), f, indent=2)
+        except OSError as e:
+            _LOGGER.warning(f"Could not save operation costs to {path}: {e}")
+
+
+@dataclass
+class RunEstimate:
+    """Operation counts and estimated duration of an ordered list of points."""
+
+    seconds: float = 0.0
+    retunes: int = 0
+    moves: int = 0
+    travel_deg: float = 0.0
+    polarization_changes: int = 0
+    points: int = 0
+
+
+def estimate_runtime(points: List[MeasurementPoint], costs: OperationCosts) -> RunEstimate:
+    """
+    Walks the points in order and sums the cost of every state change.
+
+    Args:
+        points: The measurement points in execution order.
+        costs: The per-operation costs.
+
+    Returns:
+        The estimate with operation counts.
+    """
+    estimate = RunEstimate(points=len(points))
+    angle, polarization, frequency = None, None, None
+    for point in points:
+        if point.frequency_hz != frequency:
+            estimate.retunes += 1
+            estimate.seconds += costs.retune_s
+            frequency = point.frequency_hz
+        if point.angle != angle:
+            estimate.moves += 1
+            estimate.travel_deg += abs(point.angle - (angle or 0))
+            estimate.seconds += costs.move_cost(angle, point.angle)
+            angle = point.angle
+        if point.polarization != polarization:
+            estimate.polarization_changes += 1
+            estimate.seconds += costs.polarization_s
+            polarization = point.polarization
+        estimate.seconds += costs.steps_per_point * costs.power_step_s
+    return estimate
+
+
+def _test_params(config_item: Dict[str, Any]) -> Dict[str, Any]:
+    return config_item.get("test_params", {})
+
+
+def compatibility_key(config_item: Dict[str, Any]) -> Tuple:
+    """
+    Returns the DUT settings that must match for sheets to share turntable positions.
+
+    Sheets measured on the same antenna type, at the same distance and mast height and
+    read on the same analog channel with the same threshold can be interleaved at one
+    angle; anything else needs a different physical setup and stays in its own group.
+    Sheets with ``hardware_config.concurrent_duts`` are DUTs placed in the chamber
+    together, each on its own channel, so the channel does not separate them.
+    """
+    params = _test_params(config_item)
+    hardware = config_item.get("hardware_config", {})
+    runtime = config_item.get("runtime_params", {})
+    concurrent = bool(hardware.get("concurrent_duts"))
+    return (
+        config_item.get("antenna", ""),
+        params.get("distance", 3.0),
+        runtime.get("start_malt_height"),
+        None if concurrent else hardware.get("analog_channel"),
+        None if concurrent else hardware.get("voltage_threshold_v"),
+        concurrent,
+    )
+
+
+def sheet_major_points(we_config: List[Dict[str, Any]]) -> List[MeasurementPoint]:
+    """Returns the points in the configured order: sheet, then angle, then polarization."""
+    points = []
+    for index, item in enumerate(we_config):
+        params = _test_params(item)
+        for angle in params.get("angles", []):
+            for polarization in params.get("polarizations", []):
+                points.append(
+                    MeasurementPoint(index, item.get("sheet"), item.get("id"), int(angle), polarization,
+                                     float(params.get("frequency_hz", 0)))
+                )
+    return points
+
+
+def angle_major_points(we_config: List[Dict[str, Any]]) -> Tuple[List[MeasurementPoint], List[List[Any]]]:
+    """
+    Reorders the campaign so that every turntable position is visited once per group.
+
+    Within a group of compatible sheets the turntable moves through the union of angles;
+    at each angle every polarization is measured for every frequency. Polarizations and
+    frequencies are walked in alternating (snake) order, so the last state of one block is
+    the first state of the next, and consecutive groups sweep the angles in opposite
+    directions to avoid returning the turntable to its start.
+
+    Args:
+        we_config: The merged campaign configuration.
+
+    Returns:
+        The ordered points and the sheet identifiers of each group.
+    """
+    groups: Dict[Tuple, List[int]] = {}
+    for index, item in enumerate(we_config):
+        groups.setdefault(compatibility_key(item), []).append(index)
+
+    points: List[MeasurementPoint] = []
+    group_sheets = []
+    reverse_angles = False
+    freq_reverse = False
+    pol_reverse = False
+    for indices in groups.values():
+        group_sheets.append([we_config[i].get("sheet") for i in indices])
+        angles = sorted({int(a) for i in indices for a in _test_params(we_config[i]).get("angles", [])},
+                        reverse=reverse_angles)
+        polarizations = []
+        for i in indices:
+            for pol in _test_params(we_config[i]).get("polarizations", []):
+                if pol not in polarizations:
+                    polarizations.append(pol)
+
+        for angle in angles:
+            for pol in (polarizations[::-1] if pol_reverse else polarizations):
+                block = [
+                    i for i in indices
+                    if angle in [int(a) for a in _test_params(we_config[i]).get("angles", [])]
+                    and pol in _test_params(we_config[i]).get("polarizations", [])
+                ]
+                block.sort(key=lambda i: float(_test_params(we_config[i]).get("frequency_hz", 0)),
+                           reverse=freq_reverse)
+                for i in block:
+                    item = we_config[i]
+                    points.append(
+                        MeasurementPoint(i, item.get("sheet"), item.get("id"), angle, pol,
+                                         float(_test_params(item).get("frequency_hz", 0)))
+                    )
+                if block:
+                    freq_reverse = not freq_reverse
+            pol_reverse = not pol_reverse
+        reverse_angles = not reverse_angles
+    return points, group_sheets
+
+
+@dataclass
+class CampaignPlan:
+    """An ordered campaign with its runtime estimate and the naive (sheet-major) baseline."""
+
+    order: str
+    points: List[MeasurementPoint]
+    groups: List[List[Any]]
+    estimate: RunEstimate
+    naive_estimate: RunEstimate
+
+    def summary(self) -> Dict[str, Any]:
+        saving = self.naive_estimate.seconds - self.estimate.seconds
+        return {
+            "order": self.order,
+            "points": len(self.points),
+            "groups": self.groups,
+            "estimated_s": round(self.estimate.seconds, 1),
+            "naive_estimated_s": round(self.naive_estimate.seconds, 1),
+            "saving_s": round(saving, 1),
+            "saving_pct": round(100.0 * saving / self.naive_estimate.seconds, 1) if self.naive_estimate.seconds else 0.0,
+            "plan": asdict(self.estimate),
+            "naive": asdict(self.naive_estimate),
+        }
+
+
+def build_plan(we_config: List[Dict[str, Any]], costs: OperationCosts, order: str = ANGLE_MAJOR) -> CampaignPlan:
+    """
+    Builds the execution plan of a campaign.
+
+    Args:
+        we_config: The merged campaign configuration.
+        costs: The per-operation costs used for the estimates.
+        order: ANGLE_MAJOR to reorder the campaign, SHEET_MAJOR to keep the configured order.
+
+    Returns:
+        The campaign plan.
+    """
+    naive_points = sheet_major_points(we_config)
+    naive_estimate = estimate_runtime(naive_points, costs)
+    if order == SHEET_MAJOR:
+        return CampaignPlan(order, naive_points, [[item.get("sheet")] for item in we_config],
+                            naive_estimate, naive_estimate)
+    if order != ANGLE_MAJOR:
+        raise ValueError(f"Unknown campaign order '{order}'. Use '{ANGLE_MAJOR}' or '{SHEET_MAJOR}'.")
+
+    points, groups = angle_major_points(we_config)
+    return CampaignPlan(order, points, groups, estimate_runtime(points, costs), naive_estimate)
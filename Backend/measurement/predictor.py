@@ -0,0 +1,186 @@
+import json
+import logging
+import math
+import statistics
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from measurement.engine import RampSettings, SearchResult, search_threshold
+from measurement.planner import MeasurementPoint
+from template_ingest import write_atomic
+
+_LOGGER = logging.getLogger(__name__)
+
+# Angles further away than this do not inform the prediction.
+MAX_NEIGHBOUR_DEG = 90
+# Activation levels kept per antenna/frequency in the history file.
+HISTORY_FILE = "threshold_history.json"
+
+
+@dataclass
+class PredictionStats:
+    """Accuracy of the predictions of a run and the ramp steps they saved."""
+
+    predictions: int = 0
+    misses: int = 0
+    steps_skipped: int = 0
+    steps_wasted: int = 0
+    abs_error_sum: float = 0.0
+    errors: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "predictions": self.predictions,
+            "misses": self.misses,
+            "hit_rate": round(1 - self.misses / self.predictions, 3) if self.predictions else None,
+            "mean_abs_error_db": round(self.abs_error_sum / self.errors, 2) if self.errors else None,
+            "steps_skipped": self.steps_skipped,
+            "steps_wasted": self.steps_wasted,
+            "net_steps_saved": self.steps_skipped - self.steps_wasted,
+        }
+
+
+def _history_key(config_item: Dict[str, Any], unit: str) -> str:
+    return f"{config_item.get('antenna', '')}|{config_item.get('test_params', {}).get('frequency_hz')}|{unit}"
+
+
+def _angle_distance(a: float, b: float) -> float:
+    d = abs(a - b) % 360
+    return min(d, 360 - d)
+
+
+class ThresholdPredictor:
+    """
+    Predicts the activation level of the next point from what is already known.
+
+    In order of preference the prediction comes from the nearest measured angles
+    of the same sheet and polarization (inverse-distance weighted), the same angle
+    of the other polarization, the nearest angle of the other polarization, and the
+    levels measured for the same antenna and frequency in previous runs. Levels are
+    in the unit of the sheet's ramp.
+
+    Args:
+        we_config: The campaign configuration.
+        ramps: The ramp of every sheet.
+        history: Activation levels of previous runs, see ``load_history``.
+    """
+
+    def __init__(self, we_config: List[Dict[str, Any]], ramps: List[RampSettings],
+                 history: Optional[Dict[str, Dict[str, float]]] = None):
+        self.we_config = we_config
+        self.ramps = ramps
+        self.history = history or {}
+        self.stats = PredictionStats()
+        self._observed: Dict[Tuple[int, str], Dict[int, float]] = {}
+
+    def predict(self, point: MeasurementPoint) -> Optional[float]:
+        """Returns the expected activation level of the point, None without any data."""
+        same = self._observed.get((point.sheet_index, point.polarization), {})
+        other = self._observed.get((point.sheet_index, "H" if point.polarization == "V" else "V"), {})
+        nearest = self._interpolate(same, point.angle)
+        if nearest is not None:
+            return nearest
+        if point.angle in other:
+            return other[point.angle]
+        nearest = self._interpolate(other, point.angle)
+        if nearest is not None:
+            return nearest
+        previous = self.history.get(_history_key(self.we_config[point.sheet_index],
+                                                 self.ramps[point.sheet_index].unit), {})
+        if f"{point.angle}/{point.polarization}" in previous:
+            return previous[f"{point.angle}/{point.polarization}"]
+        return statistics.median(previous.values()) if previous else None
+
+    def bracket(self, point: MeasurementPoint, ramp: RampSettings) -> RampSettings:
+        """
+        Returns the ramp starting ``prediction_margin_db`` below the prediction.
+
+        The start stays on the step grid of the full ramp, so the search lands on
+        the same levels as a full-range search.
+        """
+        predicted = self.predict(point)
+        if predicted is None:
+            return ramp
+        skip = math.floor((predicted - ramp.prediction_margin_db - ramp.start_dbm) / ramp.step_db)
+        max_skip = int(round((ramp.end_dbm - ramp.start_dbm) / ramp.step_db))
+        skip = min(max(skip, 0), max_skip)
+        return replace(ramp, start_dbm=round(ramp.start_dbm + skip * ramp.step_db, 2))
+
+    def search(self, point: MeasurementPoint, set_power: Callable[[float], None],
+               read_voltage: Callable[[], float], ramp: RampSettings) -> SearchResult:
+        """
+        Runs the threshold search from the predicted bracket.
+
+        If the DUT is already active at the first level of the bracket, the
+        prediction was too high and the search is repeated over the full ramp.
+        """
+        predicted = self.predict(point)
+        bracket = self.bracket(point, ramp)
+        if bracket.start_dbm == ramp.start_dbm:
+            return search_threshold(set_power, read_voltage, ramp)
+
+        self.stats.predictions += 1
+        skipped = int(round((bracket.start_dbm - ramp.start_dbm) / ramp.step_db))
+        result = search_threshold(set_power, read_voltage, bracket)
+        if result.activation_dbm == bracket.start_dbm:
+            self.stats.misses += 1
+            self.stats.steps_wasted += result.steps
+            _LOGGER.info(f"Prediction {predicted:.2f} for sheet {point.sheet} {point.angle} deg {point.polarization} "
+                         f"missed (active at {bracket.start_dbm}); searching the full ramp.")
+            full = search_threshold(set_power, read_voltage, ramp)
+            full.steps += result.steps
+            result = full
+        else:
+            self.stats.steps_skipped += skipped
+
+        if result.activation_dbm is not None:
+            error = result.activation_dbm - predicted
+            self.stats.abs_error_sum += abs(error)
+            self.stats.errors += 1
+            _LOGGER.info(f"Sheet {point.sheet} {point.angle} deg {point.polarization}: predicted {predicted:.2f}, "
+                         f"measured {result.activation_dbm} (error {error:+.2f} dB).")
+        return result
+
+    def observe(self, point: MeasurementPoint, activation: Optional[float]) -> None:
+        """Records the measured activation level (in the ramp unit) of a point or checkpoint record."""
+        if activation is not None:
+            self._observed.setdefault((point.sheet_index, point.polarization), {})[point.angle] = activation
+
+    def updated_history(self) -> Dict[str, Dict[str, float]]:
+        """Returns the history with the levels measured in this run."""
+        history = {key: dict(levels) for key, levels in self.history.items()}
+        for (sheet_index, polarization), levels in self._observed.items():
+            entry = history.setdefault(_history_key(self.we_config[sheet_index], self.ramps[sheet_index].unit), {})
+            entry.update({f"{angle}/{polarization}": level for angle, level in levels.items()})
+        return history
+
+    @staticmethod
+    def _interpolate(levels: Dict[int, float], angle: int) -> Optional[float]:
+        neighbours = sorted(
+            (_angle_distance(a, angle), level) for a, level in levels.items()
+            if _angle_distance(a, angle) <= MAX_NEIGHBOUR_DEG
+        )[:2]
+        if not neighbours:
+            return None
+        if neighbours[0][0] == 0:
+            return neighbours[0][1]
+        weights = [1 / distance for distance, _ in neighbours]
+        return sum(w * level for w, (_, level) in zip(weights, neighbours)) / sum(weights)
+
+
+def load_history(path: Path) -> Dict[str, Dict[str, float]]:
+    """Reads the activation levels of previous runs; a missing or damaged file gives no history."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (json.JSONDecodeError, OSError) as e:
+        _LOGGER.warning(f"Ignoring threshold history {path}: {e}")
+        return {}
+
+
+def save_history(path: Path, history: Dict[str, Dict[str, float]]) -> None:
+    """Replaces the history file in one step, so an interrupted write keeps the previous runs."""
+    write_atomic(path, json.dumps(history, indent=2).encode("utf-8"))
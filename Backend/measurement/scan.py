@@ -0,0 +1,268 @@
+import bisect
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from drivers.instrumentation import timed
+from measurement.bench import POLARIZATIONS, Bench
+from measurement.engine import PARK_POWER_DBM, SweepEngine
+
+_LOGGER = logging.getLogger(__name__)
+
+# Extra time allowed for a revolution over span / speed (acceleration, a slower table).
+SCAN_TIMEOUT_FACTOR = 1.5
+SCAN_TIMEOUT_MARGIN_S = 10.0
+END_TOLERANCE_DEG = 0.5
+
+
+@dataclass(frozen=True)
+class ScanSettings:
+    """
+    Parameters of a continuous-rotation scan.
+
+    The generator holds one level while the turntable rotates from ``start_deg``
+    through ``span_deg``; the DUT output is sampled all the way and every sample
+    is tagged with the turntable angle at the time it was taken.
+
+    Attributes:
+        frequency_hz: Generator frequency.
+        level_dbm: Generator power held during the revolution.
+        polarization: "V" or "H".
+        speed_deg_per_s: Expected turntable speed. The table runs at the speed set
+            in CtrlAxes; this value bounds the scan time and checks the sample density.
+        sample_rate_hz: DAQ sample clock rate (hardware-timed).
+        position_poll_s: Interval between turntable position reads.
+        start_deg: Angle the revolution starts from.
+        span_deg: Rotation of the scan.
+        resolution_deg: Bin width of the activation pattern.
+        analog_channel: AI channel of the DUT output.
+        threshold_v: DUT output voltage considered as activation.
+    """
+
+    frequency_hz: float
+    level_dbm: float
+    polarization: str = "V"
+    speed_deg_per_s: float = 6.0
+    sample_rate_hz: float = 100.0
+    position_poll_s: float = 0.1
+    start_deg: float = 0.0
+    span_deg: float = 360.0
+    resolution_deg: float = 1.0
+    analog_channel: int = 3
+    threshold_v: float = 4.5
+
+    def __post_init__(self):
+        if self.polarization not in POLARIZATIONS:
+            raise ValueError(f"Unknown polarization '{self.polarization}'.")
+        for name in ("speed_deg_per_s", "sample_rate_hz", "position_poll_s", "span_deg", "resolution_deg"):
+            if getattr(self, name) <= 0:
+                raise ValueError(f"Scan {name} must be greater than 0.")
+
+    @property
+    def end_deg(self) -> float:
+        return self.start_deg + self.span_deg
+
+    @property
+    def timeout_s(self) -> float:
+        return self.span_deg / self.speed_deg_per_s * SCAN_TIMEOUT_FACTOR + SCAN_TIMEOUT_MARGIN_S
+
+
+@dataclass
+class ScanResult:
+    """
+    Samples of a scan and the activation pattern binned from them.
+
+    Attributes:
+        settings: The scan parameters.
+        samples: (angle, voltage, active) of every DUT sample, in acquisition order.
+        completed: False if the scan was stopped before the end angle.
+        duration_s: Time from the start of the rotation to the last sample.
+        measured_speed_deg_per_s: Rotation speed from the first and last position reads.
+        achieved_sample_rate_hz: Samples per second actually acquired.
+        angular_spacing_deg: Rotation between two samples at the measured speed.
+        warnings: Problems of the scan worth showing with the pattern.
+    """
+
+    settings: ScanSettings
+    samples: List[Tuple[float, float, bool]] = field(default_factory=list)
+    completed: bool = False
+    duration_s: float = 0.0
+    measured_speed_deg_per_s: Optional[float] = None
+    achieved_sample_rate_hz: Optional[float] = None
+    angular_spacing_deg: Optional[float] = None
+    warnings: List[str] = field(default_factory=list)
+
+    def bins(self) -> List[Dict[str, Any]]:
+        """Active fraction of the samples in each ``resolution_deg`` bin; bins without samples are None."""
+        s = self.settings
+        count = max(1, math.ceil(s.span_deg / s.resolution_deg))
+        totals = [0] * count
+        active = [0] * count
+        for angle, _, is_active in self.samples:
+            index = min(count - 1, max(0, int((angle - s.start_deg) // s.resolution_deg)))
+            totals[index] += 1
+            active[index] += is_active
+        return [{"angle": round(s.start_deg + (i + 0.5) * s.resolution_deg, 3), "samples": totals[i],
+                 "active_fraction": active[i] / totals[i] if totals[i] else None} for i in range(count)]
+
+    def edges(self) -> List[Dict[str, Any]]:
+        """Angles where the DUT output crosses the threshold, midway between the two samples."""
+        edges = []
+        for (a0, _, on0), (a1, _, on1) in zip(self.samples, self.samples[1:]):
+            if on0 != on1:
+                edges.append({"angle": round((a0 + a1) / 2, 3), "active": on1})
+        return edges
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "settings": self.settings.__dict__,
+            "completed": self.completed,
+            "duration_s": round(self.duration_s, 3),
+            "measured_speed_deg_per_s": self.measured_speed_deg_per_s,
+            "achieved_sample_rate_hz": self.achieved_sample_rate_hz,
+            "angular_spacing_deg": self.angular_spacing_deg,
+            "warnings": self.warnings,
+            "sample_count": len(self.samples),
+            "bins": self.bins(),
+            "edges": self.edges(),
+            "samples": [[round(a, 3), round(v, 4), on] for a, v, on in self.samples],
+        }
+
+
+def interpolate_angles(fixes: List[Tuple[float, float]], times: List[float]) -> List[float]:
+    """
+    Turntable angle at each time, linear between the position reads around it.
+
+    Args:
+        fixes: (time, angle) of the position reads, in time order.
+        times: Sample times on the same clock.
+
+    Times before the first or after the last read are extrapolated from the
+    nearest pair of reads.
+    """
+    if not fixes:
+        raise ValueError("No turntable position was read during the scan.")
+    if len(fixes) == 1:
+        return [fixes[0][1]] * len(times)
+    fix_times = [t for t, _ in fixes]
+    angles = []
+    for t in times:
+        i = min(len(fixes) - 1, max(1, bisect.bisect_right(fix_times, t)))
+        (t0, a0), (t1, a1) = fixes[i - 1], fixes[i]
+        angles.append(a0 if t1 == t0 else a0 + (a1 - a0) * (t - t0) / (t1 - t0))
+    return angles
+
+
+def run_rotation_scan(bench: Bench, settings: ScanSettings,
+                      should_continue: Callable[[], bool] = lambda: True) -> ScanResult:
+    """
+    Measures an activation pattern at one level in a single revolution.
+
+    The turntable is moved to the start angle, the generator is tuned and set to
+    ``level_dbm``, then the turntable is sent to the end angle in one move. While
+    it rotates the DUT output is sampled at ``sample_rate_hz`` and the position is
+    read every ``position_poll_s``; each sample gets the angle interpolated
+    between the position reads around it, so the pattern does not depend on the
+    turntable speed being exact. The DUT output is acquired on the DAQ sample clock
+    (``start_continuous``), so position reads through CtrlAxes do not pause the
+    sampling. RF is turned off when the scan ends, also on error.
+
+    Args:
+        bench: The open bench.
+        settings: The scan parameters.
+        should_continue: Polled between samples; False stops the turntable and
+            returns the samples taken so far.
+
+    Raises:
+        TimeoutError: If the end angle is not reached within ``settings.timeout_s``.
+    """
+    step_deg = settings.speed_deg_per_s / settings.sample_rate_hz
+    if step_deg > settings.resolution_deg:
+        _LOGGER.warning(f"Scan samples every {step_deg:.2f} deg at the expected speed, "
+                        f"coarser than the {settings.resolution_deg} deg resolution.")
+    engine = SweepEngine(bench, [])
+    engine.move_turntable(settings.start_deg)
+    engine.tune(settings.frequency_hz)
+    engine.set_polarization(settings.polarization)
+    generator = bench.generator
+    axes = bench.ctrl_axes
+    try:
+        generator.set_power(settings.level_dbm)
+        generator.set_output_rf(True)
+        if bench.dut_settle_s:
+            with timed("sleep.dut_settle"):
+                time.sleep(bench.dut_settle_s)
+        result = _rotate_and_sample(bench, settings, should_continue)
+    finally:
+        generator.set_output_rf(False)
+        generator.set_power(PARK_POWER_DBM)
+    _LOGGER.info(f"Rotation scan: {len(result.samples)} samples over {result.duration_s:.1f} s "
+                 f"({result.measured_speed_deg_per_s} deg/s), completed: {result.completed}.")
+    if not result.completed:
+        axes.click_button_stop()
+    return result
+
+
+def _rotate_and_sample(bench: Bench, settings: ScanSettings, should_continue: Callable[[], bool]) -> ScanResult:
+    axes = bench.ctrl_axes
+    fixes: List[Tuple[float, float]] = []
+    voltages: List[float] = []
+    completed = False
+
+    def read_position() -> float:
+        before = time.perf_counter()
+        angle = axes.get_turntable_degrees()
+        fixes.append(((before + time.perf_counter()) / 2, angle))
+        return angle
+
+    axes.set_turntable_settings()
+    axes.set_target_position(int(round(settings.end_deg)))
+    stream = bench.ni_analog.start_continuous(settings.analog_channel, settings.sample_rate_hz)
+    try:
+        # A fix at rest, so the samples taken before the table starts get the start angle.
+        read_position()
+        axes.click_btn_move_target_position()
+        start = time.perf_counter()
+        deadline = start + settings.timeout_s
+        with timed("scan.rotation"):
+            while should_continue():
+                next_fix = time.perf_counter() + settings.position_poll_s
+                if abs(read_position() - round(settings.end_deg)) < END_TOLERANCE_DEG:
+                    completed = True
+                    break
+                if time.perf_counter() > deadline:
+                    axes.click_button_stop()
+                    raise TimeoutError(
+                        f"Rotation scan did not reach {settings.end_deg} deg within {settings.timeout_s:.0f}s.")
+                voltages.extend(stream.read_available())
+                delay = next_fix - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            if not completed:
+                read_position()
+            voltages.extend(stream.read_available())
+    finally:
+        stream.close()
+
+    times = [stream.start_time + i / stream.rate_hz for i in range(len(voltages))]
+    angles = interpolate_angles(fixes, times)
+    low, high = sorted((settings.start_deg, settings.end_deg))
+    samples = [(min(high, max(low, angle)), voltage, voltage >= settings.threshold_v)
+               for angle, voltage in zip(angles, voltages)]
+    moving = [(t, a) for t, a in fixes if t >= start]
+    (t0, a0), (t1, a1) = (moving[0], moving[-1]) if len(moving) > 1 else (fixes[0], fixes[-1])
+    speed = round(abs(a1 - a0) / (t1 - t0), 3) if t1 > t0 else None
+    result = ScanResult(settings, samples, completed, (times[-1] - start) if times else 0.0, speed)
+    if len(times) > 1:
+        result.achieved_sample_rate_hz = round((len(times) - 1) / (times[-1] - times[0]), 3)
+        if speed:
+            result.angular_spacing_deg = round(speed / result.achieved_sample_rate_hz, 4)
+    if result.angular_spacing_deg is not None and result.angular_spacing_deg > settings.resolution_deg:
+        result.warnings.append(
+            f"Samples are {result.angular_spacing_deg} deg apart, wider than the {settings.resolution_deg} deg "
+            f"resolution: some bins have no samples. Raise sample_rate_hz or slow the turntable.")
+    for warning in result.warnings:
+        _LOGGER.warning(warning)
+    return result
@@ -0,0 +1,407 @@
+import math
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from drivers.error_queue import ErrorQueue, QueuedError
+from drivers.instrumentation import timed
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    """
+    Latencies imitated by the simulated instruments.
+
+    Attributes:
+        scpi_write_s: Duration of one SCPI write including *OPC? synchronization.
+        scpi_query_s: Duration of one SCPI query.
+        daq_read_s: Duration of one on-demand analog read (task creation included).
+        relay_write_s: Duration of one relay write.
+        uia_action_s: Duration of one UIA lookup + action in CtrlAxes.
+        turntable_deg_per_s: Turntable speed; None moves instantly.
+        polarization_s: Mechanical travel of the mast between polarizations.
+    """
+
+    scpi_write_s: float = 0.0
+    scpi_query_s: float = 0.0
+    daq_read_s: float = 0.0
+    relay_write_s: float = 0.0
+    uia_action_s: float = 0.0
+    turntable_deg_per_s: Optional[float] = None
+    polarization_s: float = 0.0
+
+
+LATENCY_PROFILES = {
+    "instant": LatencyProfile(),
+    "demo": LatencyProfile(
+        scpi_write_s=0.005, scpi_query_s=0.005, daq_read_s=0.005, relay_write_s=0.002,
+        uia_action_s=0.02, turntable_deg_per_s=120.0, polarization_s=0.2,
+    ),
+    "bench": LatencyProfile(
+        scpi_write_s=0.03, scpi_query_s=0.02, daq_read_s=0.015, relay_write_s=0.01,
+        uia_action_s=0.15, turntable_deg_per_s=6.0, polarization_s=4.0,
+    ),
+}
+
+
+def _wait(seconds: float) -> None:
+    if seconds > 0:
+        time.sleep(seconds)
+
+
+class SimulatedDut:
+    """
+    Radio receiver model: activates when the field at its antenna exceeds its sensitivity.
+
+    The activation threshold (in generator dBm) follows a smooth angular pattern,
+    differs slightly between polarizations and rises with frequency. Once active the
+    DUT stays active until the power falls ``hysteresis_db`` below the threshold.
+    """
+
+    def __init__(self, base_threshold_dbm: float = -42.0, pattern_depth_db: float = 6.0,
+                 polarization_offset_db: float = 3.0, hysteresis_db: float = 2.5,
+                 active_voltage_v: float = 5.0, idle_voltage_v: float = 0.1):
+        self.base_threshold_dbm = base_threshold_dbm
+        self.pattern_depth_db = pattern_depth_db
+        self.polarization_offset_db = polarization_offset_db
+        self.hysteresis_db = hysteresis_db
+        self.active_voltage_v = active_voltage_v
+        self.idle_voltage_v = idle_voltage_v
+        self.active = False
+
+    def threshold_dbm(self, angle: float, polarization: str, frequency_hz: float) -> float:
+        """Returns the generator power at which the DUT activates."""
+        pattern = self.pattern_depth_db * (1 - math.cos(math.radians(angle))) / 2
+        offset = self.polarization_offset_db if polarization == "H" else 0.0
+        freq_term = 20 * math.log10(frequency_hz / 433.92e6) if frequency_hz > 0 else 0.0
+        return self.base_threshold_dbm + pattern + offset + freq_term
+
+    def output_voltage(self, power_dbm: Optional[float], angle: float, polarization: str, frequency_hz: float) -> float:
+        """Updates the DUT state for the incident power and returns its output voltage."""
+        if power_dbm is None:
+            self.active = False
+        else:
+            threshold = self.threshold_dbm(angle, polarization, frequency_hz)
+            if power_dbm >= threshold:
+                self.active = True
+            elif power_dbm < threshold - self.hysteresis_db:
+                self.active = False
+        return self.active_voltage_v if self.active else self.idle_voltage_v
+
+
+class SimulatedChamber:
+    """Shared physical state linking the simulated instruments and the DUT."""
+
+    def __init__(self, dut: Optional[SimulatedDut] = None, profile: LatencyProfile = LatencyProfile(),
+                 duts: Optional[Dict[int, SimulatedDut]] = None):
+        self.dut = dut or SimulatedDut()
+        # DUTs wired to particular analog channels; other channels read ``dut``.
+        self.duts = duts or {}
+        self.profile = profile
+        self.frequency_hz = 433.92e6
+        self.power_dbm = -120.0
+        self.rf_on = False
+        self.polarization = "V"
+        self.angle = 0.0
+        self.malt_height = 150.0
+        # Turntable angle at a time.monotonic() instant, set by the turntable, so a
+        # reading taken while it rotates sees the angle of that moment.
+        self.position_source: Optional[Callable[[float], float]] = None
+
+    def incident_power(self) -> Optional[float]:
+        return self.power_dbm if self.rf_on else None
+
+    def angle_at(self, t: float) -> float:
+        return self.position_source(t) if self.position_source is not None else self.angle
+
+    def current_angle(self) -> float:
+        return self.angle_at(time.monotonic())
+
+
+class SimulatedGenerator:
+    """
+    Stand-in for SMB100A exposing the same public API.
+
+    In per-command error checking every command is followed by a status query, as
+    RsInstrument does, and fails if the error queue is not empty. Errors can be
+    queued with ``inject_error``.
+    """
+
+    def __init__(self, chamber: SimulatedChamber, deferred_errors: bool = False):
+        self.chamber = chamber
+        self.deferred_errors = deferred_errors
+        self.error_queue: deque = deque()
+        self._errors = ErrorQueue(self._query_error)
+
+    def set_error_checking(self, deferred: bool) -> None:
+        self.deferred_errors = deferred
+
+    def inject_error(self, code: int, message: str) -> None:
+        """Queues an instrument error, as if caused by the last command."""
+        self.error_queue.append(f'{code},"{message}"')
+
+    def drain_errors(self) -> List[QueuedError]:
+        return self._errors.drain()
+
+    def check_errors(self) -> None:
+        errors = self.drain_errors()
+        if errors:
+            raise RuntimeError("; ".join(str(error) for error in errors))
+
+    @timed("scpi.write")
+    def _write(self, cmd: str) -> None:
+        self._errors.sent(cmd)
+        _wait(self.chamber.profile.scpi_write_s)
+        self._status_check(cmd)
+
+    @timed("scpi.query")
+    def _query(self, cmd: str) -> None:
+        self._errors.sent(cmd)
+        _wait(self.chamber.profile.scpi_query_s)
+        self._status_check(cmd)
+
+    @timed("scpi.query")
+    def _query_error(self, cmd: str) -> str:
+        _wait(self.chamber.profile.scpi_query_s)
+        return self.error_queue.popleft() if self.error_queue else '0,"No error"'
+
+    def _status_check(self, cmd: str) -> None:
+        if self.deferred_errors:
+            return
+        with timed("scpi.query"):
+            _wait(self.chamber.profile.scpi_query_s)
+        if self.error_queue:
+            raise RuntimeError(f"Instrument error after {cmd}: {self.error_queue.popleft()}")
+
+    def _query_str(self, cmd: str) -> str:
+        """Answers the raw SCPI queries the generator supports."""
+        answers = {
+            "*IDN?": lambda: "Rohde&Schwarz,SMB100A,SIMULATED,0.0",
+            "OUTP?": lambda: "1" if self.chamber.rf_on else "0",
+            "FREQ?": lambda: f"{self.chamber.frequency_hz:.2f}",
+            "POW?": lambda: f"{self.chamber.power_dbm:.2f}",
+        }
+        if cmd not in answers:
+            raise ValueError(f"Unsupported simulated query: {cmd}")
+        self._query(cmd)
+        return answers[cmd]()
+
+    def get_idn(self) -> str:
+        return self._query_str("*IDN?")
+
+    def set_output_rf(self, state: bool) -> None:
+        self._write("OUTP ON" if state else "OUTP OFF")
+        self.chamber.rf_on = state
+
+    def get_output_rf_state(self) -> bool:
+        self._query("OUTP?")
+        return self.chamber.rf_on
+
+    def set_frequency(self, hz: float) -> None:
+        if hz <= 0:
+            raise ValueError(f"Frequency {hz} Hz must be greater than 0.")
+        self._write(f"FREQ {hz:.2f}")
+        self.chamber.frequency_hz = hz
+
+    def get_frequency(self) -> float:
+        self._query("FREQ?")
+        return self.chamber.frequency_hz
+
+    def set_power(self, dbm: float) -> None:
+        if not -120 <= dbm <= 20:
+            raise ValueError(f"Power {dbm} dBm is out of range (-120 to 14).")
+        self._write(f"POW {dbm:.2f}")
+        self.chamber.power_dbm = dbm
+
+    def get_power(self) -> float:
+        self._query("POW?")
+        return self.chamber.power_dbm
+
+    def safe_state(self) -> None:
+        self.set_output_rf(False)
+        self.set_power(-120)
+
+    def close(self) -> None:
+        pass
+
+
+class SimulatedAnalogInput:
+    """Stand-in for NIUSB6361Handler reading the DUT output voltage."""
+
+    def __init__(self, chamber: SimulatedChamber, device_id: str = "SimDev2"):
+        self.chamber = chamber
+        self.device_id = device_id
+
+    @timed("daq.read_analog_input")
+    def read_analog_input(self, channel: int, min_val: float = -10.0, max_val: float = 10.0,
+                          differential: bool = True) -> float:
+        _wait(self.chamber.profile.daq_read_s)
+        return self._voltage(channel)
+
+    @timed("daq.read_analog_inputs")
+    def read_analog_inputs(self, channels: List[int], min_val: float = -10.0, max_val: float = 10.0,
+                           differential: bool = True) -> List[float]:
+        _wait(self.chamber.profile.daq_read_s)
+        return [self._voltage(channel) for channel in channels]
+
+    def start_continuous(self, channel: int, rate_hz: float, buffer_s: float = 10.0, min_val: float = -10.0,
+                         max_val: float = 10.0, differential: bool = True) -> "SimulatedContinuousInput":
+        _wait(self.chamber.profile.daq_read_s)
+        return SimulatedContinuousInput(self, channel, rate_hz)
+
+    def _voltage(self, channel: int, angle: Optional[float] = None) -> float:
+        c = self.chamber
+        angle = c.current_angle() if angle is None else angle
+        return c.duts.get(channel, c.dut).output_voltage(c.incident_power(), angle, c.polarization, c.frequency_hz)
+
+    def safe_state(self) -> None:
+        self.read_analog_input(0)
+
+
+class SimulatedContinuousInput:
+    """Stand-in for ContinuousAnalogInput: samples on an exact clock, each at the angle of its instant."""
+
+    def __init__(self, analog: SimulatedAnalogInput, channel: int, rate_hz: float):
+        self._analog = analog
+        self._channel = channel
+        self.rate_hz = rate_hz
+        self._start = time.monotonic()
+        self.start_time = time.perf_counter()
+        self._taken = 0
+
+    @timed("daq.read_stream")
+    def read_available(self) -> List[float]:
+        due = int((time.monotonic() - self._start) * self.rate_hz) + 1
+        chamber = self._analog.chamber
+        samples = [self._analog._voltage(self._channel, chamber.angle_at(self._start + i / self.rate_hz))
+                   for i in range(self._taken, due)]
+        self._taken = max(self._taken, due)
+        return samples
+
+    def close(self) -> None:
+        pass
+
+
+class SimulatedRelay:
+    """
+    Stand-in for NI9485Handler keeping the port state in memory.
+
+    With ``polarization_lines`` closing a line connects the chamber to that port of
+    a dual-polarized antenna.
+    """
+
+    def __init__(self, chamber: SimulatedChamber, device_id: str = "SimDev1",
+                 polarization_lines: Optional[Dict[str, int]] = None):
+        self.chamber = chamber
+        self.device_id = device_id
+        self.port_state = 0
+        self.writes = 0
+        self._line_polarization = {line: pol for pol, line in (polarization_lines or {}).items()}
+
+    @timed("relay.write")
+    def write_relay(self, line: int, state: bool) -> None:
+        if state:
+            self._write(self.port_state | 1 << line)
+        else:
+            self._write(self.port_state & ~(1 << line))
+
+    @timed("relay.write")
+    def write_port(self, mask: int) -> None:
+        self._write(mask)
+
+    def _write(self, mask: int) -> None:
+        _wait(self.chamber.profile.relay_write_s)
+        self.writes += 1
+        closed = mask & ~self.port_state
+        self.port_state = mask
+        for line, polarization in self._line_polarization.items():
+            if closed & (1 << line):
+                self.chamber.polarization = polarization
+
+    def safe_state(self) -> None:
+        _wait(self.chamber.profile.relay_write_s)
+        self.port_state = 0
+
+
+class SimulatedCtrlAxes:
+    """Stand-in for CtrlAxesDriver with a turntable moving at a constant speed."""
+
+    def __init__(self, chamber: SimulatedChamber):
+        self.chamber = chamber
+        self._mode = "Turntable"
+        self._target: Optional[float] = None
+        self._pending = 0.0
+        self._move_start = 0.0
+        self._move_from = 0.0
+        chamber.position_source = self._position_at
+
+    @timed("uia.lookup")
+    def _ui(self) -> None:
+        _wait(self.chamber.profile.uia_action_s)
+
+    def _position_at(self, t: float) -> float:
+        """Angle at a time.monotonic() instant of the current move (the rest angle without one)."""
+        if self._target is None:
+            return self.chamber.angle
+        speed = self.chamber.profile.turntable_deg_per_s
+        distance = self._target - self._move_from
+        travelled = speed * max(0.0, t - self._move_start) if speed is not None else abs(distance)
+        if abs(distance) <= travelled:
+            return self._target
+        return self._move_from + math.copysign(travelled, distance)
+
+    def _update_position(self) -> float:
+        if self._target is not None:
+            self.chamber.angle = self._position_at(time.monotonic())
+            if self.chamber.angle == self._target:
+                self._target = None
+        return self.chamber.angle
+
+    def set_turntable_settings(self) -> None:
+        self._ui()
+        self._mode = "Turntable"
+
+    def set_malt_settings(self) -> None:
+        self._ui()
+        self._mode = "Malt"
+
+    def get_current_settings(self) -> str:
+        self._ui()
+        return self._mode
+
+    def set_target_position(self, position: int) -> None:
+        self._ui()
+        self._pending = float(position)
+
+    def click_btn_move_target_position(self) -> None:
+        self._ui()
+        if self._mode == "Turntable":
+            self._move_from = self._update_position()
+            self._target = self._pending
+            self._move_start = time.monotonic()
+        else:
+            self.chamber.malt_height = self._pending
+
+    def get_turntable_degrees(self) -> float:
+        self._ui()
+        return round(self._update_position(), 2)
+
+    def get_malt_height(self) -> float:
+        self._ui()
+        return self.chamber.malt_height
+
+    def set_malt_orientation(self, horizontal: bool = True) -> None:
+        self._ui()
+        polarization = "H" if horizontal else "V"
+        if polarization != self.chamber.polarization:
+            _wait(self.chamber.profile.polarization_s)
+        self.chamber.polarization = polarization
+
+    def click_button_stop(self) -> None:
+        self._ui()
+        self._move_from = self._update_position()
+        self._target = None
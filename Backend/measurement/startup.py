@@ -0,0 +1,127 @@
+"""
+Startup-time benchmark of the backend API.
+
+Imports the API module in a fresh interpreter with ``python -X importtime`` and
+reports its import time and the slowest imports. The hardware libraries (RsInstrument,
+nidaqmx, pywinauto), openpyxl and the measurement run module are loaded by the drivers
+and endpoints on first use, so none of them may be imported at startup.
+
+Usage::
+
+    python -m measurement.startup
+    python -m measurement.startup --block-hardware
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Import time of the API module (best of the runs) above which startup counts as regressed.
+IMPORT_BUDGET_S = 0.5
+# Libraries that only measurements and reports need.
+HARDWARE_MODULES = ("RsInstrument", "nidaqmx", "pywinauto")
+DEFERRED_MODULES = HARDWARE_MODULES + ("openpyxl", "numpy", "testowy", "drivers.visa_sessions")
+
+
+@dataclass
+class StartupResult:
+    """Import time of a module and the deferred modules it loaded anyway."""
+
+    module: str
+    import_s: float
+    loaded_deferred: List[str] = field(default_factory=list)
+    slowest: List[Tuple[str, float]] = field(default_factory=list)
+
+
+def _parse_importtime(stderr: str) -> Dict[str, float]:
+    """Returns the cumulative import time in seconds of every module in ``-X importtime`` output."""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line[len("import time:"):].split("|")
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total) / 1e6
+    return cumulative
+
+
+def measure_startup(module: str = "main", runs: int = 3, block: Tuple[str, ...] = (),
+                    env: Optional[Dict[str, str]] = None) -> StartupResult:
+    """
+    Imports the module in fresh interpreters and keeps the fastest run.
+
+    Args:
+        module: The module to import, relative to the backend directory.
+        runs: Number of interpreters started.
+        block: Modules made unimportable, as if they were not installed.
+        env: Extra environment variables of the interpreters.
+
+    Returns:
+        The import time and the deferred modules found in ``sys.modules``.
+
+    Raises:
+        RuntimeError: If the module cannot be imported.
+    """
+    script = (
+        "import json, sys\n"
+        f"sys.modules.update(dict.fromkeys({list(block)!r}))\n"
+        f"import {module}\n"
+        "print(json.dumps(sorted(name for name, m in sys.modules.items() if m is not None)))\n"
+    )
+    best: Optional[StartupResult] = None
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", script], cwd=BACKEND_DIR,
+            env={**os.environ, **(env or {})}, capture_output=True, text=True,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+        times = _parse_importtime(completed.stderr)
+        loaded = set(json.loads(completed.stdout.splitlines()[-1]))
+        result = StartupResult(
+            module=module,
+            import_s=times.get(module, 0.0),
+            loaded_deferred=[name for name in DEFERRED_MODULES if name in loaded],
+            slowest=sorted(((n, t) for n, t in times.items() if n != module), key=lambda x: -x[1])[:10],
+        )
+        if best is None or result.import_s < best.import_s:
+            best = result
+    return best
+
+
+def find_regressions(result: StartupResult, budget_s: float = IMPORT_BUDGET_S) -> List[str]:
+    """Returns a description of every deferred module loaded at startup and of an exceeded budget."""
+    regressions = [f"{result.module} imports {name} at startup" for name in result.loaded_deferred]
+    if result.import_s > budget_s:
+        regressions.append(f"{result.module} import time {result.import_s:.3f} s > budget {budget_s:.3f} s")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time benchmark of the backend API.")
+    parser.add_argument("--module", default="main", help="Module to import. Default: main.")
+    parser.add_argument("--runs", type=int, default=5, help="Interpreters started; the fastest counts.")
+    parser.add_argument("--block-hardware", action="store_true",
+                        help="Start in config-only mode with the hardware libraries unimportable.")
+    args = parser.parse_args(argv)
+
+    block = HARDWARE_MODULES if args.block_hardware else ()
+    env = {"ANTENNA_API_MODE": "config"} if args.block_hardware else None
+    result = measure_startup(args.module, args.runs, block, env)
+    print(f"{result.module}: {result.import_s * 1000:.1f} ms (budget {IMPORT_BUDGET_S * 1000:.0f} ms)")
+    for name, seconds in result.slowest:
+        print(f"  {seconds * 1000:8.1f} ms  {name}")
+    regressions = find_regressions(result)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
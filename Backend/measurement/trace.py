@@ -0,0 +1,333 @@
+"""
+Per-sample measurement traces: recording, memory-mapped reading and offline replay.
+
+A trace file holds every (power, voltage) sample of the threshold searches of a run,
+so an odd result can be examined, and a changed search algorithm evaluated, without
+running the chamber again.
+
+File layout (little endian)::
+
+    magic  b"ATRC"    4 bytes
+    version           uint16
+    record size       uint16
+    metadata length   uint32
+    metadata          JSON (run id, per-sheet frequency and ramp settings)
+    records           fixed-size samples, see SAMPLE
+
+Usage::
+
+    python -m measurement.trace summary config/traces/<run>.trace
+    python -m measurement.trace replay config/traces/<run>.trace --step-db 0.5
+"""
+import argparse
+import json
+import logging
+import mmap
+import queue
+import struct
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from drivers.test_calculation.calibration import Calibration
+from measurement.engine import RampSettings, SearchResult, search_threshold, sheet_ramps
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"ATRC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+# timestamp, point sequence number, power dBm, voltage V, angle deg, sheet index, polarization (0 V, 1 H)
+SAMPLE = struct.Struct("<dIffhHBx")
+POLARIZATIONS = ("V", "H")
+# Samples are written in batches of at most this many records.
+WRITE_BATCH = 512
+
+
+class TraceSample(NamedTuple):
+    timestamp: float
+    point: int
+    power_dbm: float
+    voltage_v: float
+    angle: int
+    sheet_index: int
+    polarization: str
+
+
+class TraceWriter:
+    """
+    Appends samples to a trace file from a background thread.
+
+    ``record`` only queues the sample, so the measurement loop never waits for the
+    disk. ``close`` drains the queue and closes the file.
+    """
+
+    def __init__(self, path: Path, metadata: Dict[str, Any]):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = json.dumps(metadata).encode("utf-8")
+        # Exclusive: a trace of another run is never overwritten.
+        self._file = open(path, "xb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, SAMPLE.size, len(meta)) + meta)
+        self._queue: "queue.SimpleQueue[Optional[Tuple]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._drain, name="trace-writer", daemon=True)
+        self._thread.start()
+        self.samples = 0
+
+    @classmethod
+    def for_campaign(cls, path: Path, run_id: str, we_config: List[Dict[str, Any]],
+                     calibration: Optional[Calibration] = None) -> "TraceWriter":
+        """
+        Opens a trace of a campaign, storing the frequency and ramp of every sheet.
+
+        Samples are recorded at the level of the ramp, i.e. in dBµV/m for a sheet
+        swept in field strength.
+        """
+        sheets = [
+            {
+                "sheet": item.get("sheet"),
+                "id": item.get("id"),
+                "frequency_hz": item.get("test_params", {}).get("frequency_hz"),
+                "ramp": asdict(ramp),
+            }
+            for item, (_, ramp) in zip(we_config, sheet_ramps(we_config, calibration))
+        ]
+        return cls(path, {"run_id": run_id, "started_at": time.time(), "sheets": sheets})
+
+    def record(self, point: int, sheet_index: int, angle: float, polarization: str,
+               power_dbm: float, voltage_v: float) -> None:
+        """Queues one sample."""
+        self._queue.put((time.time(), point, power_dbm, voltage_v, int(angle), sheet_index,
+                         POLARIZATIONS.index(polarization)))
+        self.samples += 1
+
+    def close(self) -> None:
+        """Writes the queued samples and closes the file."""
+        if self._file.closed:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _drain(self) -> None:
+        done = False
+        while not done:
+            batch = [self._queue.get()]
+            while len(batch) < WRITE_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                batch.pop()
+                done = True
+            try:
+                self._file.write(b"".join(SAMPLE.pack(*sample) for sample in batch))
+                self._file.flush()
+            except (OSError, ValueError, struct.error) as e:
+                _LOGGER.error(f"Trace write to {self.path} failed: {e}")
+
+
+class TraceReader:
+    """
+    Memory-mapped read access to a trace file.
+
+    Samples are decoded on access, so a large trace is not loaded into memory.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, meta_len = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a measurement trace.")
+        if version != VERSION or record_size != SAMPLE.size:
+            self._mmap.close()
+            raise ValueError(f"Unsupported trace version {version} (record size {record_size}) in {path}.")
+        self._offset = HEADER.size + meta_len
+        self.metadata: Dict[str, Any] = json.loads(self._mmap[HEADER.size:self._offset])
+        # A run that died mid-write may leave a partial last record.
+        self._count = (len(self._mmap) - self._offset) // SAMPLE.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> TraceSample:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self._decode(SAMPLE.unpack_from(self._mmap, self._offset + index * SAMPLE.size))
+
+    def __iter__(self) -> Iterator[TraceSample]:
+        end = self._offset + self._count * SAMPLE.size
+        for fields in SAMPLE.iter_unpack(self._mmap[self._offset:end]):
+            yield self._decode(fields)
+
+    def points(self) -> Iterator[Tuple[int, List[TraceSample]]]:
+        """Yields the samples of each measured point, in measurement order."""
+        # Grouped by point number, not by run: the DUTs of a shared ramp interleave their samples.
+        points: Dict[int, List[TraceSample]] = {}
+        for sample in self:
+            points.setdefault(sample.point, []).append(sample)
+        yield from points.items()
+
+    def ramp(self, sheet_index: int) -> RampSettings:
+        """Returns the ramp settings the sheet was measured with."""
+        return RampSettings(**self.metadata["sheets"][sheet_index]["ramp"])
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> "TraceReader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @staticmethod
+    def _decode(fields: Tuple) -> TraceSample:
+        timestamp, point, power, voltage, angle, sheet_index, polarization = fields
+        return TraceSample(timestamp, point, power, voltage, angle, sheet_index, POLARIZATIONS[polarization])
+
+
+class RecordedDut:
+    """
+    DUT model reconstructed from the recorded samples of one point.
+
+    The recorded ramp gives the activation level (lowest up-ramp power with the
+    voltage above the threshold) and the release level (highest down-ramp power with
+    the voltage below it). The model applies the same hysteresis: it activates at or
+    above the activation level and goes silent at or below the release level. Outside
+    the recorded data the DUT is assumed silent above an unseen activation and active
+    below an unseen release.
+    """
+
+    def __init__(self, samples: List[TraceSample], threshold_v: float):
+        active = [s for s in samples if s.voltage_v >= threshold_v]
+        idle = [s for s in samples if s.voltage_v < threshold_v]
+        first_active = next((i for i, s in enumerate(samples) if s.voltage_v >= threshold_v), None)
+        self.activation_dbm = samples[first_active].power_dbm if first_active is not None else None
+        released = [s.power_dbm for s in samples[first_active + 1:] if s.voltage_v < threshold_v] \
+            if first_active is not None else []
+        self.release_dbm = max(released) if released else None
+        self.active_v = max((s.voltage_v for s in active), default=threshold_v)
+        self.idle_v = min((s.voltage_v for s in idle), default=0.0)
+        self.active = False
+        self._power: Optional[float] = None
+
+    def set_power(self, dbm: float) -> None:
+        self._power = dbm
+        if self.activation_dbm is not None and dbm >= self.activation_dbm - 1e-6:
+            self.active = True
+        elif self.release_dbm is not None and dbm <= self.release_dbm + 1e-6:
+            self.active = False
+
+    def read_voltage(self) -> float:
+        return self.active_v if self.active else self.idle_v
+
+
+@dataclass
+class ReplayResult:
+    """Recorded and replayed outcome of one point."""
+
+    point: int
+    sheet_index: int
+    angle: int
+    polarization: str
+    recorded: SearchResult
+    replayed: SearchResult
+
+    @property
+    def changed(self) -> bool:
+        return (self.recorded.activation_dbm, self.recorded.stop_dbm) != \
+            (self.replayed.activation_dbm, self.replayed.stop_dbm)
+
+
+def recorded_result(samples: List[TraceSample], threshold_v: float) -> SearchResult:
+    """Reconstructs the search result the engine produced from its samples."""
+    result = SearchResult(steps=len(samples))
+    for sample in samples:
+        if result.activation_dbm is None:
+            if sample.voltage_v >= threshold_v:
+                result.activation_dbm = round(sample.power_dbm, 2)
+        elif sample.voltage_v < threshold_v:
+            result.stop_dbm = round(sample.power_dbm, 2)
+            break
+    return result
+
+
+def replay_trace(reader: TraceReader, **ramp_changes: Any) -> List[ReplayResult]:
+    """
+    Runs the threshold search against every recorded point.
+
+    Args:
+        reader: The trace.
+        **ramp_changes: RampSettings fields overriding the recorded ramp (e.g. step_db=0.5).
+
+    Returns:
+        The recorded and the replayed result of every point.
+    """
+    results = []
+    for point, samples in reader.points():
+        first = samples[0]
+        recorded_ramp = reader.ramp(first.sheet_index)
+        dut = RecordedDut(samples, recorded_ramp.threshold_v)
+        ramp = replace(recorded_ramp, **ramp_changes)
+        results.append(ReplayResult(
+            point, first.sheet_index, first.angle, first.polarization,
+            recorded_result(samples, recorded_ramp.threshold_v),
+            search_threshold(dut.set_power, dut.read_voltage, ramp),
+        ))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect and replay measurement traces.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    summary = commands.add_parser("summary", help="Print the points of a trace.")
+    summary.add_argument("trace", type=Path)
+    replay = commands.add_parser("replay", help="Replay the trace through the threshold search.")
+    replay.add_argument("trace", type=Path)
+    for name in ("start_dbm", "end_dbm", "step_db", "threshold_v", "stop_search_db"):
+        replay.add_argument(f"--{name.replace('_', '-')}", dest=name, type=float)
+    args = parser.parse_args(argv)
+
+    with TraceReader(args.trace) as reader:
+        print(f"Run {reader.metadata.get('run_id')}: {len(reader)} samples")
+        if args.command == "summary":
+            for point, samples in reader.points():
+                first = samples[0]
+                result = recorded_result(samples, reader.ramp(first.sheet_index).threshold_v)
+                print(f"#{point:4d} sheet {first.sheet_index} {first.angle:4d} deg {first.polarization}: "
+                      f"activation {result.activation_dbm} stop {result.stop_dbm} ({len(samples)} samples)")
+            return 0
+
+        changes = {name: getattr(args, name) for name in ("start_dbm", "end_dbm", "step_db", "threshold_v",
+                                                         "stop_search_db") if getattr(args, name) is not None}
+        results = replay_trace(reader, **changes)
+        for r in results:
+            marker = "*" if r.changed else " "
+            print(f"{marker}#{r.point:4d} sheet {r.sheet_index} {r.angle:4d} deg {r.polarization}: "
+                  f"activation {r.recorded.activation_dbm} -> {r.replayed.activation_dbm}, "
+                  f"stop {r.recorded.stop_dbm} -> {r.replayed.stop_dbm}, "
+                  f"steps {r.recorded.steps} -> {r.replayed.steps}")
+        recorded_steps = sum(r.recorded.steps for r in results)
+        replayed_steps = sum(r.replayed.steps for r in results)
+        print(f"{sum(r.changed for r in results)}/{len(results)} points changed, "
+              f"steps {recorded_steps} -> {replayed_steps}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
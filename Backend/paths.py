@@ -3,3 +3,5 @@ from pathlib import Path
 ROOT = Path(__file__).parent
 CONFIG = ROOT / "config"
 RESULTS_DIR = "results"
+# Typy anten i ich limity czułości (wspólne z frontendem)
+ANTENNAS_FILE = ROOT.parent / "Frontend" / "public" / "antennas.json"
@@ -0,0 +1,54 @@
+from typing import Any, Dict, List, Optional
+
+ROWS = "rows"
+COLUMNAR = "columnar"
+FORMATS = (ROWS, COLUMNAR)
+
+
+def result_cursor(sheets: List[Dict[str, Any]]) -> int:
+    """Highest sheet revision in result.json; 0 before any sheet is saved."""
+    return max((int(sheet.get("revision") or 0) for sheet in sheets), default=0)
+
+
+def filter_sheets(sheets: List[Dict[str, Any]], sheet: Optional[str] = None,
+                  since: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Selects the sheets of a result.json.
+
+    Args:
+        sheets: The parsed result.json.
+        sheet: Only the sheet with this identifier (compared as text).
+        since: Only sheets saved after this cursor. A cursor ahead of the file
+            (the results were reset by a new campaign) selects every sheet.
+
+    Returns:
+        The selected sheets, in file order.
+    """
+    if since is not None and since > result_cursor(sheets):
+        since = None
+    return [
+        item for item in sheets
+        if (sheet is None or str(item.get("sheet")) == sheet)
+        and (since is None or int(item.get("revision") or 0) > since)
+    ]
+
+
+def to_columnar(sheets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Converts the result rows of every sheet to one array per field.
+
+    The sheet fields other than ``result`` are kept; ``columns`` maps every field
+    found in the rows (in order of first appearance) to its values, None where a
+    row lacks the field.
+    """
+    columnar = []
+    for item in sheets:
+        rows = item.get("result") or []
+        names: Dict[str, None] = {}
+        for row in rows:
+            names.update(dict.fromkeys(row))
+        entry = {key: value for key, value in item.items() if key != "result"}
+        entry["rows"] = len(rows)
+        entry["columns"] = {name: [row.get(name) for row in rows] for name in names}
+        columnar.append(entry)
+    return columnar
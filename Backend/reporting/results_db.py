@@ -0,0 +1,198 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from measurement.compiled_plan import CompiledSheet
+
+RESULTS_DB_FILE = "results.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    campaign_order TEXT,
+    simulated INTEGER NOT NULL DEFAULT 0,
+    points INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS measurements (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    sheet TEXT,
+    config_id TEXT,
+    antenna TEXT,
+    dut_serial TEXT,
+    frequency_hz INTEGER NOT NULL,
+    angle INTEGER NOT NULL,
+    polarization TEXT NOT NULL,
+    activation_dbm REAL,
+    stop_dbm REAL,
+    sensitivity_db REAL,
+    steps INTEGER,
+    measured_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sheet_verdicts (
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    sheet TEXT NOT NULL,
+    config_id TEXT NOT NULL,
+    antenna TEXT,
+    dut_serial TEXT,
+    frequency_hz INTEGER,
+    verdict TEXT,
+    worst_margin_db REAL,
+    PRIMARY KEY (run_id, sheet, config_id)
+);
+CREATE INDEX IF NOT EXISTS idx_measurements_antenna_freq_angle ON measurements (antenna, frequency_hz, angle);
+CREATE INDEX IF NOT EXISTS idx_measurements_dut_serial ON measurements (dut_serial);
+CREATE INDEX IF NOT EXISTS idx_measurements_measured_at ON measurements (measured_at);
+CREATE INDEX IF NOT EXISTS idx_measurements_run ON measurements (run_id);
+CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs (started_at);
+"""
+
+
+class ResultsDatabase:
+    """
+    SQLite store of every measured point of every campaign.
+
+    Each run is written point by point as the results arrive, so an interrupted
+    run keeps what it measured. Aggregates across campaigns are computed in SQL.
+
+    Args:
+        path: The database file; created with its schema on first use.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._migrate()
+        self._conn.executescript(SCHEMA)
+
+    def _migrate(self) -> None:
+        """Rebuilds a sheet_verdicts table keyed by (run_id, sheet) with the config_id column."""
+        columns = [row["name"] for row in self._conn.execute("PRAGMA table_info(sheet_verdicts)")]
+        if not columns or "config_id" in columns:
+            return
+        with self._conn:
+            self._conn.execute("ALTER TABLE sheet_verdicts RENAME TO sheet_verdicts_old")
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(
+                "INSERT INTO sheet_verdicts SELECT run_id, sheet, '', antenna, dut_serial, frequency_hz, verdict, "
+                "worst_margin_db FROM sheet_verdicts_old"
+            )
+            self._conn.execute("DROP TABLE sheet_verdicts_old")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "ResultsDatabase":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    # --- Writing ---------------------------------------------------------------------
+
+    def start_run(self, run_id: str, order: str = "", simulated: bool = False) -> None:
+        """
+        Raises:
+            sqlite3.IntegrityError: If the run id is already used.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, started_at, campaign_order, simulated) VALUES (?, ?, ?, ?)",
+                (run_id, time.time(), order, int(simulated)),
+            )
+
+    def record_point(self, run_id: str, sheet: "CompiledSheet", angle: int, polarization: str,
+                     activation_dbm: Optional[float], stop_dbm: Optional[float],
+                     sensitivity_db: Optional[float] = None, steps: int = 0) -> None:
+        """Stores one measured point of a sheet."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO measurements (run_id, sheet, config_id, antenna, dut_serial, frequency_hz, angle, "
+                "polarization, activation_dbm, stop_dbm, sensitivity_db, steps, measured_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, str(sheet.sheet), str(sheet.config_id), sheet.antenna, sheet.dut_serial,
+                 int(sheet.frequency_hz), int(angle), polarization,
+                 activation_dbm, stop_dbm, sensitivity_db, steps, time.time()),
+            )
+            self._conn.execute("UPDATE runs SET points = points + 1 WHERE run_id = ?", (run_id,))
+
+    def record_verdict(self, run_id: str, sheet: "CompiledSheet", verdict: Dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sheet_verdicts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, str(sheet.sheet), str(sheet.config_id), sheet.antenna, sheet.dut_serial, int(sheet.frequency_hz),
+                 verdict.get("verdict"), verdict.get("worst_margin_db")),
+            )
+
+    def finish_run(self, run_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE runs SET finished_at = ? WHERE run_id = ?", (time.time(), run_id))
+
+    # --- Queries ---------------------------------------------------------------------
+
+    def runs(self, antenna: Optional[str] = None, dut_serial: Optional[str] = None,
+             limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent runs, optionally only those that measured the antenna or DUT."""
+        where, args = self._filters(antenna=antenna, dut_serial=dut_serial)
+        sql = (
+            "SELECT r.run_id, r.started_at, r.finished_at, r.campaign_order, r.simulated, r.points, "
+            "GROUP_CONCAT(DISTINCT m.antenna) AS antennas, GROUP_CONCAT(DISTINCT m.dut_serial) AS dut_serials "
+            "FROM runs r LEFT JOIN measurements m ON m.run_id = r.run_id"
+            f"{where} GROUP BY r.run_id ORDER BY r.started_at DESC LIMIT ?"
+        )
+        return self._query(sql, args + [limit])
+
+    def activation_by_angle(self, antenna: str, frequency_hz: int, polarization: Optional[str] = None,
+                            dut_serial: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Activation and sensitivity statistics per angle and polarization across all runs."""
+        where, args = self._filters(antenna=antenna, frequency_hz=frequency_hz, polarization=polarization,
+                                    dut_serial=dut_serial)
+        sql = (
+            "SELECT m.angle, m.polarization, COUNT(m.activation_dbm) AS n, "
+            "AVG(m.activation_dbm) AS mean_activation_dbm, MIN(m.activation_dbm) AS min_activation_dbm, "
+            "MAX(m.activation_dbm) AS max_activation_dbm, "
+            "AVG(m.activation_dbm * m.activation_dbm) - AVG(m.activation_dbm) * AVG(m.activation_dbm) AS variance, "
+            "AVG(m.sensitivity_db) AS mean_sensitivity_db, MIN(m.sensitivity_db) AS min_sensitivity_db "
+            f"FROM measurements m{where} GROUP BY m.angle, m.polarization ORDER BY m.angle, m.polarization"
+        )
+        return self._query(sql, args)
+
+    def drift(self, antenna: str, frequency_hz: int, angle: Optional[int] = None,
+              polarization: Optional[str] = None, dut_serial: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Activation statistics per run in chronological order, with the change of the
+        mean activation relative to the first run.
+        """
+        where, args = self._filters(antenna=antenna, frequency_hz=frequency_hz, angle=angle,
+                                    polarization=polarization, dut_serial=dut_serial)
+        sql = (
+            "WITH per_run AS ("
+            " SELECT m.run_id, r.started_at, COUNT(m.activation_dbm) AS n, AVG(m.activation_dbm) AS mean_activation_dbm,"
+            " MIN(m.activation_dbm) AS min_activation_dbm, MAX(m.activation_dbm) AS max_activation_dbm"
+            f" FROM measurements m JOIN runs r ON r.run_id = m.run_id{where} GROUP BY m.run_id)"
+            " SELECT per_run.*, mean_activation_dbm - FIRST_VALUE(mean_activation_dbm)"
+            " OVER (ORDER BY started_at) AS drift_db FROM per_run ORDER BY started_at"
+        )
+        return self._query(sql, args)
+
+    @staticmethod
+    def _filters(**filters: Any):
+        clauses, args = [], []
+        for column, value in filters.items():
+            if value is not None:
+                clauses.append(f"m.{column} = ?")
+                args.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), args
+
+    def _query(self, sql: str, args: List[Any]) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, args)]
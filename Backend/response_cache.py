@@ -0,0 +1,117 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+try:
+    # Optional faster encoder; the standard library is used without it.
+    import orjson
+except ImportError:
+    orjson = None
+
+# Responses smaller than this are sent uncompressed; gzip does not pay off for them.
+GZIP_MIN_BYTES = 1024
+JSON_MEDIA_TYPE = "application/json"
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    """Serialized JSON response with its ETag and, above the threshold, its gzip form."""
+
+    body: bytes
+    etag: str
+    gzipped: Optional[bytes] = None
+
+    @classmethod
+    def from_data(cls, data: Any) -> "CachedPayload":
+        return cls.from_bytes(dumps(data))
+
+    @classmethod
+    def from_bytes(cls, body: bytes) -> "CachedPayload":
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        gzipped = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+        return cls(body, etag, gzipped)
+
+
+def dumps(data: Any) -> bytes:
+    """Serializes to compact UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def file_signature(*paths: Path) -> Tuple:
+    """Identifies the current version of files by modification time and size (None if missing)."""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append((str(path), None))
+    return tuple(signature)
+
+
+class ResponseCache:
+    """
+    Serialized JSON responses kept in memory until their source changes.
+
+    Every entry is built by a callable and stored with the signature of its sources
+    (see ``file_signature``); a request with an unchanged signature gets the stored
+    bytes without reading or serializing anything. Beyond ``max_entries`` the
+    oldest entry is dropped.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[Tuple, CachedPayload]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, signature: Tuple, build: Callable[[], Any]) -> CachedPayload:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        payload = CachedPayload.from_data(build())
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (signature, payload)
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+        return payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def cached_response(request: Request, payload: CachedPayload, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Returns the payload as a response to the request.
+
+    ``If-None-Match`` with the current ETag gives 304 without a body; clients that
+    accept gzip get the compressed body. The client must revalidate every time
+    (``no-cache``), since the files change whenever a configuration is saved.
+    """
+    headers = {**(headers or {}), "ETag": payload.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if _etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=304, headers=headers)
+    if payload.gzipped is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(payload.gzipped, media_type=JSON_MEDIA_TYPE, headers={**headers, "Content-Encoding": "gzip"})
+    return Response(payload.body, media_type=JSON_MEDIA_TYPE, headers=headers)
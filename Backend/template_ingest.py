@@ -0,0 +1,199 @@
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from drivers.Exel_functions.manage_data import inspect_template
+
+# Present while a template and its frequency.json are being swapped in (see TemplateIngestor._publish).
+COMMIT_MARKER = ".template_ingest.commit"
+
+
+def _write_synced(path: Path, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Writes a file through a temporary sibling and swaps it in with os.replace."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        _write_synced(tmp_path, data)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+@dataclass
+class IngestJob:
+    """Status of a single template upload."""
+
+    job_id: str
+    filename: str
+    status: str = "queued"  # queued -> running -> done | failed
+    submitted_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    message: str = ""
+    report: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class TemplateIngestor:
+    """
+    Parses uploaded report templates in a worker process.
+
+    The upload is accepted immediately and identified by a job id. The workbook is
+    loaded and validated in a separate process, so large templates do not block the
+    API event loop. A job is "queued" until a worker takes it. The template and
+    ``frequency.json`` are published as a pair, and only when the template was
+    recognised; a failed job leaves both files untouched. A worker process that dies
+    breaks the pool, which is then replaced for the next upload.
+    """
+
+    def __init__(self, template_path: Path, frequency_path: Path, max_workers: int = 1, history: int = 20):
+        self.template_path = template_path
+        self.frequency_path = frequency_path
+        self._max_workers = max_workers
+        self._history = history
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, IngestJob] = {}
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._publish_lock = threading.Lock()
+        self._recover()
+
+    def submit(self, content: bytes, filename: str = "") -> IngestJob:
+        """Queues the template content for parsing and returns the new job."""
+        job = IngestJob(job_id=uuid.uuid4().hex, filename=filename)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._trim_history()
+            try:
+                pool = self._pool()
+                future = pool.submit(inspect_template, content)
+            except BrokenProcessPool:
+                self._discard_pool()
+                pool = self._pool()
+                future = pool.submit(inspect_template, content)
+            self._futures[job.job_id] = future
+        future.add_done_callback(lambda fut: self._finish(job, content, fut, pool))
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self._refresh(job)
+            return job
+
+    def list_jobs(self) -> List[IngestJob]:
+        with self._lock:
+            for job in self._jobs.values():
+                self._refresh(job)
+            return list(self._jobs.values())
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        return self._executor
+
+    def _discard_pool(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _refresh(self, job: IngestJob) -> None:
+        # The pool marks a future running when a worker process takes it.
+        future = self._futures.get(job.job_id)
+        if job.status == "queued" and future is not None and future.running():
+            job.status = "running"
+
+    def _finish(self, job: IngestJob, content: bytes, future: Future, pool: ProcessPoolExecutor) -> None:
+        """Publishes the parsed template if validation succeeded."""
+        with self._lock:
+            self._futures.pop(job.job_id, None)
+        try:
+            frequencies, report = future.result()
+            job.report = report
+            if not frequencies:
+                job.status = "failed"
+                job.message = (
+                    "Nie udało się odczytać danych o częstotliwościach z pliku. Sprawdź, czy format pliku Excel "
+                    "jest zgodny z oczekiwanym szablonem (dane w kolumnach V-AD, nagłówki w kolumnie T)."
+                )
+                return
+
+            self._publish(content, json.dumps(frequencies, indent=2, ensure_ascii=False).encode("utf-8"))
+            job.status = "done"
+            job.message = f"Szablon zapisany. Zaktualizowano {len(frequencies)} częstotliwości."
+        except BrokenProcessPool as e:
+            print(f"Proces przetwarzania szablonu przerwany: {e}")
+            with self._lock:
+                if self._executor is pool:
+                    self._discard_pool()
+            job.status = "failed"
+            job.message = "Proces przetwarzania pliku został przerwany. Prześlij plik ponownie."
+        except Exception as e:
+            print(f"Błąd przetwarzania szablonu Excel: {e}")
+            job.status = "failed"
+            job.message = f"Wystąpił błąd serwera podczas przetwarzania pliku: {str(e)}"
+        finally:
+            job.finished_at = time.time()
+
+    def _pending_paths(self) -> Dict[str, Path]:
+        return {"template": self.template_path.with_name(f".{self.template_path.name}.pending"),
+                "frequency": self.frequency_path.with_name(f".{self.frequency_path.name}.pending")}
+
+    def _publish(self, template: bytes, frequencies: bytes) -> None:
+        """
+        Swaps in the template and its frequencies as one pair.
+
+        Both files are written to pending names first. The commit marker is written
+        only when both are on disk, and the pending files are then renamed in a fixed
+        order. After a crash, ``_recover`` finishes a swap whose marker exists and
+        discards pending files without one, so the two never come from different uploads.
+        """
+        pending = self._pending_paths()
+        self.template_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._publish_lock:
+            _write_synced(pending["template"], template)
+            _write_synced(pending["frequency"], frequencies)
+            write_atomic(self.template_path.with_name(COMMIT_MARKER), b"")
+            self._recover()
+
+    def _recover(self) -> None:
+        """Completes or rolls back a pair swap interrupted by a crash."""
+        pending = self._pending_paths()
+        marker = self.template_path.with_name(COMMIT_MARKER)
+        targets = {"template": self.template_path, "frequency": self.frequency_path}
+        committed = marker.exists()
+        for name in ("template", "frequency"):
+            if pending[name].exists():
+                if committed:
+                    os.replace(pending[name], targets[name])
+                else:
+                    pending[name].unlink()
+        if committed:
+            marker.unlink()
+
+    def _trim_history(self) -> None:
+        finished = [j for j in self._jobs.values() if j.finished_at is not None]
+        for job in sorted(finished, key=lambda j: j.finished_at)[: max(0, len(self._jobs) - self._history)]:
+            del self._jobs[job.job_id]
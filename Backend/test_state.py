@@ -1,13 +1,34 @@
+import threading
+
+
 class TestState:
     """Prosta klasa do zarządzania stanem testu w pamięci."""
     def __init__(self):
         self._is_running = False
+        self._verdicts = {}
+        self._lock = threading.Lock()
 
     def start(self):
         self._is_running = True
+        self._verdicts = {}
+
+    def try_start(self) -> bool:
+        """Rozpoczyna test, jeśli żaden nie trwa (atomowo - ręczny start i kolejka kampanii)."""
+        with self._lock:
+            if self._is_running:
+                return False
+            self.start()
+            return True
 
     def stop(self):
         self._is_running = False
 
     def is_active(self):
-        return self._is_running
\ No newline at end of file
+        return self._is_running
+
+    def set_verdict(self, key: str, verdict: dict):
+        """Zapisuje bieżącą ocenę pass/fail arkusza pod kluczem "<sheet>/<id>"."""
+        self._verdicts[key] = verdict
+
+    def verdicts(self) -> dict:
+        return dict(self._verdicts)
@@ -1,149 +1,395 @@
 from test_state import TestState
-import time
 import json
-from drivers.test_calculation.sensitivity_value import calculate_sensitivity
+import sqlite3
+from collections import Counter
+from drivers.instrumentation import METRICS
+from drivers.ni.relay_router import RELAY_WEAR_FILE, save_relay_wear
+from drivers.test_calculation.calibration import SheetCalibration, load_calibration
+from measurement.bench import Bench, load_bench_config, open_bench
+from measurement.checkpoint import CampaignCheckpoint, point_key
+from measurement.compiled_plan import CompiledCampaign, CompiledSheet, load_compiled_campaign
+from measurement.engine import DBM, SweepEngine
+from measurement.limits import SheetVerdict, load_antenna_limits
+from measurement.scan import ScanSettings, run_rotation_scan
+from measurement.predictor import HISTORY_FILE, ThresholdPredictor, load_history, save_history
+from measurement.planner import ANGLE_MAJOR, OperationCosts
+from measurement.trace import TraceWriter
+from reporting.result_collector import ResultCollector
+from reporting.results_db import RESULTS_DB_FILE, ResultsDatabase
 from pathlib import Path
+from paths import ANTENNAS_FILE
+import time
+import uuid
+
+CHECKPOINT_FILE = "checkpoint.jsonl"
+TIMING_FILE = "result_timing.json"
+TRACES_DIR = "traces"
+SCAN_RESULT_FILE = "scan_result.json"
+
+
+def new_run_id() -> str:
+    """Identyfikator przebiegu: czas startu i losowy sufiks (przebiegi z kolejki mogą ruszyć w tej samej sekundzie)."""
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def load_campaign_plan(config_dir: Path, order: str = ANGLE_MAJOR):
+    """
+    Wczytuje skompilowaną kampanię (kompilowaną przy zapisie we_config.json)
+    i buduje jej plan z szacowanym czasem trwania.
+    """
+    campaign = load_compiled_campaign(config_dir)
+    costs = OperationCosts.load(config_dir / "operation_costs.json")
+    return campaign, costs, campaign.plan(costs, order)
+
+
+def describe_resume(config_dir: Path) -> dict:
+    """
+    Opisuje przerwaną kampanię możliwą do wznowienia.
+
+    Raises:
+        ValueError: Gdy nie ma czego wznawiać lub konfiguracja się zmieniła.
+    """
+    campaign, costs, _ = load_campaign_plan(config_dir)
+    restored = CampaignCheckpoint(config_dir / CHECKPOINT_FILE).load_for(campaign.we_config)
+    plan = campaign.plan(costs, restored.order or ANGLE_MAJOR)
+    remaining = [p for p in plan.points if point_key(p) not in restored.records]
+    last = restored.last
+    return {
+        "order": plan.order,
+        "completed_points": len(restored.records),
+        "remaining_points": len(remaining),
+        "saved_s": round(restored.saved_s, 1),
+        "last_point": {"sheet": last.sheet, "angle": last.angle, "polarization": last.polarization} if last else None,
+    }
+
+
+def add_sensitivity(data: list, sheet_cal: SheetCalibration) -> None:
+    """
+    Dopisuje do wierszy wyników czułość (dBµV/m i µV/m) dla aktywacji H i V.
+
+    Tłumienie kabla i współczynnik anteny pochodzą z kalibracji arkusza
+    (``CompiledSheet.calibration``: tablice config/calibration, a bez nich wartości
+    arkusza). Gdy brakuje danych, czułość nie jest liczona (None) - nie ma wartości domyślnych.
+    """
+    if not sheet_cal.complete:
+        print(f"Uwaga: niepełna kalibracja arkusza ({sheet_cal.to_dict()}) - czułość nie zostanie policzona.")
+
+    for row in data:
+        # Dla polaryzacji H (Activation)
+        h_db, h_uv = sheet_cal.field_strength(row.get("genPolarH_act"))
+        row["sens_genPolarH_act_db"] = h_db
+        row["sens_genPolarH_act_uv"] = h_uv
+
+        # Dla polaryzacji V (Activation)
+        v_db, v_uv = sheet_cal.field_strength(row.get("genPolarV_act"))
+        row["sens_genPolarV_act_db"] = v_db
+        row["sens_genPolarV_act_uv"] = v_uv
+
+
+def save_sheet_result(result_file_path: Path, campaign: CompiledCampaign, sheet: CompiledSheet, data: list,
+                      verdict: dict = None) -> None:
+    """Zapisuje wyniki jednego arkusza (i jego ocenę pass/fail) do result.json, zachowując pozostałe arkusze."""
+    all_sheets_data = []
+    # Sprawdź czy plik istnieje, jeśli tak - wczytaj
+    if result_file_path.exists():
+        with open(result_file_path, "r", encoding="utf-8") as f:
+            try:
+                all_sheets_data = json.load(f)
+            except json.JSONDecodeError:
+                all_sheets_data = []
+
+    # Jeśli plik nie istniał lub był pusty, zainicjalizuj strukturę z kampanii
+    if not all_sheets_data:
+        all_sheets_data = campaign.result_skeleton()
+
+    for entry in all_sheets_data:
+        if (entry.get("sheet"), entry.get("id")) == sheet.key:
+            entry["result"] = data
+            # Aktualizacja pól informacyjnych
+            entry["antenna"] = sheet.antenna
+            entry["frequency_mhz"] = sheet.frequency_mhz
+            # Kilka DUT w komorze jednocześnie (concurrent_duts): arkusz identyfikuje swój DUT
+            if sheet.dut_serial:
+                entry["dut_serial"] = sheet.dut_serial
+            if verdict is not None:
+                entry["verdict"] = verdict
+            # Kolejny numer zapisu arkusza - kursor GET /download-data?since=
+            entry["revision"] = max((int(s.get("revision") or 0) for s in all_sheets_data), default=0) + 1
+            break
+
+    # Zapisz całość (tryb 'w' utworzy plik jeśli nie istnieje)
+    with open(result_file_path, "w", encoding="utf-8") as f:
+        json.dump(all_sheets_data, f, indent=2, ensure_ascii=False)
+
+
+def save_timing_breakdown(result_file_path: Path, points_measured: int, prediction: dict = None) -> dict:
+    """Zapisuje rozkład czasu przebiegu (histogramy operacji i trafność predykcji progu) obok result.json."""
+    breakdown = METRICS.snapshot()
+    breakdown["points_measured"] = points_measured
+    if prediction is not None:
+        breakdown["prediction"] = prediction
+    with open(result_file_path.with_name(TIMING_FILE), "w", encoding="utf-8") as f:
+        json.dump(breakdown, f, indent=2, ensure_ascii=False)
+    return breakdown
+
+
+def _save_completed_sheet(result_file_path: Path, campaign: CompiledCampaign, sheet: CompiledSheet,
+                          collector: ResultCollector, verdict: SheetVerdict = None) -> None:
+    """Liczy czułość i zapisuje kompletny arkusz do result.json."""
+    data = collector.get_data()
+    add_sensitivity(data, sheet.calibration)
+    save_sheet_result(result_file_path, campaign, sheet, data, verdict.to_dict() if verdict else None)
+    print(
+        f"Zapisano wyniki dla Sheet {sheet.sheet}, ID {sheet.config_id}"
+        + (f" (ocena: {verdict.verdict})" if verdict else "")
+    )
+
+
+def _publish_verdict(state: TestState, sheet: CompiledSheet, verdict: SheetVerdict) -> None:
+    # Klucz (sheet, id) jak w result.json - kilka konfiguracji może mieć ten sam numer arkusza (lub brak)
+    state.set_verdict(f"{sheet.sheet}/{sheet.config_id}",
+                      {"sheet": sheet.sheet, "id": sheet.config_id, **verdict.to_dict()})
+
+
+def run_antenna_test(state: TestState, result_file_path: Path, order: str = ANGLE_MAJOR, resume: bool = False,
+                     config_dir: Path = None, campaign: CompiledCampaign = None, bench: Bench = None) -> bool:
+    """
+    Wykonuje kampanię pomiarową dla wszystkich konfiguracji z we_config.json.
+
+    Punkty (arkusz, kąt, polaryzacja) są wykonywane w kolejności planu kampanii.
+    Każdy zmierzony punkt jest zapisywany w pliku checkpoint.jsonl; z ``resume=True``
+    punkty zapisane przez przerwany test są pomijane, a ich wyniki przywracane.
+    Wyniki arkusza trafiają do result.json, gdy wszystkie jego punkty są zmierzone.
+    Po każdym punkcie arkusz jest oceniany względem limitów anteny (antennas.json);
+    z ``abort_sheet_on_fail`` pozostałe punkty arkusza, który już nie spełnia limitu, są pomijane.
 
+    Kolejka kampanii przekazuje zamrożoną kampanię (``campaign``), katalog konfiguracji
+    stanowiska (``config_dir``: kalibracja, koszty, baza wyników) oddzielny od katalogu
+    wyników zadania oraz stanowisko otwarte na całą kolejkę (``bench``), które po
+    przebiegu jest tylko ustawiane w stan bezpieczny, a nie zamykane.
 
-def run_antenna_test(state: TestState, result_file_path: Path):
-    """Symulacja pracy anteny w tle dla wszystkich konfiguracji z we_config.json."""
-    we_config_path = result_file_path.parent / "we_config.json"
-    
-    if not we_config_path.exists():
+    Returns:
+        True, gdy zmierzono wszystkie punkty kampanii.
+    """
+    run_dir = result_file_path.parent
+    config_dir = config_dir or run_dir
+    we_config_path = config_dir / "we_config.json"
+
+    if campaign is None and not we_config_path.exists():
         print(f"Błąd: Nie znaleziono pliku konfiguracji {we_config_path}")
         state.stop()
-        return
+        return False
+
+    checkpoint = CampaignCheckpoint(run_dir / CHECKPOINT_FILE)
+    try:
+        # Kampania skompilowana i sprawdzona przy zapisie (rampy, kalibracja, punkty);
+        # błąd konfiguracji pojawia się przed otwarciem stanowiska
+        if campaign is None:
+            campaign, costs, plan = load_campaign_plan(config_dir, order)
+        else:
+            costs = OperationCosts.load(config_dir / "operation_costs.json")
+            plan = campaign.plan(costs, order)
+        we_config, sheets = campaign.we_config, campaign.sheets
+        calibration = load_calibration(config_dir)
+        ramps = campaign.ramps
+        if resume:
+            restored = checkpoint.load_for(we_config)
+            if restored.order and restored.order != plan.order:
+                plan = campaign.plan(costs, restored.order)
+            completed = restored.records
+        else:
+            checkpoint.start(we_config, plan.order)
+            completed = {}
+    except Exception as e:
+        print(f"Błąd odczytu we_config.json lub punktu kontrolnego: {e}")
+        state.stop()
+        return False
+
+    summary = plan.summary()
+    print(
+        f"Rozpoczynanie sekwencji testów ({len(we_config)} konfiguracji, {summary['points']} punktów, "
+        f"kolejność: {plan.order}). Szacowany czas: {summary['estimated_s']:.0f} s "
+        f"(kolejność arkuszy: {summary['naive_estimated_s']:.0f} s, oszczędność {summary['saving_s']:.0f} s)."
+    )
+
+    collectors = {sheet.key: ResultCollector() for sheet in sheets}
+    remaining = Counter(sheets[point.sheet_index].key for point in plan.points)
+    # Ocena pass/fail względem limitów anteny, aktualizowana po każdym punkcie
+    limits = load_antenna_limits(ANTENNAS_FILE)
+    verdicts = {
+        sheet.key: SheetVerdict(limits.get(sheet.antenna), sheet.calibration, remaining[sheet.key])
+        for sheet in sheets
+    }
+    for record in completed.values():
+        key = sheets[record.sheet_index].key
+        collectors[key].add_measurement(record.angle, record.polarization, record.activation_dbm, record.stop_dbm)
+        verdicts[key].add(record.angle, record.polarization, record.activation_dbm, record.stop_dbm)
+        remaining[key] -= 1
+    for sheet in sheets:
+        key = sheet.key
+        if remaining[key] > 0 and sheet.abort_on_fail and verdicts[key].has_failed:
+            verdicts[key].aborted = True
+            remaining[key] = 0
+        _publish_verdict(state, sheet, verdicts[key])
+    if completed:
+        print(
+            f"Wznawianie testu: pominięto {len(completed)} zmierzonych punktów "
+            f"(zaoszczędzony czas stanowiska: {restored.saved_s:.0f} s)."
+        )
+        # Arkusze zakończone przed przerwaniem mogły nie zdążyć trafić do result.json
+        for sheet in sheets:
+            if remaining[sheet.key] == 0 and collectors[sheet.key].get_data():
+                _save_completed_sheet(result_file_path, campaign, sheet, collectors[sheet.key], verdicts[sheet.key])
 
+    own_bench = bench is None
     try:
-        with open(we_config_path, "r", encoding="utf-8") as f:
-            we_config = json.load(f)
+        if own_bench:
+            bench = open_bench(load_bench_config(config_dir / "bench_config.json"))
     except Exception as e:
-        print(f"Błąd odczytu we_config.json: {e}")
+        print(f"Błąd inicjalizacji stanowiska: {e}")
         state.stop()
-        return
-
-    print(f"Rozpoczynanie sekwencji testów ({len(we_config)} konfiguracji)...")
-
-    for config_item in we_config:
-        if not state.is_active():
-            print("Test zatrzymany przez użytkownika.")
-            return
-
-        sheet_id = config_item.get("sheet")
-        obj_id = config_item.get("id")
-        params = config_item.get("test_params", {})
-
-        print(f"Testowanie: Sheet {sheet_id}, ID {obj_id}...")
-
-        # Symulacja czasu trwania pomiaru dla jednego arkusza (np. 5s)
-        for _ in range(5):
-            if not state.is_active():
-                return
-            time.sleep(1)
-
-        # Przykładowe dane wynikowe (szkielet)
-        data = [
-            {"angle": "0°", "genPolarH_act": -10, "genPolarH_stop": 0, "genPolarV_act": 0, "genPolarV_stop": 0},
-            {"angle": "30°", "genPolarH_act": 120, "genPolarH_stop": 60, "genPolarV_act": 90, "genPolarV_stop": 50},
-            {"angle": "60°", "genPolarH_act": 100, "genPolarH_stop": 50, "genPolarV_act": 80, "genPolarV_stop": 40},
-  {
-    "angle": "90°",
-    "genPolarH_act": 100, "genPolarH_stop": 60, "genPolarV_act": 80, "genPolarV_stop": 40
-  },
-  {
-    "angle": "120°",
-    "genPolarH_act": 100, "genPolarH_stop": 50, "genPolarV_act": 80, "genPolarV_stop": 40
-  },
-  {
-    "angle": "150°",
-    "genPolarH_act": 100, "genPolarH_stop": 50, "genPolarV_act": 80, "genPolarV_stop": 40
-  },
-  {
-    "angle": "180°",
-    "genPolarH_act": 100, "genPolarH_stop": 50, "genPolarV_act": 80, "genPolarV_stop": 40
-  },
-  {
-    "angle": "210°",
-    "genPolarH_act": 100, "genPolarH_stop": 50, "genPolarV_act": 80, "genPolarV_stop": 40
-  },
-  {
-    "angle": "240°",
-    "genPolarH_act": 100, "genPolarH_stop": 50, "genPolarV_act": 80, "genPolarV_stop": 40
-  },
-  {
-    "angle": "270°",
-    "genPolarH_act": 100, "genPolarH_stop": 50, "genPolarV_act": 80, "genPolarV_stop": 40
-  },
-  {
-    "angle": "300°",
-    "genPolarH_act": 100, "genPolarH_stop": 50, "genPolarV_act": 80, "genPolarV_stop": 40
-  },
-  {
-    "angle": "330°",
-    "genPolarH_act": 100, "genPolarH_stop": 50, "genPolarV_act": 80, "genPolarV_stop": 40
-  }
-    ]
-    
-        # Parametry do obliczeń pobrane z konfiguracji
-        calc_freq = params.get("frequency_hz", 409987500) / 1000000.0  # Hz -> MHz
-        calc_distance = params.get("distance", 3.0)
-        calc_wire_loss = params.get("wire_loss_db", 4.79)
-        calc_ant_factor = params.get("antenna_factor_dbm_1", 17.8)
-
-        # Obliczanie sensitivity i dodawanie do wyników
-        for row in data:
-            # Dla polaryzacji H (Activation)
-            h_db, h_uv = calculate_sensitivity(row.get("genPolarH_act"), calc_freq, calc_distance, calc_wire_loss, calc_ant_factor)
-            row["sens_genPolarH_act_db"] = h_db
-            row["sens_genPolarH_act_uv"] = h_uv
-
-            # Dla polaryzacji V (Activation)
-            v_db, v_uv = calculate_sensitivity(row.get("genPolarV_act"), calc_freq, calc_distance, calc_wire_loss, calc_ant_factor)
-            row["sens_genPolarV_act_db"] = v_db
-            row["sens_genPolarV_act_uv"] = v_uv
-
-        # Zapis do pliku result.json dla bieżącej konfiguracji
+        return False
+
+    run_id = new_run_id()
+    try:
+        # Przebiegi napięcia w funkcji mocy dla każdego punktu (analiza i odtwarzanie offline)
+        trace = TraceWriter.for_campaign(config_dir / TRACES_DIR / f"{run_id}.trace", run_id, we_config, calibration)
+    except OSError as e:
+        print(f"Nie udało się utworzyć pliku przebiegów: {e}")
+        trace = None
+    try:
+        # Historia wyników wszystkich kampanii (zapytania zbiorcze: GET /history/...)
+        results_db = ResultsDatabase(config_dir / RESULTS_DB_FILE)
+        results_db.start_run(run_id, plan.order, bench.simulated)
+    except sqlite3.Error as e:
+        print(f"Nie udało się otworzyć bazy wyników: {e}")
+        results_db = None
+
+    # Przewidywanie progu z sąsiednich kątów, drugiej polaryzacji i poprzednich przebiegów
+    predictor = ThresholdPredictor(we_config, [ramp for _, ramp in ramps], load_history(config_dir / HISTORY_FILE))
+    for record in completed.values():
+        sheet_calibration, ramp = ramps[record.sheet_index]
+        level = record.activation_dbm if ramp.unit == DBM or record.activation_dbm is None \
+            else sheet_calibration.field_strength(record.activation_dbm)[0]
+        predictor.observe(record, level)
+    engine = SweepEngine(bench, we_config, costs, trace, calibration, predictor, sheets=sheets)
+    # Pomija punkty arkuszy przerwanych po przekroczeniu limitu
+    should_measure = lambda point: not verdicts[sheets[point.sheet_index].key].aborted
+    METRICS.start_run(run_id)
+    points_measured = 0
+    finished = False
+
+    try:
+        point_start = time.perf_counter()
+        for point, result in engine.run(plan, state.is_active, skip=completed.keys(), should_measure=should_measure):
+            now = time.perf_counter()
+            checkpoint.record(point, result, now - point_start)
+            point_start = now
+            points_measured += 1
+
+            sheet = sheets[point.sheet_index]
+            key = sheet.key
+            collectors[key].add_measurement(point.angle, point.polarization, result.activation_dbm, result.stop_dbm)
+            if results_db is not None:
+                sensitivity_db, _ = sheet.calibration.field_strength(result.activation_dbm)
+                try:
+                    results_db.record_point(run_id, sheet, point.angle, point.polarization,
+                                            result.activation_dbm, result.stop_dbm, sensitivity_db, result.steps)
+                except sqlite3.Error as e:
+                    # Błąd bazy historii nie przerywa pomiaru; wyniki trafiają też do result.json
+                    print(f"Nie udało się zapisać punktu w bazie wyników: {e}")
+            verdict = verdicts[key]
+            verdict.add(point.angle, point.polarization, result.activation_dbm, result.stop_dbm)
+            remaining[key] -= 1
+            if remaining[key] > 0 and sheet.abort_on_fail and verdict.has_failed:
+                print(
+                    f"Sheet {sheet.sheet} nie spełnia limitu ({len(verdict.failed)} punktów) - "
+                    f"pominięto pozostałe {remaining[key]} punktów arkusza."
+                )
+                verdict.aborted = True
+                remaining[key] = 0
+            _publish_verdict(state, sheet, verdict)
+            if remaining[key] > 0:
+                continue
+
+            # Wszystkie punkty arkusza zmierzone - zapis do pliku result.json
+            try:
+                _save_completed_sheet(result_file_path, campaign, sheet, collectors[key], verdict)
+                if results_db is not None:
+                    results_db.record_verdict(run_id, sheet, verdict.to_dict())
+            except Exception as e:
+                print(f"Krytyczny błąd zapisu: {e}")
+                return False
+
+        if state.is_active():
+            finished = True
+            checkpoint.complete()
+            print("Wszystkie testy zakończone.")
+        else:
+            print("Test zatrzymany przez użytkownika. Można go wznowić (POST /resume-test).")
+    except Exception as e:
+        print(f"Błąd podczas pomiaru: {e}. Test można wznowić (POST /resume-test).")
+    finally:
+        if own_bench:
+            bench.close()
+        else:
+            bench.safe_state()
+        METRICS.end_run()
+        if trace is not None:
+            trace.close()
+        if results_db is not None:
+            try:
+                results_db.finish_run(run_id)
+            except sqlite3.Error as e:
+                print(f"Nie udało się zapisać zakończenia przebiegu w bazie wyników: {e}")
+            results_db.close()
         try:
-            all_sheets_data = []
-            # Sprawdź czy plik istnieje, jeśli tak - wczytaj
-            if result_file_path.exists():
-                with open(result_file_path, "r", encoding="utf-8") as f:
-                    try:
-                        all_sheets_data = json.load(f)
-                    except json.JSONDecodeError:
-                        all_sheets_data = []
-
-            # Jeśli plik nie istniał lub był pusty, zainicjalizuj strukturę z we_config
-            if not all_sheets_data:
-                for cfg in we_config:
-                    f_hz = cfg.get("test_params", {}).get("frequency_hz", 0)
-                    all_sheets_data.append({
-                        "sheet": cfg.get("sheet"),
-                        "id": cfg.get("id"),
-                        "antenna": cfg.get("antenna", ""),
-                        "frequency_mhz": f_hz / 1000000.0,
-                        "result": []
-                    })
-
-            updated = False
-            for sheet in all_sheets_data:
-                if sheet.get("sheet") == sheet_id and sheet.get("id") == obj_id:
-                    sheet["result"] = data
-                    # Aktualizacja pól informacyjnych
-                    sheet["antenna"] = config_item.get("antenna", "")
-                    sheet["frequency_mhz"] = params.get("frequency_hz", 0) / 1000000.0
-                    updated = True
-                    break
-            
-            # Zapisz całość (tryb 'w' utworzy plik jeśli nie istnieje)
-            with open(result_file_path, "w", encoding="utf-8") as f:
-                json.dump(all_sheets_data, f, indent=2, ensure_ascii=False)
-                print(f"Zapisano wyniki dla Sheet {sheet_id}, ID {obj_id}")
-
-        except Exception as e:
-            print(f"Krytyczny błąd zapisu: {e}")
-            state.stop()
-            return
-
-    state.stop() # Oznacz test jako zakończony
-    print("Wszystkie testy zakończone.")
\ No newline at end of file
+            save_timing_breakdown(result_file_path, points_measured, predictor.stats.to_dict())
+        except OSError as e:
+            print(f"Nie udało się zapisać rozkładu czasu: {e}")
+        # Koszty operacji i progi mierzone na symulatorze nie opisują rzeczywistego stanowiska
+        if not bench.simulated:
+            costs.save(config_dir / "operation_costs.json")
+            save_history(config_dir / HISTORY_FILE, predictor.updated_history())
+            if bench.router is not None:
+                save_relay_wear(config_dir / RELAY_WEAR_FILE, bench.router)
+        state.stop() # Oznacz test jako zakończony
+    return finished
+
+
+def run_scan_test(state: TestState, settings: ScanSettings, config_dir: Path) -> bool:
+    """
+    Wykonuje pomiar w ruchu: jeden obrót stołu przy stałym poziomie generatora.
+
+    Próbki DUT z przypisanym kątem i wzór aktywacji w przedziałach ``resolution_deg``
+    trafiają do scan_result.json w katalogu konfiguracji.
+
+    Returns:
+        True, gdy stół wykonał pełny obrót.
+    """
+    try:
+        bench = open_bench(load_bench_config(config_dir / "bench_config.json"))
+    except Exception as e:
+        print(f"Błąd inicjalizacji stanowiska: {e}")
+        state.stop()
+        return False
+
+    run_id = new_run_id()
+    METRICS.start_run(run_id)
+    completed = False
+    try:
+        result = run_rotation_scan(bench, settings, state.is_active)
+        with open(config_dir / SCAN_RESULT_FILE, "w", encoding="utf-8") as f:
+            json.dump({"run_id": run_id, **result.to_dict()}, f, indent=2)
+        completed = result.completed
+        print(f"Pomiar w ruchu zakończony: {len(result.samples)} próbek"
+              f"{'' if completed else ' (zatrzymany przed pełnym obrotem)'}.")
+    except Exception as e:
+        print(f"Błąd podczas pomiaru w ruchu: {e}")
+    finally:
+        bench.close()
+        METRICS.end_run()
+        if not bench.simulated and bench.router is not None:
+            save_relay_wear(config_dir / RELAY_WEAR_FILE, bench.router)
+        state.stop()
+    return completed
@@ -0,0 +1,46 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from measurement.startup import BACKEND_DIR, HARDWARE_MODULES, find_regressions, measure_startup
+
+CONFIG_ONLY_CLIENT = """
+import json, sys
+sys.modules.update(dict.fromkeys({blocked!r}))
+from fastapi.testclient import TestClient
+import main
+client = TestClient(main.app)
+print(json.dumps([client.get("/check-status").json()["mode"], client.post("/start-test").status_code,
+                  client.get("/get-runtime-params").status_code]))
+"""
+
+
+@pytest.mark.benchmark
+def test_startup_does_not_import_deferred_modules():
+    """Verifies that hardware, report and measurement modules are loaded on first use, not at startup."""
+    result = measure_startup("main", runs=1)
+
+    assert result.loaded_deferred == []
+
+
+@pytest.mark.benchmark
+def test_config_only_mode_without_hardware_libraries():
+    """Verifies that the API starts and serves configuration without RsInstrument, nidaqmx or pywinauto."""
+    completed = subprocess.run(
+        [sys.executable, "-c", CONFIG_ONLY_CLIENT.format(blocked=list(HARDWARE_MODULES))], cwd=BACKEND_DIR,
+        env={**os.environ, "ANTENNA_API_MODE": "config"}, capture_output=True, text=True,
+    )
+
+    assert completed.returncode == 0, completed.stderr
+    assert json.loads(completed.stdout.splitlines()[-1]) == ["config", 503, 200]
+
+
+@pytest.mark.benchmark
+def test_import_time_within_budget(request):
+    """Verifies the import time of the API module against the committed budget."""
+    if not request.config.getoption("--run-benchmark"):
+        pytest.skip("Startup-time budget is checked only with --run-benchmark.")
+    result = measure_startup("main", runs=5)
+
+    assert find_regressions(result) == []
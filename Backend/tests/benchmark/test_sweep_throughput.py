@@ -0,0 +1,24 @@
+import pytest
+from measurement.benchmark import SCENARIOS, find_regressions, load_baselines, run_benchmark
+
+BASELINES = load_baselines()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+def test_operations_per_point_do_not_regress(scenario):
+    """Verifies that the hot loop does not issue more SCPI, DAQ, UIA or relay operations per point."""
+    result = run_benchmark(scenario, "instant")
+
+    assert result.points == len(SCENARIOS[scenario]) * 24
+    assert find_regressions(result, BASELINES.get(result.key)) == []
+
+
+@pytest.mark.benchmark
+def test_sweep_throughput_does_not_regress(request):
+    """Verifies points/hour of the sensitivity sweep with the demo instrument latency."""
+    if not request.config.getoption("--run-benchmark"):
+        pytest.skip("Throughput benchmark runs only with --run-benchmark.")
+    result = run_benchmark("sensitivity_sweep", "demo")
+
+    assert find_regressions(result, BASELINES.get(result.key)) == []
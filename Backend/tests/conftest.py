@@ -16,6 +16,10 @@ def pytest_addoption(parser):
     parser.addini("GENERATOR_ADDRESS", "VISA address for the signal generator")
     parser.addini("NI_RELAY_DEVICE_ID", "Device ID for the NI Relay card")
     parser.addini("NI_ANALOG_DEVICE_ID", "Device ID for the NI Analog Input card")
+    parser.addoption(
+        "--run-benchmark", action="store_true", default=False,
+        help="Also run the sweep benchmarks with simulated instrument latency (slow).",
+    )
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
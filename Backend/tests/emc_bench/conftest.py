@@ -1,7 +1,7 @@
 import pytest
 import logging
 import pythoncom
-from drivers.rs_smb100a import SMB100A
+from drivers.visa_sessions import VisaSessionManager
 from drivers.ni.do_9485 import NI9485Handler
 from drivers.ni.usb_6361 import NIUSB6361Handler
 from drivers.ui.ctrl_axes import CtrlAxesDriver
@@ -9,11 +9,24 @@ from drivers.ui.ctrl_axes import CtrlAxesDriver
 _LOGGER = logging.getLogger("EMC.Fixtures")
 
 
+@pytest.fixture(scope="session")
+def visa_sessions():
+    """
+    Provides the pool of VISA sessions shared by all tests of the session.
+    Closes every session at the end of the test session.
+    """
+    sessions = VisaSessionManager()
+    yield sessions
+    _LOGGER.info(f"Closing VISA sessions. Connection statistics: {sessions.stats()}")
+    sessions.close_all()
+
+
 @pytest.fixture(scope="function")
-def generator(hardware_config):
+def generator(hardware_config, visa_sessions):
     """
-    Provides an SMB100A generator driver instance.
-    Ensures the generator is set to a safe state (RF OFF, Min Power) after each test.
+    Provides the pooled SMB100A generator session.
+    Ensures the generator is set to a safe state (RF OFF, Min Power) after each test;
+    the VISA session itself stays open for the next test.
     """
     address = hardware_config["generator_address"]
     if not address:
@@ -23,7 +36,7 @@ def generator(hardware_config):
 
     _LOGGER.info(f"Initializing SMB100A Generator at resource: {address}...")
     try:
-        driver = SMB100A(address)
+        driver = visa_sessions.get(address)
     except Exception as e:
         pytest.fail(f"Could not connect to Generator: {e}")
 
@@ -31,7 +44,6 @@ def generator(hardware_config):
 
     _LOGGER.info("Teardown: Setting Generator to Safe State.")
     driver.safe_state()
-    driver.close()
 
 
 @pytest.fixture(scope="function")
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+import pytest
+from drivers.async_instrument import AsyncInstrument, AsyncSMB100A, InstrumentTimeoutError
+from measurement import engine as engine_module
+from measurement.bench import create_simulated_bench
+from measurement.engine import SweepEngine
+from measurement.planner import OperationCosts, build_plan
+from measurement.simulation import SimulatedChamber, SimulatedGenerator
+
+
+class SlowDriver:
+    """Driver whose commands block, recording how many run at the same time."""
+
+    def __init__(self, delay_s):
+        self.delay_s = delay_s
+        self.log = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def command(self, name):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay_s)
+        with self._lock:
+            self.active -= 1
+        self.log.append(name)
+        return name
+
+
+def test_instruments_run_in_parallel_but_commands_are_serialised():
+    """Verifies parallelism across instruments and serialisation within one."""
+    first, second = SlowDriver(0.1), SlowDriver(0.1)
+
+    async def scenario():
+        a, b = AsyncInstrument(first), AsyncInstrument(second)
+        start = time.perf_counter()
+        await asyncio.gather(a.call(first.command, "a1"), a.call(first.command, "a2"), b.call(second.command, "b1"))
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(scenario())
+
+    assert first.log == ["a1", "a2"] and first.max_active == 1
+    assert elapsed < 0.3
+
+
+def test_timeout_does_not_interleave_commands():
+    """Verifies that a timed-out command finishes before the next one is sent."""
+    driver = SlowDriver(0.2)
+
+    async def scenario():
+        instrument = AsyncInstrument(driver, timeout_s=0.05)
+        with pytest.raises(InstrumentTimeoutError):
+            await instrument.call(driver.command, "slow")
+        return await instrument.call(driver.command, "next", timeout=1.0)
+
+    assert asyncio.run(scenario()) == "next"
+    assert driver.log == ["slow", "next"] and driver.max_active == 1
+
+
+def test_exclusive_sequence_is_not_interleaved():
+    """Verifies that another task cannot send commands inside an exclusive block."""
+    driver = SlowDriver(0.01)
+
+    async def scenario():
+        instrument = AsyncInstrument(driver)
+
+        async def sequence():
+            async with instrument.exclusive():
+                await instrument.call(driver.command, "freq")
+                await asyncio.sleep(0.02)
+                await instrument.call(driver.command, "pow")
+
+        await asyncio.gather(sequence(), instrument.call(driver.command, "other"))
+
+    asyncio.run(scenario())
+    assert driver.log == ["freq", "pow", "other"]
+
+
+def test_async_smb100a_raw_query_on_simulated_generator():
+    """Verifies the raw SCPI query path of the async generator API."""
+    generator = SimulatedGenerator(SimulatedChamber())
+
+    async def scenario():
+        async with AsyncSMB100A(generator) as instrument:
+            await instrument.set_frequency(868.95e6)
+            return await instrument.query("FREQ?")
+
+    assert float(asyncio.run(scenario())) == 868.95e6
+
+
+def test_overlapped_io_gives_the_same_results(monkeypatch):
+    """Verifies that retuning during the moves does not change the measurement."""
+    monkeypatch.setattr(engine_module, "POSITION_POLL_S", 0.0)
+    we_config = [
+        {"sheet": i, "id": i, "test_params": {"frequency_hz": f, "angles": [0, 90], "polarizations": ["V", "H"]},
+         "runtime_params": {"start_power_dbm": -50, "end_power_dbm": 0, "power_step_db": 1}}
+        for i, f in ((1, 433.92e6), (2, 868.25e6))
+    ]
+    plan = build_plan(we_config, OperationCosts())
+
+    def measure(overlap_io):
+        engine = SweepEngine(create_simulated_bench(overlap_io=overlap_io), we_config)
+        return [(p, r.activation_dbm, r.stop_dbm) for p, r in engine.run(plan)]
+
+    assert measure(True) == measure(False)
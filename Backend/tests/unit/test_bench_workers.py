@@ -0,0 +1,69 @@
+import json
+import time
+import pytest
+from fastapi.testclient import TestClient
+import main
+from bench_workers import BenchPool, BenchWorker
+
+WE_CONFIG = [{"sheet": 1, "id": 1, "antenna": "RTS",
+              "test_params": {"frequency_hz": 433.92e6, "angles": [0], "polarizations": ["V"]},
+              "runtime_params": {"start_power_dbm": -50, "end_power_dbm": 0, "power_step_db": 1}}]
+BENCH_CONFIG = {"simulated": True, "latency_profile": "instant", "polarization_settle_s": 0, "dut_settle_s": 0}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    (tmp_path / "benches.json").write_text(json.dumps([
+        {"id": "A", "config_dir": "bench_a"}, {"id": "B", "config_dir": "bench_b", "name": "Komora 2"}]))
+    for name in ("bench_a", "bench_b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "bench_config.json").write_text(json.dumps(BENCH_CONFIG))
+    pool = BenchPool(tmp_path)
+    monkeypatch.setattr(main, "bench_pool", pool)
+    yield TestClient(main.app)
+    pool.shutdown()
+
+
+def test_benches_run_concurrently_in_worker_processes(client):
+    """Verifies that two simulated benches measure at the same time with their own state and results."""
+    for bench_id in ("A", "B"):
+        assert client.post(f"/benches/{bench_id}/save-we-config", json=WE_CONFIG).status_code == 200
+        assert client.post(f"/benches/{bench_id}/start-test").status_code == 200
+
+    running = {bench["id"]: bench for bench in client.get("/benches").json()}
+    assert running["B"]["name"] == "Komora 2"
+    assert running["A"]["pid"] != running["B"]["pid"]
+    assert client.post("/benches/A/start-test").status_code in (200, 409)
+
+    deadline = time.monotonic() + 60
+    while any(client.get(f"/benches/{b}/check-status").json()["is_running"] for b in "AB"):
+        assert time.monotonic() < deadline
+        time.sleep(0.1)
+
+    for bench_id in ("A", "B"):
+        status = client.get(f"/benches/{bench_id}/check-status").json()
+        assert status["results_ready"] and status["exit_code"] == 0
+        assert status["verdicts"]["1/1"]["verdict"]
+        results = client.get(f"/benches/{bench_id}/download-data").json()
+        assert [row["angle"] for row in results[0]["result"]] == ["0°"]
+    assert client.get("/benches/C/check-status").status_code == 404
+
+
+def test_malformed_bench_list_is_read_again(tmp_path, monkeypatch):
+    """Verifies that a broken benches.json keeps failing until fixed, and that removed benches are stopped."""
+    stopped = []
+    monkeypatch.setattr(BenchWorker, "terminate", lambda worker, timeout=5.0: stopped.append(worker.bench_id))
+    pool = BenchPool(tmp_path)
+    (tmp_path / "benches.json").write_text(json.dumps([{"id": "A"}, {"id": "B"}]))
+    first = pool.get("B")
+
+    (tmp_path / "benches.json").write_text('[{"id": "A"}, {"config_dir": "x"}]')
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            pool.workers()
+
+    (tmp_path / "benches.json").write_text(json.dumps([{"id": "A"}]))
+    assert [worker.bench_id for worker in pool.workers()] == ["A"]
+    assert stopped == [first.bench_id]
+    with pytest.raises(KeyError):
+        pool.get("B")
@@ -0,0 +1,82 @@
+import io
+import pytest
+import openpyxl
+from drivers.test_calculation.calibration import Calibration, CalibrationTable, load_calibration, load_table
+from drivers.test_calculation.sensitivity_value import calculate_sensitivity
+from testowy import add_sensitivity
+
+
+CABLE_CSV = b"frequency_mhz;loss_db\n868;7,2\n400;4,5\n433,92;5,0\n"
+
+
+def test_table_interpolates_between_sorted_points():
+    """Verifies sorting, linear/log interpolation and clamping at the table edges."""
+    table = CalibrationTable([200e6, 100e6], [2.0, 1.0], log_frequency=False)
+    assert table.frequencies_hz == (100e6, 200e6)
+    assert table.value_at(150e6) == pytest.approx(1.5)
+    assert table.value_at(50e6) == 1.0
+    assert table.value_at(400e6) == 2.0
+
+    log_table = CalibrationTable([100e6, 1000e6], [10.0, 20.0])
+    assert log_table.value_at(316.227766e6) == pytest.approx(15.0)
+    assert log_table.values_at([100e6, 316.227766e6, 1000e6]) == pytest.approx([10.0, 15.0, 20.0])
+
+
+def test_table_rejects_duplicate_frequencies():
+    """Verifies that an ambiguous table is rejected."""
+    with pytest.raises(ValueError):
+        CalibrationTable([100e6, 100e6], [1.0, 2.0])
+
+
+def test_load_table_from_csv_and_excel():
+    """Verifies loading of semicolon CSV with decimal commas and of an Excel sheet."""
+    table = load_table(CABLE_CSV, "cable_loss", filename="cable.csv")
+    assert table.frequencies_hz == (400e6, 433.92e6, 868e6)
+    assert table.values_db == (4.5, 5.0, 7.2)
+
+    workbook = openpyxl.Workbook()
+    workbook.active.append(["Frequency Hz", "AF dB"])
+    workbook.active.append([433.92e6, 17.5])
+    workbook.active.append([868e6, 22.0])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    table = load_table(buffer.getvalue(), "antenna_factor", filename="af.xlsx")
+    assert table.value_at(868e6) == 22.0
+
+
+def test_table_takes_precedence_over_sheet_scalar(tmp_path):
+    """Verifies the value priority: table, then sheet value, then no value."""
+    (tmp_path / "calibration").mkdir()
+    (tmp_path / "calibration" / "cable_loss.csv").write_bytes(CABLE_CSV)
+    calibration = load_calibration(tmp_path)
+    assert load_calibration(tmp_path) is calibration
+
+    sheet = calibration.for_sheet({"frequency_hz": 433.92e6, "distance": 3, "wire_loss_db": 9.9,
+                                   "antenna_factor_dbm_1": 17.8})
+    assert (sheet.wire_loss_db, sheet.wire_loss_source) == (5.0, "table")
+    assert (sheet.antenna_factor_db_1, sheet.antenna_factor_source) == (17.8, "sheet")
+
+    missing = calibration.for_sheet({"frequency_hz": 433.92e6, "distance": 3})
+    assert missing.antenna_factor_source == "missing"
+    assert not missing.complete
+
+
+def test_generator_power_inverts_the_sensitivity_formula():
+    """Verifies that the field-strength conversion round-trips through calculate_sensitivity."""
+    sheet = Calibration().for_sheet({"frequency_hz": 426062500, "distance": 3, "wire_loss_db": 6.93,
+                                     "antenna_factor_dbm_1": 17.2})
+    power = sheet.generator_power(40.0)
+    assert calculate_sensitivity(power, 426.0625, 3, 6.93, 17.2)[0] == pytest.approx(40.0)
+    assert sheet.field_strength(power)[0] == pytest.approx(40.0)
+
+
+def test_add_sensitivity_has_no_builtin_defaults():
+    """Verifies that sensitivity is left empty instead of using hard-coded calibration values."""
+    rows = [{"genPolarH_act": -40.0, "genPolarV_act": None}]
+    add_sensitivity(rows, Calibration().for_sheet({"frequency_hz": 433.92e6, "distance": 3}))
+    assert rows[0]["sens_genPolarH_act_db"] is None
+
+    add_sensitivity(rows, Calibration().for_sheet({"frequency_hz": 433.92e6, "distance": 3, "wire_loss_db": 5.0,
+                                                   "antenna_factor_dbm_1": 17.8}))
+    assert rows[0]["sens_genPolarH_act_db"] == pytest.approx(calculate_sensitivity(-40.0, 433.92, 3, 5.0, 17.8)[0])
+    assert rows[0]["sens_genPolarV_act_db"] is None
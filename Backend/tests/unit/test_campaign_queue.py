@@ -0,0 +1,129 @@
+import json
+import pytest
+import main
+import test_state
+import measurement.engine as engine_module
+from campaign_queue import CANCELLED, DONE, QUEUED, STOPPED, CampaignQueue
+from reporting.results_db import RESULTS_DB_FILE, ResultsDatabase
+
+WE_CONFIG = [{"sheet": 1, "id": 1, "antenna": "RTS",
+              "test_params": {"frequency_hz": 433.92e6, "angles": [0, 90], "polarizations": ["V"]},
+              "runtime_params": {"start_power_dbm": -50, "end_power_dbm": 0, "power_step_db": 1}}]
+
+
+class FakeBench:
+    opened = 0
+    closed = 0
+
+    def __init__(self):
+        FakeBench.opened += 1
+
+    def close(self):
+        FakeBench.closed += 1
+
+
+@pytest.fixture
+def fake_queue(tmp_path):
+    FakeBench.opened = FakeBench.closed = 0
+    ran = []
+
+    def run_job(job, result_file, bench):
+        ran.append((job.name, bench))
+        return True
+
+    return CampaignQueue(tmp_path, test_state.TestState(), run_job, FakeBench), ran
+
+
+def test_priority_move_cancel_and_persistence(tmp_path, fake_queue):
+    """Verifies the execution order, reordering, cancellation and re-queueing of an interrupted job."""
+    queue, _ = fake_queue
+    a = queue.add(WE_CONFIG, "angle_major", "a", {"serial": "SN1"})
+    b = queue.add(WE_CONFIG, "angle_major", "b")
+    c = queue.add(WE_CONFIG, "angle_major", "c", priority=5)
+    assert [job.name for job in queue.jobs()] == ["c", "a", "b"]
+    assert a.we_config[0]["dut_serial"] == "SN1" and "dut_serial" not in WE_CONFIG[0]
+
+    queue.move(b.job_id, 0)
+    assert [job.name for job in queue.jobs()] == ["b", "c", "a"]
+    queue.cancel(c.job_id)
+    with pytest.raises(ValueError):
+        queue.set_priority(c.job_id, 1)
+
+    a.status = "running"
+    queue._save()
+    reloaded = CampaignQueue(tmp_path, test_state.TestState(), None, None)
+    assert [(job.name, job.status, job.resume) for job in reloaded.jobs()] == [
+        ("b", QUEUED, False), ("a", QUEUED, True), ("c", CANCELLED, False)]
+
+
+def test_jobs_run_back_to_back_on_one_bench(fake_queue):
+    """Verifies that one bench session serves every job and that the statistics count them."""
+    queue, ran = fake_queue
+    for name in ("a", "b", "c"):
+        queue.add(WE_CONFIG, "angle_major", name)
+
+    assert queue.run_pending() == 3
+    assert [name for name, _ in ran] == ["a", "b", "c"]
+    assert len({id(bench) for _, bench in ran}) == 1
+    assert (FakeBench.opened, FakeBench.closed) == (1, 1)
+    stats = queue.stats()
+    assert stats["finished"][DONE] == 3 and stats["queued"] == 0
+    assert stats["mean_wait_s"] is not None
+
+
+def test_stopped_job_pauses_the_queue(tmp_path):
+    """Verifies that a job stopped from outside pauses the queue until resumed."""
+    outcomes = iter([False, True, True])
+    queue = CampaignQueue(tmp_path, test_state.TestState(), lambda job, result_file, bench: next(outcomes), FakeBench)
+    first = queue.add(WE_CONFIG, "angle_major", "a")
+    queue.add(WE_CONFIG, "angle_major", "b")
+
+    assert queue.run_pending() == 1
+    assert first.status == STOPPED and queue.paused
+    queue.requeue(first.job_id)
+    queue.resume()
+    assert queue.run_pending() == 2
+    assert first.status == DONE
+
+
+def test_bench_open_failure_pauses_the_queue(tmp_path):
+    """Verifies that a bench that cannot be opened holds the queue instead of failing every job."""
+    def open_bench():
+        raise ConnectionError("VISA resource GPIB0::28::INSTR not found")
+
+    state = test_state.TestState()
+    queue = CampaignQueue(tmp_path, state, lambda job, result_file, bench: True, open_bench)
+    first = queue.add(WE_CONFIG, "angle_major", "a")
+    second = queue.add(WE_CONFIG, "angle_major", "b")
+
+    assert queue.run_pending() == 0
+    assert (first.status, second.status) == (QUEUED, QUEUED)
+    assert queue.paused and "GPIB0::28::INSTR" in queue.stats()["pause_reason"]
+    assert first.started_at is None and not state.is_active()
+    assert CampaignQueue(tmp_path, state, None, None).paused
+
+    queue._open_bench = FakeBench
+    queue.resume()
+    assert queue.run_pending() == 2
+    assert first.status == DONE and queue.stats()["pause_reason"] == ""
+
+
+def test_queue_job_on_simulated_bench(tmp_path, monkeypatch):
+    """Verifies a queued job measured on the simulated bench with results in its own directory."""
+    monkeypatch.setattr(engine_module, "POSITION_POLL_S", 0.0)
+    monkeypatch.setattr(main, "CONFIG", tmp_path)
+    (tmp_path / "bench_config.json").write_text(json.dumps(
+        {"simulated": True, "latency_profile": "instant", "polarization_settle_s": 0, "dut_settle_s": 0}))
+    queue = CampaignQueue(tmp_path, main.test_state, main._run_queue_job, main._open_queue_bench)
+    job = queue.add(WE_CONFIG, "angle_major", dut={"serial": "SN7"})
+    second = queue.add(WE_CONFIG, "angle_major", dut={"serial": "SN8"})
+
+    assert queue.run_pending() == 2
+    assert job.status == DONE and second.status == DONE, job.message
+    # Jobs started within the same second are still separate runs with their own traces.
+    with ResultsDatabase(tmp_path / RESULTS_DB_FILE) as db:
+        assert len(db.runs()) == 2
+    assert len(list((tmp_path / "traces").iterdir())) == 2
+    results = json.loads(queue.result_file(job).read_text())
+    assert [row["angle"] for row in results[0]["result"]] == ["0°", "90°"]
+    assert not (tmp_path / "result.json").exists()
@@ -0,0 +1,78 @@
+import pytest
+from measurement import engine as engine_module
+from measurement.bench import create_simulated_bench
+from measurement.checkpoint import CampaignCheckpoint, point_key
+from measurement.engine import SearchResult, SweepEngine
+from measurement.planner import OperationCosts, build_plan
+
+WE_CONFIG = [
+    {"sheet": 1, "id": 1, "test_params": {"frequency_hz": 433.92e6, "angles": [0, 90, 180], "polarizations": ["V", "H"]},
+     "runtime_params": {"start_power_dbm": -50, "end_power_dbm": 0, "power_step_db": 1}},
+]
+
+
+def test_journal_roundtrip_ignores_truncated_line(tmp_path):
+    """Verifies that recorded points survive a crash in the middle of a write."""
+    checkpoint = CampaignCheckpoint(tmp_path / "checkpoint.jsonl")
+    points = build_plan(WE_CONFIG, OperationCosts()).points
+    checkpoint.start(WE_CONFIG, "angle_major")
+    checkpoint.record(points[0], SearchResult(-40.0, -43.0, 14), 1.5)
+    checkpoint.record(points[1], SearchResult(None, None, 51), 2.5)
+    with open(checkpoint.path, "a", encoding="utf-8") as f:
+        f.write('{"type": "point", "sheet_ind')
+
+    state = checkpoint.load_for(WE_CONFIG)
+
+    assert set(state.records) == {point_key(points[0]), point_key(points[1])}
+    assert state.records[point_key(points[1])].activation_dbm is None
+    assert state.saved_s == pytest.approx(4.0)
+    assert state.order == "angle_major"
+
+
+def test_resume_after_torn_tail_keeps_journal_readable(tmp_path):
+    """Verifies that records appended after a torn last line are read back, the completion marker included."""
+    checkpoint = CampaignCheckpoint(tmp_path / "checkpoint.jsonl")
+    points = build_plan(WE_CONFIG, OperationCosts()).points
+    checkpoint.start(WE_CONFIG, "angle_major")
+    checkpoint.record(points[0], SearchResult(-40.0, -43.0, 14), 1.5)
+    with open(checkpoint.path, "a", encoding="utf-8") as f:
+        f.write('{"type": "point", "sheet_ind')
+
+    checkpoint.load_for(WE_CONFIG)
+    checkpoint.record(points[1], SearchResult(-41.0, -44.0, 15), 1.5)
+    checkpoint.complete()
+    state = checkpoint.load()
+
+    assert set(state.records) == {point_key(points[0]), point_key(points[1])}
+    assert state.completed
+    with pytest.raises(ValueError):
+        checkpoint.load_for(WE_CONFIG)
+
+
+def test_completed_or_changed_campaign_cannot_be_resumed(tmp_path):
+    """Verifies that a checkpoint is rejected after completion or a configuration change."""
+    checkpoint = CampaignCheckpoint(tmp_path / "checkpoint.jsonl")
+    with pytest.raises(ValueError):
+        checkpoint.load_for(WE_CONFIG)
+
+    checkpoint.start(WE_CONFIG, "angle_major")
+    changed = [dict(WE_CONFIG[0], antenna="other")]
+    with pytest.raises(ValueError):
+        checkpoint.load_for(changed)
+
+    checkpoint.complete()
+    with pytest.raises(ValueError):
+        checkpoint.load_for(WE_CONFIG)
+
+
+def test_engine_skips_completed_points(monkeypatch):
+    """Verifies that a resumed run measures only the remaining points after restoring the bench."""
+    monkeypatch.setattr(engine_module, "POSITION_POLL_S", 0.0)
+    bench = create_simulated_bench()
+    plan = build_plan(WE_CONFIG, OperationCosts())
+    done = {point_key(p) for p in plan.points[:4]}
+
+    measured = [point for point, _ in SweepEngine(bench, WE_CONFIG).run(plan, skip=done)]
+
+    assert measured == plan.points[4:]
+    assert bench.generator.get_output_rf_state() is False
@@ -0,0 +1,87 @@
+import json
+import os
+import pytest
+from drivers.test_calculation.calibration import Calibration
+from measurement import compiled_plan
+from measurement.compiled_plan import (COMPILED_PLAN_FILE, compile_campaign, load_compiled_campaign,
+                                       save_compiled_campaign)
+from measurement.engine import FIELD, sheet_ramps
+from measurement.planner import ANGLE_MAJOR, SHEET_MAJOR, OperationCosts, build_plan
+
+WE_CONFIG = [
+    {"sheet": 1, "id": 1, "antenna": "RTS", "dut_serial": "SN-1",
+     "test_params": {"frequency_hz": 433.92e6, "distance": 3, "wire_loss_db": 5.0, "antenna_factor_dbm_1": 17.8,
+                     "angles": [0, 90], "polarizations": ["V", "H"], "routes": ["att_20"]},
+     "runtime_params": {"start_power_dbm": -60, "end_power_dbm": 0, "power_step_db": 1,
+                        "abort_sheet_on_fail": True}},
+    {"sheet": 2, "id": 2, "antenna": "RTS",
+     "test_params": {"frequency_hz": 868.3e6, "distance": 3, "wire_loss_db": 6.0, "antenna_factor_dbm_1": 23.5,
+                     "angles": [0, 90], "polarizations": ["V"]},
+     "runtime_params": {"sweep_unit": FIELD, "start_field_dbuvm": 40, "end_field_dbuvm": 100, "field_step_db": 1}},
+]
+
+
+def test_compiled_campaign_matches_the_dict_path():
+    """Verifies the resolved sheets, ramps and plans against the values computed from the dicts."""
+    campaign = compile_campaign(WE_CONFIG)
+
+    assert [s.key for s in campaign.sheets] == [(1, 1), (2, 2)]
+    assert campaign.sheets[0].frequency_mhz == pytest.approx(433.92)
+    assert campaign.sheets[0].abort_on_fail and not campaign.sheets[1].abort_on_fail
+    assert [(s.routes, s.concurrent) for s in campaign.sheets] == [(("att_20",), False), ((), False)]
+    assert campaign.ramps == sheet_ramps(WE_CONFIG, Calibration())
+    costs = OperationCosts()
+    for order in (ANGLE_MAJOR, SHEET_MAJOR):
+        expected = build_plan(WE_CONFIG, costs, order)
+        assert campaign.plan(costs, order).summary() == expected.summary()
+        assert campaign.plan(costs, order).points == expected.points
+    assert campaign.result_skeleton()[1] == {"sheet": 2, "id": 2, "antenna": "RTS", "frequency_mhz": 868.3,
+                                             "result": []}
+
+
+@pytest.mark.parametrize("change, message", [
+    ({"test_params": {"frequency_hz": "abc"}}, "frequency_hz must be a number"),
+    ({"test_params": {"frequency_hz": 1e6, "polarizations": ["X"]}}, "unknown polarizations"),
+    ({"runtime_params": {"start_power_dbm": 0, "end_power_dbm": -10}}, "below its start"),
+    ({"test_params": {"frequency_hz": 1e6}, "runtime_params": {"sweep_unit": FIELD}}, "Sheet 1:"),
+])
+def test_invalid_sheets_are_rejected(change, message):
+    """Verifies that the configuration is validated when it is compiled."""
+    with pytest.raises(ValueError, match=message):
+        compile_campaign([dict({"sheet": 1, "id": 1}, **change)])
+
+
+def test_stored_campaign_is_reused_until_the_source_changes(tmp_path, monkeypatch):
+    """Verifies loading the stored compilation and recompiling after we_config.json is edited."""
+    (tmp_path / "we_config.json").write_text(json.dumps(WE_CONFIG))
+    save_compiled_campaign(tmp_path, compile_campaign(WE_CONFIG))
+    assert (tmp_path / COMPILED_PLAN_FILE).exists()
+
+    calls = []
+    monkeypatch.setattr(compiled_plan, "compile_campaign",
+                        lambda *args: calls.append(args) or compile_campaign(*args))
+    assert load_compiled_campaign(tmp_path).sheets[1].ramp.unit == FIELD
+    assert calls == []
+
+    edited = [WE_CONFIG[0]]
+    (tmp_path / "we_config.json").write_text(json.dumps(edited))
+    os.utime(tmp_path / "we_config.json", ns=(1, 1))
+    assert len(load_compiled_campaign(tmp_path).sheets) == 1
+    assert len(calls) == 1
+    assert len(load_compiled_campaign(tmp_path).sheets) == 1
+    assert len(calls) == 1
+
+
+def test_planner_change_invalidates_stored_orders(tmp_path, monkeypatch):
+    """Verifies that a compilation stored by another planner version is rebuilt, not reused."""
+    (tmp_path / "we_config.json").write_text(json.dumps(WE_CONFIG))
+    save_compiled_campaign(tmp_path, compile_campaign(WE_CONFIG))
+    monkeypatch.setattr(compiled_plan, "COMPILED_VERSION", (compiled_plan.COMPILED_FORMAT, -1))
+    calls = []
+    monkeypatch.setattr(compiled_plan, "compile_campaign",
+                        lambda *args: calls.append(args) or compile_campaign(*args))
+
+    load_compiled_campaign(tmp_path)
+    load_compiled_campaign(tmp_path)
+
+    assert len(calls) == 1
@@ -0,0 +1,191 @@
+import json
+import pytest
+from measurement import engine as engine_module
+from measurement.compiled_plan import compile_campaign
+from measurement.bench import create_simulated_bench, load_bench_config, open_bench
+from measurement.engine import RampSettings, SweepEngine, search_threshold, search_thresholds
+from measurement.simulation import SimulatedChamber, SimulatedDut
+from measurement.planner import OperationCosts, build_plan
+
+
+def _fake_dut(threshold_dbm, hysteresis_db=2.0):
+    """Returns set_power/read_voltage callables of a DUT with hysteresis."""
+    state = {"power": None, "active": False}
+
+    def set_power(dbm):
+        state["power"] = dbm
+        if dbm >= threshold_dbm:
+            state["active"] = True
+        elif dbm < threshold_dbm - hysteresis_db:
+            state["active"] = False
+
+    def read_voltage():
+        return 5.0 if state["active"] else 0.0
+
+    return set_power, read_voltage
+
+
+def test_search_finds_activation_and_stop():
+    """Verifies the up-ramp and the silent search below the activation."""
+    set_power, read_voltage = _fake_dut(-37.5)
+    result = search_threshold(set_power, read_voltage, RampSettings(start_dbm=-50, end_dbm=0, step_db=1))
+
+    assert result.activation_dbm == -37.0
+    assert result.stop_dbm == -40.0
+    assert result.steps == 14 + 3
+
+
+def test_search_without_activation():
+    """Verifies that a silent DUT stops the ramp at the end power."""
+    set_power, read_voltage = _fake_dut(10.0)
+    result = search_threshold(set_power, read_voltage, RampSettings(start_dbm=-50, end_dbm=-40, step_db=2))
+
+    assert result.activation_dbm is None
+    assert result.stop_dbm is None
+    assert result.steps == 6
+
+
+def test_shared_ramp_matches_individual_searches():
+    """Verifies that one shared ramp finds every DUT's activation and stop like separate ramps."""
+    ramp = RampSettings(start_dbm=-50, end_dbm=0, step_db=1)
+    duts = [_fake_dut(-37.5), _fake_dut(-44.2, hysteresis_db=1.0), _fake_dut(10.0)]
+    power = [None]
+
+    def set_power(dbm):
+        power[0] = dbm
+        for dut_set_power, _ in duts:
+            dut_set_power(dbm)
+
+    results = search_thresholds(set_power, lambda: [read() for _, read in duts], [ramp] * 3)
+
+    assert [(r.activation_dbm, r.stop_dbm) for r in results] == [(-37.0, -40.0), (-44.0, -46.0), (None, None)]
+    assert results[0].steps == 51 + 9
+
+
+def test_ramp_is_capped_by_safe_stop_power():
+    """Verifies that safe_stop_power_dbm limits the configured end power."""
+    ramp = RampSettings.from_config({
+        "runtime_params": {"start_power_dbm": -50, "end_power_dbm": 10, "power_step_db": 1},
+        "hardware_config": {"safe_stop_power_dbm": -20, "voltage_threshold_v": 4.5, "analog_channel": 1},
+    })
+
+    assert ramp.end_dbm == -20
+    assert ramp.analog_channel == 1
+
+
+def test_engine_runs_plan_on_simulated_bench(monkeypatch):
+    """Verifies a full angle-major run on the simulated bench."""
+    monkeypatch.setattr(engine_module, "POSITION_POLL_S", 0.0)
+    we_config = [
+        {"sheet": i, "id": i, "test_params": {"frequency_hz": f, "angles": [0, 90, 180], "polarizations": ["V", "H"]},
+         "runtime_params": {"start_power_dbm": -50, "end_power_dbm": 0, "power_step_db": 1}}
+        for i, f in ((1, 433.92e6), (2, 868.25e6))
+    ]
+    bench = create_simulated_bench()
+    plan = build_plan(we_config, OperationCosts())
+    engine = SweepEngine(bench, we_config)
+
+    results = list(engine.run(plan))
+
+    assert len(results) == 12
+    assert all(result.activation_dbm is not None for _, result in results)
+    assert bench.generator.get_output_rf_state() is False
+    # The simulated DUT is less sensitive at higher frequencies.
+    by_sheet = {p.sheet: r.activation_dbm for p, r in results if p.angle == 0 and p.polarization == "V"}
+    assert by_sheet[2] > by_sheet[1]
+
+
+def test_relay_switched_polarization(tmp_path, monkeypatch):
+    """Verifies that relay routes from hardware_config.json switch polarization without moving the mast."""
+    monkeypatch.setattr(engine_module, "POSITION_POLL_S", 0.0)
+    hardware_config = {"analog_channel": 3, "polarization_relay": {"V": 2, "H": 5},
+                       "relay_routes": {"dut_power": {"lines": [0]}, "att_10": {"lines": [3], "group": "att"},
+                                        "att_20": {"lines": [4], "group": "att"}}}
+    (tmp_path / "bench_config.json").write_text(json.dumps({"simulated": True, "latency_profile": "instant"}))
+    (tmp_path / "hardware_config.json").write_text(json.dumps(hardware_config))
+    bench = open_bench(load_bench_config(tmp_path / "bench_config.json"))
+    monkeypatch.setattr(bench.ctrl_axes, "set_malt_orientation", lambda horizontal: pytest.fail("mast rotated"))
+    # Merged like the frontend does it: the whole hardware config (route definitions included) in every sheet.
+    we_config = [{"sheet": 1, "id": 1, "test_params": {"frequency_hz": 433.92e6, "angles": [0, 90, 180],
+                                                       "polarizations": ["V", "H"], "routes": ["dut_power", "att_20"]},
+                  "runtime_params": {"start_power_dbm": -50, "end_power_dbm": 0, "power_step_db": 1},
+                  "hardware_config": hardware_config}]
+
+    results = {(p.angle, p.polarization): r.activation_dbm
+               for p, r in SweepEngine(bench, we_config).run(build_plan(we_config, OperationCosts()))}
+
+    assert bench.ni_relay.port_state in (0b010101, 0b110001)
+    assert bench.router.counters()["routes"] == {"dut_power": 1, "att_10": 0, "att_20": 1,
+                                                 "polarization_V": 2, "polarization_H": 2}
+    # The simulated DUT is less sensitive through the H port.
+    assert results[(0, "H")] > results[(0, "V")]
+    with pytest.raises(ValueError):
+        open_bench({"simulated": True, "polarization_relay": {"V": 1, "H": 1}})
+    with pytest.raises(ValueError):
+        SweepEngine(create_simulated_bench(), we_config)
+    with pytest.raises(ValueError, match="routes"):
+        compile_campaign([{**we_config[0], "test_params": {**we_config[0]["test_params"], "routes": "att_20"}}])
+
+
+def test_concurrent_duts_share_the_ramp(monkeypatch):
+    """Verifies that DUTs on different channels are measured together, each into its own sheet."""
+    monkeypatch.setattr(engine_module, "POSITION_POLL_S", 0.0)
+    duts = {1: SimulatedDut(base_threshold_dbm=-44.0), 2: SimulatedDut(base_threshold_dbm=-38.0)}
+    we_config = [
+        {"sheet": channel, "id": channel,
+         "test_params": {"frequency_hz": 433.92e6, "angles": [0, 90], "polarizations": ["V"]},
+         "runtime_params": {"start_power_dbm": -50, "end_power_dbm": 0, "power_step_db": 1},
+         "hardware_config": {"analog_channel": channel, "concurrent_duts": True}}
+        for channel in duts
+    ]
+    bench = create_simulated_bench(chamber=SimulatedChamber(duts=duts))
+    plan = build_plan(we_config, OperationCosts())
+    assert len(plan.groups) == 1
+
+    results = {(p.sheet, p.angle): r for p, r in SweepEngine(bench, we_config).run(plan)}
+
+    assert len(results) == 4
+    assert results[(1, 0)].activation_dbm == -44.0 and results[(2, 0)].activation_dbm == -38.0
+    assert results[(1, 0)].steps == results[(2, 0)].steps
+    assert results[(2, 90)].activation_dbm > results[(2, 0)].activation_dbm
+
+
+def test_predictive_sheets_are_not_batched():
+    """Verifies that concurrent sheets with a predicted start keep their own ramps."""
+    we_config = [
+        {"sheet": channel, "id": channel,
+         "test_params": {"frequency_hz": 433.92e6, "angles": [0], "polarizations": ["V"]},
+         "runtime_params": {"start_power_dbm": -50, "end_power_dbm": 0, "power_step_db": step,
+                            "predictive_start": True},
+         "hardware_config": {"analog_channel": channel, "concurrent_duts": True}}
+        for channel, step in ((1, 1), (2, 5))
+    ]
+    engine = SweepEngine(create_simulated_bench(), we_config)
+    points = build_plan(we_config, OperationCosts()).points
+
+    assert engine._concurrent_batch(points, 0, lambda point: True) == [points[0]]
+
+
+def test_field_strength_ramp_on_simulated_bench(monkeypatch):
+    """Verifies that a field-strength ramp reports generator powers consistent with its field levels."""
+    monkeypatch.setattr(engine_module, "POSITION_POLL_S", 0.0)
+    test_params = {"frequency_hz": 433.92e6, "distance": 3, "wire_loss_db": 12.0, "antenna_factor_dbm_1": 17.8,
+                   "angles": [0], "polarizations": ["V"]}
+    we_config = [{"sheet": 1, "id": 1, "test_params": test_params,
+                  "runtime_params": {"sweep_unit": engine_module.FIELD, "start_field_dbuvm": 0,
+                                     "end_field_dbuvm": 80, "field_step_db": 0.5}}]
+    engine = SweepEngine(create_simulated_bench(), we_config)
+
+    (_, result), = engine.run(build_plan(we_config, OperationCosts()))
+
+    assert result.activation_field is not None and result.activation_field % 0.5 == 0
+    calibration = engine._calibrations[0]
+    assert calibration.field_strength(result.activation_dbm)[0] == pytest.approx(result.activation_field, abs=0.01)
+
+
+def test_field_strength_ramp_requires_calibration():
+    """Verifies that a field-strength ramp without antenna factor is rejected."""
+    item = {"sheet": 1, "test_params": {"frequency_hz": 433.92e6, "distance": 3, "wire_loss_db": 5.0},
+            "runtime_params": {"sweep_unit": engine_module.FIELD, "start_field_dbuvm": 0, "end_field_dbuvm": 80}}
+    with pytest.raises(ValueError):
+        SweepEngine(create_simulated_bench(), [item])
@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import patch
+from drivers.error_queue import parse_error
+from drivers.rs_smb100a import SMB100A, InstrumentCommandError
+from measurement.simulation import SimulatedChamber, SimulatedGenerator
+
+
+def test_parse_error_response():
+    """Verifies parsing of SYST:ERR? responses."""
+    assert parse_error('-222,"Data out of range"\n') == (-222, "Data out of range")
+    assert parse_error('0,"No error"') == (0, "No error")
+
+
+def test_errors_are_attributed_to_the_command_window():
+    """Verifies that drained errors carry the commands sent since the previous drain."""
+    generator = SimulatedGenerator(SimulatedChamber(), deferred_errors=True)
+    generator.set_frequency(433.92e6)
+    assert generator.drain_errors() == []
+
+    generator.set_power(-50)
+    generator.set_power(-49)
+    generator.inject_error(-221, "Settings conflict")
+    errors = generator.drain_errors()
+
+    assert len(errors) == 1
+    assert (errors[0].code, errors[0].first_command, errors[0].last_command) == (-221, 2, 3)
+    assert errors[0].commands == ("POW -50.00", "POW -49.00")
+    assert generator.drain_errors() == []
+
+
+def test_deferred_mode_skips_the_per_command_status_check():
+    """Verifies that an error surfaces at the next command per-command, and only at the checkpoint deferred."""
+    per_command = SimulatedGenerator(SimulatedChamber())
+    per_command.inject_error(-222, "Data out of range")
+    with pytest.raises(RuntimeError):
+        per_command.set_power(-40)
+
+    deferred = SimulatedGenerator(SimulatedChamber(), deferred_errors=True)
+    deferred.inject_error(-222, "Data out of range")
+    deferred.set_power(-40)
+    with pytest.raises(RuntimeError, match="-222"):
+        deferred.check_errors()
+
+
+def test_smb100a_deferred_error_checking():
+    """Verifies that the driver disables the RsInstrument status checking and drains the queue."""
+    with patch("drivers.rs_smb100a.RsInstrument") as mock_class:
+        inst = mock_class.return_value
+        inst.query_str.side_effect = ['-113,"Undefined header"', '0,"No error"']
+        driver = SMB100A("TCPIP::1.2.3.4::INSTR", deferred_errors=True)
+        driver.set_power(-30)
+
+        assert inst.instrument_status_checking is False
+        with pytest.raises(InstrumentCommandError, match="POW -30.00"):
+            driver.check_errors()
+        inst.query_str.assert_called_with("SYST:ERR?")
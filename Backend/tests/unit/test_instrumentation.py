@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import patch
+from drivers.instrumentation import METRICS, LatencyHistogram, MetricsRegistry, timed
+from drivers.rs_smb100a import SMB100A
+
+
+def test_histogram_counts_and_percentiles():
+    """Verifies the bucket-based statistics of a latency histogram."""
+    histogram = LatencyHistogram()
+    for seconds in (0.001, 0.001, 0.003, 0.004, 0.9):
+        histogram.observe(seconds)
+
+    stats = histogram.to_dict()
+    assert stats["count"] == 5
+    assert stats["p50_s"] == 0.005
+    assert stats["p95_s"] == 0.9
+    assert stats["buckets"] == {"le_0.001": 2, "le_0.005": 2, "le_1.0": 1}
+
+
+def test_timed_as_decorator_and_context_manager():
+    """Verifies that both forms record the operation and count failures."""
+    registry = MetricsRegistry()
+    registry.start_run("test")
+
+    @timed("op.ok", registry)
+    def ok():
+        return 42
+
+    @timed("op.fail", registry)
+    def fail():
+        raise RuntimeError("boom")
+
+    assert ok() == 42
+    with pytest.raises(RuntimeError):
+        fail()
+    with timed("op.ok", registry):
+        pass
+
+    operations = registry.snapshot()["operations"]
+    assert operations["op.ok"]["count"] == 2
+    assert operations["op.fail"]["errors"] == 1
+
+
+def test_smb100a_commands_are_instrumented():
+    """Verifies that SCPI writes and queries of the driver land in the run metrics."""
+    with patch("drivers.rs_smb100a.RsInstrument") as mock_class:
+        mock_class.return_value.query_float_with_opc.return_value = 868e6
+        driver = SMB100A("TCPIP::1.2.3.4::INSTR")
+        METRICS.start_run("test")
+
+        driver.set_power(-30)
+        driver.set_frequency(868e6)
+        driver.get_frequency()
+
+    assert METRICS.count("scpi.write") == 2
+    assert METRICS.count("scpi.query") == 1
@@ -0,0 +1,95 @@
+import json
+import pytest
+import testowy
+from drivers.test_calculation.calibration import Calibration
+from measurement import engine as engine_module
+from reporting.results_db import ResultsDatabase
+from measurement.compiled_plan import compile_campaign
+from measurement.limits import FAIL, NO_LIMIT, PASS, PENDING, AntennaLimits, SheetVerdict, load_antenna_limits
+import test_state
+
+PARAMS = {"frequency_hz": 433.92e6, "distance": 3, "wire_loss_db": 5.0, "antenna_factor_dbm_1": 17.8}
+
+
+def test_verdict_is_updated_per_point():
+    """Verifies running statistics, margins and the pass/fail transitions."""
+    calibration = Calibration().for_sheet(PARAMS)
+    limit = calibration.field_strength(-40.0)[0]
+    verdict = SheetVerdict(AntennaLimits(down_limit_dbuvm=limit), calibration, total_points=3)
+
+    verdict.add(0, "V", -45.0, -48.0)
+    assert verdict.verdict == PENDING
+    verdict.add(0, "H", -41.0, -42.0)
+    assert verdict.verdict == PENDING
+    assert (verdict.min_activation_dbm, verdict.max_activation_dbm, verdict.max_gap_db) == (-45.0, -41.0, 3.0)
+    assert verdict.worst_margin_db == pytest.approx(1.0)
+
+    verdict.add(90, "V", -38.0, None)
+    assert verdict.verdict == FAIL
+    assert verdict.to_dict()["failed_points"] == [
+        {"angle": 90, "polarization": "V", "activation_dbm": -38.0, "margin_db": pytest.approx(-2.0)}
+    ]
+
+
+def test_generator_limit_without_calibration_and_missing_activation():
+    """Verifies the generator limit fallback and that a silent DUT fails."""
+    verdict = SheetVerdict(AntennaLimits(down_limit_dbuvm=40, generator_dbm=-30), Calibration().for_sheet({}), 2)
+    verdict.add(0, "V", -35.0, -37.0)
+    assert verdict.to_dict()["limit"] == "generator"
+    verdict.add(0, "H", None, None)
+    assert verdict.verdict == FAIL
+
+    complete = SheetVerdict(AntennaLimits(generator_dbm=-30), Calibration().for_sheet({}), 1)
+    complete.add(0, "V", -35.0, -37.0)
+    assert complete.verdict == PASS
+    assert SheetVerdict(None, Calibration().for_sheet(PARAMS), 1).verdict == NO_LIMIT
+
+
+def test_load_antenna_limits(tmp_path):
+    """Verifies reading the limits of antennas.json by antenna name."""
+    path = tmp_path / "antennas.json"
+    path.write_text(json.dumps([{"id": 1, "nazwa": "RTS", "parametry": {"down_limit": 40, "upper_limit": 100,
+                                                                         "generator": -54}}]))
+    assert load_antenna_limits(path) == {"RTS": AntennaLimits(40, 100, -54)}
+    assert load_antenna_limits(tmp_path / "missing.json") == {}
+
+
+def test_failed_sheet_is_aborted(tmp_path, monkeypatch):
+    """Verifies that with abort_sheet_on_fail a failed sheet stops after its first point."""
+    monkeypatch.setattr(engine_module, "POSITION_POLL_S", 0.0)
+    antennas = tmp_path / "antennas.json"
+    # The simulated DUT activates around -42 dBm, above this generator limit.
+    antennas.write_text(json.dumps([{"nazwa": "RTS", "parametry": {"generator": -60}}]))
+    monkeypatch.setattr(testowy, "ANTENNAS_FILE", antennas)
+    (tmp_path / "bench_config.json").write_text(json.dumps(
+        {"simulated": True, "latency_profile": "instant", "polarization_settle_s": 0, "dut_settle_s": 0}))
+    (tmp_path / "we_config.json").write_text(json.dumps([
+        {"sheet": 1, "id": 1, "antenna": "RTS",
+         "test_params": {"frequency_hz": 433.92e6, "angles": [0, 90, 180], "polarizations": ["V", "H"]},
+         "runtime_params": {"start_power_dbm": -50, "end_power_dbm": 0, "power_step_db": 1,
+                            "abort_sheet_on_fail": True}},
+    ]))
+    state = test_state.TestState()
+    state.start()
+
+    testowy.run_antenna_test(state, tmp_path / "result.json")
+
+    sheet = json.loads((tmp_path / "result.json").read_text())[0]
+    assert sheet["verdict"]["verdict"] == FAIL
+    assert sheet["verdict"]["aborted"] is True
+    assert sheet["verdict"]["points"] == 1
+    assert state.verdicts()["1/1"]["verdict"] == FAIL
+    # Every measured point also goes to the results database.
+    with ResultsDatabase(tmp_path / "results.db") as db:
+        assert db.runs()[0]["points"] == 1
+
+
+def test_verdicts_of_configs_sharing_a_sheet_are_kept_apart():
+    """Verifies that configurations with the same (or no) sheet number publish separate verdicts."""
+    campaign = compile_campaign([{"sheet": None, "id": config_id, "test_params": PARAMS} for config_id in (1, 2)])
+    state = test_state.TestState()
+    for sheet in campaign.sheets:
+        testowy._publish_verdict(state, sheet, SheetVerdict(None, sheet.calibration, total_points=1))
+
+    assert sorted(state.verdicts()) == ["None/1", "None/2"]
+    assert state.verdicts()["None/2"]["id"] == 2
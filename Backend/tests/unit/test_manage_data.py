@@ -0,0 +1,94 @@
+import io
+import pytest
+import openpyxl
+from drivers.Exel_functions.manage_data import (
+    MergedCellIndex,
+    parse_frequency_block,
+    parse_template,
+    read_merged_ranges,
+)
+
+
+def _build_template(sheet_titles=("1",)) -> bytes:
+    """Builds a minimal template with the frequency block in rows 3-8, columns T-AD."""
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for title in sheet_titles:
+        sheet = workbook.create_sheet(title)
+        sheet["T2"] = "Frequencies"
+        sheet.merge_cells("T2:AD2")
+        headers = ["Protocol", "Country", None, "Frequency (MHz)", "Wire Loss (dB) :", "Antenna Factor (dBm-1) :"]
+        for row, header in enumerate(headers, start=3):
+            if header:
+                sheet.cell(row=row, column=20, value=header)
+        sheet.merge_cells("T4:U5")
+        sheet.merge_cells("V4:V5")
+        for col, (protocol, country, freq) in enumerate(
+            [("RTS (FM)", "Japan", 426.0625), ("RTX (FM)", "Europe", 868.25)], start=22
+        ):
+            sheet.cell(row=3, column=col, value=protocol)
+            sheet.cell(row=4, column=col, value=country)
+            sheet.cell(row=6, column=col, value=freq)
+            sheet.cell(row=7, column=col, value=6.93)
+            sheet.cell(row=8, column=col, value=17.2)
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
+def test_merged_cell_index_resolves_anchor():
+    """Verifies that every cell of a merged range maps to its top-left anchor."""
+    index = MergedCellIndex([openpyxl.worksheet.cell_range.CellRange("T4:U5")])
+
+    assert index.anchor(5, 21) == (4, 20)
+    assert index.anchor(4, 20) == (4, 20)
+    assert index.anchor(6, 20) is None
+
+
+def test_read_merged_ranges_read_only_matches_regular():
+    """Verifies that merged ranges streamed in read-only mode match the regular worksheet."""
+    content = _build_template()
+    regular = openpyxl.load_workbook(io.BytesIO(content)).active
+    read_only = openpyxl.load_workbook(io.BytesIO(content), read_only=True).active
+
+    assert {str(r) for r in read_merged_ranges(read_only)} == {str(r) for r in read_merged_ranges(regular)}
+
+
+def test_parse_frequency_block_uses_merged_values():
+    """Verifies key normalization and merged-cell fallback for keys and values."""
+    sheet = openpyxl.load_workbook(io.BytesIO(_build_template()), read_only=True).active
+    items = parse_frequency_block(sheet)
+
+    assert len(items) == 2
+    assert items[0]["protocol"] == "RTS (FM)"
+    assert items[0]["country"] == "Japan"
+    assert items[0]["frequency_mhz"] == 426.0625
+    assert items[1]["antenna_factor_dbm_1"] == 17.2
+
+
+def test_parse_template_all_sheets_deduplicates():
+    """Verifies that identical objects from several sheets are reported once."""
+    frequencies = parse_template(_build_template(("1", "2")))
+
+    assert [item["id"] for item in frequencies] == [1, 2]
+    assert frequencies[0]["sheets"] == ["1", "2"]
+
+
+def test_parse_template_active_sheet_only():
+    """Verifies that parsing can still be limited to the active sheet."""
+    frequencies = parse_template(_build_template(("1", "2")), all_sheets=False)
+
+    assert len(frequencies) == 2
+    assert frequencies[0]["sheets"] == ["1"]
+
+
+def test_read_merged_ranges_without_private_openpyxl_attributes():
+    """Verifies the fallback to a regular load when a read-only sheet does not expose its XML part."""
+    content = _build_template()
+    regular = openpyxl.load_workbook(io.BytesIO(content)).active
+    read_only = openpyxl.load_workbook(io.BytesIO(content), read_only=True).active
+    del read_only._worksheet_path
+
+    with pytest.raises(ValueError):
+        read_merged_ranges(read_only)
+    assert {str(r) for r in read_merged_ranges(read_only, content)} == {str(r) for r in read_merged_ranges(regular)}
@@ -51,6 +51,14 @@ def test_ni9485_write_relay_operation_error(mock_nidaqmx_task):
     with pytest.raises(NIOperationError):
         driver.write_relay(line=1, state=False)
 
+def test_ni9485_write_port(mock_nidaqmx_task):
+    """Verifies that a port write sets all relay lines at once."""
+    driver = NI9485Handler(DEVICE_ID)
+    driver.write_port(0b101)
+
+    mock_nidaqmx_task.do_channels.add_do_chan.assert_called_with(f"{DEVICE_ID}/port0")
+    mock_nidaqmx_task.write.assert_called_with(5)
+
 def test_ni9485_safe_state(mock_nidaqmx_task):
     """Verifies that safe_state opens all relays."""
     driver = NI9485Handler(DEVICE_ID)
@@ -72,6 +80,34 @@ def test_ni6361_read_analog_success(mock_nidaqmx_task):
     mock_nidaqmx_task.ai_channels.add_ai_voltage_chan.assert_called_once()
     mock_nidaqmx_task.read.assert_called_once()
 
+def test_ni6361_read_analog_inputs_in_one_scan(mock_nidaqmx_task):
+    """Verifies that several channels are read by one task in one read."""
+    mock_nidaqmx_task.read.return_value = [0.1, 4.9]
+
+    driver = NIUSB6361Handler(DEVICE_ID)
+
+    assert driver.read_analog_inputs([1, 4]) == [0.1, 4.9]
+    mock_nidaqmx_task.ai_channels.add_ai_voltage_chan.assert_called_once_with(
+        f"{DEVICE_ID}/ai1,{DEVICE_ID}/ai4", min_val=-10.0, max_val=10.0, units=ANY, terminal_config=ANY
+    )
+    mock_nidaqmx_task.read.assert_called_once()
+
+def test_ni6361_continuous_acquisition_is_hardware_timed():
+    """Verifies that a continuous acquisition runs on the sample clock and drains the buffer on read."""
+    with patch("drivers.ni.usb_6361.nidaqmx") as mock_nidaqmx:
+        mock_nidaqmx.DaqError = MockDaqError
+        task = mock_nidaqmx.Task.return_value
+        task.read.return_value = [0.1, 0.2, 4.9]
+
+        stream = NIUSB6361Handler(DEVICE_ID).start_continuous(3, rate_hz=1000.0, buffer_s=2.0)
+
+        assert stream.read_available() == [0.1, 0.2, 4.9]
+        stream.close()
+    task.timing.cfg_samp_clk_timing.assert_called_once_with(1000.0, sample_mode=ANY, samps_per_chan=2000)
+    task.start.assert_called_once()
+    task.stop.assert_called_once()
+    task.close.assert_called_once()
+
 def test_ni6361_read_analog_config_error(mock_nidaqmx_task):
     """Verifies that an AI channel configuration error is handled correctly."""
     mock_nidaqmx_task.ai_channels.add_ai_voltage_chan.side_effect = MockDaqError("Invalid AI channel")
@@ -0,0 +1,89 @@
+import pytest
+from measurement.planner import (
+    ANGLE_MAJOR,
+    SHEET_MAJOR,
+    MeasurementPoint,
+    OperationCosts,
+    build_plan,
+    estimate_runtime,
+)
+
+
+def _sheet(sheet, freq_hz, antenna="RTS Printed or Wire Antenna", angles=(0, 30, 60), polarizations=("V", "H")):
+    """Builds a minimal we_config entry."""
+    return {
+        "sheet": sheet,
+        "id": sheet,
+        "antenna": antenna,
+        "test_params": {"frequency_hz": freq_hz, "distance": 3, "angles": list(angles), "polarizations": list(polarizations)},
+        "hardware_config": {"analog_channel": 3, "voltage_threshold_v": 4.5},
+        "runtime_params": {"start_malt_height": 150},
+    }
+
+
+def test_sheet_major_keeps_configured_order():
+    """Verifies that the naive plan follows sheet, angle, polarization order."""
+    plan = build_plan([_sheet(1, 433.92e6), _sheet(2, 868.25e6)], OperationCosts(), SHEET_MAJOR)
+
+    assert [(p.sheet, p.angle, p.polarization) for p in plan.points[:3]] == [(1, 0, "V"), (1, 0, "H"), (1, 30, "V")]
+    assert plan.estimate == plan.naive_estimate
+
+
+def test_angle_major_visits_each_angle_once():
+    """Verifies that compatible sheets share turntable positions."""
+    plan = build_plan([_sheet(1, 433.92e6), _sheet(2, 868.25e6)], OperationCosts(), ANGLE_MAJOR)
+
+    assert len(plan.points) == 12
+    assert plan.estimate.moves == 3
+    assert plan.naive_estimate.moves == 6
+    assert plan.estimate.seconds < plan.naive_estimate.seconds
+    assert plan.summary()["saving_s"] > 0
+
+
+def test_angle_major_snakes_polarization_and_frequency():
+    """Verifies that consecutive blocks continue from the previous polarization and frequency."""
+    plan = build_plan([_sheet(1, 433.92e6), _sheet(2, 868.25e6)], OperationCosts(), ANGLE_MAJOR)
+    states = [(p.angle, p.polarization, p.frequency_hz) for p in plan.points[:6]]
+
+    assert states == [
+        (0, "V", 433.92e6), (0, "V", 868.25e6),
+        (0, "H", 868.25e6), (0, "H", 433.92e6),
+        (30, "H", 433.92e6), (30, "H", 868.25e6),
+    ]
+
+
+def test_incompatible_sheets_stay_in_separate_groups():
+    """Verifies that sheets with a different DUT antenna are not interleaved."""
+    plan = build_plan([_sheet(1, 433.92e6), _sheet(2, 868.25e6, antenna="Other")], OperationCosts(), ANGLE_MAJOR)
+
+    assert plan.groups == [[1], [2]]
+    assert {p.sheet for p in plan.points[:6]} == {1}
+    # The second group sweeps the angles backwards from where the first one ended.
+    assert plan.points[6].angle == 60
+
+
+def test_estimate_counts_state_changes():
+    """Verifies the cost model on a hand-made sequence."""
+    costs = OperationCosts(retune_s=1, move_overhead_s=2, move_s_per_deg=0.1, polarization_s=3,
+                           power_step_s=0.5, steps_per_point=2)
+    points = [MeasurementPoint(0, 1, 1, 0, "V", 1e6), MeasurementPoint(0, 1, 1, 30, "V", 1e6)]
+    estimate = estimate_runtime(points, costs)
+
+    # retune 1 + move 2 + pol 3 + point 1, then move 2 + 3 + point 1
+    assert estimate.seconds == pytest.approx(13.0)
+    assert (estimate.retunes, estimate.moves, estimate.polarization_changes) == (1, 2, 1)
+
+
+def test_unknown_order_is_rejected():
+    with pytest.raises(ValueError):
+        build_plan([_sheet(1, 433.92e6)], OperationCosts(), "random")
+
+
+def test_operation_costs_roundtrip(tmp_path):
+    """Verifies that learned costs survive a save/load cycle."""
+    costs = OperationCosts()
+    costs.observe("retune_s", 1.5)
+    costs.save(tmp_path / "operation_costs.json")
+
+    assert OperationCosts.load(tmp_path / "operation_costs.json").retune_s == pytest.approx(costs.retune_s)
+    assert OperationCosts.load(tmp_path / "missing.json") == OperationCosts()
@@ -0,0 +1,97 @@
+import pytest
+import template_ingest
+from measurement import engine as engine_module
+from measurement.bench import create_simulated_bench
+from measurement.engine import RampSettings, SweepEngine
+from measurement.planner import MeasurementPoint, OperationCosts, build_plan
+from measurement.predictor import ThresholdPredictor, load_history, save_history
+
+RAMP = RampSettings(start_dbm=-80, end_dbm=0, step_db=1, predict=True, prediction_margin_db=3)
+CONFIG = [{"sheet": 1, "id": 1, "antenna": "RTS", "test_params": {"frequency_hz": 433.92e6}}]
+
+
+def _point(angle, polarization="V"):
+    return MeasurementPoint(0, 1, 1, angle, polarization, 433.92e6)
+
+
+def _dut(threshold_dbm):
+    state = {"active": False}
+
+    def set_power(dbm):
+        if dbm >= threshold_dbm:
+            state["active"] = True
+        elif dbm < threshold_dbm - 2:
+            state["active"] = False
+
+    return set_power, lambda: 5.0 if state["active"] else 0.0
+
+
+def test_prediction_sources_in_order_of_preference():
+    """Verifies neighbouring angles, then the other polarization, then the history of previous runs."""
+    predictor = ThresholdPredictor(CONFIG, [RAMP], history={"RTS|433920000.0|dBm": {"0/V": -50.0, "30/V": -44.0}})
+    assert predictor.predict(_point(0)) == -50.0
+    assert predictor.predict(_point(60)) == -47.0
+
+    predictor.observe(_point(0, "H"), -40.0)
+    assert predictor.predict(_point(0)) == -40.0
+    predictor.observe(_point(0), -42.0)
+    predictor.observe(_point(60), -36.0)
+    assert predictor.predict(_point(30)) == pytest.approx(-39.0)
+
+
+def test_bracket_stays_on_the_ramp_grid():
+    """Verifies that the predicted start is snapped to the step grid and clamped to the ramp."""
+    predictor = ThresholdPredictor(CONFIG, [RAMP])
+    predictor.observe(_point(0), -41.4)
+    assert predictor.bracket(_point(0), RAMP).start_dbm == -45.0
+    predictor.observe(_point(0), -200.0)
+    assert predictor.bracket(_point(0), RAMP).start_dbm == -80.0
+
+
+def test_search_falls_back_to_full_ramp_on_a_miss():
+    """Verifies the saved steps on a hit and the full-range search when the prediction is too high."""
+    predictor = ThresholdPredictor(CONFIG, [RAMP])
+    predictor.observe(_point(0), -42.0)
+
+    hit = predictor.search(_point(30), *_dut(-43.0), RAMP)
+    assert hit.activation_dbm == -43.0
+    assert predictor.stats.steps_skipped == 35
+
+    predictor.observe(_point(60), -20.0)
+    miss = predictor.search(_point(60), *_dut(-50.0), RAMP)
+    assert miss.activation_dbm == -50.0
+    assert predictor.stats.misses == 1
+    assert predictor.stats.to_dict()["predictions"] == 2
+
+
+def test_predictive_start_reduces_steps_on_simulated_bench(monkeypatch):
+    """Verifies that the predicted ramp finds the same thresholds with fewer steps."""
+    monkeypatch.setattr(engine_module, "POSITION_POLL_S", 0.0)
+    runtime = {"start_power_dbm": -80, "end_power_dbm": 0, "power_step_db": 1}
+    we_config = [{"sheet": 1, "id": 1, "test_params": {"frequency_hz": 433.92e6, "angles": [0, 90, 180, 270],
+                                                       "polarizations": ["V", "H"]}, "runtime_params": runtime}]
+    predictive = [dict(we_config[0], runtime_params=dict(runtime, predictive_start=True))]
+    plan = build_plan(we_config, OperationCosts())
+
+    full = list(SweepEngine(create_simulated_bench(), we_config).run(plan))
+    predictor = ThresholdPredictor(predictive, [RampSettings.from_config(predictive[0])])
+    predicted = list(SweepEngine(create_simulated_bench(), predictive, predictor=predictor).run(plan))
+
+    assert [r.activation_dbm for _, r in predicted] == [r.activation_dbm for _, r in full]
+    assert sum(r.steps for _, r in predicted) < sum(r.steps for _, r in full)
+    assert predictor.stats.predictions == len(plan.points) - 1
+
+
+def test_interrupted_history_write_keeps_previous_runs(tmp_path, monkeypatch):
+    """Verifies that a history write failing mid-way leaves the previous file readable."""
+    path = tmp_path / "threshold_history.json"
+    save_history(path, {"RTS|433920000.0|dBm": {"0/V": -44.0}})
+
+    def crash(*args):
+        raise OSError("disk full")
+    monkeypatch.setattr(template_ingest.os, "replace", crash)
+    with pytest.raises(OSError):
+        save_history(path, {"RTS|433920000.0|dBm": {"0/V": -40.0}})
+
+    assert load_history(path) == {"RTS|433920000.0|dBm": {"0/V": -44.0}}
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
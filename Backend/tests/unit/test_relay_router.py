@@ -0,0 +1,66 @@
+import json
+import pytest
+from drivers.ni.relay_router import RelayRouter, parse_routes, save_relay_wear
+
+ROUTES = {
+    "dut_power": {"lines": [0]},
+    "att_0db": {"lines": [1, 2], "group": "attenuator"},
+    "att_20db": {"lines": [2, 3], "group": "attenuator", "break_before_make": False},
+    "port_a": {"lines": [4], "group": "antenna", "settle_s": 0.01},
+    "port_b": {"lines": [5], "group": "antenna"},
+}
+
+
+class FakeRelay:
+    def __init__(self):
+        self.writes = []
+
+    def write_port(self, mask):
+        self.writes.append(mask)
+
+    def safe_state(self):
+        self.writes.append(0)
+
+
+def test_transitions_change_only_differing_lines():
+    """Verifies the precomputed masks, one write per change and break-before-make ordering."""
+    relay = FakeRelay()
+    router = RelayRouter(relay, parse_routes(ROUTES))
+    transition = router.transition("att_0db", "att_20db")
+    assert (transition.open_mask, transition.close_mask) == (0b0010, 0b1000)
+
+    router.select("dut_power")
+    router.select("att_0db")
+    assert router.select("att_0db") == 0.0
+    router.select("att_20db")
+    assert relay.writes == [0b0001, 0b0111, 0b1101]
+
+    assert router.select("port_a") == 0.01
+    relay.writes.clear()
+    router.select("port_b")
+    assert relay.writes == [0b001101, 0b101101]
+    assert router.counters() == {"routes": {"dut_power": 1, "att_0db": 1, "att_20db": 1, "port_a": 1, "port_b": 1},
+                                 "line_toggles": [1, 2, 1, 1, 2, 1, 0, 0], "port_writes": 6}
+
+
+def test_invalid_routes():
+    """Verifies the rejection of out-of-range lines and of lines shared by two groups."""
+    with pytest.raises(ValueError):
+        parse_routes({"a": {"lines": [8]}})
+    with pytest.raises(ValueError):
+        parse_routes({"a": {"lines": [1]}, "b": {"lines": [1], "group": "other"}})
+
+
+def test_relay_wear_accumulates(tmp_path):
+    """Verifies that the counters are added to the totals once and then reset."""
+    router = RelayRouter(FakeRelay(), parse_routes(ROUTES))
+    router.select("dut_power")
+    path = tmp_path / "relay_wear.json"
+
+    save_relay_wear(path, router)
+    router.select("port_a")
+    totals = save_relay_wear(path, router)
+
+    assert totals["routes"]["dut_power"] == 1 and totals["routes"]["port_a"] == 1
+    assert totals["port_writes"] == 2
+    assert json.loads(path.read_text()) == totals
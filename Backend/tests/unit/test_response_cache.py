@@ -0,0 +1,55 @@
+import json
+import os
+import pytest
+from fastapi.testclient import TestClient
+import main
+
+SHEETS = [{"sheet": i, "id": i, "antenna": "RTS", "test_params": {"frequency_hz": 433.92e6}} for i in range(40)]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    for name in ("HARDWARE_CONFIG_PATH", "RUNTIME_PARAMS_PATH", "TEST_CONFIG_PATH", "FREQUENCY_JSON_PATH"):
+        monkeypatch.setattr(main, name, tmp_path / f"{name.lower()}.json")
+    monkeypatch.setattr(main, "CONFIG", tmp_path)
+    monkeypatch.setattr(main, "response_cache", main.ResponseCache())
+    main.TEST_CONFIG_PATH.write_text(json.dumps(SHEETS))
+    main.HARDWARE_CONFIG_PATH.write_text(json.dumps({"analog_channel": 3}))
+    return TestClient(main.app)
+
+
+def test_conditional_get_and_gzip(client):
+    """Verifies the ETag, the 304 on a matching If-None-Match and the gzip body above the threshold."""
+    response = client.get("/get-test-config", headers={"Accept-Encoding": "gzip"})
+    etag = response.headers["etag"]
+    assert response.json() == SHEETS
+    assert response.headers["content-encoding"] == "gzip"
+
+    plain = client.get("/get-test-config", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert int(response.headers["content-length"]) < len(plain.content)
+
+    not_modified = client.get("/get-test-config", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert client.get("/get-hardware-config").headers.get("content-encoding") is None
+
+
+def test_cached_bytes_follow_file_changes(client):
+    """Verifies that the cached response is rebuilt only when its file changes."""
+    first = client.get("/get-hardware-config")
+    assert client.get("/get-hardware-config").headers["etag"] == first.headers["etag"]
+
+    main.HARDWARE_CONFIG_PATH.write_text(json.dumps({"analog_channel": 5}))
+    os.utime(main.HARDWARE_CONFIG_PATH, ns=(1, 1))
+    changed = client.get("/get-hardware-config", headers={"If-None-Match": first.headers["etag"]})
+    assert changed.status_code == 200
+    assert changed.json() == {"analog_channel": 5}
+
+
+def test_bootstrap_returns_all_configuration(client):
+    """Verifies the combined response and its defaults for missing files."""
+    data = client.get("/bootstrap").json()
+
+    assert data == {"frequencies": [], "hardware_config": {"analog_channel": 3}, "runtime_params": {},
+                    "test_config": SHEETS}
@@ -0,0 +1,43 @@
+import json
+from fastapi.testclient import TestClient
+import main
+import testowy
+from measurement.compiled_plan import compile_campaign
+from reporting.result_views import filter_sheets, result_cursor, to_columnar
+
+CAMPAIGN = compile_campaign([{"sheet": s, "id": s, "antenna": "RTS", "test_params": {"frequency_hz": 433.92e6}}
+                             for s in (1, 2)])
+ROWS = [{"angle": "0°", "genPolarH_act": -41.0, "genPolarV_act": -43.0},
+        {"angle": "90°", "genPolarH_act": -40.0}]
+
+
+def test_columnar_and_filters():
+    """Verifies one array per field and the sheet/cursor filters, including a cursor from a reset file."""
+    sheets = [{"sheet": 1, "id": 1, "revision": 1, "result": ROWS}, {"sheet": 2, "id": 2, "revision": 2, "result": []}]
+
+    assert to_columnar(sheets[:1]) == [{"sheet": 1, "id": 1, "revision": 1, "rows": 2, "columns": {
+        "angle": ["0°", "90°"], "genPolarH_act": [-41.0, -40.0], "genPolarV_act": [-43.0, None]}}]
+    assert result_cursor(sheets) == 2
+    assert [s["sheet"] for s in filter_sheets(sheets, since=1)] == [2]
+    assert [s["sheet"] for s in filter_sheets(sheets, sheet="1")] == [1]
+    assert [s["sheet"] for s in filter_sheets(sheets, since=7)] == [1, 2]
+
+
+def test_download_data_since_cursor(tmp_path, monkeypatch):
+    """Verifies the cursor header, the incremental fetch after a sheet is saved and the columnar format."""
+    result_file = tmp_path / "result.json"
+    monkeypatch.setattr(main, "RESULT_FILE", result_file)
+    monkeypatch.setattr(main, "result_cache", main.ResponseCache())
+    client = TestClient(main.app)
+
+    testowy.save_sheet_result(result_file, CAMPAIGN, CAMPAIGN.sheets[0], [dict(r) for r in ROWS])
+    first = client.get("/download-data")
+    cursor = first.headers["x-result-cursor"]
+    assert cursor == "1"
+    assert [s["revision"] for s in first.json() if "revision" in s] == [1]
+
+    testowy.save_sheet_result(result_file, CAMPAIGN, CAMPAIGN.sheets[1], [dict(ROWS[0])])
+    changed = client.get("/download-data", params={"since": cursor, "format": "columnar"})
+    assert changed.headers["x-result-cursor"] == "2"
+    assert [(s["sheet"], s["columns"]["genPolarV_act"]) for s in changed.json()] == [(2, [-43.0])]
+    assert client.get("/download-data", params={"format": "xml"}).status_code == 400
@@ -0,0 +1,84 @@
+import sqlite3
+import pytest
+from drivers.test_calculation.calibration import Calibration
+from measurement.compiled_plan import compile_sheet
+from reporting.results_db import ResultsDatabase
+
+SHEET = compile_sheet(0, {"sheet": 1, "id": 1, "antenna": "RTS", "dut_serial": "SN-001",
+                          "test_params": {"frequency_hz": 433920000}}, Calibration())
+
+
+@pytest.fixture
+def db(tmp_path):
+    with ResultsDatabase(tmp_path / "results.db") as database:
+        for run_id, offset in (("run-1", 0.0), ("run-2", 1.5)):
+            database.start_run(run_id, "angle_major")
+            for angle, activation in ((0, -45.0), (90, -41.0)):
+                database.record_point(run_id, SHEET, angle, "V", activation + offset, activation + offset - 2, steps=10)
+            database.record_point(run_id, SHEET, 0, "H", None, None, steps=61)
+            database.finish_run(run_id)
+        yield database
+
+
+def test_activation_statistics_per_angle(db):
+    """Verifies the per-angle aggregates across runs, ignoring points without activation."""
+    rows = db.activation_by_angle("RTS", 433920000, polarization="V")
+
+    assert [(r["angle"], r["n"]) for r in rows] == [(0, 2), (90, 2)]
+    assert rows[0]["mean_activation_dbm"] == pytest.approx(-44.25)
+    assert (rows[0]["min_activation_dbm"], rows[0]["max_activation_dbm"]) == (-45.0, -43.5)
+    assert db.activation_by_angle("RTS", 868250000) == []
+
+
+def test_drift_between_runs(db):
+    """Verifies the per-run means in chronological order and their change relative to the first run."""
+    rows = db.drift("RTS", 433920000, dut_serial="SN-001")
+
+    assert [r["run_id"] for r in rows] == ["run-1", "run-2"]
+    assert [r["drift_db"] for r in rows] == [0.0, pytest.approx(1.5)]
+
+
+def test_runs_and_index_use(db):
+    """Verifies the run listing and that the angle query is served by the index."""
+    runs = db.runs(antenna="RTS")
+    assert [r["run_id"] for r in runs] == ["run-2", "run-1"]
+    assert runs[0]["points"] == 3
+
+    plan = db._query("EXPLAIN QUERY PLAN SELECT angle FROM measurements m "
+                     "WHERE m.antenna = ? AND m.frequency_hz = ?", ["RTS", 433920000])
+    assert any("idx_measurements_antenna_freq_angle" in row["detail"] for row in plan)
+
+
+def test_duplicate_run_id_is_rejected(db):
+    """Verifies that a second run with the same id fails instead of merging into the first."""
+    with pytest.raises(sqlite3.IntegrityError):
+        db.start_run("run-1", "angle_major")
+
+
+def test_verdicts_of_configs_sharing_a_sheet(db):
+    """Verifies that two configurations with the same sheet number keep their own verdicts."""
+    other = compile_sheet(1, {"sheet": 1, "id": 2, "antenna": "RTS", "test_params": {"frequency_hz": 868.3e6}},
+                          Calibration())
+    db.record_verdict("run-1", SHEET, {"verdict": "pass", "worst_margin_db": 3.0})
+    db.record_verdict("run-1", other, {"verdict": "fail", "worst_margin_db": -1.0})
+
+    rows = db._query("SELECT config_id, verdict FROM sheet_verdicts WHERE run_id = ? ORDER BY config_id", ["run-1"])
+    assert [(r["config_id"], r["verdict"]) for r in rows] == [("1", "pass"), ("2", "fail")]
+
+
+def test_verdict_table_keyed_by_sheet_is_migrated(tmp_path):
+    """Verifies that a database from before config_id keeps its verdicts and accepts per-config ones."""
+    path = tmp_path / "results.db"
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute("CREATE TABLE sheet_verdicts (run_id TEXT NOT NULL, sheet TEXT NOT NULL, antenna TEXT, "
+                     "dut_serial TEXT, frequency_hz INTEGER, verdict TEXT, worst_margin_db REAL, "
+                     "PRIMARY KEY (run_id, sheet))")
+        conn.execute("INSERT INTO sheet_verdicts VALUES ('old', '1', 'RTS', NULL, 433920000, 'pass', 2.0)")
+    conn.close()
+
+    with ResultsDatabase(path) as database:
+        database.start_run("new")
+        database.record_verdict("new", SHEET, {"verdict": "fail"})
+        rows = database._query("SELECT run_id, config_id, verdict FROM sheet_verdicts ORDER BY run_id", [])
+
+    assert [tuple(r.values()) for r in rows] == [("new", "1", "fail"), ("old", "", "pass")]
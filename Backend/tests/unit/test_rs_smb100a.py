@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import MagicMock, patch, call
-from drivers.rs_smb100a import SMB100A, InstrumentRangeError, InstrumentConnectionError
+from drivers.rs_smb100a import SMB100A, InstrumentCommandError, InstrumentRangeError, InstrumentConnectionError
 
 # Adres testowy (nie ma znaczenia przy mockowaniu)
 RESOURCE = "TCPIP::1.2.3.4::INSTR"
@@ -100,3 +100,17 @@ def test_context_manager(mock_rs_inst):
     # Po wyjsciu z with powinno byc safe_state i close
     assert driver.inst.write_with_opc.call_count >= 2 # safe state calls
     driver.inst.close.assert_called_once()
+
+class TimeoutException(Exception):
+    """Odpowiednik RsInstrument.TimeoutException (klasyfikowany po nazwie)."""
+
+def test_failure_classification(mock_rs_inst):
+    """Sprawdza czy timeout jest bledem polaczenia, a blad zgloszony przez przyrzad bledem komendy."""
+    driver = SMB100A(RESOURCE)
+    mock_rs_inst.write_with_opc.side_effect = TimeoutException("VI_ERROR_TMO")
+    with pytest.raises(InstrumentConnectionError):
+        driver.set_power(-40)
+
+    mock_rs_inst.write_with_opc.side_effect = Exception("-222,Data out of range")
+    with pytest.raises(InstrumentCommandError):
+        driver.set_power(-40)
@@ -0,0 +1,84 @@
+import json
+import pytest
+import test_state
+from measurement.bench import create_simulated_bench
+from measurement.scan import ScanSettings, interpolate_angles, run_rotation_scan
+from measurement.simulation import LatencyProfile, SimulatedChamber
+from testowy import SCAN_RESULT_FILE, run_scan_test
+
+
+def test_interpolate_angles_between_position_reads():
+    """Verifies linear interpolation between reads and extrapolation past the last one."""
+    fixes = [(0.0, 0.0), (1.0, 10.0), (3.0, 30.0)]
+
+    assert interpolate_angles(fixes, [0.5, 2.0, 4.0, -1.0]) == [5.0, 20.0, 40.0, -10.0]
+    assert interpolate_angles([(0.0, 7.0)], [1.0, 2.0]) == [7.0, 7.0]
+    with pytest.raises(ValueError):
+        interpolate_angles([], [1.0])
+
+
+def test_rotation_scan_maps_activation_pattern():
+    """Verifies that one revolution of the simulated table yields the DUT pattern at a fixed level."""
+    chamber = SimulatedChamber(profile=LatencyProfile(turntable_deg_per_s=720.0))
+    bench = create_simulated_bench(chamber=chamber)
+    # Between the DUT threshold at 0 deg (-42 dBm) and at 180 deg (-36 dBm).
+    settings = ScanSettings(frequency_hz=433.92e6, level_dbm=-39.0, speed_deg_per_s=720.0, sample_rate_hz=1000.0,
+                            position_poll_s=0.01, resolution_deg=10.0)
+
+    result = run_rotation_scan(bench, settings)
+
+    assert result.completed
+    angles = [angle for angle, _, _ in result.samples]
+    assert angles == sorted(angles)
+    assert angles[0] < 20 and angles[-1] > 340
+    bins = {b["angle"]: b["active_fraction"] for b in result.bins()}
+    assert bins[5.0] == 1.0 and bins[355.0] == 1.0
+    assert bins[185.0] == 0.0
+    assert [edge["active"] for edge in result.edges()] == [False, True]
+    assert result.achieved_sample_rate_hz == pytest.approx(1000.0)
+    assert result.angular_spacing_deg == pytest.approx(0.72, rel=0.1) and not result.warnings
+    assert not chamber.rf_on
+
+
+def test_coarse_sampling_is_reported():
+    """Verifies that samples spaced wider than the resolution are flagged, leaving empty bins."""
+    bench = create_simulated_bench(chamber=SimulatedChamber(profile=LatencyProfile(turntable_deg_per_s=720.0)))
+    settings = ScanSettings(frequency_hz=433.92e6, level_dbm=-39.0, speed_deg_per_s=720.0, sample_rate_hz=100.0,
+                            position_poll_s=0.01, resolution_deg=1.0)
+
+    result = run_rotation_scan(bench, settings)
+
+    assert result.angular_spacing_deg == pytest.approx(7.2, rel=0.1)
+    assert result.warnings and "resolution" in result.warnings[0]
+    assert any(b["active_fraction"] is None for b in result.bins())
+
+
+def test_rotation_scan_stops_on_request():
+    """Verifies that a stopped scan halts the table and keeps the samples taken so far."""
+    chamber = SimulatedChamber(profile=LatencyProfile(turntable_deg_per_s=90.0))
+    bench = create_simulated_bench(chamber=chamber)
+    calls = iter(range(5))
+    settings = ScanSettings(frequency_hz=433.92e6, level_dbm=-39.0, sample_rate_hz=200.0, position_poll_s=0.02)
+
+    result = run_rotation_scan(bench, settings, lambda: next(calls, None) is not None)
+
+    assert not result.completed
+    assert 0 < len(result.samples) < 200
+    assert chamber.angle < 90
+    assert not chamber.rf_on
+
+
+def test_scan_runner_saves_result(tmp_path):
+    """Verifies that the scan runner opens the configured bench, saves the pattern and releases the state."""
+    (tmp_path / "bench_config.json").write_text(json.dumps({"simulated": True, "latency_profile": "demo"}))
+    state = test_state.TestState()
+    state.start()
+    settings = ScanSettings(frequency_hz=433.92e6, level_dbm=-39.0, speed_deg_per_s=120.0, sample_rate_hz=50.0,
+                            span_deg=30.0, resolution_deg=10.0)
+
+    assert run_scan_test(state, settings, tmp_path)
+
+    saved = json.loads((tmp_path / SCAN_RESULT_FILE).read_text())
+    assert saved["completed"] and saved["sample_count"] > 0
+    assert [b["angle"] for b in saved["bins"]] == [5.0, 15.0, 25.0]
+    assert not state.is_active()
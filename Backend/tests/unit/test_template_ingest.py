@@ -0,0 +1,92 @@
+import json
+import os
+import time
+import pytest
+from paths import CONFIG
+import template_ingest
+from template_ingest import TemplateIngestor
+
+
+def _wait(ingestor: TemplateIngestor, job_id: str, timeout: float = 30.0):
+    """Polls the job until it leaves the running state."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = ingestor.get(job_id)
+        if job.status in ("done", "failed"):
+            return job
+        time.sleep(0.05)
+    raise TimeoutError(f"Ingest job {job_id} did not finish within {timeout}s.")
+
+
+@pytest.fixture
+def ingestor(tmp_path):
+    """Provides an ingestor writing into a temporary directory."""
+    instance = TemplateIngestor(tmp_path / "uploaded_template.xlsx", tmp_path / "frequency.json")
+    yield instance
+    instance.shutdown()
+
+
+def test_ingest_valid_template_swaps_files(ingestor):
+    """Verifies that a recognised template is published together with its frequencies."""
+    content = (CONFIG / "uploaded_template.xlsx").read_bytes()
+    submitted = ingestor.submit(content, "template.xlsx")
+    # Not taken by a worker yet: the pool starts its process on the first submit.
+    assert submitted.status == "queued"
+    job = _wait(ingestor, submitted.job_id)
+
+    assert job.status == "done"
+    assert ingestor.template_path.read_bytes() == content
+    frequencies = json.loads(ingestor.frequency_path.read_text(encoding="utf-8"))
+    assert len(frequencies) == job.report["frequency_count"]
+    assert all(sheet["recognised"] for sheet in job.report["sheets"])
+
+
+def test_ingest_invalid_template_keeps_previous_files(ingestor):
+    """Verifies that a failed job leaves the current template and frequencies untouched."""
+    ingestor.frequency_path.write_text("[]", encoding="utf-8")
+    job = _wait(ingestor, ingestor.submit(b"not an xlsx", "broken.xlsx").job_id)
+
+    assert job.status == "failed"
+    assert ingestor.frequency_path.read_text(encoding="utf-8") == "[]"
+    assert not ingestor.template_path.exists()
+
+
+def test_interrupted_swap_is_completed_as_a_pair(tmp_path, monkeypatch):
+    """Verifies that a crash between the two renames is finished on the next start, not left mismatched."""
+    template, frequency = tmp_path / "uploaded_template.xlsx", tmp_path / "frequency.json"
+    template.write_bytes(b"old template")
+    frequency.write_text("old", encoding="utf-8")
+    ingestor = TemplateIngestor(template, frequency)
+    renames = []
+
+    def crashing_replace(src, dst):
+        renames.append(dst)
+        if len(renames) == 3:
+            raise OSError("power loss")
+        os.rename(src, dst)
+
+    monkeypatch.setattr(template_ingest.os, "replace", crashing_replace)
+    with pytest.raises(OSError):
+        ingestor._publish(b"new template", b"new")
+    monkeypatch.undo()
+    assert template.read_bytes() == b"new template" and frequency.read_text(encoding="utf-8") == "old"
+
+    TemplateIngestor(template, frequency)
+
+    assert template.read_bytes() == b"new template" and frequency.read_text(encoding="utf-8") == "new"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["frequency.json", "uploaded_template.xlsx"]
+
+
+def test_broken_worker_pool_is_replaced(ingestor):
+    """Verifies that uploads work again after the worker process died."""
+    ingestor.frequency_path.write_text("[]", encoding="utf-8")
+    _wait(ingestor, ingestor.submit(b"not an xlsx", "broken.xlsx").job_id)
+    for process in list(ingestor._executor._processes.values()):
+        process.kill()
+
+    first = _wait(ingestor, ingestor.submit(b"not an xlsx", "after-crash.xlsx").job_id)
+    content = (CONFIG / "uploaded_template.xlsx").read_bytes()
+    second = _wait(ingestor, ingestor.submit(content, "template.xlsx").job_id)
+
+    assert first.status == "failed"
+    assert second.status == "done", second.message
@@ -0,0 +1,76 @@
+import pytest
+from measurement import engine as engine_module
+from measurement.bench import create_simulated_bench
+from measurement.engine import SweepEngine
+from measurement.simulation import SimulatedChamber, SimulatedDut
+from measurement.planner import OperationCosts, build_plan
+from measurement.trace import TraceReader, TraceWriter, replay_trace
+
+WE_CONFIG = [
+    {"sheet": 1, "id": 1, "test_params": {"frequency_hz": 433.92e6, "angles": [0, 180], "polarizations": ["V", "H"]},
+     "runtime_params": {"start_power_dbm": -50, "end_power_dbm": 0, "power_step_db": 1}},
+]
+
+
+def test_trace_roundtrip_ignores_partial_record(tmp_path):
+    """Verifies that written samples are read back and a torn last record is skipped."""
+    path = tmp_path / "run.trace"
+    with TraceWriter.for_campaign(path, "run", WE_CONFIG) as writer:
+        writer.record(1, 0, 90, "H", -50.0, 0.1)
+        writer.record(1, 0, 90, "H", -49.0, 5.0)
+        writer.record(2, 0, 180, "V", -50.0, 0.1)
+    with open(path, "ab") as f:
+        f.write(b"\x00" * 7)
+
+    with pytest.raises(FileExistsError):
+        TraceWriter.for_campaign(path, "run", WE_CONFIG)
+
+    with TraceReader(path) as reader:
+        assert len(reader) == 3
+        assert reader[1].power_dbm == -49.0 and reader[1].polarization == "H"
+        assert [(point, len(samples)) for point, samples in reader.points()] == [(1, 2), (2, 1)]
+        assert reader.ramp(0).start_dbm == -50.0
+        assert reader.metadata["sheets"][0]["frequency_hz"] == 433.92e6
+
+
+def test_replay_reproduces_the_recorded_run(tmp_path, monkeypatch):
+    """Verifies that replaying a trace with the recorded ramp gives the measured results."""
+    monkeypatch.setattr(engine_module, "POSITION_POLL_S", 0.0)
+    path = tmp_path / "run.trace"
+    plan = build_plan(WE_CONFIG, OperationCosts())
+    with TraceWriter.for_campaign(path, "run", WE_CONFIG) as writer:
+        measured = [result for _, result in SweepEngine(create_simulated_bench(), WE_CONFIG, trace=writer).run(plan)]
+
+    with TraceReader(path) as reader:
+        same = replay_trace(reader)
+        coarse = replay_trace(reader, step_db=2.0)
+
+    assert [(r.replayed.activation_dbm, r.replayed.stop_dbm, r.replayed.steps) for r in same] == \
+        [(m.activation_dbm, m.stop_dbm, m.steps) for m in measured]
+    assert not any(r.changed for r in same)
+    assert sum(r.replayed.steps for r in coarse) < sum(m.steps for m in measured)
+
+
+def test_concurrent_run_trace_groups_samples_by_point(tmp_path, monkeypatch):
+    """Verifies that the interleaved samples of a shared ramp are read back as one point per DUT."""
+    monkeypatch.setattr(engine_module, "POSITION_POLL_S", 0.0)
+    duts = {1: SimulatedDut(base_threshold_dbm=-44.0), 2: SimulatedDut(base_threshold_dbm=-38.0)}
+    we_config = [
+        {"sheet": channel, "id": channel, "test_params": {"frequency_hz": 433.92e6, "angles": [0], "polarizations": ["V"]},
+         "runtime_params": {"start_power_dbm": -50, "end_power_dbm": 0, "power_step_db": 1},
+         "hardware_config": {"analog_channel": channel, "concurrent_duts": True}}
+        for channel in duts
+    ]
+    path = tmp_path / "run.trace"
+    bench = create_simulated_bench(chamber=SimulatedChamber(duts=duts))
+    with TraceWriter.for_campaign(path, "run", we_config) as writer:
+        measured = [result for _, result in
+                    SweepEngine(bench, we_config, trace=writer).run(build_plan(we_config, OperationCosts()))]
+
+    with TraceReader(path) as reader:
+        points = list(reader.points())
+        replayed = replay_trace(reader)
+
+    assert [len(samples) for _, samples in points] == [measured[0].steps] * 2
+    assert [(r.replayed.activation_dbm, r.replayed.stop_dbm) for r in replayed] == \
+        [(m.activation_dbm, m.stop_dbm) for m in measured] == [(-44.0, -47.0), (-38.0, -41.0)]
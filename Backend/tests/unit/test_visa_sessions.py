@@ -0,0 +1,120 @@
+import pytest
+from drivers.rs_smb100a import InstrumentCommandError, InstrumentConnectionError, InstrumentRangeError
+from drivers.visa_sessions import VisaSessionManager
+
+
+class FlakyGenerator:
+    """SMB100A stand-in whose link can be dropped; records the commands it receives."""
+
+    link_up = True
+    instances = []
+
+    def __init__(self, resource):
+        if not FlakyGenerator.link_up:
+            raise InstrumentConnectionError(f"Cannot connect to {resource}")
+        self.commands = []
+        FlakyGenerator.instances.append(self)
+
+    def _check(self):
+        if not FlakyGenerator.link_up:
+            raise InstrumentConnectionError("VI_ERROR_CONN_LOST")
+
+    def get_idn(self):
+        self._check()
+        return "Rohde&Schwarz,SMB100A,FAKE,1.0"
+
+    def set_frequency(self, hz):
+        self._check()
+        self.commands.append(("FREQ", hz))
+        if hz > 6e9:
+            raise InstrumentCommandError('-222,"Data out of range"')
+
+    def set_power(self, dbm):
+        if not -120 <= dbm <= 20:
+            raise InstrumentRangeError(dbm)
+        self._check()
+        self.commands.append(("POW", dbm))
+
+    def set_output_rf(self, state):
+        self._check()
+        self.commands.append(("OUTP", state))
+
+    def check_errors(self):
+        self._check()
+        errors, self.queued = getattr(self, "queued", []), []
+        if errors:
+            raise InstrumentCommandError("; ".join(errors))
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def manager():
+    FlakyGenerator.link_up = True
+    FlakyGenerator.instances = []
+    return VisaSessionManager(factory=FlakyGenerator, max_attempts=3, backoff_s=0.1, sleep=lambda s: None)
+
+
+def test_session_is_pooled_per_resource(manager):
+    """Verifies that the same resource reuses one open session."""
+    first = manager.get("GPIB0::28::INSTR")
+    first.close()
+
+    assert manager.get("GPIB0::28::INSTR") is first
+    assert len(FlakyGenerator.instances) == 1
+
+
+def test_reconnect_replays_state_with_rf_off_first(manager):
+    """Verifies reconnection after a dropped link and the replay of the cached state."""
+    session = manager.get("GPIB0::28::INSTR")
+    session.set_frequency(868.95e6)
+    session.set_power(-40)
+    session.set_output_rf(True)
+
+    FlakyGenerator.link_up = False
+    delays = []
+    manager.sleep = lambda s: (delays.append(s), setattr(FlakyGenerator, "link_up", len(delays) < 2))
+    session.set_power(-39)
+
+    replayed = FlakyGenerator.instances[-1].commands
+    assert replayed == [("OUTP", False), ("FREQ", 868.95e6), ("POW", -40), ("OUTP", True), ("POW", -39)]
+    assert session.stats["reconnects"] == 1
+    assert session.stats["last_reconnect_s"] is not None
+
+
+def test_range_error_does_not_reconnect_and_dead_link_gives_up(manager):
+    """Verifies that range errors pass through and a dead instrument ends with a connection error."""
+    session = manager.get("GPIB0::28::INSTR")
+    with pytest.raises(InstrumentRangeError):
+        session.set_power(30)
+    assert session.stats["reconnects"] == 0
+
+    FlakyGenerator.link_up = False
+    with pytest.raises(InstrumentConnectionError):
+        session.set_frequency(433.92e6)
+    assert session.stats["failed_reconnects"] == 1
+
+
+def test_command_error_is_not_resent(manager):
+    """Verifies that an error reported by the instrument passes through without a reconnect or a resend."""
+    session = manager.get("GPIB0::28::INSTR")
+    with pytest.raises(InstrumentCommandError):
+        session.set_frequency(7e9)
+
+    assert FlakyGenerator.instances[-1].commands == [("FREQ", 7e9)]
+    assert session.stats["reconnects"] == 0 and len(FlakyGenerator.instances) == 1
+
+
+def test_deferred_error_check_raises_without_reconnect(manager):
+    """Verifies that queued instrument errors reach the caller and a failed queue read is not retried."""
+    session = manager.get("GPIB0::28::INSTR")
+    FlakyGenerator.instances[-1].queued = ['-222,"Data out of range"']
+    with pytest.raises(InstrumentCommandError, match="-222"):
+        session.check_errors()
+    assert session.stats["reconnects"] == 0
+
+    FlakyGenerator.link_up = False
+    with pytest.raises(InstrumentConnectionError):
+        session.check_errors()
+    assert session.stats["reconnects"] == 0 and session.stats["failed_reconnects"] == 0
@@ -46,6 +46,22 @@ function App() {
   const [isTesting, setIsTesting] = useState(false);
   const [testResults, setTestResults] = useState(null);
   const pollingInterval = useRef(null);
+  // Kursor wyników (nagłówek X-Result-Cursor) - kolejne zapytania pobierają tylko zmienione arkusze
+  const resultCursor = useRef(0);
+
+  const fetchResults = async () => {
+    const since = resultCursor.current;
+    const resultRes = await fetch(`http://localhost:8000/download-data${since ? `?since=${since}` : ""}`);
+    if (!resultRes.ok) return;
+    const changed = await resultRes.json();
+    resultCursor.current = Number(resultRes.headers.get("X-Result-Cursor")) || 0;
+    setTestResults(prev => {
+      if (!since || !prev) return changed;
+      const key = sheet => `${sheet.sheet}|${sheet.id}`;
+      const updates = new Map(changed.map(sheet => [key(sheet), sheet]));
+      return prev.map(sheet => updates.get(key(sheet)) ?? sheet);
+    });
+  };
 
   // Funkcja do sprawdzania statusu testu
   const checkTestStatus = async () => {
@@ -55,17 +71,13 @@ function App() {
       
       // Jeśli test trwa, ale są już dostępne częściowe wyniki, pobierz je dla podglądu (Live Update)
       if (statusData.is_running && statusData.results_ready) {
-        const resultRes = await fetch("http://localhost:8000/download-data");
-        const resultData = await resultRes.json();
-        setTestResults(resultData);
+        await fetchResults();
       }
 
       // Test zakończył się pomyślnie i wyniki są gotowe
       if (!statusData.is_running && statusData.results_ready) {
         clearInterval(pollingInterval.current);
-        const resultRes = await fetch("http://localhost:8000/download-data");
-        const resultData = await resultRes.json();
-        setTestResults(resultData);
+        await fetchResults();
         setIsTesting(false);
         console.log("Test zakończony, wyniki pobrane.");
       } 
@@ -83,15 +95,21 @@ function App() {
     }
   };
 
-  const handleStartTest = async () => {
+  const handleStartTest = () => runTestRequest("start-test");
+
+  // Wznowienie przerwanego testu - backend pomija punkty zapisane w punkcie kontrolnym
+  const handleResumeTest = () => runTestRequest("resume-test");
+
+  const runTestRequest = async (endpoint) => {
     // Sprawdzenie, czy test już nie jest w toku
     if (isTesting) return;
 
     setIsTesting(true);
     setTestResults(null); // Czyścimy poprzednie wyniki
+    resultCursor.current = 0;
     try {
       // 1. Uruchom test na backendzie
-      const startRes = await fetch("http://localhost:8000/start-test", { method: "POST" });
+      const startRes = await fetch(`http://localhost:8000/${endpoint}`, { method: "POST" });
       if (!startRes.ok) {
         // Jeśli backend zwrócił błąd (np. 409 Conflict), obsłuż go
         const errorData = await startRes.json();
@@ -164,6 +182,7 @@ function App() {
         <div className="print:hidden">
           <TestControl 
             handleStartTest={handleStartTest} 
+            handleResumeTest={handleResumeTest}
             handleStopTest={handleStopTest} 
             isTesting={isTesting} 
           />
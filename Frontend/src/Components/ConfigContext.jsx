@@ -17,7 +17,10 @@ export const ConfigProvider = ({ children }) => {
     power_step_db: 1.0,
     start_table_position: 0,
     start_malt_height: 150,
-    silent_search_reduction_db: 5.0
+    silent_search_reduction_db: 5.0,
+    sweep_unit: 'dBm',
+    abort_sheet_on_fail: false,
+    predictive_start: false
   });
 
   const [testConfig, setTestConfig] = useState([]);
@@ -65,9 +68,27 @@ export const ConfigProvider = ({ children }) => {
     }
   };
 
+  // Cała konfiguracja w jednym zapytaniu; backend odpowiada 304, gdy pliki się nie zmieniły
+  const bootstrapConfig = async () => {
+    try {
+      const response = await fetch('http://127.0.0.1:8000/bootstrap');
+      if (!response.ok) {
+        console.error("Błąd pobierania konfiguracji:", response.statusText);
+        return;
+      }
+      const data = await response.json();
+      if (data.hardware_config && Object.keys(data.hardware_config).length > 0) setHardwareConfig(data.hardware_config);
+      if (data.runtime_params && Object.keys(data.runtime_params).length > 0) setRuntimeParams(data.runtime_params);
+      if (Array.isArray(data.test_config) && data.test_config.length > 0) setTestConfig(data.test_config);
+      setFrequenciesData(Array.isArray(data.frequencies) ? data.frequencies : []);
+    } catch (error) {
+      console.error("Błąd sieci podczas pobierania konfiguracji:", error);
+      setFrequenciesData([]);
+    }
+  };
+
   useEffect(() => {
-    refreshConfig();
-    fetchFrequencies();
+    bootstrapConfig();
   }, []);
 
   return (
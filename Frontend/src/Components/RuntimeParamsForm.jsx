@@ -15,6 +15,20 @@ const RuntimeParamsForm = ({ onSaveSuccess }) => {
     }));
   };
 
+  const handleUnitChange = (e) => {
+    const sweep_unit = e.target.value;
+    setRuntimeParams(prev => ({
+      ...prev,
+      sweep_unit,
+      // Domyślny zakres rampy w natężeniu pola przy pierwszym przełączeniu
+      start_field_dbuvm: prev.start_field_dbuvm ?? 20.0,
+      end_field_dbuvm: prev.end_field_dbuvm ?? 80.0,
+      field_step_db: prev.field_step_db ?? prev.power_step_db
+    }));
+  };
+
+  const isFieldMode = runtimeParams.sweep_unit === 'dBuV/m';
+
   const handleSave = async () => {
     setIsSaving(true);
     try {
@@ -50,7 +64,10 @@ const RuntimeParamsForm = ({ onSaveSuccess }) => {
       power_step_db: 1.0,
       start_table_position: 0,
       start_malt_height: 150,
-      silent_search_reduction_db: 5.0
+      silent_search_reduction_db: 5.0,
+      sweep_unit: 'dBm',
+      abort_sheet_on_fail: false,
+      predictive_start: false
     });
   };
 
@@ -62,6 +79,63 @@ const RuntimeParamsForm = ({ onSaveSuccess }) => {
       </div>
 
       <div className="grid grid-cols-1 sm:grid-cols-2 gap-4">
+        {/* Sweep Unit */}
+        <div className="sm:col-span-2">
+          <label className="block text-sm font-medium text-gray-700 mb-1">Jednostka rampy</label>
+          <select
+            name="sweep_unit"
+            value={runtimeParams.sweep_unit || 'dBm'}
+            onChange={handleUnitChange}
+            className="w-full p-2 border border-gray-300 rounded-md focus:ring-blue-500 focus:border-blue-500"
+          >
+            <option value="dBm">Moc generatora (dBm)</option>
+            <option value="dBuV/m">Natężenie pola (dBµV/m)</option>
+          </select>
+        </div>
+
+        {isFieldMode && (
+          <>
+            {/* Start Field */}
+            <div>
+              <label className="block text-sm font-medium text-gray-700 mb-1">Start Field (dBµV/m)</label>
+              <input
+                type="number"
+                name="start_field_dbuvm"
+                value={runtimeParams.start_field_dbuvm}
+                onChange={handleChange}
+                step="0.1"
+                className="w-full p-2 border border-gray-300 rounded-md focus:ring-blue-500 focus:border-blue-500"
+              />
+            </div>
+
+            {/* End Field */}
+            <div>
+              <label className="block text-sm font-medium text-gray-700 mb-1">End Field (dBµV/m)</label>
+              <input
+                type="number"
+                name="end_field_dbuvm"
+                value={runtimeParams.end_field_dbuvm}
+                onChange={handleChange}
+                step="0.1"
+                className="w-full p-2 border border-gray-300 rounded-md focus:ring-blue-500 focus:border-blue-500"
+              />
+            </div>
+
+            {/* Field Step */}
+            <div>
+              <label className="block text-sm font-medium text-gray-700 mb-1">Field Step (dB)</label>
+              <input
+                type="number"
+                name="field_step_db"
+                value={runtimeParams.field_step_db}
+                onChange={handleChange}
+                step="0.1"
+                className="w-full p-2 border border-gray-300 rounded-md focus:ring-blue-500 focus:border-blue-500"
+              />
+            </div>
+          </>
+        )}
+
         {/* Start Power */}
         <div>
           <label className="block text-sm font-medium text-gray-700 mb-1">Start Power (dBm)</label>
@@ -137,6 +211,36 @@ const RuntimeParamsForm = ({ onSaveSuccess }) => {
             className="w-full p-2 border border-gray-300 rounded-md focus:ring-blue-500 focus:border-blue-500"
           />
         </div>
+
+        {/* Abort Sheet On Fail */}
+        <div className="sm:col-span-2 flex items-center">
+          <input
+            type="checkbox"
+            id="abort_sheet_on_fail"
+            name="abort_sheet_on_fail"
+            checked={!!runtimeParams.abort_sheet_on_fail}
+            onChange={(e) => setRuntimeParams(prev => ({ ...prev, abort_sheet_on_fail: e.target.checked }))}
+            className="mr-2"
+          />
+          <label htmlFor="abort_sheet_on_fail" className="text-sm font-medium text-gray-700">
+            Przerwij arkusz po przekroczeniu limitu anteny
+          </label>
+        </div>
+
+        {/* Predictive Start */}
+        <div className="sm:col-span-2 flex items-center">
+          <input
+            type="checkbox"
+            id="predictive_start"
+            name="predictive_start"
+            checked={!!runtimeParams.predictive_start}
+            onChange={(e) => setRuntimeParams(prev => ({ ...prev, predictive_start: e.target.checked }))}
+            className="mr-2"
+          />
+          <label htmlFor="predictive_start" className="text-sm font-medium text-gray-700">
+            Start rampy od przewidywanego progu (sąsiednie kąty)
+          </label>
+        </div>
       </div>
 
       <div className="mt-6 flex gap-3">
@@ -2,6 +2,17 @@ import React, { useState, useCallback } from 'react';
 import { useDropzone } from 'react-dropzone';
 import { FileUp, CheckCircle2 } from 'lucide-react';
 
+// Odpytuje backend o status zadania przetwarzania szablonu aż do jego zakończenia
+const waitForIngestJob = async (jobId) => {
+  for (;;) {
+    const res = await fetch(`http://127.0.0.1:8000/upload-template/${jobId}`);
+    const job = await res.json();
+    if (!res.ok) throw new Error(job.detail || 'Nie można odczytać statusu przetwarzania.');
+    if (job.status === 'done' || job.status === 'failed') return job;
+    await new Promise((resolve) => setTimeout(resolve, 500));
+  }
+};
+
 const TemplateUploader = ({ onUploadSuccess }) => {
   const [templateFile, setTemplateFile] = useState(null);
 
@@ -18,18 +29,20 @@ const TemplateUploader = ({ onUploadSuccess }) => {
       const formData = new FormData();
       formData.append('file', file);
 
-      // Wysyłamy szablon do backendu
+      // Wysyłamy szablon do backendu - przetwarzanie odbywa się w tle
       fetch('http://127.0.0.1:8000/upload-template', {
         method: 'POST',
         body: formData,
       })
         .then(async (res) => {
           const data = await res.json();
-          if (!res.ok) throw new Error(data.detail || 'Wystąpił błąd podczas przetwarzania pliku.');
-          return data;
+          if (!res.ok) throw new Error(data.detail || 'Wystąpił błąd podczas przesyłania pliku.');
+          return waitForIngestJob(data.job_id);
         })
-        .then((data) => {
-          alert(data.message);
+        .then((job) => {
+          if (job.status === 'failed') throw new Error(job.message);
+          const warnings = job.report?.warnings || [];
+          alert(warnings.length > 0 ? `${job.message}\n\nOstrzeżenia:\n${warnings.join('\n')}` : job.message);
           if (onUploadSuccess) {
             onUploadSuccess(); // Odśwież listę częstotliwości
           }
@@ -10,6 +10,7 @@ const TestConfigForm = ({ onSaveSuccess }) => {
   const [antennas, setAntennas] = useState([]);
   const [selectedAntenna, setSelectedAntenna] = useState("");
   const [distance, setDistance] = useState(3);
+  const [dutSerial, setDutSerial] = useState("");
   const [isSaving, setIsSaving] = useState(false);
 
   // Pobierz dostępne anteny
@@ -66,6 +67,7 @@ const TestConfigForm = ({ onSaveSuccess }) => {
           date: currentDate,
           description: `EMC sensitivity sweep test for ${freqData.frequency_mhz} MHz band`,
           antenna: selectedAntenna,
+          dut_serial: dutSerial.trim() || null,
           test_params: {
             frequency_hz: Math.round(freqData.frequency_mhz * 1000000), // Konwersja MHz -> Hz
             wire_loss_db: freqData.wire_loss_db,
@@ -84,7 +86,7 @@ const TestConfigForm = ({ onSaveSuccess }) => {
   useEffect(() => {
     const newConfig = generateConfig();
     setTestConfig(newConfig);
-  }, [sheetCount, selectedFreqIds, selectedAntenna, distance, availableFrequencies]);
+  }, [sheetCount, selectedFreqIds, selectedAntenna, distance, dutSerial, availableFrequencies]);
 
   const handleSave = async () => {
     if (!selectedAntenna) {
@@ -160,6 +162,15 @@ const TestConfigForm = ({ onSaveSuccess }) => {
             className="w-full p-2 text-sm border border-gray-300 rounded-md focus:ring-blue-500 focus:border-blue-500"
           />
         </div>
+        <div>
+          <label className="block text-xs font-bold text-gray-500 uppercase mb-1">Numer seryjny DUT</label>
+          <input
+            type="text"
+            value={dutSerial}
+            onChange={(e) => setDutSerial(e.target.value)}
+            className="w-full p-2 text-sm border border-gray-300 rounded-md focus:ring-blue-500 focus:border-blue-500"
+          />
+        </div>
       </div>
 
       <div className="mb-4">
@@ -189,7 +200,7 @@ const TestConfigForm = ({ onSaveSuccess }) => {
               <option value="">-- Wybierz --</option>
               {availableFrequencies.map((freq) => (
                 <option key={freq.id} value={freq.id}>
-                  {freq.frequency_mhz} MHz ({freq.protocol} - {freq.country})
+                  {freq.frequency_mhz} MHz ({freq.protocol} - {freq.country}){freq.sheets ? ` [Arkusz ${freq.sheets.join(', ')}]` : ''}
                 </option>
               ))}
             </select>
@@ -1,4 +1,21 @@
-function TestControl({ handleStartTest, handleStopTest, isTesting }) {
+import { useEffect, useState } from 'react';
+
+const formatDuration = (seconds) => {
+  const minutes = Math.round(seconds / 60);
+  return minutes >= 60 ? `${Math.floor(minutes / 60)} h ${minutes % 60} min` : `${minutes} min`;
+};
+
+function TestControl({ handleStartTest, handleResumeTest, handleStopTest, isTesting }) {
+    const [plan, setPlan] = useState(null);
+
+    // Plan kampanii (szacowany czas i oszczędność względem kolejności arkuszy) przed startem testu
+    useEffect(() => {
+      if (isTesting) return;
+      fetch("http://localhost:8000/campaign-plan")
+        .then((res) => (res.ok ? res.json() : null))
+        .then(setPlan)
+        .catch(() => setPlan(null));
+    }, [isTesting]);
 
     return (
         /* Sekcja Sterowania Anteną */
@@ -18,6 +35,18 @@ function TestControl({ handleStartTest, handleStopTest, isTesting }) {
               {isTesting ? "Test w toku..." : "Uruchom Test Anteny"}
             </button>
 
+            <button
+              onClick={handleResumeTest}
+              disabled={isTesting}
+              className={`px-6 py-3 rounded-md font-semibold text-white transition-colors w-64 text-center ${
+                isTesting 
+                  ? "bg-slate-400 cursor-not-allowed" 
+                  : "bg-amber-600 hover:bg-amber-700 shadow-lg"
+              }`}
+            >
+              Wznów Przerwany Test
+            </button>
+
             <button
               onClick={handleStopTest}
               disabled={!isTesting}
@@ -30,6 +59,15 @@ function TestControl({ handleStartTest, handleStopTest, isTesting }) {
               Zatrzymaj Test
             </button>
           </div>
+
+          {plan && (
+            <p className="mt-4 text-sm text-slate-600">
+              Plan: {plan.points} punktów, szacowany czas {formatDuration(plan.estimated_s)}
+              {plan.saving_s > 0 && (
+                <> (kolejność arkuszy: {formatDuration(plan.naive_estimated_s)}, oszczędność {formatDuration(plan.saving_s)} / {plan.saving_pct}%)</>
+              )}
+            </p>
+          )}
         </div>
     );
 }